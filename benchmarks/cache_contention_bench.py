@@ -0,0 +1,113 @@
+"""
+캐시 잠금 경합 벤치마크
+
+여러 스레드에서 동시에 캐시를 조회/저장하여 단일 잠금 ImageCache와
+샤드 분할 ShardedImageCache의 처리량(ops/s)을 스레드 수별로 비교합니다.
+조회 시 validator가 파일 존재를 확인(syscall)하므로 잠금을 잡은 채
+GIL을 놓는 실제 서버의 HIT 경로와 같은 조건입니다.
+
+사용법:
+    python benchmarks/cache_contention_bench.py
+    python benchmarks/cache_contention_bench.py --threads 1 8 32 --shards 8 --ops 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from generators.cache import ImageCache  # noqa: E402
+from generators.sharded_cache import ShardedImageCache  # noqa: E402
+
+
+def files_exist(result: Dict[str, Any]) -> bool:
+    """ImageGenerator의 캐시 검증과 같은 파일 존재 확인"""
+    return all(os.path.exists(path) for path in result["image_paths"])
+
+
+def run(
+    cache, threads: int, ops: int, keys: int, write_ratio: float, path: str
+) -> float:
+    """스레드 수별 처리량(ops/s) 측정"""
+    for i in range(keys):
+        cache.set(f"key{i}", {"image_paths": [path]})
+
+    barrier = threading.Barrier(threads + 1)
+    per_thread = ops // threads
+
+    def worker(seed: int) -> None:
+        rng = random.Random(seed)
+        barrier.wait()
+        for _ in range(per_thread):
+            key = f"key{rng.randrange(keys)}"
+            if rng.random() < write_ratio:
+                cache.set(key, {"image_paths": [path]})
+            else:
+                cache.get(key)
+
+    pool = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * threads / elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ops", type=int, default=20000, help="전체 연산 수")
+    parser.add_argument("--keys", type=int, default=1000, help="키 개수")
+    parser.add_argument("--shards", type=int, default=8, help="샤드 수")
+    parser.add_argument(
+        "--write-ratio", type=float, default=0.1, help="저장 연산 비율 (0~1)"
+    )
+    parser.add_argument(
+        "--threads", type=int, nargs="+", default=[1, 8, 32], help="스레드 수 목록"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"keys={args.keys}, ops={args.ops}, write_ratio={args.write_ratio}, "
+        f"shards={args.shards}, cpu={os.cpu_count()}"
+    )
+    print(f"{'threads':>8} {'single ops/s':>13} {'sharded ops/s':>14} {'speedup':>8}")
+
+    with tempfile.NamedTemporaryFile(suffix=".png") as image:
+        for threads in args.threads:
+            single = run(
+                ImageCache(max_size=args.keys, validator=files_exist),
+                threads,
+                args.ops,
+                args.keys,
+                args.write_ratio,
+                image.name,
+            )
+            sharded = run(
+                ShardedImageCache(
+                    max_size=args.keys, validator=files_exist, shards=args.shards
+                ),
+                threads,
+                args.ops,
+                args.keys,
+                args.write_ratio,
+                image.name,
+            )
+            print(
+                f"{threads:>8} {single:>13.0f} {sharded:>14.0f} "
+                f"{sharded / single:>7.2f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
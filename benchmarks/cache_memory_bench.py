@@ -0,0 +1,128 @@
+"""
+캐시 항목 메모리 벤치마크
+
+ImageCache L1에 서버가 저장하는 형식의 성공 결과(출력본 목록과 마스터 해시
+포함)를 N개 저장하고 항목당 메모리를 측정합니다. 결과 딕셔너리를 그대로
+보관하던 이전 방식(dataclass 항목 + dict)과 비교하며, tracemalloc 측정값과
+get_stats()의 memory_bytes 추정값을 함께 출력합니다.
+
+사용법:
+    python benchmarks/cache_memory_bench.py
+    python benchmarks/cache_memory_bench.py --entries 100000
+"""
+
+import argparse
+import gc
+import hashlib
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from generators.cache import ImageCache  # noqa: E402
+
+STYLES = ("realistic", "anime", "watercolor", "cyberpunk")
+FORMATS = (("png", 95), ("webp", 80), ("jpeg", 90))
+
+
+@dataclass
+class LegacyEntry:
+    """이전 CacheEntry (결과 딕셔너리를 그대로 보관)"""
+
+    key: str
+    result: Dict[str, Any]
+    created_at: float
+    expires_at: float
+    weight: int = 0
+
+
+def make_result(i: int) -> Dict[str, Any]:
+    """_store_cached()가 저장하는 형식의 결과 (문자열은 요청마다 새로 생성)"""
+    fmt, quality = FORMATS[i % len(FORMATS)]
+    digest = hashlib.sha256(str(i).encode()).hexdigest()
+    path = f"/home/user/obsidian-imagen/output/images/blobs/{digest[:2]}/{digest}.{fmt}"
+    rendition = {
+        "local_path": path,
+        "url": f"{path}",
+        "filename": f"imagen_{i:08d}.{fmt}",
+        "content_hash": digest,
+        "format": f"{fmt}",
+        "quality": quality,
+        "width": 1408,
+        "height": 768,
+        "encoding": f"{'server' if fmt == 'png' else 'local'}",
+        "status": f"Image generated with Imagen 4 and saved as {fmt.upper()}.",
+    }
+    return {
+        "success": True,
+        "prompt": f"a {STYLES[i % 4]} portrait of a cat number {i} sitting on a sofa",
+        **rendition,
+        "master_hash": hashlib.sha256(digest.encode()).hexdigest(),
+        "renditions": {f"{fmt}" if fmt == "png" else f"{fmt}:q{quality}": rendition},
+        "served_as": [f"{fmt}:q{quality}"],
+    }
+
+
+def measure(entries: int, fill: Callable[[int], Any]) -> int:
+    """fill(entries)가 할당한 메모리(바이트, 결과를 보관하는 동안)"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    holder = fill(entries)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del holder
+    gc.collect()
+    return after - before
+
+
+def fill_legacy(entries: int) -> Any:
+    cache: "OrderedDict[str, LegacyEntry]" = OrderedDict()
+    now = time.monotonic()
+    for i in range(entries):
+        key = hashlib.sha256(f"key{i}".encode()).hexdigest()
+        cache[key] = LegacyEntry(key, make_result(i), now, now + 3600, 4096)
+    return cache
+
+
+def fill_compact(entries: int) -> Any:
+    cache = ImageCache(max_size=entries, ttl_seconds=3600, weigher=lambda _: 4096)
+    for i in range(entries):
+        cache.set(hashlib.sha256(f"key{i}".encode()).hexdigest(), make_result(i))
+    return cache
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--entries", type=int, default=100000, help="저장할 항목 수")
+    args = parser.parse_args()
+
+    legacy = measure(args.entries, fill_legacy)
+    stats: Dict[str, Any] = {}
+
+    def fill_and_stats(entries: int) -> Any:
+        cache = fill_compact(entries)
+        stats.update(cache.get_stats())
+        return cache
+
+    compact = measure(args.entries, fill_and_stats)
+
+    print(f"entries: {args.entries}")
+    print(f"{'layout':>22} {'total MiB':>10} {'bytes/entry':>12}")
+    for name, total in (("dataclass + dict", legacy), ("slots + tuple", compact)):
+        print(f"{name:>22} {total / 2**20:>10.1f} {total / args.entries:>12.0f}")
+    print(
+        f"{'memory_bytes (stat)':>22} {stats['memory_bytes'] / 2**20:>10.1f} "
+        f"{stats['memory_bytes'] / args.entries:>12.0f}"
+    )
+    print(f"saved: {(1 - compact / legacy) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+캐시 제거 정책 trace 재생 벤치마크
+
+기록된 캐시 키 순서(CACHE_TRACE_PATH로 기록한 파일 등)를 ImageCache에
+재생하여 LRU와 W-TinyLFU(CACHE_ADMISSION=tinylfu)의 hit rate를 캐시 크기별로
+비교합니다. MISS이면 생성 후 저장하는 서버 동작과 같이 get() 후 set()합니다.
+trace 파일이 없으면 자주 쓰이는 하우스 스타일 프롬프트(Zipf 분포)와
+일회성 프롬프트, 일회성 프롬프트 배치가 섞인 합성 trace를 사용합니다.
+
+사용법:
+    python benchmarks/cache_trace_bench.py
+    python benchmarks/cache_trace_bench.py --trace output/cache/trace.log --sizes 50 100 200
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from generators.cache import ImageCache  # noqa: E402
+
+
+def load_trace(path: Path) -> List[str]:
+    """trace 파일 읽기 (줄마다 키 하나, 또는 "key" 필드가 있는 JSON 줄)"""
+    keys = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            keys.append(json.loads(line)["key"] if line.startswith("{") else line)
+    return keys
+
+
+def synthetic_trace(
+    length: int, house: int, house_ratio: float, burst_every: int, burst_size: int
+) -> List[str]:
+    """하우스 스타일(Zipf) + 일회성 프롬프트 + 주기적 일회성 배치 trace 생성"""
+    rng = random.Random(0)
+    weights = [1 / (rank + 1) for rank in range(house)]
+    keys: List[str] = []
+    one_off = 0
+    while len(keys) < length:
+        if burst_every and len(keys) % burst_every == burst_every - 1:
+            # 배치 생성처럼 일회성 프롬프트가 한꺼번에 들어오는 구간
+            keys.extend(f"batch-{one_off + i}" for i in range(burst_size))
+            one_off += burst_size
+        elif rng.random() < house_ratio:
+            keys.append(f"house-{rng.choices(range(house), weights)[0]}")
+        else:
+            keys.append(f"once-{one_off}")
+            one_off += 1
+    return keys[:length]
+
+
+def replay(keys: List[str], size: int, admission: str) -> float:
+    """trace 재생 후 hit rate(%) 반환"""
+    cache = ImageCache(max_size=size, ttl_seconds=10**9, admission=admission)
+    for key in keys:
+        if cache.get(key) is None:
+            cache.set(key, {"key": key})
+    return cache.get_stats()["hit_rate_percent"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--trace", type=Path, help="재생할 trace 파일 (기본: 합성)")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[25, 50, 100, 200],
+        help="캐시 크기 목록",
+    )
+    parser.add_argument("--length", type=int, default=50000, help="합성 trace 길이")
+    parser.add_argument(
+        "--house", type=int, default=100, help="하우스 스타일 프롬프트 수"
+    )
+    parser.add_argument(
+        "--house-ratio", type=float, default=0.6, help="하우스 스타일 요청 비율"
+    )
+    parser.add_argument(
+        "--burst-every", type=int, default=2000, help="일회성 배치 간격 (0 = 없음)"
+    )
+    parser.add_argument("--burst-size", type=int, default=300, help="일회성 배치 크기")
+    args = parser.parse_args()
+
+    if args.trace:
+        keys = load_trace(args.trace)
+        source = str(args.trace)
+    else:
+        keys = synthetic_trace(
+            args.length, args.house, args.house_ratio, args.burst_every, args.burst_size
+        )
+        source = "synthetic"
+    print(f"trace: {source}, requests={len(keys)}, unique={len(set(keys))}")
+    print(f"{'size':>6} {'lru hit%':>9} {'tinylfu hit%':>13} {'delta':>7} {'time':>7}")
+
+    for size in args.sizes:
+        started = time.perf_counter()
+        lru = replay(keys, size, "lru")
+        tinylfu = replay(keys, size, "tinylfu")
+        elapsed = time.perf_counter() - started
+        print(
+            f"{size:>6} {lru:>9.2f} {tinylfu:>13.2f} {tinylfu - lru:>+7.2f} "
+            f"{elapsed:>6.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+후처리 프로세스 풀 처리량 벤치마크
+
+API 응답 크기(기본 2048px)의 이미지를 여러 요청 스레드에서 동시에
+PostProcessor.render()로 처리하고, 워커 수별 처리량(images/s)을 비교합니다.
+workers=0은 기존 방식(요청 스레드에서 직접 처리, GIL 경합)입니다.
+
+사용법:
+    python benchmarks/postprocess_bench.py
+    python benchmarks/postprocess_bench.py --images 32 --size 2048 --workers 0 1 2 4 8
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from generators.postprocess import PostProcessor  # noqa: E402
+
+
+def make_source_image(size: int) -> bytes:
+    """압축이 어려운 노이즈 섞인 그라디언트 PNG 바이트 생성"""
+    rng = np.random.default_rng(0)
+    gradient = np.linspace(0, 255, size, dtype=np.float32)
+    arr = np.stack(
+        [
+            np.tile(gradient, (size, 1)),
+            np.tile(gradient[:, None], (1, size)),
+            np.full((size, size), 128, dtype=np.float32),
+        ],
+        axis=-1,
+    )
+    arr += rng.normal(0, 12, arr.shape)
+    img = Image.fromarray(np.clip(arr, 0, 255).astype(np.uint8), mode="RGB")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def run(
+    workers: int,
+    image_bytes: bytes,
+    images: int,
+    target: int,
+    format: str,
+    output_dir: Path,
+) -> float:
+    """워커 수별 처리량(images/s) 측정"""
+    processor = PostProcessor(workers=workers)
+    # 요청 스레드 수는 워커 수보다 많게 두어 풀이 항상 바쁘도록 함
+    threads = max(2, workers * 2)
+
+    def job(index: int) -> None:
+        processor.render(
+            image_bytes,
+            str(output_dir / f"w{workers}_{index}.{format}"),
+            format,
+            90,
+            target,
+            target,
+        )
+
+    try:
+        # 프로세스 시작 비용은 측정에서 제외
+        job(-1)
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=threads) as pool:
+            list(pool.map(job, range(images)))
+        elapsed = time.perf_counter() - start
+    finally:
+        processor.shutdown()
+    return images / elapsed
+
+
+def main() -> None:
+    cpu = os.cpu_count() or 1
+    default_workers = sorted({0, 1, 2, 4, cpu} & set(range(cpu + 1)))
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--images", type=int, default=16, help="처리할 이미지 수")
+    parser.add_argument("--size", type=int, default=2048, help="원본 이미지 크기(px)")
+    parser.add_argument(
+        "--target", type=int, default=1536, help="리사이즈 목표 크기(px)"
+    )
+    parser.add_argument("--format", default="png", help="출력 형식 (png/jpeg/webp)")
+    parser.add_argument(
+        "--workers", type=int, nargs="+", default=default_workers, help="워커 수 목록"
+    )
+    args = parser.parse_args()
+
+    image_bytes = make_source_image(args.size)
+    print(
+        f"source: {args.size}px PNG ({len(image_bytes) / 1024:.0f} KiB) -> "
+        f"{args.target}px {args.format.upper()}, images={args.images}, cpu={cpu}"
+    )
+    print(f"{'workers':>8} {'images/s':>10} {'speedup':>8}")
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for workers in args.workers:
+            throughput = run(
+                workers, image_bytes, args.images, args.target, args.format, Path(tmp)
+            )
+            baseline = baseline or throughput
+            print(f"{workers:>8} {throughput:>10.2f} {throughput / baseline:>7.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -28,10 +28,11 @@ class ImageGallery:
         thumbnail_dir: 썸네일 저장 디렉토리
         enable_thumbnails: 썸네일 생성 활성화 여부
         thumbnail_size: 썸네일 크기 (픽셀)
+        blob_store: 내용 주소 이미지 저장소 (레코드별 "gallery:<ID>" 참조 보유)
     """
 
     # 메타데이터 파일 잠금 (동시성 제어)
-    _lock = threading.Lock()
+    _lock = threading.RLock()
 
     def __init__(
         self,
@@ -40,6 +41,7 @@ class ImageGallery:
         enable_thumbnails: bool = False,
         thumbnail_dir: Optional[Path] = None,
         thumbnail_size: int = 256,
+        blob_store: Any = None,
     ):
         """
         이미지 갤러리를 초기화합니다.
@@ -50,11 +52,13 @@ class ImageGallery:
             enable_thumbnails: 썸네일 생성 활성화 여부
             thumbnail_dir: 썸네일 저장 디렉토리 (기본값: images_dir.parent / "thumbnails")
             thumbnail_size: 썸네일 크기 (기본값: 256px)
+            blob_store: 내용 주소 이미지 저장소 (기본값: None = 파일 직접 삭제)
         """
         self.images_dir = Path(images_dir)
         self.metadata_path = Path(metadata_path)
         self.enable_thumbnails = enable_thumbnails
         self.thumbnail_size = thumbnail_size
+        self.blob_store = blob_store
 
         # 썸네일 디렉토리 설정
         if thumbnail_dir is None:
@@ -68,6 +72,7 @@ class ImageGallery:
         # 메타데이터 로드
         self._images: Dict[str, ImageMetadata] = {}
         self._load_metadata()
+        self._sync_blob_references()
 
     def _ensure_directories(self) -> None:
         """필요한 디렉토리를 생성합니다."""
@@ -96,6 +101,32 @@ class ImageGallery:
             self._images = {}
             self._save_metadata()  # 빈 메타데이터 파일 생성
 
+    def _sync_blob_references(self) -> None:
+        """저장소 참조를 메타데이터 레코드와 일치시킵니다."""
+        if self.blob_store is None:
+            return
+        alive = []
+        for image_id, metadata in self._images.items():
+            if metadata.content_hash:
+                holder = f"gallery:{image_id}"
+                if self.blob_store.acquire(metadata.content_hash, holder):
+                    alive.append(holder)
+        self.blob_store.retain("gallery:", alive)
+
+    def _release_file(self, metadata: ImageMetadata) -> None:
+        """
+        이미지 파일 참조를 해제합니다.
+
+        저장소 파일은 다른 보유자(캐시 항목 등)가 없을 때만 삭제되고,
+        저장소 밖 파일은 바로 삭제됩니다.
+        """
+        if metadata.content_hash and self.blob_store is not None:
+            self.blob_store.release(f"gallery:{metadata.id}")
+            return
+        image_file = Path(metadata.filepath)
+        if image_file.exists():
+            image_file.unlink()
+
     def _save_metadata(self) -> None:
         """메타데이터를 저장합니다."""
         with self._lock:
@@ -122,6 +153,8 @@ class ImageGallery:
 
             # 메타데이터 등록
             self._images[metadata.id] = metadata
+            if metadata.content_hash and self.blob_store is not None:
+                self.blob_store.acquire(metadata.content_hash, f"gallery:{metadata.id}")
             self._save_metadata()
 
             logger.info(f"이미지 등록 완료: {metadata.id}")
@@ -158,6 +191,16 @@ class ImageGallery:
             logger.error(f"썸네일 생성 실패: {e}")
             return None
 
+    def all_images(self) -> List[ImageMetadata]:
+        """
+        모든 이미지 메타데이터의 사본 목록을 반환합니다. (다른 스레드에서 읽기용)
+
+        Returns:
+            이미지 메타데이터 목록 (등록 순서)
+        """
+        with self._lock:
+            return list(self._images.values())
+
     def list_images(
         self,
         limit: int = 50,
@@ -292,10 +335,8 @@ class ImageGallery:
             }
 
         with self._lock:
-            # 파일 삭제
-            image_file = Path(metadata.filepath)
-            if image_file.exists():
-                image_file.unlink()
+            # 파일 삭제 (저장소 파일은 참조 해제)
+            self._release_file(metadata)
 
             # 썸네일 삭제
             if metadata.thumbnail_path:
@@ -377,16 +418,19 @@ class ImageGallery:
 
         파일이 존재하지 않는 메타데이터 항목을 제거합니다.
         """
-        orphaned = []
+        with self._lock:
+            orphaned = []
 
-        for image_id, metadata in list(self._images.items()):
-            image_file = Path(metadata.filepath)
-            if not image_file.exists():
-                orphaned.append(image_id)
+            for image_id, metadata in list(self._images.items()):
+                image_file = Path(metadata.filepath)
+                if not image_file.exists():
+                    orphaned.append(image_id)
 
-        if orphaned:
-            logger.warning(f"고아 메타데이터 {len(orphaned)}개 발견, 삭제 중")
-            for image_id in orphaned:
-                del self._images[image_id]
+            if orphaned:
+                logger.warning(f"고아 메타데이터 {len(orphaned)}개 발견, 삭제 중")
+                for image_id in orphaned:
+                    if self.blob_store is not None:
+                        self.blob_store.release(f"gallery:{image_id}")
+                    del self._images[image_id]
 
-            self._save_metadata()
+                self._save_metadata()
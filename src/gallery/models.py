@@ -29,6 +29,7 @@ class ImageMetadata:
         format: 이미지 형식 (png, jpeg, webp)
         size_bytes: 파일 크기 (바이트)
         generation_params: 생성 파라미터 딕셔너리
+        content_hash: 내용 주소 저장소의 SHA-256 해시 (저장소 밖 파일이면 None)
     """
 
     id: str
@@ -43,6 +44,7 @@ class ImageMetadata:
     format: str
     size_bytes: int
     generation_params: Dict[str, Any]
+    content_hash: Optional[str] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -0,0 +1,180 @@
+"""
+캐시 입장(admission) 정책 모듈
+
+ImageCache의 기본 LRU는 한 번만 요청되는 프롬프트가 몰리면 자주 쓰이는
+하우스 스타일 프롬프트 항목까지 밀어냅니다. WTinyLFU는 최근 접근 빈도를
+count-min sketch로 추정하여, 새 항목이 밀어낼 항목보다 자주 쓰일 때만
+본 영역(main)에 들입니다.
+
+핵심 기능:
+- CountMinSketch: 4비트 포화 카운터, 표본 수가 폭의 10배가 되면 절반으로 감쇠
+- WTinyLFU: 입장 창(window, 용량 1%) LRU + 본 영역 SLRU(probation 20%/protected 80%)
+- 창에서 밀려난 후보와 probation의 LRU 항목 중 추정 빈도가 높은 쪽을 유지
+
+정책 객체는 키 순서만 관리하며, 항목 저장과 잠금은 ImageCache가 담당합니다.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import List, Optional
+
+# CACHE_ADMISSION 값
+ADMISSION_POLICIES = ("lru", "tinylfu")
+
+
+class CountMinSketch:
+    """
+    키 접근 빈도 추정기 (count-min sketch)
+
+    특징:
+    - depth개 행의 카운터 중 최솟값으로 빈도를 추정 (과대 추정만 발생)
+    - 카운터는 15에서 포화
+    - 기록 수가 width * 10에 도달하면 모든 카운터를 절반으로 줄여 오래된 빈도 감쇠
+    """
+
+    DEPTH = 4
+    MAX_COUNT = 15
+
+    def __init__(self, width: int):
+        """
+        Args:
+            width: 행당 카운터 수 (2의 거듭제곱으로 올림, 보통 캐시 용량의 몇 배)
+        """
+        self.width = 1 << max(4, (max(1, width) - 1).bit_length())
+        self._mask = self.width - 1
+        self._rows = [bytearray(self.width) for _ in range(self.DEPTH)]
+        self._samples = 0
+        self._sample_limit = self.width * 10
+
+    def _indexes(self, key: str) -> List[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        return [
+            int.from_bytes(digest[i * 4 : (i + 1) * 4], "little") & self._mask
+            for i in range(self.DEPTH)
+        ]
+
+    def increment(self, key: str) -> None:
+        """키 접근 기록"""
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < self.MAX_COUNT:
+                row[index] += 1
+        self._samples += 1
+        if self._samples >= self._sample_limit:
+            self._reset()
+
+    def estimate(self, key: str) -> int:
+        """키의 추정 접근 빈도"""
+        return min(row[index] for row, index in zip(self._rows, self._indexes(key)))
+
+    def _reset(self) -> None:
+        """모든 카운터 절반으로 감쇠"""
+        for row in self._rows:
+            for i, count in enumerate(row):
+                if count:
+                    row[i] = count >> 1
+        self._samples //= 2
+
+
+class WTinyLFU:
+    """
+    W-TinyLFU 제거 대상 선택 정책
+
+    새 키는 입장 창의 MRU 위치에 들어가고, 창이 차면 창의 LRU 키(후보)가
+    본 영역으로 옮겨질지 경쟁합니다. probation에서 다시 접근된 키는
+    protected로 승격되며, protected가 차면 그 LRU 키는 probation으로 강등됩니다.
+    """
+
+    def __init__(self, max_size: int):
+        """
+        Args:
+            max_size: 캐시 최대 항목 수 (창 1%, 최소 1개)
+        """
+        self.resize(max_size)
+        self.sketch = CountMinSketch(max(16, max_size * 4))
+        self._window: OrderedDict[str, None] = OrderedDict()
+        self._probation: OrderedDict[str, None] = OrderedDict()
+        self._protected: OrderedDict[str, None] = OrderedDict()
+
+    def resize(self, max_size: int) -> None:
+        """
+        영역 크기 재계산 (캐시 용량 변경 시, 초과분은 victim()이 차례로 선택)
+
+        빈도 추정기는 그대로 유지합니다.
+        """
+        self.window_max = max(1, max_size // 100)
+        self.main_max = max(0, max_size - self.window_max)
+        self.protected_max = self.main_max * 8 // 10
+
+    def record(self, key: str) -> None:
+        """조회 기록 (HIT/MISS 모두, 빈도 추정용)"""
+        self.sketch.increment(key)
+
+    def add(self, key: str) -> None:
+        """새 키를 입장 창에 추가"""
+        self.remove(key)
+        self._window[key] = None
+
+    def access(self, key: str) -> None:
+        """HIT한 키의 순서 갱신 (probation → protected 승격)"""
+        if key in self._window:
+            self._window.move_to_end(key)
+        elif key in self._protected:
+            self._protected.move_to_end(key)
+        elif key in self._probation:
+            del self._probation[key]
+            self._protected[key] = None
+            while len(self._protected) > self.protected_max and self._protected:
+                demoted, _ = self._protected.popitem(last=False)
+                self._probation[demoted] = None
+
+    def remove(self, key: str) -> None:
+        """키 삭제 (제거/무효화/만료 시)"""
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                del segment[key]
+                return
+
+    @staticmethod
+    def _oldest(
+        segment: "OrderedDict[str, None]", protect: Optional[str]
+    ) -> Optional[str]:
+        for key in segment:
+            if key != protect:
+                return key
+        return None
+
+    def victim(self, protect: Optional[str] = None) -> Optional[str]:
+        """
+        용량/무게 예산 초과 시 제거할 키 선택 (선택된 키는 호출자가 remove())
+
+        Args:
+            protect: 제거하지 않을 키 (방금 저장/갱신한 키)
+
+        Returns:
+            제거할 키 또는 None (protect 외에 항목이 없음)
+        """
+        while len(self._window) > self.window_max:
+            candidate = self._oldest(self._window, protect)
+            if candidate is None:
+                break
+            if len(self._probation) + len(self._protected) < self.main_max:
+                # 본 영역에 자리가 있으면 경쟁 없이 probation으로 이동
+                del self._window[candidate]
+                self._probation[candidate] = None
+                continue
+            victim = self._oldest(self._probation, protect) or self._oldest(
+                self._protected, protect
+            )
+            if victim is None:
+                return candidate
+            if self.sketch.estimate(candidate) > self.sketch.estimate(victim):
+                del self._window[candidate]
+                self._probation[candidate] = None
+                return victim
+            return candidate
+
+        return (
+            self._oldest(self._probation, protect)
+            or self._oldest(self._protected, protect)
+            or self._oldest(self._window, protect)
+        )
@@ -0,0 +1,413 @@
+"""
+내용 주소 기반 이미지 저장소 모듈
+
+생성된 이미지 파일을 인코딩된 바이트의 SHA-256 해시로 저장하고,
+캐시 항목과 갤러리 레코드가 보유한 참조를 관리합니다.
+
+핵심 기능:
+- 같은 내용의 이미지는 한 번만 저장 (중복 제거)
+- 보유자(holder) 단위 참조: "cache:<키>", "gallery:<이미지 ID>" 등
+- 마지막 참조가 해제되면 파일 삭제 (캐시 HIT이 삭제된 파일을 가리키지 않음)
+- 참조 목록을 SQLite 인덱스에 저장하여 재시작 후에도 유지
+- 같은 디렉토리를 쓰는 여러 프로세스가 인덱스를 공유 (변경마다 행 단위 트랜잭션)
+- 스레드 안전성 (단일 연결 + RLock)
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    ext TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS holders (
+    holder TEXT PRIMARY KEY,
+    digest TEXT NOT NULL,
+    owner INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_holders_digest ON holders (digest);
+"""
+
+
+def file_digest(path: Path) -> str:
+    """
+    파일 내용의 SHA-256 해시
+
+    Args:
+        path: 파일 경로
+
+    Returns:
+        64자 16진수 해시 문자열
+    """
+    sha = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+def _process_alive(pid: int) -> bool:
+    """pid 프로세스가 실행 중인지 여부"""
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+
+def _prefix_range(prefix: str) -> Tuple[str, str]:
+    """prefix로 시작하는 문자열의 [하한, 상한) 범위 (인덱스 범위 검색용)"""
+    if not prefix:
+        return "", chr(0x10FFFF)
+    return prefix, prefix[:-1] + chr(ord(prefix[-1]) + 1)
+
+
+class BlobStore:
+    """
+    SHA-256 내용 주소 저장소
+
+    파일은 root/<해시 앞 2자>/<해시>.<확장자>에 저장됩니다.
+    보유자가 없는 새 파일은 유지되며, 참조가 있던 파일은 마지막 보유자가
+    해제될 때 삭제됩니다.
+
+    참조는 root/index.sqlite3에 보유자 단위 행으로 저장되며, 각 행에는
+    참조를 등록한 프로세스(owner)가 기록됩니다. 같은 디렉토리를 쓰는 다른
+    프로세스의 변경도 즉시 반영되고, 재시작 시 정리(reclaim)는 종료된
+    프로세스의 참조만 대상으로 합니다.
+    """
+
+    INDEX_FILENAME = "index.sqlite3"
+
+    def __init__(self, root: Path):
+        """
+        저장소 초기화 (인덱스가 없으면 생성)
+
+        Args:
+            root: 저장소 루트 디렉토리
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.root / self.INDEX_FILENAME
+        self._lock = threading.RLock()
+        self._pid = os.getpid()
+
+        # 통계 (이 프로세스 기준)
+        self._ingested = 0
+        self._deduplicated = 0
+        self._deleted = 0
+
+        self._conn = sqlite3.connect(
+            str(self._index_path),
+            check_same_thread=False,
+            isolation_level=None,
+            timeout=30,
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """쓰기 트랜잭션 (다른 프로세스의 변경과 직렬화, 예외 시 롤백)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _blob_path(self, digest: str, ext: str) -> Path:
+        return self.root / digest[:2] / f"{digest}{ext}"
+
+    def _ext(self, digest: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT ext FROM blobs WHERE digest = ?", (digest,)
+        ).fetchone()
+        return row[0] if row else None
+
+    def ingest(self, path: Path, digest: Optional[str] = None) -> str:
+        """
+        파일을 저장소로 이동 (같은 내용이 이미 있으면 원본 파일만 삭제)
+
+        Args:
+            path: 저장할 파일 경로 (이동 후 삭제됨)
+            digest: 호출자가 이미 검증한 내용 해시 (기본값: None = 파일을 읽어 계산)
+
+        Returns:
+            파일 내용의 SHA-256 해시
+        """
+        path = Path(path)
+        digest = digest or file_digest(path)
+        self._add(
+            digest,
+            path.suffix.lower(),
+            place=lambda target: os.replace(path, target),
+            discard=path.unlink,
+        )
+        return digest
+
+    def put(self, data: bytes, ext: str) -> str:
+        """
+        바이트를 저장소에 기록 (같은 내용이 이미 있으면 기록 생략)
+
+        Args:
+            data: 저장할 파일 내용
+            ext: 파일 확장자 (예: ".png")
+
+        Returns:
+            내용의 SHA-256 해시
+        """
+        digest = hashlib.sha256(data).hexdigest()
+
+        def place(target: Path) -> None:
+            tmp_path = target.with_suffix(f"{target.suffix}.{self._pid}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, target)
+
+        self._add(digest, ext.lower(), place=place, discard=lambda: None)
+        return digest
+
+    def _add(
+        self,
+        digest: str,
+        ext: str,
+        place: Callable[[Path], None],
+        discard: Callable[[], None],
+    ) -> None:
+        """새 내용이면 place(대상 경로)로 기록하고, 이미 있으면 discard() 호출"""
+        with self._transaction() as conn:
+            known_ext = self._ext(digest)
+            target = self._blob_path(digest, known_ext or ext)
+            if target.exists():
+                discard()
+                self._deduplicated += 1
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                place(target)
+            self._ingested += 1
+
+            if known_ext is None:
+                conn.execute(
+                    "INSERT INTO blobs (digest, ext) VALUES (?, ?)", (digest, ext)
+                )
+
+    def path(self, digest: str) -> Optional[Path]:
+        """
+        해시에 해당하는 파일 경로
+
+        Args:
+            digest: SHA-256 해시
+
+        Returns:
+            파일 경로 또는 None (저장소에 없는 경우)
+        """
+        with self._lock:
+            ext = self._ext(digest)
+        return self._blob_path(digest, ext) if ext is not None else None
+
+    def exists(self, digest: str) -> bool:
+        """해시에 해당하는 파일이 디스크에 있는지 여부"""
+        path = self.path(digest)
+        return path is not None and path.exists()
+
+    def size(self, digest: str) -> int:
+        """해시에 해당하는 파일 크기 (바이트, 파일이 없으면 0)"""
+        path = self.path(digest)
+        try:
+            return path.stat().st_size if path is not None else 0
+        except FileNotFoundError:
+            return 0
+
+    def refcount(self, digest: str) -> int:
+        """해시에 대한 보유자 수"""
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM holders WHERE digest = ?", (digest,)
+            ).fetchone()
+            return count
+
+    def holders(self, prefix: str = "") -> List[str]:
+        """
+        prefix로 시작하는 보유자 이름 목록
+
+        Args:
+            prefix: 보유자 이름 접두사 (기본값: "" = 전체)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT holder FROM holders WHERE holder >= ? AND holder < ?",
+                _prefix_range(prefix),
+            )
+            return [holder for (holder,) in rows]
+
+    def acquire(self, digest: str, holder: str) -> bool:
+        """
+        보유자가 파일을 참조하도록 등록
+
+        보유자가 다른 파일을 참조하고 있었으면 그 참조는 해제됩니다.
+
+        Args:
+            digest: SHA-256 해시
+            holder: 보유자 이름 (예: "cache:<키>", "gallery:<이미지 ID>")
+
+        Returns:
+            등록 여부 (저장소에 없는 해시면 False)
+        """
+        with self._transaction() as conn:
+            if self._ext(digest) is None:
+                return False
+            row = conn.execute(
+                "SELECT digest FROM holders WHERE holder = ?", (holder,)
+            ).fetchone()
+            if row is not None and row[0] == digest:
+                return True
+            if row is not None:
+                self._release_locked([holder])
+            conn.execute(
+                "INSERT INTO holders (holder, digest, owner) VALUES (?, ?, ?)",
+                (holder, digest, self._pid),
+            )
+            return True
+
+    def release(self, holder: str) -> bool:
+        """
+        보유자의 참조 해제 (마지막 참조였으면 파일 삭제)
+
+        Args:
+            holder: 보유자 이름
+
+        Returns:
+            해제 여부 (참조가 없던 보유자면 False)
+        """
+        with self._transaction():
+            return self._release_locked([holder]) > 0
+
+    def retain(self, prefix: str, alive: Iterable[str]) -> int:
+        """
+        prefix로 시작하는 보유자 중 alive에 없는 보유자의 참조 해제
+
+        캐시 항목 제거 시 그 항목의 참조(마스터와 출력본)를 해제하거나,
+        더 이상 존재하지 않는 갤러리 레코드의 참조를 정리하는 데 사용합니다.
+        (prefix 범위만 인덱스로 조회)
+
+        Args:
+            prefix: 보유자 이름 접두사 (예: "cache:<키>")
+            alive: 유지할 보유자 이름 목록
+
+        Returns:
+            해제된 참조 수
+        """
+        alive_set: Set[str] = set(alive)
+        with self._transaction():
+            stale = [
+                holder for holder in self.holders(prefix) if holder not in alive_set
+            ]
+            return self._release_locked(stale)
+
+    def reclaim(self, prefix: str, alive: Iterable[str]) -> int:
+        """
+        종료된 프로세스가 남긴 참조 정리 (재시작 시 사용)
+
+        prefix로 시작하는 보유자 중 alive에 없고, 등록한 프로세스가 더 이상
+        실행 중이지 않은 보유자의 참조만 해제합니다. 같은 저장소를 쓰는
+        다른 프로세스가 실행 중이면 그 프로세스의 참조는 유지됩니다.
+
+        Args:
+            prefix: 보유자 이름 접두사 (예: "cache:")
+            alive: 유지할 보유자 이름 목록
+
+        Returns:
+            해제된 참조 수
+        """
+        alive_set: Set[str] = set(alive)
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT holder, owner FROM holders WHERE holder >= ? AND holder < ?",
+                _prefix_range(prefix),
+            ).fetchall()
+            owners_alive: Dict[int, bool] = {}
+            stale = []
+            for holder, owner in rows:
+                if holder in alive_set or owner == self._pid:
+                    continue
+                if owner not in owners_alive:
+                    owners_alive[owner] = _process_alive(owner)
+                if not owners_alive[owner]:
+                    stale.append(holder)
+            return self._release_locked(stale)
+
+    def _release_locked(self, holders: List[str]) -> int:
+        """보유자 참조를 해제하고 참조가 없어진 파일 삭제 (트랜잭션 안에서 호출)"""
+        released = 0
+        digests: Set[str] = set()
+        for holder in holders:
+            row = self._conn.execute(
+                "SELECT digest FROM holders WHERE holder = ?", (holder,)
+            ).fetchone()
+            if row is None:
+                continue
+            self._conn.execute("DELETE FROM holders WHERE holder = ?", (holder,))
+            digests.add(row[0])
+            released += 1
+
+        for digest in digests:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM holders WHERE digest = ?", (digest,)
+            ).fetchone()
+            if count:
+                continue
+
+            # 마지막 참조 해제: 파일과 인덱스 항목 삭제
+            ext = self._ext(digest)
+            if ext is None:
+                continue
+            self._conn.execute("DELETE FROM blobs WHERE digest = ?", (digest,))
+            try:
+                self._blob_path(digest, ext).unlink()
+                self._deleted += 1
+            except FileNotFoundError:
+                pass
+            logger.info(f"저장소 파일 삭제 (참조 없음): {digest[:16]}...")
+        return released
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        저장소 통계 조회
+
+        Returns:
+            파일 수, 참조 수, 중복 제거 횟수, 삭제된 파일 수 딕셔너리
+        """
+        with self._lock:
+            (blobs,) = self._conn.execute("SELECT COUNT(*) FROM blobs").fetchone()
+            (references,) = self._conn.execute(
+                "SELECT COUNT(*) FROM holders"
+            ).fetchone()
+            return {
+                "blobs": blobs,
+                "references": references,
+                "ingested": self._ingested,
+                "deduplicated": self._deduplicated,
+                "deleted": self._deleted,
+            }
+
+    def close(self) -> None:
+        """인덱스 연결 종료"""
+        with self._lock:
+            self._conn.close()
@@ -5,54 +5,167 @@ SPEC-CACHE-001: 동일한 프롬프트/스타일/비율 조합에 대해
 중복 API 호출을 방지하는 캐싱 레이어 구현
 
 핵심 기능:
-- SHA-256 기반 캐시 키 생성
+- SHA-256 기반 캐시 키 생성 (프롬프트 표기 정규화)
 - LRU (Least Recently Used) 정책
 - TTL (Time-To-Live) 기반 만료
 - 스레드 안전성 (RLock)
+- 선택적 디스크 L2 계층 (재시작 후에도 캐시 유지)
+- 선택적 바이트 예산 (항목 무게 합계 기준 LRU 제거)
+- 만료 힙과 백그라운드 정리 스레드 (조회되지 않는 만료 항목도 제거)
+- 선택적 W-TinyLFU 입장 정책 (일회성 프롬프트가 자주 쓰이는 항목을 밀어내지 않음)
+- 모델/스타일 정의 네임스페이스 키와 태그 역색인 (태그 단위 일괄 무효화)
+- 실행 중 용량/TTL 변경 (줄일 때는 잠금을 나누어 잡고 조금씩 제거)
+- 항목 순회(entries())와 L2 전용 저장 (캐시 번들 내보내기/가져오기)
+- 압축된 L1 항목 표현 (__slots__ 항목, 튜플 기반 결과, 형식/스타일 등 문자열 intern)
 """
 
 import hashlib
+import heapq
+import json
+import logging
+import sys
 import time
 import threading
+import unicodedata
+import weakref
 from collections import OrderedDict
-from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Callable, Dict, Any, Iterable, Iterator, List, Optional, Set, Tuple
+
+from generators.admission import ADMISSION_POLICIES, WTinyLFU
+from generators.disk_cache import SqliteCacheStore
+
+logger = logging.getLogger(__name__)
+
+
+# 캐시 키에서 제외하는 불용어 (생성 결과에 영향이 거의 없는 관사/요청 표현)
+PROMPT_STOP_WORDS = frozenset(
+    {
+        # 영어: 관사와 요청 표현
+        "a",
+        "an",
+        "the",
+        "please",
+        # 한국어: 띄어 쓴 부사/요청 표현 (조사는 단어에 붙으므로 제거하지 않음)
+        "좀",
+        "그냥",
+        "제발",
+    }
+)
+
+
+def canonicalize_prompt(prompt: str) -> str:
+    """
+    캐시 키용 프롬프트 정규화
+
+    같은 이미지를 요청하는 표기 차이("A cat on a sofa", "a cat on a sofa.",
+    "a  cat on a sofa")가 같은 캐시 키가 되도록 합니다.
+    - Unicode NFKC 정규화 (전각 문자, 호환 문자)
+    - 소문자 변환 (casefold)
+    - 연속 공백을 공백 하나로
+    - 끝의 문장 부호 제거 (".", "!", "?", "。", "~" 등)
+    - 불용어 단어 제거 (PROMPT_STOP_WORDS)
+
+    Args:
+        prompt: 원본 프롬프트
+
+    Returns:
+        정규화된 프롬프트 (불용어만 있는 경우 불용어 제거 전 문자열)
+    """
+    text = unicodedata.normalize("NFKC", prompt).casefold()
+    text = " ".join(text.split())
+    while text and (unicodedata.category(text[-1]).startswith("P") or text[-1] == "~"):
+        text = text[:-1].rstrip()
+    words = [word for word in text.split(" ") if word not in PROMPT_STOP_WORDS]
+    return " ".join(words) if words else text
+
+
+# 캐시 항목 태그 종류 ("<종류>:<값>", 태그 단위 일괄 무효화용)
+TAG_KINDS = ("model", "style")
+
+
+def cache_tag(kind: str, value: str) -> str:
+    """
+    캐시 항목 태그 문자열
+
+    Args:
+        kind: 태그 종류 (TAG_KINDS)
+        value: 값 (모델 이름, 스타일 이름 등, 대소문자/앞뒤 공백 무시)
+
+    Returns:
+        "model:imagen-4.0-fast-generate-001", "style:cyberpunk" 형태의 문자열
+    """
+    return f"{kind.strip().lower()}:{value.strip().lower()}"
+
+
+def style_fingerprint(style: Optional[Dict[str, Any]]) -> str:
+    """
+    스타일 정의의 해시 (banana_styles.json 항목이 바뀌면 달라짐)
+
+    Args:
+        style: 스타일 정의 딕셔너리 (없으면 None)
+
+    Returns:
+        12자 16진수 문자열 (style이 None이면 "none")
+    """
+    if style is None:
+        return "none"
+    source = json.dumps(style, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
+
+
+def _namespace(model: str, style_version: str) -> str:
+    """키 원본 문자열에 붙이는 모델/스타일 정의 네임스페이스 (비어 있으면 생략)"""
+    suffix = ""
+    if model:
+        suffix += f"|model={model.strip().lower()}"
+    if style_version:
+        suffix += f"|style_version={style_version}"
+    return suffix
 
 
 def generate_cache_key(
     prompt: str,
     style: str,
     aspect_ratio: str = "16:9",
-    format: str = "png",
-    quality: int = 95,
+    *,
+    variant: int = 0,
+    model: str = "",
+    style_version: str = "",
 ) -> str:
     """
     캐시 키 생성 - SHA-256 해시 사용
 
     입력값을 정규화하여 일관된 해시 키를 생성합니다.
-    - 앞뒤 공백 제거
-    - 소문자 변환 (prompt, style, format)
+    - 프롬프트는 canonicalize_prompt()로 정규화
+    - 앞뒤 공백 제거, 소문자 변환 (style)
     - 파이프(|) 구분자로 연결
+    - 모델 이름과 스타일 정의 해시를 네임스페이스로 포함 (모델이나 스타일
+      키워드가 바뀌면 이전 결과를 제공하지 않음)
+
+    출력 형식/품질은 생성 결과에 영향을 주지 않으므로 키에 포함하지 않습니다.
+    (캐시된 무손실 마스터에서 로컬 변환, rendition_key() 참고)
+    aspect_ratio 뒤의 인자는 키워드로만 받으므로, 네 번째 위치 인자로 형식을
+    넘기던 이전 호출은 TypeError가 됩니다.
 
     Args:
         prompt: 이미지 생성 프롬프트
         style: 스타일 이름
         aspect_ratio: 화면 비율 (기본값: "16:9")
-        format: 이미지 형식 (기본값: "png")
-        quality: 이미지 품질 (기본값: 95)
+        variant: 변형 슬롯 번호 (기본값: 0, 0이면 기존 키와 동일)
+        model: Imagen 모델 이름 (기본값: "" = 네임스페이스 없음)
+        style_version: 스타일 정의 해시 (style_fingerprint(), 기본값: "")
 
     Returns:
         64자 16진수 해시 문자열
     """
-    normalized_prompt = prompt.strip().lower()
+    normalized_prompt = canonicalize_prompt(prompt)
     normalized_style = style.strip().lower()
     normalized_ratio = aspect_ratio.strip()
-    normalized_format = format.strip().lower()
 
-    key_source = (
-        f"{normalized_prompt}|{normalized_style}|{normalized_ratio}|"
-        f"{normalized_format}|{quality}"
-    )
+    key_source = f"{normalized_prompt}|{normalized_style}|{normalized_ratio}"
+    key_source += _namespace(model, style_version)
+    if variant > 0:
+        key_source += f"|v{variant}"
     return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
 
 
@@ -60,64 +173,351 @@ def generate_cache_key_advanced(
     prompt: str,
     style: str,
     aspect_ratio: str = "16:9",
-    format: str = "png",
-    quality: int = 95,
+    *,
     width: Optional[int] = None,
     height: Optional[int] = None,
     negative_prompt: Optional[str] = None,
     style_intensity: str = "normal",
     enhance_prompt: bool = True,
+    variant: int = 0,
+    model: str = "",
+    style_version: str = "",
 ) -> str:
     """
     고급 기능용 캐시 키 생성
 
     generate_cache_key()를 확장하여 추가 파라미터들을 포함합니다.
+    (출력 형식/품질은 generate_cache_key()와 마찬가지로 제외, aspect_ratio 뒤의
+    인자는 키워드 전용)
 
     Args:
         prompt: 이미지 생성 프롬프트
         style: 스타일 이름
         aspect_ratio: 화면 비율 (기본값: "16:9")
-        format: 이미지 형식 (기본값: "png")
-        quality: 이미지 품질 (기본값: 95)
         width: 사용자 정의 너비 (선택)
         height: 사용자 정의 높이 (선택)
         negative_prompt: 네거티브 프롬프트 (선택)
         style_intensity: 스타일 강도 (기본값: "normal")
         enhance_prompt: 프롬프트 강화 활성화 (기본값: True)
+        variant: 변형 슬롯 번호 (기본값: 0, 0이면 기존 키와 동일)
+        model: Imagen 모델 이름 (기본값: "" = 네임스페이스 없음)
+        style_version: 스타일 정의 해시 (style_fingerprint(), 기본값: "")
 
     Returns:
         64자 16진수 해시 문자열
     """
-    normalized_prompt = prompt.strip().lower()
+    normalized_prompt = canonicalize_prompt(prompt)
     normalized_style = style.strip().lower()
     normalized_ratio = aspect_ratio.strip()
-    normalized_format = format.strip().lower()
 
     # 선택적 파라미터 정규화
     width_str = str(width) if width else "none"
     height_str = str(height) if height else "none"
-    normalized_negative = negative_prompt.strip().lower() if negative_prompt else "none"
+    normalized_negative = (
+        canonicalize_prompt(negative_prompt) if negative_prompt else "none"
+    )
 
     key_source = (
         f"{normalized_prompt}|{normalized_style}|{normalized_ratio}|"
-        f"{normalized_format}|{quality}|{width_str}x{height_str}|"
+        f"{width_str}x{height_str}|"
         f"{normalized_negative}|{style_intensity}|{enhance_prompt}"
     )
+    key_source += _namespace(model, style_version)
+    if variant > 0:
+        key_source += f"|v{variant}"
     return hashlib.sha256(key_source.encode("utf-8")).hexdigest()
 
 
-@dataclass
+def rendition_key(format: str, quality: int) -> str:
+    """
+    캐시 항목 안의 출력본(형식/품질) 키
+
+    PNG는 무손실이므로 품질과 관계없이 같은 출력본을 사용합니다.
+
+    Args:
+        format: 이미지 형식 (png, jpeg, jpg, webp)
+        quality: 이미지 품질 (JPEG/WebP용)
+
+    Returns:
+        "png", "jpeg:q80" 형태의 문자열
+    """
+    normalized_format = format.strip().lower()
+    if normalized_format == "jpg":
+        normalized_format = "jpeg"
+    if normalized_format == "png":
+        return normalized_format
+    return f"{normalized_format}:q{quality}"
+
+
+# resize()/set_ttl()이 잠금을 한 번 잡고 처리하는 최대 항목 수
+# (그 사이에 다른 스레드의 조회가 잠금을 얻을 수 있음)
+ADMIN_BATCH_SIZE = 64
+
+# 값의 종류가 적어 intern하여 항목 간에 공유하는 결과 필드 (리스트 값은 항목별 intern)
+INTERNED_FIELDS = frozenset(
+    {
+        "format",
+        "encoding",
+        "status",
+        "style",
+        "aspect_ratio",
+        "served_as",
+        "error",
+    }
+)
+
+
+class _Schema(tuple):
+    """압축된 딕셔너리의 키 목록 (같은 키 구성의 결과끼리 공유)"""
+
+    __slots__ = ()
+
+
+# 키 목록 -> 공유 _Schema (결과 형식의 종류만큼만 생김)
+_SCHEMAS: Dict[Tuple[str, ...], _Schema] = {}
+
+
+def _pack(value: Any, seen: Dict[str, str], intern: bool = False) -> Any:
+    """
+    결과 값을 튜플 기반 표현으로 변환
+
+    - 딕셔너리: (공유 _Schema, 값1, 값2, ...)
+    - 리스트/튜플: (값1, 값2, ...) (복원 시 리스트)
+    - INTERNED_FIELDS의 문자열은 intern, 한 항목 안에서 반복되는 문자열
+      (local_path/url 등)은 같은 객체 하나만 보관
+
+    Args:
+        seen: 항목 안에서 이미 본 문자열 (값 -> 보관 중인 객체)
+        intern: 문자열을 intern할지 여부 (INTERNED_FIELDS 필드의 값)
+    """
+    if type(value) is str:
+        return sys.intern(value) if intern else seen.setdefault(value, value)
+    if isinstance(value, dict):
+        names = tuple(sys.intern(str(name)) for name in value)
+        schema = _SCHEMAS.get(names)
+        if schema is None:
+            schema = _SCHEMAS.setdefault(names, _Schema(names))
+        return (
+            schema,
+            *(
+                _pack(item, seen, name in INTERNED_FIELDS)
+                for name, item in zip(names, value.values())
+            ),
+        )
+    if isinstance(value, (list, tuple)):
+        return tuple(_pack(item, seen, intern) for item in value)
+    return value
+
+
+def _unpack(value: Any) -> Any:
+    """_pack()의 역변환 (매번 새 딕셔너리/리스트를 생성)"""
+    if type(value) is tuple:
+        if value and type(value[0]) is _Schema:
+            return {name: _unpack(item) for name, item in zip(value[0], value[1:])}
+        return [_unpack(item) for item in value]
+    return value
+
+
+def _packed_size(value: Any, counted: Set[int], shared: bool = False) -> int:
+    """
+    압축된 값의 추정 메모리 (바이트)
+
+    항목 간에 공유되는 _Schema, intern된 문자열(shared), None/bool은 제외하고,
+    항목 안에서 반복되는 객체는 한 번만 셉니다.
+    """
+    if shared and type(value) is str:
+        return 0
+    if value is None or type(value) in (bool, _Schema) or id(value) in counted:
+        return 0
+    counted.add(id(value))
+    size = sys.getsizeof(value)
+    if type(value) is tuple:
+        if value and type(value[0]) is _Schema:
+            size += sum(
+                _packed_size(item, counted, name in INTERNED_FIELDS)
+                for name, item in zip(value[0], value[1:])
+            )
+        else:
+            size += sum(_packed_size(item, counted, shared) for item in value)
+    return size
+
+
 class CacheEntry:
-    """캐시 항목 데이터 클래스"""
+    """
+    캐시 항목
+
+    결과 딕셔너리는 튜플 기반 표현으로 보관하고 result 조회 시마다 새
+    딕셔너리로 복원합니다 (호출자가 반환값을 수정해도 캐시는 바뀌지 않음).
+
+    created_at/expires_at은 time.monotonic() 기준이므로 시스템 시계 변경의
+    영향을 받지 않습니다. (L2에는 재시작 후에도 유효한 time.time() 기준으로 저장)
+    """
+
+    __slots__ = (
+        "key",
+        "_packed",
+        "created_at",
+        "expires_at",
+        "weight",
+        "memory",
+        "tags",
+    )
+
+    def __init__(
+        self,
+        key: str,
+        result: Dict[str, Any],
+        created_at: float,
+        expires_at: float,
+        weight: int = 0,
+        tags: Tuple[str, ...] = (),
+    ):
+        """
+        Args:
+            key: 캐시 키
+            result: 결과 딕셔너리
+            created_at: 생성 시각 (time.monotonic())
+            expires_at: 만료 시각 (time.monotonic())
+            weight: 항목 무게 (바이트)
+            tags: 항목 태그 (cache_tag(), intern하여 항목 간 공유)
+        """
+        self.key = key
+        self.created_at = created_at
+        self.expires_at = expires_at
+        self.weight = weight
+        self.tags = tags
+        self.result = result
 
-    key: str
-    result: Dict[str, Any]
-    created_at: float
-    expires_at: float
+    @property
+    def result(self) -> Dict[str, Any]:
+        """결과 딕셔너리 (새 사본)"""
+        return _unpack(self._packed)
+
+    @result.setter
+    def result(self, result: Dict[str, Any]) -> None:
+        self._packed = _pack(result, {})
+        # 항목 객체 + 키 + 압축된 결과 (공유 문자열/키 목록 제외)
+        self.memory = (
+            sys.getsizeof(self)
+            + sys.getsizeof(self.key)
+            + _packed_size(self._packed, set())
+        )
 
     def is_expired(self) -> bool:
         """TTL 만료 여부 확인"""
-        return time.time() > self.expires_at
+        return time.monotonic() > self.expires_at
+
+
+def _to_monotonic(wall_time: float) -> float:
+    """time.time() 기준 시각을 time.monotonic() 기준으로 변환"""
+    return time.monotonic() + (wall_time - time.time())
+
+
+def _to_wall(monotonic_time: float) -> float:
+    """time.monotonic() 기준 시각을 time.time() 기준으로 변환"""
+    return time.time() + (monotonic_time - time.monotonic())
+
+
+def _sweep_loop(
+    cache_ref: "weakref.ReferenceType[Any]",
+    interval: float,
+    stop: threading.Event,
+) -> None:
+    """
+    정리 스레드 본문: interval초마다 만료 항목 제거
+
+    캐시를 약한 참조로 보유하므로 캐시가 수거되면 스레드도 종료됩니다.
+    """
+    while not stop.wait(interval):
+        cache = cache_ref()
+        if cache is None:
+            return
+        try:
+            cache.purge_expired()
+        except Exception as e:
+            logger.error(f"캐시 만료 정리 실패: {e}")
+        del cache
+
+
+def _start_sweeper(
+    cache: Any, interval: float, stop: threading.Event
+) -> threading.Thread:
+    """cache.purge_expired()를 interval초마다 호출하는 데몬 스레드 시작"""
+    sweeper = threading.Thread(
+        target=_sweep_loop,
+        args=(weakref.ref(cache), interval, stop),
+        name="image-cache-sweeper",
+        daemon=True,
+    )
+    sweeper.start()
+    return sweeper
+
+
+def _format_stats(
+    counters: Dict[str, int],
+    max_size: int,
+    max_bytes: int,
+    ttl_seconds: int,
+    l2: Optional[SqliteCacheStore],
+    sweeper_running: bool,
+    admission: str = "lru",
+) -> Dict[str, Any]:
+    """
+    통계 카운터를 get_stats() 형식으로 변환
+
+    Args:
+        counters: hits, misses, l2_hits, l2_misses, invalidated_hits, expired,
+            size, bytes, memory_bytes (L1 기준)
+    """
+    hits = counters["hits"]
+    total = hits + counters["misses"]
+    l1_hits = hits - counters["l2_hits"]
+    stats: Dict[str, Any] = {
+        "hits": hits,
+        "misses": counters["misses"],
+        "total_requests": total,
+        "hit_rate_percent": round(hits / total * 100, 2) if total else 0.0,
+        "cache_size": counters["size"],
+        "max_size": max_size,
+        # 사용 중인 바이트 (L2가 있으면 L2 기준, L1 항목은 모두 L2에도 있음)
+        "bytes": l2.total_bytes if l2 is not None else counters["bytes"],
+        "max_bytes": max_bytes,
+        # L1 항목 표현의 추정 메모리 (이미지 파일 크기인 bytes와 별개)
+        "memory_bytes": counters["memory_bytes"],
+        "ttl_seconds": ttl_seconds,
+        # L1 제거 정책 (lru 또는 tinylfu)
+        "admission": admission,
+        # 파일이 삭제되는 등 유효하지 않아 MISS로 처리된 항목 수
+        "invalidated_hits": counters["invalidated_hits"],
+        # 조회되지 않은 채 만료되어 정리된 항목 수
+        "expired": counters["expired"],
+        "sweeper_running": sweeper_running,
+        "l1": {
+            "hits": l1_hits,
+            "misses": total - l1_hits,
+            "hit_rate_percent": round(l1_hits / total * 100, 2) if total else 0.0,
+            "size": counters["size"],
+            "bytes": counters["bytes"],
+            "memory_bytes": counters["memory_bytes"],
+        },
+    }
+    if l2 is not None:
+        l2_hits = counters["l2_hits"]
+        l2_total = l2_hits + counters["l2_misses"]
+        stats["l2"] = {
+            "enabled": True,
+            "hits": l2_hits,
+            "misses": counters["l2_misses"],
+            "hit_rate_percent": round(l2_hits / l2_total * 100, 2) if l2_total else 0.0,
+            "size": l2.size,
+            "max_size": l2.max_entries,
+            "bytes": l2.total_bytes,
+            "max_bytes": l2.max_bytes,
+            "path": str(l2.path),
+        }
+    else:
+        stats["l2"] = {"enabled": False}
+    return stats
 
 
 class ImageCache:
@@ -129,24 +529,172 @@ class ImageCache:
     - TTL 기반 자동 만료
     - RLock을 사용한 스레드 안전성
     - Hit/Miss 통계 수집
+    - L2 저장소가 있으면 write-through 저장, L1 MISS 시 L2에서 승격
+    - validator로 HIT 직전에 결과 유효성(이미지 파일 존재 등) 확인
+    - max_bytes 설정 시 항목 무게(weigher) 합계가 예산 이하가 되도록 LRU 제거
+    - 만료 시각 최소 힙: 저장 시와 정리 스레드에서 만료 항목을 O(log n)에 제거
+    - admission="tinylfu"이면 W-TinyLFU로 L1 제거 대상 선택 (기본값: LRU)
+    - 태그 역색인: invalidate_tag()가 태그가 붙은 항목만 찾아 무효화
     """
 
-    def __init__(self, max_size: int = 100, ttl_seconds: int = 3600):
+    def __init__(
+        self,
+        max_size: int = 100,
+        ttl_seconds: int = 3600,
+        l2: Optional[SqliteCacheStore] = None,
+        validator: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        on_remove: Optional[Callable[[str], None]] = None,
+        max_bytes: int = 0,
+        weigher: Optional[Callable[[Dict[str, Any]], int]] = None,
+        sweep_interval: float = 0,
+        owner: Optional[Callable[[str], "ImageCache"]] = None,
+        admission: str = "lru",
+    ):
         """
         캐시 초기화
 
         Args:
             max_size: 최대 캐시 항목 수 (기본값: 100)
             ttl_seconds: 캐시 만료 시간(초) (기본값: 3600 = 1시간)
+            l2: 디스크 L2 저장소 (기본값: None = 메모리 캐시만 사용)
+            validator: 캐시된 결과가 아직 유효한지 확인하는 함수
+                (False면 항목을 삭제하고 MISS 처리)
+            on_remove: 키가 캐시(모든 계층)에서 제거될 때 호출되는 함수
+            max_bytes: L1 항목 무게 합계 예산 (기본값: 0 = 제한 없음,
+                L2 예산은 SqliteCacheStore의 max_bytes로 설정)
+            weigher: 결과의 무게(바이트)를 계산하는 함수
+                (기본값: None = 결과 JSON 크기)
+            sweep_interval: 만료 항목 정리 스레드 실행 간격(초)
+                (기본값: 0 = 정리 스레드 없이 저장/통계 조회 시에만 정리)
+            owner: 키를 L1에 보유하는 캐시를 찾는 함수 (ShardedImageCache의
+                샤드가 L2를 공유할 때 다른 샤드의 키가 L2에서 제거되면 그 샤드에
+                알리는 데 사용, 기본값: None = 이 캐시)
+            admission: L1 제거 정책 ("lru" 또는 "tinylfu", 기본값: "lru")
         """
         self._cache: OrderedDict[str, CacheEntry] = OrderedDict()
+        # 태그 -> L1 키 집합 (L2 항목의 태그는 L2 저장소의 역색인 사용)
+        self._tag_index: Dict[str, Set[str]] = {}
         self._lock = threading.RLock()
         self._max_size = max_size
         self._ttl_seconds = ttl_seconds
+        self._l2 = l2
+        self._validator = validator
+        self._on_remove = on_remove
+        self._max_bytes = max(0, max_bytes)
+        self._weigher = weigher
+        self._l1_bytes = 0
+        self._l1_memory = 0  # L1 항목 표현의 추정 메모리 합계
+        self._owner = owner
+        if admission not in ADMISSION_POLICIES:
+            raise ValueError(f"Unknown cache admission policy: {admission}")
+        self._admission = admission
+        # W-TinyLFU 정책 (None이면 OrderedDict 순서 그대로 LRU)
+        self._policy: Optional[WTinyLFU] = (
+            WTinyLFU(max_size) if admission == "tinylfu" else None
+        )
 
-        # 통계 카운터
+        # 다른 샤드가 L2에서 제거한 이 캐시의 키 (다음 작업 시 L1에서 삭제)
+        self._pending: List[str] = []
+        self._pending_lock = threading.Lock()
+
+        # (만료 시각, 키) 최소 힙: 재저장/삭제된 항목의 이전 값은 꺼낼 때 무시
+        self._expiry_heap: List[Tuple[float, str]] = []
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
+
+        # 통계 카운터 (hits = L1 HIT + L2 HIT)
         self._hits = 0
         self._misses = 0
+        self._l2_hits = 0
+        self._l2_misses = 0
+        self._invalidated_hits = 0
+        self._expired = 0
+
+        if sweep_interval > 0:
+            self.start_sweeper(sweep_interval)
+
+    def _discard_later(self, key: str) -> None:
+        """L2에서 제거된 키를 다음 작업 시 L1에서 삭제하도록 예약 (잠금 불필요)"""
+        with self._pending_lock:
+            self._pending.append(key)
+
+    def _drain_pending(self) -> None:
+        """예약된 키를 L1에서 삭제 (잠금 보유 상태, 제거 알림은 이미 전달됨)"""
+        if not self._pending:
+            return
+        with self._pending_lock:
+            pending, self._pending = self._pending, []
+        for key in pending:
+            self._pop_l1(key)
+
+    def _removed(self, key: str) -> None:
+        """키 제거 알림 (잠금 보유 상태)"""
+        if self._on_remove is not None:
+            self._on_remove(key)
+
+    def _is_valid(self, result: Dict[str, Any]) -> bool:
+        return self._validator is None or self._validator(result)
+
+    def _weigh(self, result: Dict[str, Any]) -> int:
+        """결과 무게 (바이트)"""
+        if self._weigher is not None:
+            return max(0, int(self._weigher(result)))
+        return len(json.dumps(result, ensure_ascii=False, default=str).encode())
+
+    def _pop_l1(self, key: str) -> Optional[CacheEntry]:
+        """L1에서 항목 삭제 및 무게 합계 갱신 (잠금 보유 상태)"""
+        entry = self._cache.pop(key, None)
+        if entry is not None:
+            self._l1_bytes -= entry.weight
+            self._l1_memory -= entry.memory
+            for tag in entry.tags:
+                keys = self._tag_index.get(tag)
+                if keys is not None:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tag_index[tag]
+            if self._policy is not None:
+                self._policy.remove(key)
+        return entry
+
+    def _evict_l1(self, protect: Optional[str] = None) -> None:
+        """
+        항목 수/무게 예산을 넘지 않도록 L1의 LRU 항목 제거 (잠금 보유 상태)
+
+        protect 키는 제거하지 않으므로 예산보다 큰 단일 항목은 유지됩니다.
+        L2가 있으면 제거된 항목은 L2에 남아 있습니다.
+        """
+        while self._cache:
+            over_size = len(self._cache) > self._max_size
+            over_bytes = self._max_bytes and self._l1_bytes > self._max_bytes
+            if not (over_size or over_bytes):
+                return
+            if self._policy is not None:
+                victim = self._policy.victim(protect)
+                if victim is None:
+                    return
+                self._pop_l1(victim)
+                if self._l2 is None:
+                    self._removed(victim)
+                continue
+            oldest = next(iter(self._cache))
+            if oldest == protect:
+                if len(self._cache) == 1:
+                    return
+                self._cache.move_to_end(oldest)
+                continue
+            self._pop_l1(oldest)
+            if self._l2 is None:
+                self._removed(oldest)
+
+    def _drop_invalid(self, key: str) -> None:
+        """유효하지 않은 항목을 모든 계층에서 삭제하고 MISS 처리 (잠금 보유 상태)"""
+        self._pop_l1(key)
+        if self._l2 is not None:
+            self._l2.delete(key)
+        self._removed(key)
+        self._invalidated_hits += 1
+        self._misses += 1
 
     def get(self, key: str) -> Optional[Dict[str, Any]]:
         """
@@ -154,64 +702,335 @@ class ImageCache:
 
         - 키가 존재하면 LRU 순서 업데이트 후 반환
         - TTL 만료된 항목은 삭제 후 None 반환
+        - L1에 없으면 L2를 조회하여 원래 만료 시각 그대로 L1로 승격
         - 키가 없으면 None 반환
 
         Args:
             key: 캐시 키 (generate_cache_key()로 생성)
 
         Returns:
-            캐시된 결과 딕셔너리 또는 None
+            캐시된 결과 딕셔너리의 새 사본 또는 None
         """
         with self._lock:
+            self._drain_pending()
+            if self._policy is not None:
+                self._policy.record(key)
             if key in self._cache:
                 entry = self._cache[key]
 
-                # TTL 만료 검사
+                # TTL 만료 검사 (L2 항목도 같은 만료 시각이므로 함께 삭제)
                 if entry.is_expired():
-                    del self._cache[key]
+                    self._pop_l1(key)
+                    if self._l2 is not None:
+                        self._l2.delete(key)
+                    self._removed(key)
                     self._misses += 1
                     return None
 
+                result = entry.result
+                if not self._is_valid(result):
+                    self._drop_invalid(key)
+                    return None
+
                 # LRU 순서 업데이트: 가장 최근 사용으로 이동
                 self._cache.move_to_end(key)
+                if self._policy is not None:
+                    self._policy.access(key)
                 self._hits += 1
-                return entry.result
+                return result
+
+            if self._l2 is not None:
+                stored = self._l2.get(key)
+                if stored is not None and not self._is_valid(stored[0]):
+                    self._l2_misses += 1
+                    self._drop_invalid(key)
+                    return None
+                if stored is not None:
+                    result, created_at, expires_at = stored
+                    self._insert_l1(
+                        key,
+                        result,
+                        _to_monotonic(created_at),
+                        _to_monotonic(expires_at),
+                        self._l2.tags(key),
+                    )
+                    self._hits += 1
+                    self._l2_hits += 1
+                    return result
+                self._l2_misses += 1
 
             self._misses += 1
             return None
 
-    def set(self, key: str, result: Dict[str, Any]) -> None:
+    def _insert_l1(
+        self,
+        key: str,
+        result: Dict[str, Any],
+        created_at: float,
+        expires_at: float,
+        tags: Iterable[str] = (),
+    ) -> int:
+        """
+        L1에 항목 추가 (만료 항목 정리 후 용량/무게 예산 초과 시 LRU 제거,
+        잠금 보유 상태)
+
+        Args:
+            created_at: 생성 시각 (time.monotonic())
+            expires_at: 만료 시각 (time.monotonic())
+            tags: 항목 태그
+
+        Returns:
+            항목 무게 (바이트)
+        """
+        # 기존 항목이 있으면 삭제 (업데이트를 위해)
+        self._pop_l1(key)
+        # 만료 항목이 살아 있는 항목 대신 LRU 자리를 차지하지 않도록 먼저 정리
+        self._purge_l1_expired()
+
+        weight = self._weigh(result)
+        entry = CacheEntry(
+            key=key,
+            result=result,
+            created_at=created_at,
+            expires_at=expires_at,
+            weight=weight,
+            tags=tuple(sys.intern(tag) for tag in dict.fromkeys(tags)),
+        )
+        self._cache[key] = entry
+        for tag in entry.tags:
+            self._tag_index.setdefault(tag, set()).add(key)
+        self._l1_bytes += weight
+        self._l1_memory += entry.memory
+        if self._policy is not None:
+            self._policy.add(key)
+        self._push_expiry(expires_at, key)
+        self._evict_l1(protect=key)
+        return weight
+
+    def _push_expiry(self, expires_at: float, key: str) -> None:
+        """만료 힙에 추가 (무시할 이전 값이 많이 쌓이면 재구성, 잠금 보유 상태)"""
+        heapq.heappush(self._expiry_heap, (expires_at, key))
+        if len(self._expiry_heap) > 2 * len(self._cache) + 64:
+            self._expiry_heap = [
+                (entry.expires_at, entry.key) for entry in self._cache.values()
+            ]
+            heapq.heapify(self._expiry_heap)
+
+    def _purge_l1_expired(self) -> int:
+        """
+        만료 힙에서 기한이 지난 L1 항목을 제거 (항목당 O(log n), 잠금 보유 상태)
+
+        L2 항목도 같은 만료 시각이므로 함께 삭제합니다.
+
+        Returns:
+            제거된 항목 수
+        """
+        now = time.monotonic()
+        removed = 0
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            expires_at, key = heapq.heappop(self._expiry_heap)
+            entry = self._cache.get(key)
+            if entry is None or entry.expires_at != expires_at:
+                continue  # 이미 삭제되었거나 다시 저장된 항목
+            self._pop_l1(key)
+            if self._l2 is not None:
+                self._l2.delete(key)
+            self._removed(key)
+            removed += 1
+        self._expired += removed
+        return removed
+
+    def purge_expired(self, include_l2: bool = True) -> int:
+        """
+        만료된 항목을 모든 계층에서 제거 (정리 스레드에서 주기적으로 호출)
+
+        Args:
+            include_l2: L1에 없는 만료 L2 항목도 정리할지 여부 (L2를 공유하는
+                샤드는 ShardedImageCache가 한 번만 정리)
+
+        Returns:
+            제거된 항목 수
+        """
+        with self._lock:
+            self._drain_pending()
+            removed = self._purge_l1_expired()
+            if include_l2 and self._l2 is not None:
+                # L1에 없는 L2 항목 (L1에서 밀려났거나 재시작 전 저장된 항목)
+                expired = self._l2.purge_expired()
+                for key in expired:
+                    self._removed(key)
+                self._expired += len(expired)
+                removed += len(expired)
+        if removed:
+            logger.info(f"만료 캐시 항목 정리: {removed}개")
+        return removed
+
+    def start_sweeper(self, interval: float) -> None:
+        """
+        만료 항목 정리 스레드 시작 (이미 실행 중이면 무시)
+
+        Args:
+            interval: 정리 간격(초)
+        """
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._sweeper_stop = threading.Event()
+            self._sweeper = _start_sweeper(self, interval, self._sweeper_stop)
+
+    def stop_sweeper(self) -> None:
+        """만료 항목 정리 스레드 중지"""
+        self._sweeper_stop.set()
+        sweeper = self._sweeper
+        if sweeper is not None and sweeper is not threading.current_thread():
+            sweeper.join(timeout=5)
+        self._sweeper = None
+
+    def _sync_l2(self, evicted: List[str]) -> None:
+        """
+        L2 예산 초과로 제거된 키를 L1에서도 삭제 (잠금 보유 상태)
+
+        다른 샤드가 보유한 키는 그 샤드의 잠금을 기다리지 않도록 삭제를 예약합니다.
+        """
+        for key in evicted:
+            owner = self._owner(key) if self._owner is not None else self
+            if owner is self:
+                self._pop_l1(key)
+            else:
+                owner._discard_later(key)
+            self._removed(key)
+
+    def set(self, key: str, result: Dict[str, Any], tags: Iterable[str] = ()) -> None:
         """
         캐시에 항목 저장
 
         - 용량 초과 시 LRU 정책으로 가장 오래된 항목 제거
         - TTL 설정과 함께 저장
+        - L2 저장소가 있으면 같은 만료 시각으로 함께 저장
 
         Args:
             key: 캐시 키
             result: 저장할 결과 딕셔너리
+            tags: 항목 태그 (invalidate_tag()로 일괄 무효화, 기본값: 없음)
         """
+        tags = tuple(tags)
         with self._lock:
-            # 기존 항목이 있으면 삭제 (업데이트를 위해)
-            if key in self._cache:
-                del self._cache[key]
-
-            # 용량 초과 시 가장 오래된 항목(first=False의 반대) 제거
-            while len(self._cache) >= self._max_size:
-                self._cache.popitem(last=False)
-
-            # 새 항목 추가
-            now = time.time()
-            self._cache[key] = CacheEntry(
-                key=key,
-                result=result,
-                created_at=now,
-                expires_at=now + self._ttl_seconds,
-            )
+            self._drain_pending()
+            now = time.monotonic()
+            weight = self._insert_l1(key, result, now, now + self._ttl_seconds, tags)
+            if self._l2 is not None:
+                wall_now = time.time()
+                self._sync_l2(
+                    self._l2.set(
+                        key,
+                        result,
+                        wall_now,
+                        wall_now + self._ttl_seconds,
+                        weight,
+                        tags,
+                    )
+                )
+
+    def add(
+        self,
+        key: str,
+        result: Dict[str, Any],
+        created_at: float,
+        tags: Iterable[str] = (),
+        l1: bool = True,
+    ) -> bool:
+        """
+        없는 키만 저장 (갤러리 기록이나 캐시 번들에서 복원할 때 사용)
+
+        만료 시각은 저장 시점이 아닌 원래 생성 시각 + TTL입니다.
+
+        Args:
+            key: 캐시 키
+            result: 저장할 결과 딕셔너리
+            created_at: 원래 생성 시각 (time.time() 기준)
+            tags: 항목 태그 (기본값: 없음)
+            l1: L1에도 저장할지 여부 (False면 L2에만 저장하고 첫 HIT 시 승격,
+                L2가 없으면 무시, 기본값: True)
+
+        Returns:
+            저장 여부 (이미 있거나 만료된 경우 False)
+        """
+        tags = tuple(tags)
+        expires_at = created_at + self._ttl_seconds
+        with self._lock:
+            self._drain_pending()
+            if expires_at <= time.time() or key in self._cache:
+                return False
+            if self._l2 is not None and self._l2.get(key) is not None:
+                return False
+            if l1 or self._l2 is None:
+                weight = self._insert_l1(
+                    key,
+                    result,
+                    _to_monotonic(created_at),
+                    _to_monotonic(expires_at),
+                    tags,
+                )
+            else:
+                weight = self._weigh(result)
+            if self._l2 is not None:
+                self._sync_l2(
+                    self._l2.set(key, result, created_at, expires_at, weight, tags)
+                )
+            return True
+
+    def update(self, key: str, result: Dict[str, Any]) -> bool:
+        """
+        기존 항목의 결과만 교체 (생성/만료 시각, 태그, LRU 순서는 유지, 무게는 재계산)
+
+        Args:
+            key: 캐시 키
+            result: 새 결과 딕셔너리
+
+        Returns:
+            교체 여부 (항목이 없거나 만료된 경우 False)
+        """
+        with self._lock:
+            self._drain_pending()
+            weight = self._weigh(result)
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._l1_memory -= entry.memory
+                entry.result = result
+                self._l1_memory += entry.memory
+                self._l1_bytes += weight - entry.weight
+                entry.weight = weight
+                times = (_to_wall(entry.created_at), _to_wall(entry.expires_at))
+                self._evict_l1(protect=key)
+            else:
+                stored = self._l2.get(key) if self._l2 is not None else None
+                if stored is None:
+                    return False
+                times = (stored[1], stored[2])
+
+            if self._l2 is not None:
+                self._sync_l2(self._l2.set(key, result, *times, weight))
+            return True
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """
+        L1 항목의 남은 유효 시간 (조기 갱신 판단용, HIT/MISS 통계에 포함하지 않음)
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            만료까지 남은 초 (L1에 없으면 None)
+        """
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            return entry.expires_at - time.monotonic()
 
     def invalidate(self, key: str) -> bool:
         """
-        특정 키의 캐시 무효화
+        특정 키의 캐시 무효화 (L1, L2 모두)
 
         Args:
             key: 삭제할 캐시 키
@@ -220,48 +1039,282 @@ class ImageCache:
             삭제 성공 여부
         """
         with self._lock:
-            if key in self._cache:
-                del self._cache[key]
-                return True
-            return False
+            self._drain_pending()
+            removed = self._l2.delete(key) if self._l2 is not None else False
+            if self._pop_l1(key) is not None:
+                removed = True
+            if removed:
+                self._removed(key)
+            return removed
+
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        태그가 붙은 모든 항목 무효화 (L1, L2 모두)
+
+        태그 역색인으로 해당 항목만 찾으므로 비용은 태그가 붙은 항목 수에 비례합니다.
+
+        Args:
+            tag: cache_tag()로 만든 태그
+
+        Returns:
+            무효화된 항목 수
+        """
+        with self._lock:
+            self._drain_pending()
+            keys = set(self._tag_index.get(tag, ()))
+            if self._l2 is not None:
+                keys.update(self._l2.keys_for_tag(tag))
+            return sum(1 for key in keys if self.invalidate(key))
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """
+        키가 접두사로 시작하는 모든 항목 무효화 (L1, L2 모두)
+
+        Args:
+            prefix: 캐시 키 접두사 (비어 있으면 아무것도 무효화하지 않음,
+                전체 삭제는 clear() 사용)
+
+        Returns:
+            무효화된 항목 수
+        """
+        if not prefix:
+            return 0
+        with self._lock:
+            self._drain_pending()
+            keys = {key for key in self._cache if key.startswith(prefix)}
+            if self._l2 is not None:
+                keys.update(self._l2.keys_with_prefix(prefix))
+            return sum(1 for key in keys if self.invalidate(key))
+
+    def resize(
+        self,
+        max_size: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        include_l2: bool = True,
+    ) -> int:
+        """
+        실행 중 최대 항목 수/바이트 예산 변경
+
+        줄일 때는 한도를 ADMIN_BATCH_SIZE개씩 단계적으로 낮추며 잠금을 단계마다
+        풀어, 많은 항목을 제거하는 동안에도 다른 스레드의 조회가 기다리지 않게
+        합니다. (그 사이의 저장도 현재 단계의 한도만 적용) 바이트 예산은 L2에도
+        적용됩니다.
+
+        Args:
+            max_size: 새 최대 항목 수 (None = 유지, 최소 1)
+            max_bytes: 새 바이트 예산 (None = 유지, 0 = 제한 없음)
+            include_l2: 바이트 예산을 L2에도 적용할지 여부 (L2를 공유하는 샤드는
+                ShardedImageCache가 한 번만 적용)
+
+        Returns:
+            L1에서 제거된 항목 수
+        """
+        target_size = self._max_size if max_size is None else max(1, max_size)
+        target_bytes = self._max_bytes if max_bytes is None else max(0, max_bytes)
+        evicted = 0
+        while True:
+            with self._lock:
+                self._drain_pending()
+                before = len(self._cache)
+                self._max_size = max(target_size, before - ADMIN_BATCH_SIZE)
+                if target_bytes and self._l1_bytes > target_bytes and before:
+                    step = self._l1_bytes * ADMIN_BATCH_SIZE // before
+                    self._max_bytes = max(target_bytes, self._l1_bytes - step)
+                else:
+                    self._max_bytes = target_bytes
+                if self._policy is not None:
+                    self._policy.resize(self._max_size)
+                self._evict_l1()
+                evicted += before - len(self._cache)
+                done = self._max_size == target_size and self._max_bytes == target_bytes
+            if done:
+                break
+            time.sleep(0)  # 대기 중인 다른 스레드에 잠금 양보
+
+        if include_l2 and self._l2 is not None and max_bytes is not None:
+            with self._lock:
+                self._sync_l2(self._l2.resize(max_bytes=target_bytes))
+        if evicted:
+            logger.info(
+                f"캐시 용량 변경: max_size={target_size}, max_bytes={target_bytes}, "
+                f"{evicted}개 제거"
+            )
+        return evicted
+
+    def set_ttl(self, ttl_seconds: int, include_l2: bool = True) -> int:
+        """
+        실행 중 TTL 변경 (기존 항목도 생성 시각 + 새 TTL로 만료 시각 재계산)
+
+        L1 항목은 ADMIN_BATCH_SIZE개씩 잠금을 나누어 갱신하고, 새 TTL로 이미
+        만료된 항목은 바로 제거합니다.
+
+        Args:
+            ttl_seconds: 새 캐시 만료 시간(초)
+            include_l2: L2 항목의 만료 시각도 바꾸고 정리할지 여부 (L2를 공유하는
+                샤드는 ShardedImageCache가 한 번만 적용)
+
+        Returns:
+            새 TTL로 만료되어 제거된 항목 수
+        """
+        with self._lock:
+            self._ttl_seconds = ttl_seconds
+            keys = list(self._cache)
+        for start in range(0, len(keys), ADMIN_BATCH_SIZE):
+            with self._lock:
+                for key in keys[start : start + ADMIN_BATCH_SIZE]:
+                    entry = self._cache.get(key)
+                    if entry is None:
+                        continue
+                    entry.expires_at = entry.created_at + ttl_seconds
+                    self._push_expiry(entry.expires_at, key)
+            time.sleep(0)
+        if include_l2 and self._l2 is not None:
+            self._l2.set_ttl(ttl_seconds)
+        return self.purge_expired(include_l2=include_l2)
+
+    def tag_counts(self) -> Dict[str, int]:
+        """
+        태그별 항목 수 (L2가 있으면 L2 기준, 만료 항목 포함)
+
+        Returns:
+            태그 -> 항목 수
+        """
+        if self._l2 is not None:
+            return self._l2.tag_counts()
+        with self._lock:
+            self._drain_pending()
+            return {tag: len(keys) for tag, keys in self._tag_index.items()}
 
     def clear(self) -> int:
         """
-        전체 캐시 초기화
+        전체 캐시 초기화 (L1, L2 모두)
+
+        Returns:
+            삭제된 항목 수 (L2가 있으면 L2 기준, L1 항목은 모두 L2에도 있음)
+        """
+        with self._lock:
+            keys = self.keys()
+            self._clear_l1()
+            if self._l2 is not None:
+                self._l2.clear()
+            for key in keys:
+                self._removed(key)
+            return len(keys)
+
+    def _clear_l1(self) -> List[str]:
+        """
+        L1 항목과 통계 초기화 (제거 알림 없음, L2는 유지)
 
         Returns:
-            삭제된 항목 수
+            L1에 있던 키 목록
         """
         with self._lock:
-            count = len(self._cache)
+            self._drain_pending()
+            keys = list(self._cache)
             self._cache.clear()
+            self._tag_index.clear()
+            self._l1_bytes = 0
+            self._l1_memory = 0
+            self._expiry_heap = []
+            if self._policy is not None:
+                self._policy = WTinyLFU(self._max_size)
             self._hits = 0
             self._misses = 0
-            return count
+            self._l2_hits = 0
+            self._l2_misses = 0
+            self._invalidated_hits = 0
+            self._expired = 0
+            return keys
+
+    def entries(
+        self, include_l2: bool = True
+    ) -> Iterator[Tuple[str, Dict[str, Any], float, float, Tuple[str, ...]]]:
+        """
+        만료되지 않은 항목 순회 (HIT/MISS 통계와 LRU 순서는 바꾸지 않음)
+
+        L1 항목을 잠금 안에서 한 번에 복사한 뒤 L2에만 있는 항목을 이어서
+        반환하므로, 순회하는 동안 캐시 잠금을 보유하지 않습니다.
+
+        Args:
+            include_l2: L1에 없는 L2 항목도 반환할지 여부 (L2를 공유하는
+                샤드는 ShardedImageCache가 한 번만 순회)
+
+        Yields:
+            (키, 결과 딕셔너리, 생성 시각, 만료 시각, 태그), 시각은 time.time() 기준
+        """
+        with self._lock:
+            self._drain_pending()
+            snapshot = [
+                (
+                    entry.key,
+                    entry.result,
+                    _to_wall(entry.created_at),
+                    _to_wall(entry.expires_at),
+                    entry.tags,
+                )
+                for entry in self._cache.values()
+                if not entry.is_expired()
+            ]
+        yield from snapshot
+        if include_l2 and self._l2 is not None:
+            known = {item[0] for item in snapshot}
+            yield from (item for item in self._l2.entries() if item[0] not in known)
+
+    def keys(self) -> List[str]:
+        """
+        캐시된 모든 키 (L1, L2 합집합)
+
+        Returns:
+            캐시 키 목록
+        """
+        with self._lock:
+            self._drain_pending()
+            keys = list(self._cache)
+            if self._l2 is not None:
+                known = set(keys)
+                keys.extend(k for k in self._l2.keys() if k not in known)
+            return keys
 
     def get_stats(self) -> Dict[str, Any]:
         """
         캐시 통계 조회
 
         Returns:
-            통계 딕셔너리 (hits, misses, hit_rate_percent, cache_size, max_size)
+            통계 딕셔너리 (hits, misses, hit_rate_percent, cache_size, max_size,
+            계층별 통계 l1/l2)
         """
-        with self._lock:
-            total = self._hits + self._misses
-            hit_rate = (self._hits / total * 100) if total > 0 else 0.0
+        return _format_stats(
+            self._counters(),
+            max_size=self._max_size,
+            max_bytes=self._max_bytes,
+            ttl_seconds=self._ttl_seconds,
+            l2=self._l2,
+            sweeper_running=self._sweeper is not None and self._sweeper.is_alive(),
+            admission=self._admission,
+        )
 
+    def _counters(self) -> Dict[str, int]:
+        """L1 통계 카운터 사본 (만료 항목 정리 후, 이 캐시의 잠금만 사용)"""
+        with self._lock:
+            self._drain_pending()
+            # 만료되었지만 아직 정리되지 않은 항목이 크기에 포함되지 않도록
+            self._purge_l1_expired()
             return {
                 "hits": self._hits,
                 "misses": self._misses,
-                "total_requests": total,
-                "hit_rate_percent": round(hit_rate, 2),
-                "cache_size": len(self._cache),
-                "max_size": self._max_size,
-                "ttl_seconds": self._ttl_seconds,
+                "l2_hits": self._l2_hits,
+                "l2_misses": self._l2_misses,
+                "invalidated_hits": self._invalidated_hits,
+                "expired": self._expired,
+                "size": len(self._cache),
+                "bytes": self._l1_bytes,
+                "memory_bytes": self._l1_memory,
             }
 
     @property
     def size(self) -> int:
         """현재 캐시 크기"""
         with self._lock:
+            self._drain_pending()
+            self._purge_l1_expired()
             return len(self._cache)
@@ -0,0 +1,366 @@
+"""
+캐시 번들 모듈
+
+새 장비나 새 배포는 빈 캐시로 시작하여 자주 쓰는 슬라이드 삽화를 다시
+생성합니다. 캐시 번들은 캐시 항목(키, 결과 메타데이터, 태그)과 그 항목이
+참조하는 이미지 파일을 하나의 tar 아카이브로 묶어, 빌드 산출물로 배포한 뒤
+API 호출 없이 캐시를 채울 수 있게 합니다.
+
+아카이브 구성 (PAX 형식, 압축하지 않음, 가져올 때는 gzip 등 압축도 허용):
+- bundle.json: 번들 헤더 (format, version, created_at, model)
+- entries/<키>.json: 캐시 항목 하나 (key, result, created_at, tags, blobs)
+- blobs/<SHA-256><확장자>: 바로 앞 항목이 참조하는 이미지 파일
+
+핵심 기능:
+- 항목마다 이미지 파일을 바로 뒤에 두어 항목 단위로 완결 (스트리밍 가져오기)
+- 모든 멤버에 SHA-256 체크섬 (PAX 헤더 IMAGEN.sha256), 읽으면서 검증
+- 손상된 항목은 건너뛰고 나머지는 계속 가져옴
+- 원자적 내보내기 (임시 파일에 쓴 뒤 교체)
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import re
+import tarfile
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_FORMAT = "imagen-cache-bundle"
+BUNDLE_VERSION = 1
+HEADER_NAME = "bundle.json"
+CHECKSUM_HEADER = "IMAGEN.sha256"
+
+# 항목 JSON 최대 크기 (결과 메타데이터만 담으므로 넉넉한 상한)
+MAX_ENTRY_BYTES = 4 * 1024 * 1024
+
+_COPY_CHUNK_SIZE = 1024 * 1024
+_KEY_PATTERN = re.compile(r"[0-9a-f]{64}")
+_EXT_PATTERN = re.compile(r"\.[a-z0-9]{1,8}")
+
+
+class BundleError(ValueError):
+    """번들을 읽을 수 없음 (헤더 없음, 지원하지 않는 형식/버전, 손상된 아카이브)"""
+
+
+@dataclass
+class BundleEntry:
+    """번들의 캐시 항목 하나"""
+
+    key: str
+    result: Dict[str, Any]
+    created_at: float
+    tags: List[str] = field(default_factory=list)
+    # 참조하는 이미지 파일: SHA-256 해시 -> 확장자
+    blobs: Dict[str, str] = field(default_factory=dict)
+
+
+def _member(name: str, size: int, checksum: str) -> tarfile.TarInfo:
+    """체크섬 PAX 헤더가 붙은 일반 파일 멤버"""
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(time.time())
+    info.mode = 0o644
+    info.pax_headers = {CHECKSUM_HEADER: checksum}
+    return info
+
+
+def _encode(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, ensure_ascii=False, sort_keys=True).encode("utf-8")
+
+
+class BundleWriter:
+    """
+    캐시 번들 쓰기 (컨텍스트 관리자, 정상 종료 시에만 대상 경로에 생성)
+
+    사용 예:
+        with BundleWriter(path, {"model": model}) as writer:
+            writer.add(entry, {digest: blob_path})
+    """
+
+    def __init__(self, path: Path, header: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            path: 번들 파일 경로 (상위 디렉토리가 없으면 생성)
+            header: 번들 헤더에 추가할 정보 (예: 모델 이름)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        self._tar = tarfile.open(self._tmp_path, "w", format=tarfile.PAX_FORMAT)
+        self.entries = 0
+        self.blobs = 0
+        self._add_bytes(
+            HEADER_NAME,
+            _encode(
+                {
+                    **(header or {}),
+                    "format": BUNDLE_FORMAT,
+                    "version": BUNDLE_VERSION,
+                    "created_at": time.time(),
+                }
+            ),
+        )
+
+    def _add_bytes(self, name: str, data: bytes) -> None:
+        info = _member(name, len(data), hashlib.sha256(data).hexdigest())
+        self._tar.addfile(info, io.BytesIO(data))
+
+    def add(self, entry: BundleEntry, files: Dict[str, Path]) -> None:
+        """
+        항목과 참조하는 이미지 파일 기록
+
+        파일을 모두 연 뒤에 기록하므로, 파일이 없으면 아무것도 쓰지 않고
+        FileNotFoundError가 발생합니다.
+
+        Args:
+            entry: 캐시 항목 (blobs는 files로 채움)
+            files: 이미지 파일 SHA-256 해시 -> 내용 주소 저장소의 파일 경로
+        """
+        handles: List[Tuple[str, BinaryIO]] = []
+        try:
+            for digest, path in files.items():
+                handles.append((digest, open(path, "rb")))
+            entry.blobs = {
+                digest: Path(path).suffix.lower() for digest, path in files.items()
+            }
+            self._add_bytes(
+                f"entries/{entry.key}.json",
+                _encode(
+                    {
+                        "key": entry.key,
+                        "result": entry.result,
+                        "created_at": entry.created_at,
+                        "tags": list(entry.tags),
+                        "blobs": entry.blobs,
+                    }
+                ),
+            )
+            for digest, handle in handles:
+                # 내용 주소 저장소의 파일 이름이 곧 체크섬 (가져올 때 다시 계산)
+                size = os.fstat(handle.fileno()).st_size
+                name = f"blobs/{digest}{entry.blobs[digest]}"
+                self._tar.addfile(_member(name, size, digest), handle)
+                self.blobs += 1
+        finally:
+            for _, handle in handles:
+                handle.close()
+        self.entries += 1
+
+    def close(self) -> None:
+        """아카이브를 마무리하고 대상 경로로 교체"""
+        self._tar.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        """기록 중단 (임시 파일 삭제)"""
+        self._tar.close()
+        self._tmp_path.unlink(missing_ok=True)
+
+    def __enter__(self) -> "BundleWriter":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class _Pending:
+    """읽는 중인 항목과 검증을 마친 이미지 파일"""
+
+    __slots__ = ("entry", "accepted", "failed", "staged")
+
+    def __init__(self, entry: Optional[BundleEntry], accepted: bool = True):
+        self.entry = entry
+        self.accepted = accepted
+        self.failed = entry is None
+        self.staged: Dict[str, Path] = {}
+
+    def discard(self) -> None:
+        for path in self.staged.values():
+            path.unlink(missing_ok=True)
+        self.staged.clear()
+
+
+class BundleReader:
+    """
+    캐시 번들 스트리밍 읽기 (앞에서부터 한 번만 읽으며 항목 단위로 반환)
+
+    순회하면 검증을 마친 항목마다 (항목, 해시 -> 임시 이미지 파일 경로)를
+    반환합니다. 임시 파일은 staging_dir에 만들어지며, 호출자가 다음 항목을
+    요청하기 전에 옮기지 않은 파일은 삭제됩니다.
+
+    특징:
+    - 체크섬이 맞지 않거나 형식이 잘못된 항목은 건너뛰고 corrupt 증가
+    - accept(항목)가 False인 항목은 이미지 파일을 쓰지 않고 건너뛰고 skipped 증가
+    - 헤더가 없거나 아카이브가 잘려 읽을 수 없으면 BundleError
+      (그 전에 반환한 항목은 호출자가 이미 처리한 상태)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        staging_dir: Path,
+        accept: Optional[Callable[[BundleEntry], bool]] = None,
+    ):
+        """
+        Args:
+            path: 번들 파일 경로
+            staging_dir: 검증 중인 이미지 파일을 둘 디렉토리 (내용 주소 저장소와
+                같은 파일 시스템이면 이동이 복사 없이 끝남)
+            accept: 가져올 항목인지 판단하는 함수 (기본값: None = 모두)
+        """
+        self.path = Path(path)
+        self.staging_dir = Path(staging_dir)
+        self._accept = accept
+        self.header: Optional[Dict[str, Any]] = None
+        self.entries = 0
+        self.skipped = 0
+        self.corrupt = 0
+
+    def __iter__(self) -> Iterator[Tuple[BundleEntry, Dict[str, Path]]]:
+        pending: Optional[_Pending] = None
+        try:
+            with tarfile.open(self.path, "r|*") as tar:
+                for member in tar:
+                    if self.header is None:
+                        self.header = self._read_header(tar, member)
+                    elif member.name.startswith("entries/"):
+                        if pending is not None:
+                            yield from self._finish(pending)
+                        pending = self._read_entry(tar, member)
+                    elif member.name.startswith("blobs/") and pending is not None:
+                        self._stage_blob(tar, member, pending)
+                    # 알 수 없는 멤버는 무시 (이후 버전과의 호환)
+                if pending is not None:
+                    yield from self._finish(pending)
+                    pending = None
+        except tarfile.TarError as e:
+            raise BundleError(f"번들을 읽을 수 없습니다: {e}") from e
+        finally:
+            if pending is not None:
+                pending.discard()
+        if self.header is None:
+            raise BundleError("번들 헤더가 없습니다.")
+
+    @staticmethod
+    def _read_member(tar: tarfile.TarFile, member: tarfile.TarInfo) -> Optional[bytes]:
+        """작은 멤버의 내용 (체크섬이 맞지 않으면 None)"""
+        if not member.isfile() or member.size > MAX_ENTRY_BYTES:
+            return None
+        handle = tar.extractfile(member)
+        data = handle.read() if handle is not None else b""
+        if hashlib.sha256(data).hexdigest() != member.pax_headers.get(CHECKSUM_HEADER):
+            return None
+        return data
+
+    def _read_header(
+        self, tar: tarfile.TarFile, member: tarfile.TarInfo
+    ) -> Dict[str, Any]:
+        data = self._read_member(tar, member) if member.name == HEADER_NAME else None
+        if data is None:
+            raise BundleError("번들 헤더가 없거나 손상되었습니다.")
+        try:
+            header = json.loads(data)
+        except ValueError as e:
+            raise BundleError(f"번들 헤더를 읽을 수 없습니다: {e}") from e
+        if not isinstance(header, dict) or header.get("format") != BUNDLE_FORMAT:
+            raise BundleError("캐시 번들이 아닙니다.")
+        if not isinstance(header.get("version"), int) or (
+            header["version"] > BUNDLE_VERSION
+        ):
+            raise BundleError(f"지원하지 않는 번들 버전: {header.get('version')}")
+        return header
+
+    def _read_entry(self, tar: tarfile.TarFile, member: tarfile.TarInfo) -> _Pending:
+        data = self._read_member(tar, member)
+        try:
+            record = json.loads(data) if data is not None else None
+            key = record["key"]
+            blobs = record["blobs"]
+            entry = BundleEntry(
+                key=key,
+                result=record["result"],
+                created_at=float(record["created_at"]),
+                tags=[str(tag) for tag in record["tags"]],
+                blobs=dict(blobs),
+            )
+            valid = (
+                _KEY_PATTERN.fullmatch(key) is not None
+                and member.name == f"entries/{key}.json"
+                and isinstance(entry.result, dict)
+                and all(
+                    _KEY_PATTERN.fullmatch(digest) and _EXT_PATTERN.fullmatch(ext)
+                    for digest, ext in entry.blobs.items()
+                )
+            )
+        except (TypeError, ValueError, KeyError, AttributeError):
+            valid = False
+        if not valid:
+            logger.warning(f"손상된 번들 항목 건너뜀: {member.name}")
+            return _Pending(None)
+        accepted = self._accept is None or self._accept(entry)
+        return _Pending(entry, accepted)
+
+    def _stage_blob(
+        self, tar: tarfile.TarFile, member: tarfile.TarInfo, pending: _Pending
+    ) -> None:
+        if pending.failed or not pending.accepted:
+            return
+        assert pending.entry is not None
+        name = member.name[len("blobs/") :]
+        digest, ext = name[:64], name[64:]
+        source = tar.extractfile(member) if member.isfile() else None
+        if (
+            source is None
+            or pending.entry.blobs.get(digest) != ext
+            or member.pax_headers.get(CHECKSUM_HEADER) != digest
+        ):
+            pending.failed = True
+            return
+
+        fd, tmp_name = tempfile.mkstemp(
+            prefix=".bundle-", suffix=ext, dir=self.staging_dir
+        )
+        tmp_path = Path(tmp_name)
+        sha = hashlib.sha256()
+        with os.fdopen(fd, "wb") as target:
+            for chunk in iter(lambda: source.read(_COPY_CHUNK_SIZE), b""):
+                sha.update(chunk)
+                target.write(chunk)
+        if sha.hexdigest() != digest:
+            tmp_path.unlink(missing_ok=True)
+            pending.failed = True
+            return
+        pending.staged[digest] = tmp_path
+
+    def _finish(
+        self, pending: _Pending
+    ) -> Iterator[Tuple[BundleEntry, Dict[str, Path]]]:
+        """항목 하나를 마무리 (모든 이미지 파일이 검증되었으면 반환)"""
+        try:
+            if not pending.accepted:
+                self.skipped += 1
+                return
+            assert pending.failed or pending.entry is not None
+            if pending.failed or set(pending.staged) != set(pending.entry.blobs):
+                self.corrupt += 1
+                if pending.entry is not None:
+                    logger.warning(
+                        f"이미지 파일이 없거나 손상된 번들 항목 건너뜀: "
+                        f"{pending.entry.key[:16]}..."
+                    )
+                return
+            self.entries += 1
+            yield pending.entry, dict(pending.staged)
+        finally:
+            pending.discard()
@@ -0,0 +1,407 @@
+"""
+디스크 기반 L2 캐시 저장소 모듈
+
+ImageCache(메모리 L1) 뒤에서 동작하는 SQLite 저장소로,
+서버를 재시작해도 캐시된 생성 결과를 유지합니다.
+
+핵심 기능:
+- SQLite WAL 모드 (읽기와 쓰기가 서로 막지 않음)
+- 항목별 만료 시각 저장, 만료 항목은 조회되지 않고 purge_expired()/제거 시 삭제
+- 최대 항목 수 또는 바이트 예산 초과 시 마지막 접근 시각 기준으로 제거
+- 항목 태그 역색인 테이블 (항목 삭제 시 트리거로 함께 삭제)
+- 스레드 안전성 (단일 연결 + Lock)
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    weight INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_cache_accessed ON cache_entries (accessed_at);
+CREATE INDEX IF NOT EXISTS idx_cache_expires ON cache_entries (expires_at);
+CREATE TABLE IF NOT EXISTS cache_tags (
+    tag TEXT NOT NULL,
+    key TEXT NOT NULL,
+    PRIMARY KEY (tag, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_cache_tags_key ON cache_tags (key);
+CREATE TRIGGER IF NOT EXISTS cache_tags_cleanup AFTER DELETE ON cache_entries
+BEGIN
+    DELETE FROM cache_tags WHERE key = OLD.key;
+END;
+"""
+
+
+class SqliteCacheStore:
+    """
+    SQLite 기반 캐시 저장소 (ImageCache의 L2 계층)
+
+    결과 딕셔너리는 JSON으로 저장하며, 만료 시각은 time.time() 기준이므로
+    재시작 후에도 그대로 적용됩니다. (L1은 time.monotonic() 기준으로 변환해 사용)
+    """
+
+    def __init__(self, path: Path, max_entries: int = 10000, max_bytes: int = 0):
+        """
+        저장소 초기화 (파일과 테이블이 없으면 생성)
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로
+            max_entries: 최대 항목 수 (기본값: 10000)
+            max_bytes: 항목 무게 합계 예산 (기본값: 0 = 제한 없음)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_entries = max_entries
+        self._max_bytes = max(0, max_bytes)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[Tuple[Dict[str, Any], float, float]]:
+        """
+        항목 조회 (만료된 항목은 None 반환)
+
+        만료된 항목은 purge_expired()나 공간 확보 시 삭제되어 삭제된 키가
+        호출자에게 전달되므로, 조회 시에는 삭제하지 않습니다.
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            (결과 딕셔너리, 생성 시각, 만료 시각) 또는 None
+        """
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT result, created_at, expires_at FROM cache_entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            result_json, created_at, expires_at = row
+            if now > expires_at:
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key)
+            )
+
+        try:
+            return json.loads(result_json), created_at, expires_at
+        except json.JSONDecodeError as e:
+            logger.error(f"L2 캐시 항목 손상: {key[:16]}... ({e})")
+            self.delete(key)
+            return None
+
+    def set(
+        self,
+        key: str,
+        result: Dict[str, Any],
+        created_at: float,
+        expires_at: float,
+        weight: int = 0,
+        tags: Optional[Iterable[str]] = None,
+    ) -> List[str]:
+        """
+        항목 저장 (최대 항목 수나 바이트 예산 초과 시 가장 오래 접근하지 않은
+        항목부터 제거, 저장한 항목은 제거하지 않음)
+
+        Args:
+            key: 캐시 키
+            result: 저장할 결과 딕셔너리 (JSON 직렬화 가능)
+            created_at: 생성 시각 (time.time())
+            expires_at: 만료 시각 (time.time())
+            weight: 항목 무게 (바이트)
+            tags: 항목 태그 (기본값: None = 기존 태그 유지)
+
+        Returns:
+            공간 확보를 위해 제거된 키 목록
+        """
+        try:
+            result_json = json.dumps(result, ensure_ascii=False)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"L2 캐시 저장 생략 (직렬화 불가): {e}")
+            return []
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(key, result, created_at, expires_at, accessed_at, weight) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, result_json, created_at, expires_at, time.time(), weight),
+            )
+            # REPLACE는 삭제 트리거를 실행하지 않으므로 태그는 명시적으로 교체
+            if tags is not None:
+                self._conn.execute("DELETE FROM cache_tags WHERE key = ?", (key,))
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO cache_tags (tag, key) VALUES (?, ?)",
+                    [(tag, key) for tag in tags],
+                )
+            return self._evict_locked(protect=key)
+
+    def _evict_locked(self, protect: str) -> List[str]:
+        """만료 항목과 최대 항목 수/바이트 예산 초과분을 삭제 (잠금 보유 상태)"""
+        count, total = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(weight), 0) FROM cache_entries"
+        ).fetchone()
+        over_bytes = self._max_bytes and total > self._max_bytes
+        if count <= self._max_entries and not over_bytes:
+            return []
+
+        now = time.time()
+        removed = []
+        for key, weight in self._conn.execute(
+            "SELECT key, weight FROM cache_entries WHERE expires_at < ?", (now,)
+        ).fetchall():
+            removed.append(key)
+            count -= 1
+            total -= weight
+
+        rows = self._conn.execute(
+            "SELECT key, weight FROM cache_entries WHERE expires_at >= ? AND key != ? "
+            "ORDER BY accessed_at ASC",
+            (now, protect),
+        )
+        for key, weight in rows:
+            over_bytes = self._max_bytes and total > self._max_bytes
+            if count <= self._max_entries and not over_bytes:
+                break
+            removed.append(key)
+            count -= 1
+            total -= weight
+
+        self._conn.executemany(
+            "DELETE FROM cache_entries WHERE key = ?", [(key,) for key in removed]
+        )
+        return removed
+
+    def resize(
+        self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> List[str]:
+        """
+        최대 항목 수/바이트 예산 변경 (줄이면 가장 오래 접근하지 않은 항목부터 제거)
+
+        Args:
+            max_entries: 새 최대 항목 수 (None = 유지)
+            max_bytes: 새 바이트 예산 (None = 유지, 0 = 제한 없음)
+
+        Returns:
+            제거된 키 목록
+        """
+        with self._lock:
+            if max_entries is not None:
+                self._max_entries = max(1, max_entries)
+            if max_bytes is not None:
+                self._max_bytes = max(0, max_bytes)
+            return self._evict_locked(protect="")
+
+    def set_ttl(self, ttl_seconds: float) -> None:
+        """모든 항목의 만료 시각을 생성 시각 + ttl_seconds로 변경"""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE cache_entries SET expires_at = created_at + ?", (ttl_seconds,)
+            )
+
+    def purge_expired(self) -> List[str]:
+        """
+        만료된 항목 일괄 삭제 (expires_at 인덱스 사용)
+
+        Returns:
+            삭제된 키 목록
+        """
+        now = time.time()
+        with self._lock:
+            expired = [
+                key
+                for (key,) in self._conn.execute(
+                    "SELECT key FROM cache_entries WHERE expires_at < ?", (now,)
+                )
+            ]
+            self._conn.executemany(
+                "DELETE FROM cache_entries WHERE key = ?", [(key,) for key in expired]
+            )
+            return expired
+
+    def delete(self, key: str) -> bool:
+        """
+        항목 삭제
+
+        Args:
+            key: 캐시 키
+
+        Returns:
+            삭제 여부
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE key = ?", (key,)
+            )
+            return cursor.rowcount > 0
+
+    def clear(self) -> int:
+        """
+        전체 항목 삭제
+
+        Returns:
+            삭제된 항목 수
+        """
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM cache_entries")
+            return cursor.rowcount
+
+    def tags(self, key: str) -> List[str]:
+        """항목의 태그 목록"""
+        with self._lock:
+            return [
+                tag
+                for (tag,) in self._conn.execute(
+                    "SELECT tag FROM cache_tags WHERE key = ?", (key,)
+                )
+            ]
+
+    def keys_for_tag(self, tag: str) -> List[str]:
+        """
+        태그가 붙은 키 목록 (만료 항목 포함, (tag, key) 기본 키 인덱스 사용)
+
+        Args:
+            tag: 태그
+
+        Returns:
+            캐시 키 목록
+        """
+        with self._lock:
+            return [
+                key
+                for (key,) in self._conn.execute(
+                    "SELECT key FROM cache_tags WHERE tag = ?", (tag,)
+                )
+            ]
+
+    def tag_counts(self) -> Dict[str, int]:
+        """태그별 항목 수 (만료 항목 포함)"""
+        with self._lock:
+            return dict(
+                self._conn.execute(
+                    "SELECT tag, COUNT(*) FROM cache_tags GROUP BY tag ORDER BY tag"
+                ).fetchall()
+            )
+
+    def keys_with_prefix(self, prefix: str) -> List[str]:
+        """
+        접두사로 시작하는 키 목록 (만료 항목 포함, 기본 키 인덱스 범위 검색)
+
+        Args:
+            prefix: 키 접두사 (비어 있지 않아야 함)
+
+        Returns:
+            캐시 키 목록
+        """
+        # 접두사 다음 문자열: 마지막 문자를 다음 코드 포인트로 바꾼 값 (배타적 상한)
+        upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+        with self._lock:
+            return [
+                key
+                for (key,) in self._conn.execute(
+                    "SELECT key FROM cache_entries WHERE key >= ? AND key < ?",
+                    (prefix, upper),
+                )
+            ]
+
+    def entries(
+        self, batch_size: int = 256
+    ) -> Iterator[Tuple[str, Dict[str, Any], float, float, Tuple[str, ...]]]:
+        """
+        만료되지 않은 항목 순회 (키 순서, 접근 시각은 갱신하지 않음)
+
+        키 범위로 batch_size개씩 읽으므로 순회 중에도 다른 조회/저장이
+        잠금을 오래 기다리지 않습니다. (순회 중 변경된 항목은 반영될 수도 있음)
+
+        Args:
+            batch_size: 한 번에 읽는 항목 수 (기본값: 256)
+
+        Yields:
+            (키, 결과 딕셔너리, 생성 시각, 만료 시각, 태그)
+        """
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT key, result, created_at, expires_at FROM cache_entries "
+                    "WHERE key > ? AND expires_at > ? ORDER BY key LIMIT ?",
+                    (last, time.time(), batch_size),
+                ).fetchall()
+                if not rows:
+                    return
+                tags: Dict[str, List[str]] = {}
+                for key, tag in self._conn.execute(
+                    "SELECT key, tag FROM cache_tags WHERE key >= ? AND key <= ?",
+                    (rows[0][0], rows[-1][0]),
+                ):
+                    tags.setdefault(key, []).append(tag)
+            for key, result_json, created_at, expires_at in rows:
+                try:
+                    result = json.loads(result_json)
+                except json.JSONDecodeError:
+                    continue  # get()에서 삭제되도록 남겨 둠
+                yield key, result, created_at, expires_at, tuple(tags.get(key, ()))
+            last = rows[-1][0]
+
+    def keys(self) -> List[str]:
+        """저장된 모든 키 (만료 항목 포함)"""
+        with self._lock:
+            return [
+                key for (key,) in self._conn.execute("SELECT key FROM cache_entries")
+            ]
+
+    @property
+    def size(self) -> int:
+        """저장된 항목 수 (만료 항목 포함)"""
+        with self._lock:
+            (count,) = self._conn.execute(
+                "SELECT COUNT(*) FROM cache_entries"
+            ).fetchone()
+            return count
+
+    @property
+    def total_bytes(self) -> int:
+        """저장된 항목 무게 합계 (만료 항목 포함)"""
+        with self._lock:
+            (total,) = self._conn.execute(
+                "SELECT COALESCE(SUM(weight), 0) FROM cache_entries"
+            ).fetchone()
+            return total
+
+    @property
+    def max_entries(self) -> int:
+        """최대 항목 수"""
+        return self._max_entries
+
+    @property
+    def max_bytes(self) -> int:
+        """항목 무게 합계 예산 (0 = 제한 없음)"""
+        return self._max_bytes
+
+    def close(self) -> None:
+        """데이터베이스 연결 종료"""
+        with self._lock:
+            self._conn.close()
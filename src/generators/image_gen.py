@@ -1,28 +1,185 @@
+import asyncio
 import os
 import sys
 import logging
 import json
+import math
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
-from PIL import Image
 
 # src 디렉토리를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from generators.cache import generate_cache_key, ImageCache
-from generators.format_handlers import save_image
+from generators.admission import ADMISSION_POLICIES
+from generators.blob_store import BlobStore
+from generators.cache import (
+    TAG_KINDS,
+    cache_tag,
+    generate_cache_key,
+    generate_cache_key_advanced,
+    ImageCache,
+    rendition_key,
+    style_fingerprint,
+)
+from generators.cache_bundle import (
+    BundleEntry,
+    BundleError,
+    BundleReader,
+    BundleWriter,
+)
+from generators.disk_cache import SqliteCacheStore
+from generators.postprocess import PostProcessor, encode_lossless, workers_from_env
+from generators.process_flight import ProcessSingleFlight
+from generators.prompt_index import PromptIndex
+from generators.retry import (
+    RetryExhaustedError,
+    is_deterministic_error,
+    retry_policy_from_env,
+)
+from generators.scheduler import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    scheduler_from_env,
+)
+from generators.sharded_cache import ShardedImageCache
+from generators.singleflight import SingleFlight
+from generators.timing import stage_timer
+from gallery.models import ImageMetadata
 from models.prompt_enhancer import PromptEnhancer, validate_resolution
 
 load_dotenv()
 
+# Imagen 기본 모델 (IMAGEN_MODEL 환경 변수로 변경) 및 지원 비율 (SPEC-IMG-003)
+IMAGEN_MODEL = "imagen-4.0-fast-generate-001"
+SUPPORTED_ASPECT_RATIOS = [
+    "1:1",
+    "16:9",
+    "9:16",
+    "4:3",
+    "3:4",
+    "21:9",  # Ultra-Wide
+    "2:3",  # Portrait SNS
+    "3:2",  # Photo DSLR
+    "5:4",  # Large Format
+]
+
+# Imagen이 한 번의 요청으로 반환할 수 있는 최대 이미지 수
+MAX_VARIANTS = 4
+
+# Imagen이 직접 인코딩할 수 있는 출력 형식 (그 외 형식은 로컬 변환)
+SERVER_OUTPUT_MIME_TYPES = {
+    "png": "image/png",
+    "jpeg": "image/jpeg",
+    "jpg": "image/jpeg",
+}
+
+# 캐시에 저장하지 않는 요청 단위 결과 키
+REQUEST_ONLY_KEYS = ("attempts", "timings")
+
+# 형식/품질별 출력본에 속하는 결과 키 (나머지는 캐시 항목의 공통 정보)
+RENDITION_KEYS = (
+    "local_path",
+    "url",
+    "filename",
+    "content_hash",
+    "format",
+    "quality",
+    "width",
+    "height",
+    "encoding",
+    "status",
+)
+
+# 생성 파이프라인 단계 (결과의 "timings"에 "<단계>_ms"로 이 순서대로 기록)
+PIPELINE_STAGES = (
+    "enhance",  # 프롬프트 강화/해상도 검증/네거티브 프롬프트 (고급 생성)
+    "key",  # 변형별 캐시 키 계산
+    "cache",  # 캐시 조회
+    "api",  # Imagen 호출 (스케줄러 대기, 재시도 포함)
+    "decode",  # 이미지 디코딩 (원본 저장 시 헤더 확인)
+    "resize",  # 해상도 조정
+    "encode",  # 출력 형식 인코딩
+    "write",  # 파일 쓰기
+    "store",  # 내용 해시 계산 및 내용 주소 저장소로 이동
+    "master",  # 캐시용 무손실 마스터 저장
+    "register",  # 캐시 저장 및 갤러리 등록
+)
+
+# 캐시 없이 생성하는 함수: 요청할 이미지 수를 받아 결과 딕셔너리 반환
+UncachedFn = Callable[[int], Dict[str, Any]]
+AsyncUncachedFn = Callable[[int], Awaitable[Dict[str, Any]]]
+
+
+@dataclass
+class GenerationRequest:
+    """
+    전처리가 끝난 생성 요청
+
+    기본/고급 생성과 배치 항목이 모두 이 요청으로 같은 파이프라인
+    (캐시 조회 → API 호출 → 후처리 → 저장 → 등록)을 거칩니다.
+    """
+
+    mode: str  # "basic" 또는 "advanced"
+    prompt: str  # 프롬프트 (고급 생성은 강화/트리밍 적용 후)
+    style_name: str
+    aspect_ratio: str
+    format: str
+    quality: int
+    width: Optional[int] = None
+    height: Optional[int] = None
+    negative_prompt: Optional[str] = None
+    cache_keys: List[str] = field(default_factory=list)  # 변형 슬롯별 캐시 키
+    # 변형 슬롯별 프롬프트를 뺀 생성 입력 키 (유사 프롬프트 검색 범위)
+    scope_keys: List[str] = field(default_factory=list)
+    # 캐시 항목 태그 (모델, 스타일: 태그 단위 일괄 무효화용)
+    cache_tags: List[str] = field(default_factory=list)
+    source_prompt: str = ""  # 사용자 프롬프트 (강화 전, 유사 프롬프트 검색용)
+    generation_params: Dict[str, Any] = field(default_factory=dict)  # 갤러리 기록용
+    timings: Dict[str, float] = field(default_factory=dict)  # 요청 단계 소요 시간
+    started: float = field(default_factory=time.perf_counter)
+
+    @property
+    def advanced(self) -> bool:
+        return self.mode == "advanced"
+
+    @property
+    def label(self) -> str:
+        """로그/상태 메시지용 이름"""
+        return "Advanced image" if self.advanced else "Image"
+
 
 class ImageGenerator:
     def __init__(self, styles_data: Dict[str, Any]):
         self.styles = {s["name"]: s for s in styles_data.get("styles", [])}
         self.default_style = styles_data.get("default_style", "Flat Corporate")
+        # 스타일 정의 해시 (키워드 등이 바뀌면 캐시 키가 달라짐)
+        self._style_versions = {
+            name: style_fingerprint(style) for name, style in self.styles.items()
+        }
+        # Imagen 모델 (캐시 키 네임스페이스에 포함)
+        self.model = os.getenv("IMAGEN_MODEL", "").strip() or IMAGEN_MODEL
 
         self.api_key = os.getenv("GOOGLE_API_KEY")
         self.client = None
@@ -35,23 +192,421 @@ class ImageGenerator:
         else:
             logging.warning("GOOGLE_API_KEY is not set. Image generation will fail.")
 
-        # Ensure output directory exists
-        self.output_dir = Path("output/images")
+        # Ensure output directory exists (IMAGE_OUTPUT_DIR, 기본 output/images)
+        self.output_dir = Path(os.getenv("IMAGE_OUTPUT_DIR", "output/images"))
         self.output_dir.mkdir(parents=True, exist_ok=True)
 
+        # 내용 주소 이미지 저장소: 캐시 항목("cache:<키>")과 갤러리 레코드
+        # ("gallery:<ID>")가 참조를 보유하고, 마지막 참조 해제 시 파일 삭제
+        self.blob_store = BlobStore(self.output_dir / "blobs")
+        # 캐시 항목은 "cache:<키>"(마스터)와 "cache:<키>:<출력본>" 참조를 보유
+
         # 캐시 설정 (환경 변수 기반)
         self._cache_enabled = os.getenv("CACHE_ENABLED", "true").lower() == "true"
-        self._cache: Optional[ImageCache] = None
+        self._cache: Optional[Union[ImageCache, ShardedImageCache]] = None
+        # 유사 프롬프트 색인 (CACHE_APPROX_THRESHOLD > 0이면 근사 HIT 허용)
+        self._prompt_index: Optional[PromptIndex] = None
+        # 결정적 실패(안전 필터 차단, 이미지 없음) 결과 캐시 (짧은 TTL)
+        self._negative_cache: Optional[ImageCache] = None
+        # 만료가 가까운 HIT 항목의 백그라운드 조기 갱신 강도 (0 = 사용 안 함)
+        self._refresh_beta = 0.0
+        # 같은 L2 파일을 쓰는 다른 서버 프로세스와의 요청 병합 (CACHE_SHARED)
+        self._process_flight: Optional[ProcessSingleFlight] = None
 
         if self._cache_enabled:
+            negative_ttl = int(os.getenv("CACHE_NEGATIVE_TTL_SECONDS", "300"))
+            if negative_ttl > 0:
+                self._negative_cache = ImageCache(
+                    max_size=int(os.getenv("CACHE_NEGATIVE_MAX_SIZE", "1000")),
+                    ttl_seconds=negative_ttl,
+                )
+            if os.getenv("CACHE_STALE_WHILE_REVALIDATE", "false").lower() == "true":
+                self._refresh_beta = float(os.getenv("CACHE_EARLY_REFRESH_BETA", "1.0"))
+            approx_threshold = float(os.getenv("CACHE_APPROX_THRESHOLD", "0"))
+            if approx_threshold > 0:
+                self._prompt_index = PromptIndex(threshold=min(approx_threshold, 1.0))
             max_size = int(os.getenv("CACHE_MAX_SIZE", "100"))
             ttl_seconds = int(os.getenv("CACHE_TTL_SECONDS", "3600"))
-            self._cache = ImageCache(max_size=max_size, ttl_seconds=ttl_seconds)
-            logging.info(f"캐시 활성화: max_size={max_size}, ttl={ttl_seconds}초")
+            # 캐시 항목이 보유한 이미지 파일 크기 합계 예산 (0 = 제한 없음)
+            max_bytes = int(os.getenv("CACHE_MAX_BYTES", "0"))
+            # 조회되지 않는 만료 항목과 그 이미지 파일을 정리하는 간격 (0 = 사용 안 함)
+            sweep_interval = float(os.getenv("CACHE_SWEEP_INTERVAL_SECONDS", "60"))
+            # 캐시 잠금 경합을 줄이기 위한 샤드 수 (1 = 단일 잠금 ImageCache)
+            shards = int(os.getenv("CACHE_SHARDS", "1"))
+            # L1 제거 정책: lru(기본) 또는 tinylfu (W-TinyLFU 입장 정책)
+            admission = os.getenv("CACHE_ADMISSION", "lru").strip().lower()
+            if admission not in ADMISSION_POLICIES:
+                logging.warning(f"알 수 없는 CACHE_ADMISSION: {admission}, lru 사용")
+                admission = "lru"
+            options: Dict[str, Any] = {"shards": shards} if shards > 1 else {}
+            cache_class = ShardedImageCache if shards > 1 else ImageCache
+            # 여러 MCP 클라이언트의 서버 프로세스가 L2 캐시를 공유 (경로 미설정 시 기본 경로)
+            shared = os.getenv("CACHE_SHARED", "false").lower() == "true"
+            l2 = self._open_l2_store(
+                max_bytes,
+                self.output_dir.parent / "cache" / "image_cache.sqlite3"
+                if shared
+                else None,
+            )
+            if shared and l2 is not None:
+                self._process_flight = ProcessSingleFlight(
+                    l2.path,
+                    lease_seconds=float(os.getenv("CACHE_FLIGHT_LEASE_SECONDS", "300")),
+                )
+            self._cache = cache_class(
+                max_size=max_size,
+                ttl_seconds=ttl_seconds,
+                l2=l2,
+                validator=self._cached_file_exists,
+                on_remove=self._on_cache_removed,
+                max_bytes=max_bytes,
+                weigher=self._cached_weight,
+                sweep_interval=sweep_interval,
+                admission=admission,
+                **options,
+            )
+            logging.info(
+                f"캐시 활성화: max_size={max_size}, ttl={ttl_seconds}초, "
+                f"max_bytes={max_bytes}, sweep={sweep_interval}초, shards={shards}, "
+                f"approx_threshold={approx_threshold}, admission={admission}, "
+                f"shared={self._process_flight is not None}"
+            )
+
+        # 캐시 조회 키 기록 (CACHE_TRACE_PATH, benchmarks/cache_trace_bench.py로 재생)
+        self._trace_lock = threading.Lock()
+        self._trace_file: Optional[Any] = None
+        trace_path = os.getenv("CACHE_TRACE_PATH", "").strip()
+        if self._cache is not None and trace_path:
+            Path(trace_path).parent.mkdir(parents=True, exist_ok=True)
+            self._trace_file = open(trace_path, "a", encoding="utf-8", buffering=1)
+
+        # 종료된 프로세스의 캐시 항목이 보유하던 참조 중 사라진 항목의 참조 정리
+        # (같은 저장소를 쓰는 다른 실행 중인 프로세스의 참조는 유지)
+        alive = set(self._cache.keys()) if self._cache else set()
+        self.blob_store.reclaim(
+            "cache:",
+            (
+                holder
+                for holder in self.blob_store.holders("cache:")
+                if holder.split(":")[1] in alive
+            ),
+        )
+
+        # 캐시된 마스터에서 로컬 변환한 횟수와 그 덕분에 생략한 API 호출 수
+        self._stats_lock = threading.Lock()
+        self._derived_renders = 0
+        self._api_calls_saved = 0
+        self._approximate_hits = 0
+        self._negative_hits = 0
+        self._background_refreshes = 0
+        # 다른 프로세스가 생성한 결과를 공유 캐시에서 받은 횟수
+        self._cross_process_hits = 0
+        # 백그라운드 갱신 중인 키와 갱신 스레드 풀 (첫 갱신 시 생성)
+        self._refreshing: Set[str] = set()
+        self._refresh_pool: Optional[ThreadPoolExecutor] = None
+        # 최근 API 호출 소요 시간(초)의 지수 이동 평균 (조기 갱신 확률 계산용)
+        self._generation_seconds = 10.0
+
+        # 동일 키 동시 요청 병합 (캐시 MISS 중복 API 호출 방지)
+        self._singleflight = SingleFlight()
+
+        # 배치 생성 설정 (SPEC-IMG-001)
+        self.batch_max_size = int(os.getenv("BATCH_MAX_SIZE", "50"))
+        self.batch_max_concurrent = int(os.getenv("BATCH_MAX_CONCURRENT", "5"))
+
+        # 생성된 이미지를 등록할 갤러리 (SPEC-GALLERY-001, set_gallery()로 연결)
+        self.gallery: Any = None
+        # 갤러리 기록으로 캐시를 복원하는 시작 시 예열 상태 (start_cache_warmup())
+        self._warmup: Dict[str, Any] = {"status": "idle"}
+        # 시작 시 캐시 번들 가져오기 결과 (CACHE_BUNDLE_IMPORT)
+        self._bundle_import: Optional[Dict[str, Any]] = None
+
+        # Imagen 호출 스케줄러 (속도 제한, 우선순위, AIMD 동시 실행 제한)
+        self.scheduler = scheduler_from_env()
+        # 일시적 오류 재시도 및 꼬리 지연 헤징
+        self.retry_policy = retry_policy_from_env()
+
+        # 출력 형식 협상: 지원 형식은 Imagen에 직접 요청 (SERVER_ENCODING)
+        self.server_encoding = os.getenv("SERVER_ENCODING", "true").lower() == "true"
+
+        # 디코딩/리사이즈/인코딩 후처리 (POSTPROCESS_WORKERS > 0이면 프로세스 풀)
+        self.postprocessor = PostProcessor(workers=workers_from_env())
 
         # 프롬프트 강화기 초기화
         self.prompt_enhancer = PromptEnhancer()
 
+    @staticmethod
+    def _open_l2_store(
+        max_bytes: int = 0, default_path: Optional[Path] = None
+    ) -> Optional[SqliteCacheStore]:
+        """
+        디스크 L2 캐시 저장소 열기 (CACHE_L2_PATH와 default_path가 모두 비어 있으면
+        사용하지 않음)
+
+        - CACHE_L2_PATH: SQLite 파일 경로 (예: output/cache/image_cache.sqlite3)
+        - CACHE_L2_MAX_SIZE: L2 최대 항목 수 (기본 10000)
+
+        Args:
+            max_bytes: 캐시 항목이 보유한 파일 크기 합계 예산 (0 = 제한 없음)
+            default_path: CACHE_L2_PATH가 비어 있을 때 사용할 경로 (CACHE_SHARED)
+        """
+        path = os.getenv("CACHE_L2_PATH", "").strip() or (
+            str(default_path) if default_path else ""
+        )
+        if not path:
+            return None
+        max_entries = int(os.getenv("CACHE_L2_MAX_SIZE", "10000"))
+        try:
+            store = SqliteCacheStore(
+                Path(path), max_entries=max_entries, max_bytes=max_bytes
+            )
+        except Exception as e:
+            logging.error(f"L2 캐시 열기 실패, 메모리 캐시만 사용: {e}")
+            return None
+        logging.info(f"L2 캐시 활성화: {path} (max_size={max_entries})")
+        return store
+
+    def _on_cache_removed(self, key: str) -> None:
+        """캐시 항목이 모든 계층에서 제거되면 파일 참조와 유사 프롬프트 색인 정리"""
+        self.blob_store.retain(f"cache:{key}", ())
+        if self._prompt_index is not None:
+            self._prompt_index.remove(key)
+
+    @staticmethod
+    def _cached_hashes(result: Dict[str, Any]) -> Set[str]:
+        """캐시 항목이 참조하는 마스터/출력본 파일 해시"""
+        hashes = {result.get("master_hash"), result.get("content_hash")}
+        hashes.update(
+            rendition.get("content_hash")
+            for rendition in result.get("renditions", {}).values()
+        )
+        return {digest for digest in hashes if digest}
+
+    def _cached_weight(self, result: Dict[str, Any]) -> int:
+        """캐시 항목 무게: 보유한 마스터/출력본 파일 크기 합계 (바이트)"""
+        return sum(
+            self.blob_store.size(digest) for digest in self._cached_hashes(result)
+        )
+
+    def _cached_file_exists(self, result: Dict[str, Any]) -> bool:
+        """캐시된 결과의 마스터(없으면 이미지) 파일이 아직 있는지 확인 (없으면 캐시 MISS)"""
+        if result.get("master_hash"):
+            return self.blob_store.exists(result["master_hash"])
+        local_path = result.get("local_path")
+        return not local_path or Path(local_path).exists()
+
+    def set_gallery(self, gallery: Any) -> None:
+        """
+        새로 생성된 이미지를 등록할 갤러리 연결
+
+        Args:
+            gallery: register_image(ImageMetadata)를 제공하는 ImageGallery
+        """
+        self.gallery = gallery
+
+    def start_cache_warmup(self) -> Optional[threading.Thread]:
+        """
+        캐시 번들과 갤러리 기록으로 캐시 예열을 백그라운드 스레드에서 시작
+
+        MCP 서버 시작을 지연하지 않도록 별도 스레드에서 CACHE_BUNDLE_IMPORT
+        번들을 가져온 뒤(import_cache_bundle()) warm_cache()를 실행하고, 결과는
+        get_cache_stats()의 "bundle_import"와 "warmup"에 기록합니다.
+
+        Returns:
+            예열 스레드 (캐시 비활성화, 또는 번들 미설정이고 갤러리 미연결 시 None)
+        """
+        bundle_path = os.getenv("CACHE_BUNDLE_IMPORT", "").strip()
+        if self._cache is None or (self.gallery is None and not bundle_path):
+            return None
+        if self.gallery is not None:
+            self._warmup = {"status": "running"}
+        thread = threading.Thread(
+            target=self._run_warmup,
+            args=(bundle_path,),
+            name="cache-warmup",
+            daemon=True,
+        )
+        thread.start()
+        return thread
+
+    def _run_warmup(self, bundle_path: str) -> None:
+        """예열 스레드 본문 (번들을 먼저 가져오고 갤러리 기록으로 나머지 복원)"""
+        if bundle_path:
+            self._bundle_import = {"status": "running", "path": bundle_path}
+            self._bundle_import = {
+                "status": "done",
+                **self.import_cache_bundle(bundle_path),
+            }
+        if self.gallery is not None:
+            self.warm_cache()
+
+    def warm_cache(self) -> Dict[str, Any]:
+        """
+        갤러리 메타데이터(generation_params)로 캐시 키를 다시 만들어 캐시 복원
+
+        - 이미지 파일이 남아 있고 생성 시각 기준 TTL 이내인 기록만 복원
+        - 같은 키의 기록이 여럿이면 가장 최근 기록 사용
+        - 이미 캐시에 있는 키(L2 포함)는 건너뜀
+        - PNG 기록은 무손실 마스터로 사용하여 다른 형식/품질도 로컬 변환으로 제공
+
+        Returns:
+            복원 결과 (status, restored, expired, missing, skipped, elapsed_ms)
+        """
+        started = time.perf_counter()
+        counts = {"restored": 0, "expired": 0, "missing": 0, "skipped": 0}
+        if self._cache is None or self.gallery is None:
+            return {"status": "done", **counts, "elapsed_ms": 0.0}
+
+        ttl = self._cache.get_stats()["ttl_seconds"]
+        now = time.time()
+        latest: Dict[str, Tuple[float, ImageMetadata]] = {}
+        for metadata in self.gallery.all_images():
+            try:
+                key = self._warmup_key(metadata.generation_params)
+                created_at = datetime.fromisoformat(metadata.created_at).timestamp()
+            except (KeyError, TypeError, ValueError):
+                key = None
+            if key is None:
+                counts["skipped"] += 1
+            elif now - created_at >= ttl:
+                counts["expired"] += 1
+            elif key not in latest or latest[key][0] < created_at:
+                latest[key] = (created_at, metadata)
+
+        # 오래된 기록부터 저장하여 최근 기록이 LRU 뒤쪽(최근 사용)에 오도록 함
+        for key, (created_at, metadata) in sorted(
+            latest.items(), key=lambda item: item[1][0]
+        ):
+            if not self._metadata_file_exists(metadata):
+                counts["missing"] += 1
+            elif self._restore_cached(key, metadata, created_at):
+                counts["restored"] += 1
+            else:
+                counts["skipped"] += 1
+
+        self._warmup = {
+            "status": "done",
+            **counts,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        logging.info(
+            f"캐시 예열 완료: {counts['restored']}개 복원 "
+            f"(만료 {counts['expired']}, 파일 없음 {counts['missing']}, "
+            f"건너뜀 {counts['skipped']})"
+        )
+        return dict(self._warmup)
+
+    def _warmup_key(self, params: Dict[str, Any]) -> Optional[str]:
+        """
+        갤러리 기록의 생성 파라미터로 캐시 키 재생성
+
+        mode가 없는 기록과 현재와 다른 모델/스타일 정의로 생성된 기록은 None
+        (모델이 기록되지 않은 이전 기록은 기본 모델, 스타일 정의 해시가 없으면
+        현재 정의로 생성된 것으로 간주)
+        """
+        model = params.get("model", IMAGEN_MODEL)
+        style_version = params.get("style_version") or self._style_version(
+            params["style"]
+        )
+        if model != self.model or style_version != self._style_version(params["style"]):
+            return None
+        namespace = {"model": model, "style_version": style_version}
+        variant = int(params.get("variant", 0))
+        if params.get("mode") == "basic":
+            return generate_cache_key(
+                params["prompt"],
+                params["style"],
+                params["aspect_ratio"],
+                variant=variant,
+                **namespace,
+            )
+        if params.get("mode") == "advanced":
+            return generate_cache_key_advanced(
+                prompt=params["prompt"],
+                style=params["style"],
+                aspect_ratio=params["aspect_ratio"],
+                width=params.get("width"),
+                height=params.get("height"),
+                negative_prompt=params.get("negative_prompt"),
+                style_intensity=params.get("style_intensity", "normal"),
+                enhance_prompt=params.get("enhance_prompt", True),
+                variant=variant,
+                **namespace,
+            )
+        return None
+
+    def _style_version(self, style_name: str) -> str:
+        """스타일 정의 해시 (없는 스타일은 기본 스타일, _compose_prompt()와 같음)"""
+        version = self._style_versions.get(style_name)
+        if version is None:
+            version = self._style_versions.get(self.default_style, "none")
+        return version
+
+    def _cache_tags(self, style_name: str) -> List[str]:
+        """캐시 항목 태그 (모델, 스타일)"""
+        return [cache_tag("model", self.model), cache_tag("style", style_name)]
+
+    def _metadata_file_exists(self, metadata: ImageMetadata) -> bool:
+        """갤러리 기록의 이미지 파일이 아직 있는지 확인"""
+        if metadata.content_hash:
+            return self.blob_store.exists(metadata.content_hash)
+        return Path(metadata.filepath).exists()
+
+    def _restore_cached(
+        self, cache_key: str, metadata: ImageMetadata, created_at: float
+    ) -> bool:
+        """
+        갤러리 기록 하나를 캐시 항목으로 저장 (참조 보유 후 저장)
+
+        Returns:
+            저장 여부 (이미 캐시에 있으면 False)
+        """
+        assert self._cache is not None
+        params = metadata.generation_params
+        path = (
+            self.blob_store.path(metadata.content_hash)
+            if metadata.content_hash
+            else None
+        ) or Path(metadata.filepath)
+        width, _, height = metadata.resolution.partition("x")
+        quality = int(params.get("quality", 95))
+        rendition = {
+            "local_path": str(path.absolute()),
+            "url": str(path.absolute()),
+            "filename": metadata.filename,
+            "content_hash": metadata.content_hash,
+            "format": metadata.format,
+            "quality": quality,
+            "width": int(width) if width.isdigit() else None,
+            "height": int(height) if height.isdigit() else None,
+            "encoding": "restored",
+            "status": f"Image restored from gallery record {metadata.id}.",
+        }
+        key = rendition_key(metadata.format, quality)
+        cached: Dict[str, Any] = {
+            "success": True,
+            "prompt": metadata.prompt,
+            **rendition,
+            "renditions": {key: rendition},
+            "served_as": [self._output_variant(metadata.format, quality)],
+        }
+        if params.get("mode") == "advanced":
+            cached["negative_prompt"] = params.get("negative_prompt")
+
+        if metadata.content_hash:
+            # 이미 캐시된 키는 그 항목의 참조를 덮어쓰지 않도록 건너뜀
+            if self.blob_store.holders(f"cache:{cache_key}"):
+                return False
+            # PNG 기록은 무손실이므로 마스터로 사용 (다른 형식은 MISS 후 새로 생성)
+            if key == "png":
+                cached["master_hash"] = metadata.content_hash
+                self.blob_store.acquire(metadata.content_hash, f"cache:{cache_key}")
+            self.blob_store.acquire(metadata.content_hash, f"cache:{cache_key}:{key}")
+
+        return self._cache.add(
+            cache_key, cached, created_at, self._cache_tags(params["style"])
+        )
+
     def generate(
         self,
         prompt: str,
@@ -59,6 +614,7 @@ class ImageGenerator:
         aspect_ratio: str = "16:9",
         format: str = "png",
         quality: int = 95,
+        variants: int = 1,
     ) -> Dict[str, Any]:
         """
         Generates an image based on prompt and style using Google Imagen 3 via SDK.
@@ -69,146 +625,1233 @@ class ImageGenerator:
             aspect_ratio: 이미지 비율 (기본값: "16:9")
             format: 출력 형식 (png, jpeg, webp) - 기본값: "png"
             quality: 이미지 품질 1-100 (JPEG/WebP용) - 기본값: 95
+            variants: 한 번의 API 호출로 생성할 후보 이미지 수 (1-4) - 기본값: 1
 
         Returns:
-            생성 결과 딕셔너리
+            생성 결과 딕셔너리 (variants > 1이면 "variants" 목록 포함,
+            "timings"에 단계별 소요 시간 포함)
 
         캐시가 활성화된 경우:
         - 동일한 prompt + style + aspect_ratio + format + quality 조합에 대해 캐시된 결과 반환
-        - 캐시 미스 시 API 호출 후 결과 캐싱
+        - 캐시 미스 시 API 호출 후 결과 캐싱 (변형 이미지는 각각 개별 캐싱)
         """
-        # 캐시 활성화 시 캐시 조회
-        effective_style = style_name or self.default_style
-        if self._cache_enabled and self._cache:
-            cache_key = generate_cache_key(
-                prompt, effective_style, aspect_ratio, format, quality
-            )
-            cached_result = self._cache.get(cache_key)
-            if cached_result:
-                logging.info(f"캐시 HIT: {cache_key[:16]}...")
-                # 캐시된 결과에 캐시 히트 표시 추가
-                cached_result = cached_result.copy()
-                cached_result["cached"] = True
-                return cached_result
-
-        # 캐시 미스 또는 캐시 비활성화 - API 호출
-        result = self._generate_uncached(
-            prompt, style_name, aspect_ratio, format, quality
-        )
-
-        # 성공한 결과만 캐싱
-        if self._cache_enabled and self._cache and result.get("success"):
-            cache_key = generate_cache_key(
-                prompt, effective_style, aspect_ratio, format, quality
-            )
-            self._cache.set(cache_key, result)
-            logging.info(f"캐시 저장: {cache_key[:16]}...")
-
-        return result
+        request = self._prepare_basic(
+            prompt, style_name, aspect_ratio, format, quality, variants
+        )
+        result = self._generate_slots(
+            request, lambda count: self._execute(request, count)
+        )
+        return self._finish(request, result)
 
-    def _generate_uncached(
+    async def agenerate(
         self,
         prompt: str,
         style_name: Optional[str] = None,
         aspect_ratio: str = "16:9",
         format: str = "png",
         quality: int = 95,
+        variants: int = 1,
     ) -> Dict[str, Any]:
         """
-        캐시 없이 직접 API를 호출하여 이미지 생성
+        generate()의 비동기 버전
+
+        genai 비동기 클라이언트(client.aio)로 API를 호출하고,
+        디코딩/인코딩은 워커 스레드에서 수행하여 이벤트 루프를 막지 않습니다.
 
         Args:
             prompt: 이미지 생성 프롬프트
-            style_name: 스타일 이름
-            aspect_ratio: 이미지 비율
-            format: 출력 형식 (png, jpeg, webp)
-            quality: 이미지 품질 1-100
+            style_name: 스타일 이름 (None인 경우 기본 스타일 사용)
+            aspect_ratio: 이미지 비율 (기본값: "16:9")
+            format: 출력 형식 (png, jpeg, webp) - 기본값: "png"
+            quality: 이미지 품질 1-100 (JPEG/WebP용) - 기본값: 95
+            variants: 한 번의 API 호출로 생성할 후보 이미지 수 (1-4) - 기본값: 1
 
         Returns:
             생성 결과 딕셔너리
         """
-        if not self.client:
-            return {
-                "success": False,
-                "error": "Google GenAI Client is not initialized (Check GOOGLE_API_KEY).",
+        request = self._prepare_basic(
+            prompt, style_name, aspect_ratio, format, quality, variants
+        )
+        result = await self._agenerate_slots(
+            request, lambda count: self._aexecute(request, count)
+        )
+        return self._finish(request, result)
+
+    def _prepare_basic(
+        self,
+        prompt: str,
+        style_name: Optional[str],
+        aspect_ratio: str,
+        format: str,
+        quality: int,
+        variants: int = 1,
+    ) -> GenerationRequest:
+        """
+        기본 생성 요청 전처리 (변형별 캐시 키, 갤러리에 기록할 생성 파라미터)
+
+        캐시 키는 캐시 비활성화 시에도 요청 병합 키로 사용됩니다.
+
+        Returns:
+            파이프라인에 전달할 GenerationRequest
+        """
+        request = GenerationRequest(
+            mode="basic",
+            prompt=prompt,
+            style_name=style_name or self.default_style,
+            aspect_ratio=aspect_ratio,
+            format=format,
+            quality=quality,
+        )
+        request.source_prompt = prompt
+        namespace = {
+            "model": self.model,
+            "style_version": self._style_version(request.style_name),
+        }
+        with stage_timer(request.timings, "key"):
+            request.cache_keys = [
+                generate_cache_key(
+                    prompt, request.style_name, aspect_ratio, variant=i, **namespace
+                )
+                for i in range(self._clamp_variants(variants))
+            ]
+            request.scope_keys = [
+                generate_cache_key(
+                    "", request.style_name, aspect_ratio, variant=i, **namespace
+                )
+                for i in range(len(request.cache_keys))
+            ]
+        request.cache_tags = self._cache_tags(request.style_name)
+        request.generation_params = {
+            "mode": "basic",
+            "prompt": prompt,
+            "style": request.style_name,
+            "aspect_ratio": aspect_ratio,
+            "format": format,
+            "quality": quality,
+            **namespace,
+        }
+        return request
+
+    @staticmethod
+    def _clamp_variants(variants: int) -> int:
+        """변형 수를 1-MAX_VARIANTS 범위로 제한"""
+        return max(1, min(int(variants or 1), MAX_VARIANTS))
+
+    def _get_cached(
+        self, cache_key: str, request: GenerationRequest
+    ) -> Optional[Dict[str, Any]]:
+        """
+        캐시 조회
+
+        캐시 항목에 요청 형식/품질의 출력본이 없으면 무손실 마스터에서
+        로컬로 변환하여 추가합니다 (API 호출 생략).
+
+        api_calls_saved는 캐시 항목이 처음 제공하는 형식/품질 조합마다 1씩
+        증가합니다. 형식/품질이 캐시 키에 포함되던 이전 방식이라면 그 요청은
+        MISS로 API를 호출했을 것이기 때문입니다 (served_as에 기록).
+
+        Args:
+            cache_key: 캐시 키
+            request: 출력 형식/품질/크기를 담은 생성 요청
+
+        Returns:
+            cached=True 표시가 추가된 결과 사본 또는 None
+        """
+        if not self._cache:
+            return None
+
+        cached_result = self._cache.get(cache_key)
+        if not cached_result:
+            return None
+
+        renditions = cached_result.get("renditions")
+        if renditions is not None:
+            key = rendition_key(request.format, request.quality)
+            rendition = renditions.get(key)
+            changed = False
+            if rendition is None or not Path(rendition["local_path"]).exists():
+                if not cached_result.get("master_hash"):
+                    # 마스터 없이 복원된 항목은 같은 형식/품질 요청에만 사용
+                    return None
+                rendition = self._derive_rendition(
+                    cache_key, request, cached_result, key
+                )
+                if rendition is None:
+                    return None
+                cached_result = {
+                    **cached_result,
+                    "renditions": {**renditions, key: rendition},
+                }
+                changed = True
+
+            served = cached_result.get("served_as") or [
+                self._output_variant(cached_result["format"], cached_result["quality"])
+            ]
+            variant = self._output_variant(request.format, request.quality)
+            if variant not in served:
+                with self._stats_lock:
+                    self._api_calls_saved += 1
+                cached_result = {**cached_result, "served_as": [*served, variant]}
+                changed = True
+            if changed:
+                self._cache.update(cache_key, cached_result)
+
+            cached_result = {
+                **{
+                    k: v
+                    for k, v in cached_result.items()
+                    if k not in ("renditions", "served_as")
+                },
+                **rendition,
             }
 
-        # 1. Select Style
+        logging.info(f"캐시 HIT: {cache_key[:16]}...")
+        # 캐시된 결과에 캐시 히트 표시 추가 (ImageCache.get()이 매번 새 사본을
+        # 반환하므로 다시 복사하지 않음)
+        cached_result["cached"] = True
+        return cached_result
+
+    def _lookup_slot(
+        self, slot: int, request: GenerationRequest
+    ) -> Optional[Dict[str, Any]]:
+        """
+        변형 슬롯의 캐시 조회 (정확한 키 MISS 시 유사 프롬프트 검색)
+
+        유사 프롬프트 색인이 활성화되어 있으면 프롬프트 외 생성 입력이 같고
+        프롬프트 추정 유사도가 임계값 이상인 캐시 항목을 반환합니다.
+        근사 HIT 결과에는 approximate=True, similarity, matched_prompt가 추가됩니다.
+
+        Args:
+            slot: 변형 슬롯 번호
+            request: 생성 요청
+
+        Returns:
+            캐시된 결과 사본 또는 None
+        """
+        cache_key = request.cache_keys[slot]
+        if self._trace_file is not None:
+            with self._trace_lock:
+                # close() 이후 조회는 기록하지 않음
+                if self._trace_file is not None:
+                    self._trace_file.write(cache_key + "\n")
+        cached_result = self._get_cached(cache_key, request)
+        if cached_result is not None:
+            self._maybe_refresh(slot, request)
+            return cached_result
+        if self._prompt_index is None:
+            return None
+
+        match = self._prompt_index.query(
+            request.scope_keys[slot], request.source_prompt
+        )
+        if match is None or match[0] == cache_key:
+            return None
+        matched_key, similarity, matched_prompt = match
+        cached_result = self._get_cached(matched_key, request)
+        if cached_result is None:
+            return None
+
+        cached_result["approximate"] = True
+        cached_result["similarity"] = round(similarity, 3)
+        cached_result["matched_prompt"] = matched_prompt
+        with self._stats_lock:
+            self._approximate_hits += 1
+        logging.info(
+            f"근사 캐시 HIT: {cache_key[:16]}... -> {matched_key[:16]}... "
+            f"(similarity={similarity:.3f})"
+        )
+        return cached_result
+
+    def _get_negative(
+        self, request: GenerationRequest, missing: List[int]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        MISS 슬롯이 모두 최근 결정적으로 실패한 요청이면 캐시된 실패 결과 반환
+
+        Returns:
+            cached=True, negative_cached=True 표시가 추가된 실패 결과 또는 None
+        """
+        if self._negative_cache is None:
+            return None
+        failures = [self._negative_cache.get(request.cache_keys[i]) for i in missing]
+        if any(failure is None for failure in failures):
+            return None
+        with self._stats_lock:
+            self._negative_hits += 1
+        logging.info(f"실패 캐시 HIT: {request.cache_keys[missing[0]][:16]}...")
+        return {**failures[0], "cached": True, "negative_cached": True}
+
+    def _maybe_refresh(self, slot: int, request: GenerationRequest) -> None:
+        """
+        만료가 가까운 HIT 항목을 확률적으로 백그라운드에서 다시 생성
+        (stale-while-revalidate, 요청에는 캐시된 결과를 바로 반환)
+
+        남은 유효 시간이 최근 생성 소요 시간 × beta × -ln(U) (U ~ Uniform(0, 1])
+        이하이면 갱신합니다 (probabilistic early expiration). 만료에 가까울수록
+        갱신 확률이 높아지므로 같은 시각에 저장된 항목들이 동시에 갱신되지 않습니다.
+        """
+        if self._refresh_beta <= 0 or self._cache is None:
+            return
+        key = request.cache_keys[slot]
+        remaining = self._cache.expires_in(key)
+        if remaining is None:
+            return
+        threshold = (
+            self._generation_seconds
+            * self._refresh_beta
+            * -math.log(1.0 - random.random())
+        )
+        if remaining > threshold:
+            return
+        with self._stats_lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+            if self._refresh_pool is None:
+                self._refresh_pool = ThreadPoolExecutor(
+                    max_workers=2, thread_name_prefix="cache-refresh"
+                )
+            pool = self._refresh_pool
+        logging.info(f"캐시 조기 갱신 시작: {key[:16]}... ({remaining:.1f}초 남음)")
+        pool.submit(self._refresh_slot, slot, request)
+
+    def _refresh_slot(self, slot: int, request: GenerationRequest) -> None:
+        """
+        슬롯 하나를 배치 우선순위로 다시 생성하여 캐시 항목 교체 (갱신 스레드)
+
+        같은 요청의 이미지가 이미 갤러리에 있으므로 갤러리에는 등록하지 않습니다.
+        """
+        key = request.cache_keys[slot]
+        try:
+            result = self._execute(request, 1, PRIORITY_BATCH)
+            self._accept_fresh(request, [slot], result, register=False)
+            variants = self._split_variants(result)
+            if variants:
+                # 교체된 항목의 이전 출력본 참조 해제 (마스터 참조는 새 파일로 교체됨)
+                variant = variants[0]
+                current = rendition_key(variant["format"], variant["quality"])
+                self.blob_store.retain(
+                    f"cache:{key}", (f"cache:{key}", f"cache:{key}:{current}")
+                )
+                with self._stats_lock:
+                    self._background_refreshes += 1
+        except Exception as e:
+            logging.error(f"캐시 조기 갱신 실패: {e}")
+        finally:
+            with self._stats_lock:
+                self._refreshing.discard(key)
+
+    def _derive_rendition(
+        self,
+        cache_key: str,
+        request: GenerationRequest,
+        cached_result: Dict[str, Any],
+        key: str,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        캐시된 무손실 마스터를 요청 형식/품질/크기로 변환 (캐시 항목 갱신은 호출자)
+
+        Returns:
+            출력본 딕셔너리 또는 None (마스터 파일이 없어 캐시 항목을 삭제한 경우)
+        """
+        assert self._cache is not None
+        master_path = self.blob_store.path(cached_result["master_hash"])
+        if master_path is None or not master_path.exists():
+            self._cache.invalidate(cache_key)
+            return None
+
+        rendition, _ = self._render_stored(request, master_path.read_bytes())
+        rendition["status"] = (
+            f"{request.label} derived from cached master "
+            f"and saved as {request.format.upper()}."
+        )
+        rendition["derived"] = True
+        self.blob_store.acquire(rendition["content_hash"], f"cache:{cache_key}:{key}")
+        with self._stats_lock:
+            self._derived_renders += 1
+        logging.info(f"캐시 마스터에서 변환: {cache_key[:16]}... ({key})")
+        return rendition
+
+    def _store_cached(
+        self, cache_key: str, result: Dict[str, Any], tags: Iterable[str] = ()
+    ) -> None:
+        """
+        성공한 결과만 캐싱
+
+        무손실 마스터가 있으면 생성된 출력본을 형식/품질별 출력본 목록에
+        넣어 저장하고, 마스터와 출력본 파일의 참조를 보유합니다.
+
+        Args:
+            cache_key: 캐시 키
+            result: 생성 결과
+            tags: 캐시 항목 태그 (모델, 스타일)
+        """
+        if not self._cache or not result.get("success"):
+            return
+        # 시도별 기록 등 요청 단위 진단 정보는 캐싱하지 않음
+        cached = {k: v for k, v in result.items() if k not in REQUEST_ONLY_KEYS}
+        master_hash = result.get("master_hash")
+        key = rendition_key(result["format"], result["quality"])
+        if master_hash:
+            cached["renditions"] = {
+                key: {k: result[k] for k in RENDITION_KEYS if k in result}
+            }
+            cached["served_as"] = [
+                self._output_variant(result["format"], result["quality"])
+            ]
+        # 저장 중 예산 초과로 제거되는 항목이 같은 파일을 공유할 수 있으므로
+        # 참조를 먼저 보유한 뒤 저장
+        if master_hash:
+            self.blob_store.acquire(master_hash, f"cache:{cache_key}")
+            self.blob_store.acquire(result["content_hash"], f"cache:{cache_key}:{key}")
+        elif result.get("content_hash"):
+            self.blob_store.acquire(result["content_hash"], f"cache:{cache_key}")
+        self._cache.set(cache_key, cached, tags)
+        logging.info(f"캐시 저장: {cache_key[:16]}...")
+
+    @staticmethod
+    def _output_variant(format: str, quality: int) -> str:
+        """요청 형식/품질 조합 이름 (api_calls_saved 집계용, PNG도 품질 포함)"""
+        return f"{rendition_key(format, quality).split(':')[0]}:q{quality}"
+
+    def _flight_key(self, request: GenerationRequest, missing: List[int]) -> str:
+        """
+        요청 병합 키 (MISS 슬롯의 캐시 키, _lease_key()와 같음)
+
+        형식/품질이 다른 요청도 병합하고, leader와 출력본이 다른 요청은 캐시된
+        마스터에서 변환합니다 (_fill_slots()). 캐시가 비활성화되어 마스터가
+        없으면 출력본까지 같은 요청만 병합합니다.
+        """
+        keys = self._lease_key(request, missing)
+        if self._cache is None:
+            return f"{keys}|{rendition_key(request.format, request.quality)}"
+        return keys
+
+    def _generate_slots(
+        self, request: GenerationRequest, fn: UncachedFn
+    ) -> Dict[str, Any]:
+        """
+        변형 슬롯 단위로 캐시를 조회하고 MISS 슬롯만 한 번의 API 호출로 생성
+
+        - 슬롯마다 개별 캐시 키를 가지므로 이전에 생성된 변형은 재사용됨
+        - MISS 슬롯 생성은 single-flight로 실행되어 진행 중인 동일 요청에 합류
+        - 새로 생성된 결과는 leader만 캐싱하고 갤러리에 등록
+
+        Args:
+            request: 전처리된 생성 요청 (슬롯별 캐시 키와 생성 파라미터 포함)
+            fn: MISS 슬롯 수를 받아 캐시 없이 생성하는 함수
+
+        Returns:
+            생성 결과 딕셔너리
+        """
+        keys = request.cache_keys
+        with stage_timer(request.timings, "cache"):
+            slots = [self._lookup_slot(slot, request) for slot in range(len(keys))]
+        missing = [i for i, result in enumerate(slots) if result is None]
+        fresh = self._get_negative(request, missing) if missing else None
+
+        if missing and fresh is None:
+            flight_key = self._flight_key(request, missing)
+
+            def run() -> Dict[str, Any]:
+                token, shared = self._claim_process_flight(request, missing)
+                if shared is not None:
+                    return shared
+                try:
+                    result = fn(len(missing))
+                    with stage_timer(request.timings, "register"):
+                        self._accept_fresh(request, missing, result)
+                finally:
+                    self._release_process_flight(request, missing, token)
+                return result
+
+            fresh, coalesced = self._singleflight.do(flight_key, run)
+            self._fill_slots(request, slots, missing, fresh, flight_key, coalesced)
+
+        return self._combine_slots(slots, fresh)
+
+    async def _agenerate_slots(
+        self, request: GenerationRequest, coro_fn: AsyncUncachedFn
+    ) -> Dict[str, Any]:
+        """
+        _generate_slots()의 비동기 버전
+
+        캐시 조회(L2 조회, 마스터 변환 포함)와 캐싱/갤러리 등록은 워커 스레드에서
+        수행합니다.
+        """
+        keys = request.cache_keys
+        with stage_timer(request.timings, "cache"):
+            slots = await asyncio.to_thread(
+                lambda: [self._lookup_slot(slot, request) for slot in range(len(keys))]
+            )
+        missing = [i for i, result in enumerate(slots) if result is None]
+        fresh = self._get_negative(request, missing) if missing else None
+
+        if missing and fresh is None:
+            flight_key = self._flight_key(request, missing)
+
+            async def run() -> Dict[str, Any]:
+                token, shared = await self._aclaim_process_flight(request, missing)
+                if shared is not None:
+                    return shared
+                try:
+                    result = await coro_fn(len(missing))
+                    with stage_timer(request.timings, "register"):
+                        await asyncio.to_thread(
+                            self._accept_fresh, request, missing, result
+                        )
+                finally:
+                    await asyncio.to_thread(
+                        self._release_process_flight, request, missing, token
+                    )
+                return result
+
+            fresh, coalesced = await self._singleflight.ado(flight_key, run)
+            await asyncio.to_thread(
+                self._fill_slots, request, slots, missing, fresh, flight_key, coalesced
+            )
+
+        return self._combine_slots(slots, fresh)
+
+    @staticmethod
+    def _lease_key(request: GenerationRequest, missing: List[int]) -> str:
+        """
+        프로세스 간 병합 키 (MISS 슬롯의 캐시 키)
+
+        출력본은 캐시된 마스터에서 변환할 수 있으므로 형식/품질이 달라도
+        같은 임대를 기다립니다.
+        """
+        return "|".join(request.cache_keys[i] for i in missing)
+
+    def _claim_process_flight(
+        self, request: GenerationRequest, missing: List[int]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        다른 서버 프로세스와 MISS 슬롯 생성을 조율
+
+        다른 프로세스가 같은 키를 생성 중이면 끝날 때까지 기다린 뒤 공유 캐시에서
+        결과를 읽고, 결과가 없으면(실패 등) 임대를 얻어 직접 생성합니다.
+
+        Returns:
+            (임대 토큰, None): 이 프로세스가 생성 (공유 캐시 미사용 시 토큰도 None)
+            (None, 결과): 다른 프로세스가 생성한 캐시 결과
+        """
+        if self._process_flight is None:
+            return None, None
+        lease_key = self._lease_key(request, missing)
+        while True:
+            token = self._process_flight.try_acquire(lease_key)
+            if token is not None:
+                return token, None
+            logging.info(f"다른 프로세스의 생성 대기: {lease_key[:16]}...")
+            self._process_flight.wait(lease_key)
+            shared = self._shared_result(request, missing)
+            if shared is not None:
+                return None, shared
+
+    async def _aclaim_process_flight(
+        self, request: GenerationRequest, missing: List[int]
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """_claim_process_flight()의 비동기 버전"""
+        if self._process_flight is None:
+            return None, None
+        lease_key = self._lease_key(request, missing)
+        while True:
+            token = await asyncio.to_thread(self._process_flight.try_acquire, lease_key)
+            if token is not None:
+                return token, None
+            logging.info(f"다른 프로세스의 생성 대기: {lease_key[:16]}...")
+            await self._process_flight.await_release(lease_key)
+            shared = await asyncio.to_thread(self._shared_result, request, missing)
+            if shared is not None:
+                return None, shared
+
+    def _release_process_flight(
+        self, request: GenerationRequest, missing: List[int], token: Optional[str]
+    ) -> None:
+        """생성 결과를 공유 캐시에 저장한 뒤 임대 해제"""
+        if self._process_flight is not None and token is not None:
+            self._process_flight.release(self._lease_key(request, missing), token)
+
+    def _shared_result(
+        self, request: GenerationRequest, missing: List[int]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        다른 프로세스가 생성한 MISS 슬롯 결과를 공유 캐시에서 조회
+
+        Returns:
+            생성 결과 형식의 딕셔너리 (슬롯이 여럿이면 "variants" 포함) 또는
+            None (하나라도 없으면)
+        """
+        results = [self._get_cached(request.cache_keys[i], request) for i in missing]
+        if any(result is None for result in results):
+            return None
+        with self._stats_lock:
+            self._cross_process_hits += 1
+        if len(results) == 1:
+            return results[0]
+        return {**results[0], "variants": results}
+
+    @staticmethod
+    def _split_variants(result: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """생성 결과를 변형별 결과 목록으로 분리 (실패 시 빈 목록)"""
+        if not result.get("success"):
+            return []
+        return result.get("variants") or [result]
+
+    def _accept_fresh(
+        self,
+        request: GenerationRequest,
+        missing: List[int],
+        result: Dict[str, Any],
+        register: bool = True,
+    ) -> None:
+        """
+        새로 생성된 변형을 슬롯 키로 캐싱하고 갤러리에 등록
+
+        결정적 실패 결과는 실패 캐시에 슬롯 키로 저장합니다.
+
+        Args:
+            register: 갤러리에 등록할지 여부 (백그라운드 갱신은 False)
+        """
+        if not result.get("success"):
+            if result.get("deterministic") and self._negative_cache is not None:
+                failure = {
+                    k: v for k, v in result.items() if k not in REQUEST_ONLY_KEYS
+                }
+                for slot in missing:
+                    self._negative_cache.set(
+                        request.cache_keys[slot], failure, request.cache_tags
+                    )
+            return
+        api_ms = result.get("timings", {}).get("api_ms")
+        if api_ms:
+            with self._stats_lock:
+                self._generation_seconds = (
+                    0.8 * self._generation_seconds + 0.2 * api_ms / 1000
+                )
+        for slot, variant in zip(missing, self._split_variants(result)):
+            self._store_cached(request.cache_keys[slot], variant, request.cache_tags)
+            if self._prompt_index is not None and request.scope_keys:
+                self._prompt_index.add(
+                    request.scope_keys[slot],
+                    request.source_prompt,
+                    request.cache_keys[slot],
+                )
+            if register:
+                self._register_generated(
+                    variant, {**request.generation_params, "variant": slot}
+                )
+
+    def _fill_slots(
+        self,
+        request: GenerationRequest,
+        slots: List[Optional[Dict[str, Any]]],
+        missing: List[int],
+        fresh: Dict[str, Any],
+        flight_key: str,
+        coalesced: bool,
+    ) -> None:
+        """
+        새로 생성된 변형으로 비어 있는 슬롯을 채움
+
+        병합된 요청의 형식/품질이 leader와 다르면 leader가 캐싱한 마스터에서
+        요청 출력본을 변환합니다 (마스터가 없으면 leader 결과 사용).
+        """
+        if coalesced:
+            logging.info(f"요청 병합: {flight_key[:16]}...")
+        wanted = rendition_key(request.format, request.quality)
+        for slot, variant in zip(missing, self._split_variants(fresh)):
+            if coalesced:
+                derived = None
+                if rendition_key(variant["format"], variant["quality"]) != wanted:
+                    derived = self._get_cached(request.cache_keys[slot], request)
+                # 병합된 요청의 결과 사본에 coalesced 표시 추가
+                variant = dict(derived or variant)
+                variant.pop("cached", None)
+                variant["coalesced"] = True
+            slots[slot] = variant
+
+    def _combine_slots(
+        self,
+        slots: List[Optional[Dict[str, Any]]],
+        fresh: Optional[Dict[str, Any]],
+    ) -> Dict[str, Any]:
+        """
+        슬롯 결과를 하나의 응답으로 결합
+
+        단일 슬롯은 그 결과를 그대로 반환하고, 여러 슬롯은 첫 번째 변형을
+        대표 결과로 하여 "variants" 목록을 추가합니다.
+        """
+        filled = [(i, result) for i, result in enumerate(slots) if result is not None]
+        if not filled:
+            return fresh or {"success": False, "error": "No images returned."}
+
+        if len(slots) == 1:
+            return filled[0][1]
+
+        combined = dict(filled[0][1])
+        combined["variants"] = [{**result, "variant": i} for i, result in filled]
+        combined["variant_count"] = len(filled)
+        combined["cached_variants"] = sum(
+            1 for _, result in filled if result.get("cached")
+        )
+        # 새로 생성한 경우 요청 단위 진단 정보(시도별 기록 등)를 대표 결과에 포함
+        for key in REQUEST_ONLY_KEYS:
+            if fresh and key in fresh:
+                combined[key] = fresh[key]
+        return combined
+
+    @staticmethod
+    def _finish(request: GenerationRequest, result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        파이프라인 결과에 단계별 소요 시간을 기록
+
+        전처리/캐시 조회/등록 단계(요청)와 API 호출/후처리 단계(결과)를
+        PIPELINE_STAGES 순서로 합치고 전체 소요 시간(total_ms)을 추가합니다.
+        병합된 요청의 결과는 leader와 공유되므로 사본에 기록합니다.
+        """
+        result = dict(result)
+        measured = {**result.get("timings", {}), **request.timings}
+        timings = {
+            f"{stage}_ms": measured[f"{stage}_ms"]
+            for stage in PIPELINE_STAGES
+            if f"{stage}_ms" in measured
+        }
+        timings["total_ms"] = round((time.perf_counter() - request.started) * 1000, 2)
+        result["timings"] = timings
+        return result
+
+    def _register_generated(
+        self, result: Dict[str, Any], params: Dict[str, Any]
+    ) -> None:
+        """
+        새로 생성된 이미지를 갤러리에 등록
+
+        등록 실패는 로그만 남기고 생성 결과에는 영향을 주지 않습니다.
+
+        Args:
+            result: 단일 이미지 생성 결과
+            params: 캐시 키를 다시 만들 수 있는 생성 파라미터
+        """
+        if self.gallery is None or not result.get("success"):
+            return
+
+        try:
+            path = Path(result["local_path"])
+            # 저장소 파일 이름은 내용 해시이므로 생성 시 이름으로 ID 부여
+            filename = result.get("filename", path.name)
+            metadata = ImageMetadata(
+                id=f"img_{Path(filename).stem}",
+                filename=filename,
+                filepath=str(path),
+                thumbnail_path=None,
+                created_at=datetime.now().isoformat(),
+                prompt=result.get("prompt", params.get("prompt", "")),
+                style=params.get("style", ""),
+                aspect_ratio=params.get("aspect_ratio", ""),
+                resolution=f"{result.get('width')}x{result.get('height')}",
+                format=result.get("format", params.get("format", "")),
+                size_bytes=path.stat().st_size,
+                generation_params=params,
+                content_hash=result.get("content_hash"),
+            )
+            self.gallery.register_image(metadata)
+        except Exception as e:
+            logging.error(f"갤러리 등록 실패: {e}")
+
+    def _compose_prompt(
+        self, prompt: str, style_name: Optional[str], aspect_ratio: str
+    ) -> str:
+        """스타일 키워드와 비율을 프롬프트에 결합"""
         style = self.styles.get(style_name, self.styles.get(self.default_style))
         style_keywords = style["keywords"] if style else ""
 
-        # 2. Combine Prompt
         final_prompt = f"{prompt}. Style details: {style_keywords}"
         if aspect_ratio:
             final_prompt += f", Aspect Ratio: {aspect_ratio}"
+        return final_prompt
+
+    def _build_config(
+        self,
+        aspect_ratio: str,
+        number_of_images: int = 1,
+        format: str = "png",
+        quality: int = 95,
+    ) -> Any:
+        """
+        Imagen 요청 설정 생성 (지원하지 않는 비율은 16:9로 대체)
+
+        서버 인코딩이 활성화되어 있고 Imagen이 지원하는 형식이면 출력 MIME 타입과
+        압축 품질(JPEG)을 함께 요청하여 로컬 재인코딩을 생략할 수 있게 합니다.
+        캐시가 활성화되어 있으면 무손실 마스터를 보관하기 위해 항상 PNG를 요청하므로,
+        JPEG 서버 인코딩과 JPEG passthrough는 CACHE_ENABLED=false일 때만 적용됩니다.
+        """
+        if self._cache is not None:
+            format = "png"
+        options: Dict[str, Any] = {}
+        mime_type = SERVER_OUTPUT_MIME_TYPES.get(format.lower())
+        if self.server_encoding and mime_type:
+            options["output_mime_type"] = mime_type
+            if mime_type == "image/jpeg":
+                options["output_compression_quality"] = quality
+
+        return types.GenerateImagesConfig(
+            number_of_images=number_of_images,
+            aspect_ratio=aspect_ratio
+            if aspect_ratio in SUPPORTED_ASPECT_RATIOS
+            else "16:9",
+            **options,
+        )
+
+    def _call_imagen(
+        self, final_prompt: str, config: Any, priority: int
+    ) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        재시도/헤징 정책과 스케줄러를 거쳐 Imagen 호출
+
+        재시도와 헤지 요청도 각각 스케줄러 슬롯을 사용하므로 속도 제한과
+        AIMD 동시 실행 제한이 그대로 적용됩니다. 시도별 소요 시간과 헤지
+        지연은 슬롯을 얻은 뒤부터 측정하므로 대기열 대기 시간은 포함되지 않습니다.
+
+        Returns:
+            (API 응답, 시도별 기록)
+        """
+        return self.retry_policy.call(
+            lambda: self.client.models.generate_images(
+                model=self.model, prompt=final_prompt, config=config
+            ),
+            gate=lambda: self.scheduler.slot(priority),
+        )
+
+    async def _acall_imagen(
+        self, final_prompt: str, config: Any, priority: int
+    ) -> Tuple[Any, List[Dict[str, Any]]]:
+        """_call_imagen()의 비동기 버전"""
+        return await self.retry_policy.acall(
+            lambda: self.client.aio.models.generate_images(
+                model=self.model, prompt=final_prompt, config=config
+            ),
+            gate=lambda: self.scheduler.aslot(priority),
+        )
+
+    @staticmethod
+    def _failure(error: Exception) -> Dict[str, Any]:
+        """실패 결과 딕셔너리 (재시도 기록이 있으면 포함)"""
+        result: Dict[str, Any] = {"success": False, "error": str(error)}
+        if isinstance(error, RetryExhaustedError):
+            result["attempts"] = error.attempts
+        if is_deterministic_error(error):
+            # 같은 요청을 반복해도 실패하므로 짧은 TTL로 캐싱 (CACHE_NEGATIVE_TTL_SECONDS)
+            result["deterministic"] = True
+        return result
+
+    def _client_error(self) -> Dict[str, Any]:
+        return {
+            "success": False,
+            "error": "Google GenAI Client is not initialized (Check GOOGLE_API_KEY).",
+        }
+
+    @staticmethod
+    def _response_images(response: Any, count: int) -> List[bytes]:
+        """API 응답에서 최대 count개의 이미지 바이트 추출"""
+        if not response or not response.generated_images:
+            return []
+        return [
+            generated.image.image_bytes
+            for generated in response.generated_images[:count]
+        ]
+
+    @staticmethod
+    def _combine_saved(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """저장된 이미지 결과 목록을 하나의 결과로 결합"""
+        if len(results) == 1:
+            return results[0]
+        combined = dict(results[0])
+        combined["variants"] = results
+        return combined
+
+    def _save_all(
+        self, save_fn: Callable[[bytes], Dict[str, Any]], images: List[bytes]
+    ) -> Dict[str, Any]:
+        """여러 이미지를 스레드 풀에서 병렬로 디코딩/저장"""
+        if len(images) == 1:
+            return save_fn(images[0])
+        with ThreadPoolExecutor(max_workers=len(images)) as pool:
+            return self._combine_saved(list(pool.map(save_fn, images)))
+
+    async def _asave_all(
+        self, save_fn: Callable[[bytes], Dict[str, Any]], images: List[bytes]
+    ) -> Dict[str, Any]:
+        """_save_all()의 비동기 버전 (이미지마다 워커 스레드에서 처리)"""
+        results = await asyncio.gather(
+            *(asyncio.to_thread(save_fn, image_bytes) for image_bytes in images)
+        )
+        return self._combine_saved(list(results))
+
+    @staticmethod
+    def _sum_timings(result: Dict[str, Any]) -> Dict[str, float]:
+        """이미지별 후처리 소요 시간을 단계별로 합산 (변형이 여러 개인 경우)"""
+        totals: Dict[str, float] = {}
+        for image in result.get("variants") or [result]:
+            for key, ms in image.get("timings", {}).items():
+                totals[key] = round(totals.get(key, 0.0) + ms, 2)
+        return totals
+
+    def _start_generation(self, request: GenerationRequest, suffix: str = "") -> str:
+        """최종 프롬프트 구성 및 생성 시작 로그"""
+        final_prompt = self._compose_prompt(
+            request.prompt, request.style_name, request.aspect_ratio
+        )
+        if request.negative_prompt:
+            logging.info(f"네거티브 프롬프트 적용: {request.negative_prompt[:50]}...")
+        label = "advanced image" if request.advanced else "image"
+        logging.info(f"Generating {label}{suffix} with prompt: {final_prompt}")
+        return final_prompt
+
+    def _execute(
+        self,
+        request: GenerationRequest,
+        count: int = 1,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """
+        캐시 없이 직접 API를 호출하여 이미지 생성 (파이프라인 생성 단계)
+
+        API 호출 → 디코딩/리사이즈/인코딩 → 파일 저장 순서로 실행하고
+        각 단계의 소요 시간을 결과의 "timings"에 기록합니다.
+
+        Args:
+            request: 전처리된 생성 요청
+            count: 한 번의 API 호출로 요청할 이미지 수
+            priority: 스케줄러 우선순위 (PRIORITY_INTERACTIVE/PRIORITY_BATCH)
+
+        Returns:
+            생성 결과 딕셔너리 (count > 1이면 "variants" 목록 포함)
+        """
+        if not self.client:
+            return self._client_error()
 
-        logging.info(f"Generating image with prompt: {final_prompt}")
+        final_prompt = self._start_generation(request)
+        timings: Dict[str, float] = {}
 
         try:
-            # 3. Call Imagen 4
-            response = self.client.models.generate_images(
-                model="imagen-4.0-fast-generate-001",
-                prompt=final_prompt,
-                config=types.GenerateImagesConfig(
-                    number_of_images=1,
-                    aspect_ratio=aspect_ratio
-                    if aspect_ratio
-                    in [
-                        "1:1",
-                        "16:9",
-                        "9:16",
-                        "4:3",
-                        "3:4",
-                        # SPEC-IMG-003: 새로운 비율 지원
-                        "21:9",  # Ultra-Wide
-                        "2:3",  # Portrait SNS
-                        "3:2",  # Photo DSLR
-                        "5:4",  # Large Format
-                    ]
-                    else "16:9",
-                ),
+            config = self._build_config(
+                request.aspect_ratio, count, request.format, request.quality
             )
+            with stage_timer(timings, "api"):
+                response, attempts = self._call_imagen(final_prompt, config, priority)
+
+            images = self._response_images(response, count)
+            if not images:
+                # 안전 필터가 모든 이미지를 걸러낸 경우 (같은 프롬프트는 다시 걸러짐)
+                return {
+                    "success": False,
+                    "error": "No images returned.",
+                    "deterministic": True,
+                }
 
-            if response and response.generated_images:
-                image_bytes = response.generated_images[0].image.image_bytes
+            result = self._save_all(
+                lambda image_bytes: self._persist(request, image_bytes, final_prompt),
+                images,
+            )
+            result["attempts"] = attempts
+            result["timings"] = {**timings, **self._sum_timings(result)}
+            return result
 
-                # BytesIO에서 PIL 이미지로 변환
-                from io import BytesIO
+        except Exception as e:
+            logging.error(f"{request.label} generation failed: {e}")
+            return self._failure(e)
 
-                image = Image.open(BytesIO(image_bytes))
+    async def _aexecute(
+        self,
+        request: GenerationRequest,
+        count: int = 1,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> Dict[str, Any]:
+        """
+        _execute()의 비동기 버전
 
-                # Generate filename
-                from datetime import datetime
+        Returns:
+            생성 결과 딕셔너리
+        """
+        if not self.client:
+            return self._client_error()
 
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                safe_style = (style_name or "default").replace(" ", "_").lower()
-                extension = format if format != "jpg" else "jpeg"
-                filename = f"gen_{safe_style}_{timestamp}.{extension}"
-                output_path = self.output_dir / filename
+        final_prompt = self._start_generation(request, " (async)")
+        timings: Dict[str, float] = {}
 
-                # save_image() 사용하여 지정된 형식으로 저장
-                save_image(
-                    image, format=format, quality=quality, output_path=str(output_path)
-                )
-                logging.info(
-                    f"Image saved to {output_path} (format: {format}, quality: {quality})"
+        try:
+            config = self._build_config(
+                request.aspect_ratio, count, request.format, request.quality
+            )
+            with stage_timer(timings, "api"):
+                response, attempts = await self._acall_imagen(
+                    final_prompt, config, priority
                 )
 
+            images = self._response_images(response, count)
+            if not images:
+                # 안전 필터가 모든 이미지를 걸러낸 경우 (같은 프롬프트는 다시 걸러짐)
                 return {
-                    "success": True,
-                    "prompt": final_prompt,
-                    "local_path": str(output_path.absolute()),
-                    "url": str(output_path.absolute()),
-                    "format": format,
-                    "quality": quality,
-                    "status": f"Image generated with Imagen 4 and saved as {format.upper()}.",
+                    "success": False,
+                    "error": "No images returned.",
+                    "deterministic": True,
                 }
-            else:
-                return {"success": False, "error": "No images returned."}
+
+            # 디코딩/리사이즈/인코딩은 CPU 작업이므로 이벤트 루프 밖에서 수행
+            result = await self._asave_all(
+                lambda image_bytes: self._persist(request, image_bytes, final_prompt),
+                images,
+            )
+            result["attempts"] = attempts
+            result["timings"] = {**timings, **self._sum_timings(result)}
+            return result
 
         except Exception as e:
-            logging.error(f"Image generation failed: {e}")
-            return {"success": False, "error": str(e)}
+            logging.error(f"{request.label} generation failed: {e}")
+            return self._failure(e)
+
+    def _output_path(self, prefix: str, style_name: Optional[str], format: str) -> Path:
+        """출력 파일 경로 생성"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        safe_style = (style_name or "default").replace(" ", "_").lower()
+        extension = format if format != "jpg" else "jpeg"
+        # 같은 초에 여러 이미지가 저장되는 배치/동시 생성을 위해 고유 접미사 추가
+        suffix = uuid.uuid4().hex[:8]
+        filename = f"{prefix}_{safe_style}_{timestamp}_{suffix}.{extension}"
+        return self.output_dir / filename
+
+    def _render_stored(
+        self, request: GenerationRequest, image_bytes: bytes
+    ) -> Tuple[Dict[str, Any], Dict[str, float]]:
+        """
+        이미지를 디코딩하고 필요 시 리사이즈하여 요청 형식으로 저장한 뒤
+        내용 주소 저장소로 이동 (같은 내용의 이미지가 있으면 기존 파일 공유)
+
+        Returns:
+            (출력본 딕셔너리, 디코딩/리사이즈/인코딩/쓰기/저장소 이동 소요 시간)
+        """
+        prefix = "gen_adv" if request.advanced else "gen"
+        output_path = self._output_path(prefix, request.style_name, request.format)
+        format, quality = request.format, request.quality
+
+        # 요청 형식/크기 그대로 받은 경우 바로 저장하고, 그 외에는 후처리 단계
+        # (프로세스 풀 또는 현재 스레드)에서 디코딩, 해상도 조정, 인코딩 수행
+        rendered = self.postprocessor.render(
+            image_bytes,
+            str(output_path),
+            format,
+            quality,
+            request.width,
+            request.height,
+        )
+        timings = dict(rendered.timings)
+        with stage_timer(timings, "store"):
+            content_hash = self.blob_store.ingest(output_path)
+        stored_path = self.blob_store.path(content_hash).absolute()
+        logging.info(
+            f"{request.label} saved to {stored_path} (format: {format}, "
+            f"quality: {quality}, encoding: {rendered.encoding})"
+        )
+
+        rendition = {
+            "local_path": str(stored_path),
+            "url": str(stored_path),
+            "filename": output_path.name,
+            "content_hash": content_hash,
+            "format": format,
+            "quality": quality,
+            "width": rendered.width,
+            "height": rendered.height,
+            "encoding": rendered.encoding,
+        }
+        return rendition, timings
+
+    def _persist(
+        self, request: GenerationRequest, image_bytes: bytes, final_prompt: str
+    ) -> Dict[str, Any]:
+        """
+        API 응답 이미지를 요청 형식으로 저장
+
+        캐시가 활성화되어 있으면 API 응답을 무손실 마스터로 함께 보관하여
+        이후 다른 형식/품질 요청을 API 호출 없이 로컬 변환으로 처리합니다.
+
+        Returns:
+            생성 결과 딕셔너리 ("timings"에 후처리/저장 단계 소요 시간)
+        """
+        rendition, timings = self._render_stored(request, image_bytes)
+        result = {
+            "success": True,
+            "prompt": final_prompt,
+            **rendition,
+            "status": (
+                f"{request.label} generated with Imagen 4 "
+                f"and saved as {request.format.upper()}."
+            ),
+            "timings": timings,
+        }
+        if self._cache is not None:
+            with stage_timer(timings, "master"):
+                result["master_hash"] = self.blob_store.put(
+                    encode_lossless(image_bytes), ".png"
+                )
+        if request.advanced:
+            result["negative_prompt"] = request.negative_prompt
+        return result
+
+    async def agenerate_batch(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrent: Optional[int] = None,
+        default_style: Optional[str] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        여러 이미지를 병렬로 생성하고 완료되는 순서대로 결과를 반환 - SPEC-IMG-001
+
+        - 캐시 HIT 항목은 동시 실행 제한 없이 즉시 반환
+        - 캐시 MISS 항목은 Semaphore(max_concurrent)로 동시 API 호출 수 제한
+        - 개별 실패는 해당 항목의 실패 결과로 기록되고 나머지는 계속 진행
+
+        Args:
+            items: 생성 요청 목록. 각 항목은
+                {"prompt": str, "style": Optional[str], "aspect_ratio": str,
+                 "format": str, "quality": int} 형태 (prompt 외 선택)
+            max_concurrent: 동시 API 호출 최대 수 (None이면 BATCH_MAX_CONCURRENT,
+                BATCH_MAX_CONCURRENT보다 크면 BATCH_MAX_CONCURRENT로 제한)
+            default_style: 스타일이 지정되지 않은 항목에 적용할 스타일
+
+        Yields:
+            항목별 결과 딕셔너리 (index, success, prompt, style, local_path/error,
+            성공 시 단계별 소요 시간 timings)
+        """
+        limit = min(
+            max_concurrent or self.batch_max_concurrent, self.batch_max_concurrent
+        )
+        semaphore = asyncio.Semaphore(max(1, limit))
+
+        async def run_one(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+            prompt = item.get("prompt") if isinstance(item, dict) else None
+            style = (item.get("style") if isinstance(item, dict) else None) or (
+                default_style or self.default_style
+            )
+            entry: Dict[str, Any] = {"index": index, "prompt": prompt, "style": style}
+
+            if not prompt or not isinstance(prompt, str):
+                entry.update(success=False, error="Missing 'prompt' field.")
+                return entry
+
+            aspect_ratio = item.get("aspect_ratio", "16:9")
+            format = item.get("format", "png")
+            quality = item.get("quality", 95)
+
+            try:
+                request = self._prepare_basic(
+                    prompt, style, aspect_ratio, format, quality
+                )
+
+                async def bounded(count: int) -> Dict[str, Any]:
+                    async with semaphore:
+                        return await self._aexecute(request, count, PRIORITY_BATCH)
+
+                # 캐시 HIT은 세마포어를 거치지 않고 즉시 반환됨
+                result = self._finish(
+                    request, await self._agenerate_slots(request, bounded)
+                )
+            except Exception as e:
+                logging.error(f"Batch item {index} failed: {e}")
+                result = {"success": False, "error": str(e)}
+
+            entry["success"] = bool(result.get("success"))
+            if entry["success"]:
+                entry["local_path"] = result.get("local_path")
+                entry["filename"] = result.get("filename")
+                entry["cached"] = bool(result.get("cached"))
+                entry["timings"] = result["timings"]
+            else:
+                entry["error"] = result.get("error", "Unknown error")
+            return entry
+
+        tasks = [
+            asyncio.ensure_future(run_one(index, item))
+            for index, item in enumerate(items)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def generate_batch(
+        self,
+        items: List[Dict[str, Any]],
+        max_concurrent: Optional[int] = None,
+        default_style: Optional[str] = None,
+        on_result: Optional[Callable[[Dict[str, Any], int, int], Any]] = None,
+    ) -> Dict[str, Any]:
+        """
+        배치 이미지 생성 - SPEC-IMG-001
+
+        agenerate_batch()의 결과를 모아 요약합니다.
+
+        Args:
+            items: 생성 요청 목록 (agenerate_batch() 참고)
+            max_concurrent: 동시 API 호출 최대 수
+            default_style: 스타일 미지정 항목에 적용할 스타일
+            on_result: 항목 완료 시 호출되는 콜백 (entry, completed, total).
+                코루틴 함수도 허용
+
+        Returns:
+            {"success", "total", "succeeded", "failed", "cached", "results"}
+            결과 목록은 입력 순서(index)로 정렬됨
+        """
+        if not items:
+            return {"success": False, "error": "No prompts provided."}
+
+        if len(items) > self.batch_max_size:
+            return {
+                "success": False,
+                "error": (
+                    f"Batch size {len(items)} exceeds maximum limit "
+                    f"of {self.batch_max_size}."
+                ),
+            }
+
+        results: List[Dict[str, Any]] = []
+        async for entry in self.agenerate_batch(items, max_concurrent, default_style):
+            results.append(entry)
+            if on_result is not None:
+                callback_result = on_result(entry, len(results), len(items))
+                if asyncio.iscoroutine(callback_result):
+                    await callback_result
+
+        results.sort(key=lambda entry: entry["index"])
+        succeeded = sum(1 for entry in results if entry["success"])
+
+        return {
+            "success": succeeded > 0,
+            "total": len(results),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "cached": sum(1 for entry in results if entry.get("cached")),
+            "results": results,
+        }
+
+    def close(self) -> None:
+        """
+        서버 종료 시 백그라운드 자원 정리 (조기 갱신 스레드 풀, 조회 키 trace 파일)
+
+        대기 중인 갱신은 취소하고 실행 중인 갱신은 기다리지 않습니다.
+        """
+        with self._stats_lock:
+            pool, self._refresh_pool = self._refresh_pool, None
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+        with self._trace_lock:
+            trace_file, self._trace_file = self._trace_file, None
+        if trace_file is not None:
+            trace_file.close()
 
     def get_cache_stats(self) -> Dict[str, Any]:
         """
@@ -218,12 +1861,180 @@ class ImageGenerator:
             캐시 통계 딕셔너리 또는 캐시 비활성화 시 상태 메시지
         """
         if not self._cache_enabled or not self._cache:
-            return {"enabled": False, "message": "캐시가 비활성화되어 있습니다."}
+            return {
+                "enabled": False,
+                "message": "캐시가 비활성화되어 있습니다.",
+                "coalesced_hits": self._singleflight.coalesced,
+            }
 
         stats = self._cache.get_stats()
         stats["enabled"] = True
+        # 캐시 키 네임스페이스의 모델과 태그별 항목 수 (invalidate_cache_tag())
+        stats["model"] = self.model
+        stats["tags"] = self._cache.tag_counts()
+        with self._stats_lock:
+            # 캐시된 마스터에서 다른 형식/품질로 변환하여 생략한 API 호출 수
+            stats["api_calls_saved"] = self._api_calls_saved
+            stats["derived_renders"] = self._derived_renders
+            # 유사 프롬프트로 제공한 근사 HIT 수
+            stats["approximate_hits"] = self._approximate_hits
+            # 최근 결정적으로 실패한 요청에 캐시된 실패를 반환한 횟수
+            stats["negative_hits"] = self._negative_hits
+            # 만료 전에 백그라운드에서 다시 생성한 항목 수 (stale-while-revalidate)
+            stats["background_refreshes"] = self._background_refreshes
+            stats["refreshing"] = len(self._refreshing)
+            # 다른 서버 프로세스가 생성한 결과를 기다려 받은 횟수 (CACHE_SHARED)
+            stats["cross_process_hits"] = self._cross_process_hits
+        if self._process_flight is not None:
+            stats["shared"] = {
+                "path": str(self._process_flight.path),
+                "waits": self._process_flight.waits,
+                "lease_seconds": self._process_flight.lease_seconds,
+            }
+        if self._negative_cache is not None:
+            stats["negative_size"] = self._negative_cache.size
+        # 시작 시 갤러리 기록으로 복원한 항목 수 (warm_cache())
+        stats["warmup"] = dict(self._warmup)
+        if self._bundle_import is not None:
+            stats["bundle_import"] = dict(self._bundle_import)
+        if self._prompt_index is not None:
+            stats["approx_threshold"] = self._prompt_index.threshold
+            stats["approx_index_size"] = len(self._prompt_index)
+        # 진행 중인 동일 요청에 합류하여 API 호출을 생략한 횟수
+        stats["coalesced_hits"] = self._singleflight.coalesced
+        stats["in_flight"] = self._singleflight.in_flight
+        return stats
+
+    def get_scheduler_stats(self) -> Dict[str, Any]:
+        """
+        Imagen 호출 스케줄러 통계 조회
+
+        Returns:
+            대기열 깊이, 대기 시간, 동시 실행 제한 등 통계 딕셔너리
+            ("retry"에 재시도/헤징 설정과 지연 시간 분위수 포함)
+        """
+        stats = self.scheduler.get_stats()
+        stats["retry"] = self.retry_policy.get_stats()
         return stats
 
+    def invalidate_cache(self, key_prefix: str) -> Dict[str, Any]:
+        """
+        캐시 키 또는 키 접두사로 캐시 항목 무효화 (실패 캐시 포함)
+
+        Args:
+            key_prefix: 64자 캐시 키 또는 접두사 (16진수, 최소 4자, 로그의
+                "캐시 저장: <키 앞 16자>..." 값 사용 가능)
+
+        Returns:
+            무효화 결과 딕셔너리 (key_prefix, invalidated_count)
+        """
+        if not self._cache_enabled or not self._cache:
+            return {"success": False, "message": "캐시가 비활성화되어 있습니다."}
+
+        prefix = key_prefix.strip().lower().rstrip(".")
+        if len(prefix) < 4 or any(c not in "0123456789abcdef" for c in prefix):
+            return {
+                "success": False,
+                "message": (
+                    f"잘못된 캐시 키 접두사: {key_prefix} (16진수 4자 이상, "
+                    "전체 삭제는 clear_cache() 사용)"
+                ),
+            }
+        count = self._cache.invalidate_prefix(prefix)
+        if self._negative_cache is not None:
+            self._negative_cache.invalidate_prefix(prefix)
+        logging.info(f"캐시 키 무효화: {prefix}... ({count}개)")
+        return {"success": True, "key_prefix": prefix, "invalidated_count": count}
+
+    def resize_cache(
+        self, max_size: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        실행 중 캐시 용량 변경 (CACHE_MAX_SIZE/CACHE_MAX_BYTES, 재시작 시 환경 변수 값)
+
+        줄이면 가장 오래 사용하지 않은 항목부터 조금씩 제거하므로 그동안의
+        조회를 오래 막지 않습니다.
+
+        Args:
+            max_size: 새 최대 항목 수 (None = 유지, 1 이상)
+            max_bytes: 새 이미지 파일 크기 합계 예산 (None = 유지, 0 = 제한 없음)
+
+        Returns:
+            변경 결과 딕셔너리 (max_size, max_bytes, evicted_count)
+        """
+        if not self._cache_enabled or not self._cache:
+            return {"success": False, "message": "캐시가 비활성화되어 있습니다."}
+        if max_size is None and max_bytes is None:
+            return {"success": False, "message": "max_size 또는 max_bytes 필요"}
+        if (max_size is not None and max_size < 1) or (
+            max_bytes is not None and max_bytes < 0
+        ):
+            return {
+                "success": False,
+                "message": "max_size는 1 이상, max_bytes는 0 이상이어야 합니다.",
+            }
+
+        evicted = self._cache.resize(max_size=max_size, max_bytes=max_bytes)
+        stats = self._cache.get_stats()
+        return {
+            "success": True,
+            "max_size": stats["max_size"],
+            "max_bytes": stats["max_bytes"],
+            "evicted_count": evicted,
+        }
+
+    def set_cache_ttl(self, ttl_seconds: int) -> Dict[str, Any]:
+        """
+        실행 중 캐시 TTL 변경 (CACHE_TTL_SECONDS, 재시작 시 환경 변수 값)
+
+        기존 항목도 생성 시각 + 새 TTL로 만료되며, 이미 지난 항목은 바로 제거합니다.
+
+        Args:
+            ttl_seconds: 새 캐시 만료 시간(초, 1 이상)
+
+        Returns:
+            변경 결과 딕셔너리 (ttl_seconds, expired_count)
+        """
+        if not self._cache_enabled or not self._cache:
+            return {"success": False, "message": "캐시가 비활성화되어 있습니다."}
+        if ttl_seconds < 1:
+            return {"success": False, "message": "ttl_seconds는 1 이상이어야 합니다."}
+
+        expired = self._cache.set_ttl(ttl_seconds)
+        logging.info(f"캐시 TTL 변경: {ttl_seconds}초 ({expired}개 만료)")
+        return {"success": True, "ttl_seconds": ttl_seconds, "expired_count": expired}
+
+    def invalidate_cache_tag(self, tag: str) -> Dict[str, Any]:
+        """
+        태그가 붙은 캐시 항목 일괄 무효화 (실패 캐시 포함)
+
+        예: "style:Cyberpunk" (스타일의 모든 항목), "model:imagen-4.0-generate-001"
+
+        Args:
+            tag: "<종류>:<값>" 형식의 태그 (종류는 model 또는 style, 대소문자 무시)
+
+        Returns:
+            무효화 결과 딕셔너리 (tag, invalidated_count)
+        """
+        if not self._cache_enabled or not self._cache:
+            return {"success": False, "message": "캐시가 비활성화되어 있습니다."}
+
+        kind, _, value = tag.partition(":")
+        if kind.strip().lower() not in TAG_KINDS or not value.strip():
+            return {
+                "success": False,
+                "message": (
+                    f"잘못된 태그: {tag} "
+                    f"(형식: <{'|'.join(TAG_KINDS)}>:<값>, 예: style:Cyberpunk)"
+                ),
+            }
+        normalized = cache_tag(kind, value)
+        count = self._cache.invalidate_tag(normalized)
+        if self._negative_cache is not None:
+            self._negative_cache.invalidate_tag(normalized)
+        logging.info(f"캐시 태그 무효화: {normalized} ({count}개)")
+        return {"success": True, "tag": normalized, "invalidated_count": count}
+
     def clear_cache(self) -> Dict[str, Any]:
         """
         캐시 초기화
@@ -235,8 +2046,164 @@ class ImageGenerator:
             return {"success": False, "message": "캐시가 비활성화되어 있습니다."}
 
         count = self._cache.clear()
+        if self._negative_cache is not None:
+            self._negative_cache.clear()
+        self._singleflight.reset_stats()
+        with self._stats_lock:
+            self._derived_renders = 0
+            self._api_calls_saved = 0
+            self._approximate_hits = 0
+            self._negative_hits = 0
+            self._background_refreshes = 0
         return {"success": True, "cleared_count": count}
 
+    def export_cache_bundle(self, path: str) -> Dict[str, Any]:
+        """
+        만료되지 않은 캐시 항목과 참조하는 이미지 파일을 번들 하나로 내보내기
+
+        이미지 파일이 사라진 항목과 파일을 참조하지 않는 이전 형식 항목은
+        제외합니다. HIT/MISS 통계와 LRU 순서는 바뀌지 않습니다.
+
+        Args:
+            path: 번들 파일 경로 (예: build/image_cache.tar)
+
+        Returns:
+            내보내기 결과 (success, path, exported, missing, bytes, elapsed_ms)
+        """
+        if not self._cache_enabled or not self._cache:
+            return {"success": False, "message": "캐시가 비활성화되어 있습니다."}
+
+        started = time.perf_counter()
+        missing = 0
+        try:
+            with BundleWriter(Path(path), {"model": self.model}) as writer:
+                for key, result, created_at, _, tags in self._cache.entries():
+                    files = {
+                        digest: self.blob_store.path(digest)
+                        for digest in self._cached_hashes(result)
+                    }
+                    if not files or None in files.values():
+                        missing += 1
+                        continue
+                    try:
+                        writer.add(
+                            BundleEntry(key, result, created_at, list(tags)), files
+                        )
+                    except FileNotFoundError:
+                        missing += 1
+        except OSError as e:
+            logging.error(f"캐시 번들 내보내기 실패: {e}")
+            return {"success": False, "message": f"번들을 쓸 수 없습니다: {e}"}
+
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        logging.info(
+            f"캐시 번들 내보내기: {path} ({writer.entries}개, 제외 {missing}개)"
+        )
+        return {
+            "success": True,
+            "path": str(writer.path),
+            "exported": writer.entries,
+            "missing": missing,
+            "bytes": writer.path.stat().st_size,
+            "elapsed_ms": elapsed_ms,
+        }
+
+    def import_cache_bundle(self, path: str) -> Dict[str, Any]:
+        """
+        캐시 번들을 읽으면서 항목 단위로 L2(영구 계층)에 저장
+
+        - 멤버마다 SHA-256 체크섬을 검증하고 손상된 항목은 건너뜀 (corrupt)
+        - 다른 모델의 항목과 이미 캐시에 있는 키는 건너뜀 (skipped)
+        - 가져온 항목은 가져온 시점에 생성된 것으로 간주 (TTL 새로 시작)
+        - L2가 있으면 L1은 채우지 않고 첫 HIT 때 승격
+        - 아카이브가 잘려 있어도 그 전까지 가져온 항목은 유지
+
+        Args:
+            path: 번들 파일 경로 (export_cache_bundle()로 생성)
+
+        Returns:
+            가져오기 결과 (success, path, imported, skipped, corrupt, elapsed_ms)
+        """
+        if not self._cache_enabled or not self._cache:
+            return {"success": False, "message": "캐시가 비활성화되어 있습니다."}
+        if not Path(path).is_file():
+            return {"success": False, "message": f"번들 파일이 없습니다: {path}"}
+
+        started = time.perf_counter()
+        reader = BundleReader(
+            Path(path), self.blob_store.root, accept=self._accept_bundle_entry
+        )
+        imported = 0
+        error: Optional[str] = None
+        try:
+            for entry, staged in reader:
+                if self._import_bundle_entry(entry, staged):
+                    imported += 1
+                else:
+                    reader.skipped += 1
+        except (BundleError, OSError) as e:
+            error = str(e)
+            logging.error(f"캐시 번들 가져오기 중단: {path} ({e})")
+
+        counts = {
+            "path": str(path),
+            "imported": imported,
+            "skipped": reader.skipped,
+            "corrupt": reader.corrupt,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+        }
+        logging.info(
+            f"캐시 번들 가져오기: {path} ({imported}개, 건너뜀 {reader.skipped}, "
+            f"손상 {reader.corrupt})"
+        )
+        if error is not None:
+            return {"success": False, "message": error, **counts}
+        return {"success": True, **counts}
+
+    def _accept_bundle_entry(self, entry: BundleEntry) -> bool:
+        """가져올 번들 항목인지 확인 (다른 모델의 항목과 이미 캐시된 키는 제외)"""
+        models = [tag for tag in entry.tags if tag.startswith("model:")]
+        if models and cache_tag("model", self.model) not in models:
+            return False
+        return not self.blob_store.holders(f"cache:{entry.key}")
+
+    def _import_bundle_entry(self, entry: BundleEntry, staged: Dict[str, Path]) -> bool:
+        """
+        검증된 번들 항목 하나를 저장 (이미지 파일 이동, 경로 갱신, 참조 보유 후 저장)
+
+        Returns:
+            저장 여부 (이미 있는 키면 False, 보유한 참조는 해제)
+        """
+        assert self._cache is not None
+        for digest, staged_path in staged.items():
+            self.blob_store.ingest(staged_path, digest)
+
+        # 다른 장비의 파일 경로를 이 장비의 내용 주소 저장소 경로로 교체
+        result = entry.result
+        for item in (result, *result.get("renditions", {}).values()):
+            stored = (
+                self.blob_store.path(item["content_hash"])
+                if item.get("content_hash")
+                else None
+            )
+            if stored is not None:
+                item["local_path"] = item["url"] = str(stored.absolute())
+
+        if result.get("master_hash"):
+            self.blob_store.acquire(result["master_hash"], f"cache:{entry.key}")
+            for key, rendition in result.get("renditions", {}).items():
+                if rendition.get("content_hash"):
+                    self.blob_store.acquire(
+                        rendition["content_hash"], f"cache:{entry.key}:{key}"
+                    )
+        elif result.get("content_hash"):
+            self.blob_store.acquire(result["content_hash"], f"cache:{entry.key}")
+
+        if self._cache.add(entry.key, result, time.time(), entry.tags, l1=False):
+            return True
+        self.blob_store.retain(f"cache:{entry.key}", ())
+        return False
+
     def generate_advanced(
         self,
         prompt: str,
@@ -249,6 +2216,7 @@ class ImageGenerator:
         negative_prompt: Optional[str] = None,
         style_intensity: str = "normal",
         enhance_prompt: bool = True,
+        variants: int = 1,
     ) -> Dict[str, Any]:
         """
         고급 이미지 생성 - SPEC-IMG-004
@@ -270,109 +2238,30 @@ class ImageGenerator:
             negative_prompt: 네거티브 프롬프트 (선택)
             style_intensity: 스타일 강도 ("weak", "normal", "strong") - 기본값: "normal"
             enhance_prompt: 프롬프트 강화 활성화 - 기본값: True
+            variants: 한 번의 API 호출로 생성할 후보 이미지 수 (1-4) - 기본값: 1
 
         Returns:
             생성 결과 딕셔너리
         """
-        effective_style = style_name or self.default_style
-
-        # 1. 프롬프트 강화 (활성화된 경우)
-        final_prompt = prompt
-        if enhance_prompt:
-            style_obj = self.styles.get(effective_style)
-            if style_obj:
-                style_keywords = style_obj.get("keywords", "")
-                final_prompt = self.prompt_enhancer.enhance(
-                    prompt=prompt,
-                    style=style_keywords,
-                    intensity=style_intensity,
-                )
-                logging.info(f"프롬프트 강화 적용: {style_intensity} 강도")
-
-        # 2. 프롬프트 길이 검증
-        final_prompt, is_valid_length = self.prompt_enhancer.validate_length(
-            final_prompt, max_length=1000
+        request = self._prepare_advanced(
+            prompt,
+            style_name,
+            aspect_ratio,
+            format,
+            quality,
+            width,
+            height,
+            negative_prompt,
+            style_intensity,
+            enhance_prompt,
+            variants,
         )
-        if not is_valid_length:
-            logging.warning("프롬프트가 1000자를 초과하여 트리밍됨")
-
-        # 3. 해상도 검증 및 조정
-        adjusted_width = width
-        adjusted_height = height
-        resolution_adjusted = False
-
-        if width and height:
-            adjusted_width, adjusted_height, resolution_adjusted = validate_resolution(
-                width, height
-            )
-            if resolution_adjusted:
-                logging.warning(
-                    f"해상도가 {width}x{height}에서 {adjusted_width}x{adjusted_height}로 조정됨"
-                )
-
-        # 4. 네거티브 프롬프트 구성
-        final_negative_prompt = self.prompt_enhancer.build_negative_prompt(
-            custom_negative=negative_prompt,
-            style=effective_style,
-        )
-
-        # 5. 캐시 확인
-        if self._cache_enabled and self._cache:
-            from generators.cache import generate_cache_key_advanced
-
-            cache_key = generate_cache_key_advanced(
-                prompt=final_prompt,
-                style=effective_style,
-                aspect_ratio=aspect_ratio,
-                format=format,
-                quality=quality,
-                width=adjusted_width,
-                height=adjusted_height,
-                negative_prompt=final_negative_prompt,
-                style_intensity=style_intensity,
-                enhance_prompt=enhance_prompt,
-            )
-            cached_result = self._cache.get(cache_key)
-            if cached_result:
-                logging.info(f"캐시 HIT (advanced): {cache_key[:16]}...")
-                cached_result = cached_result.copy()
-                cached_result["cached"] = True
-                return cached_result
-
-        # 6. API 호출 (캐시 미스 또는 비활성화)
-        result = self._generate_uncached_advanced(
-            prompt=final_prompt,
-            style_name=effective_style,
-            aspect_ratio=aspect_ratio,
-            format=format,
-            quality=quality,
-            width=adjusted_width,
-            height=adjusted_height,
-            negative_prompt=final_negative_prompt,
+        result = self._generate_slots(
+            request, lambda count: self._execute(request, count)
         )
+        return self._finish(request, result)
 
-        # 7. 성공한 결과만 캐싱
-        if self._cache_enabled and self._cache and result.get("success"):
-            from generators.cache import generate_cache_key_advanced
-
-            cache_key = generate_cache_key_advanced(
-                prompt=final_prompt,
-                style=effective_style,
-                aspect_ratio=aspect_ratio,
-                format=format,
-                quality=quality,
-                width=adjusted_width,
-                height=adjusted_height,
-                negative_prompt=final_negative_prompt,
-                style_intensity=style_intensity,
-                enhance_prompt=enhance_prompt,
-            )
-            self._cache.set(cache_key, result)
-            logging.info(f"캐시 저장 (advanced): {cache_key[:16]}...")
-
-        return result
-
-    def _generate_uncached_advanced(
+    async def agenerate_advanced(
         self,
         prompt: str,
         style_name: Optional[str] = None,
@@ -382,123 +2271,147 @@ class ImageGenerator:
         width: Optional[int] = None,
         height: Optional[int] = None,
         negative_prompt: Optional[str] = None,
+        style_intensity: str = "normal",
+        enhance_prompt: bool = True,
+        variants: int = 1,
     ) -> Dict[str, Any]:
         """
-        캐시 없이 직접 API를 호출하여 고급 이미지 생성
+        generate_advanced()의 비동기 버전
 
-        Args:
-            prompt: 이미지 생성 프롬프트
-            style_name: 스타일 이름
-            aspect_ratio: 이미지 비율
-            format: 출력 형식
-            quality: 이미지 품질
-            width: 조정된 너비
-            height: 조정된 높이
-            negative_prompt: 네거티브 프롬프트
+        파라미터는 generate_advanced()와 동일합니다.
 
         Returns:
             생성 결과 딕셔너리
         """
-        if not self.client:
-            return {
-                "success": False,
-                "error": "Google GenAI Client is not initialized (Check GOOGLE_API_KEY).",
-            }
-
-        # 스타일 선택
-        style = self.styles.get(style_name, self.styles.get(self.default_style))
-        style_keywords = style["keywords"] if style else ""
-
-        # 프롬프트 조합
-        final_prompt = f"{prompt}. Style details: {style_keywords}"
-        if aspect_ratio:
-            final_prompt += f", Aspect Ratio: {aspect_ratio}"
-
-        # 네거티브 프롬프트가 있는 경우 로그에 기록
-        if negative_prompt:
-            logging.info(f"네거티브 프롬프트 적용: {negative_prompt[:50]}...")
+        request = self._prepare_advanced(
+            prompt,
+            style_name,
+            aspect_ratio,
+            format,
+            quality,
+            width,
+            height,
+            negative_prompt,
+            style_intensity,
+            enhance_prompt,
+            variants,
+        )
+        result = await self._agenerate_slots(
+            request, lambda count: self._aexecute(request, count)
+        )
+        return self._finish(request, result)
 
-        logging.info(f"Generating advanced image with prompt: {final_prompt}")
+    def _prepare_advanced(
+        self,
+        prompt: str,
+        style_name: Optional[str],
+        aspect_ratio: str,
+        format: str,
+        quality: int,
+        width: Optional[int],
+        height: Optional[int],
+        negative_prompt: Optional[str],
+        style_intensity: str,
+        enhance_prompt: bool,
+        variants: int = 1,
+    ) -> GenerationRequest:
+        """
+        고급 생성 요청 전처리 (프롬프트 강화, 해상도 검증, 네거티브 프롬프트, 캐시 키)
 
-        try:
-            # Imagen 4 호출
-            response = self.client.models.generate_images(
-                model="imagen-4.0-fast-generate-001",
-                prompt=final_prompt,
-                config=types.GenerateImagesConfig(
-                    number_of_images=1,
-                    aspect_ratio=aspect_ratio
-                    if aspect_ratio
-                    in [
-                        "1:1",
-                        "16:9",
-                        "9:16",
-                        "4:3",
-                        "3:4",
-                        "21:9",
-                        "2:3",
-                        "3:2",
-                        "5:4",
-                    ]
-                    else "16:9",
-                ),
+        Returns:
+            파이프라인에 전달할 GenerationRequest
+        """
+        effective_style = style_name or self.default_style
+        timings: Dict[str, float] = {}
+        started = time.perf_counter()
+
+        with stage_timer(timings, "enhance"):
+            # 1. 프롬프트 강화 (활성화된 경우)
+            final_prompt = prompt
+            if enhance_prompt:
+                style_obj = self.styles.get(effective_style)
+                if style_obj:
+                    style_keywords = style_obj.get("keywords", "")
+                    final_prompt = self.prompt_enhancer.enhance(
+                        prompt=prompt,
+                        style=style_keywords,
+                        intensity=style_intensity,
+                    )
+                    logging.info(f"프롬프트 강화 적용: {style_intensity} 강도")
+
+            # 2. 프롬프트 길이 검증
+            final_prompt, is_valid_length = self.prompt_enhancer.validate_length(
+                final_prompt, max_length=1000
             )
+            if not is_valid_length:
+                logging.warning("프롬프트가 1000자를 초과하여 트리밍됨")
 
-            if response and response.generated_images:
-                image_bytes = response.generated_images[0].image.image_bytes
-
-                # BytesIO에서 PIL 이미지로 변환
-                from io import BytesIO
+            # 3. 해상도 검증 및 조정
+            adjusted_width = width
+            adjusted_height = height
+            resolution_adjusted = False
 
-                image = Image.open(BytesIO(image_bytes))
-
-                # 해상도 조정이 필요한 경우 리사이즈
-                if width and height:
-                    # 현재 이미지 크기 가져오기
-                    original_width, original_height = image.size
-
-                    # 요청된 크기와 다른 경우만 리사이즈
-                    if original_width != width or original_height != height:
-                        image = image.resize((width, height), Image.Resampling.LANCZOS)  # type: ignore[assignment]
-                        logging.info(f"이미지 리사이즈: {width}x{height}")
-
-                # 파일명 생성
-                from datetime import datetime
-
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                safe_style = (style_name or "default").replace(" ", "_").lower()
-                extension = format if format != "jpg" else "jpeg"
-                filename = f"gen_adv_{safe_style}_{timestamp}.{extension}"
-                output_path = self.output_dir / filename
-
-                # save_image() 사용하여 지정된 형식으로 저장
-                save_image(
-                    image, format=format, quality=quality, output_path=str(output_path)
-                )
-                logging.info(
-                    f"Advanced image saved to {output_path} (format: {format}, quality: {quality})"
+            if width and height:
+                adjusted_width, adjusted_height, resolution_adjusted = (
+                    validate_resolution(width, height)
                 )
+                if resolution_adjusted:
+                    logging.warning(
+                        f"해상도가 {width}x{height}에서 {adjusted_width}x{adjusted_height}로 조정됨"
+                    )
+
+            # 4. 네거티브 프롬프트 구성
+            final_negative_prompt = self.prompt_enhancer.build_negative_prompt(
+                custom_negative=negative_prompt,
+                style=effective_style,
+            )
 
-                result = {
-                    "success": True,
-                    "prompt": final_prompt,
-                    "local_path": str(output_path.absolute()),
-                    "url": str(output_path.absolute()),
-                    "format": format,
-                    "quality": quality,
-                    "width": width if width else image.size[0],
-                    "height": height if height else image.size[1],
-                    "negative_prompt": negative_prompt,
-                    "status": f"Advanced image generated with Imagen 4 and saved as {format.upper()}.",
-                }
-
-                return result
-            else:
-                return {"success": False, "error": "No images returned."}
-
-        except Exception as e:
-            logging.error(f"Advanced image generation failed: {e}")
-            return {"success": False, "error": str(e)}
+        # 5. 캐시 키 (변형별로 한 번만 계산, 요청 병합 키로도 사용)
+        key_params = {
+            "prompt": final_prompt,
+            "style": effective_style,
+            "aspect_ratio": aspect_ratio,
+            "width": adjusted_width,
+            "height": adjusted_height,
+            "negative_prompt": final_negative_prompt,
+            "style_intensity": style_intensity,
+            "enhance_prompt": enhance_prompt,
+            "model": self.model,
+            "style_version": self._style_version(effective_style),
+        }
+        with stage_timer(timings, "key"):
+            cache_keys = [
+                generate_cache_key_advanced(**key_params, variant=i)
+                for i in range(self._clamp_variants(variants))
+            ]
+            scope_keys = [
+                generate_cache_key_advanced(**{**key_params, "prompt": ""}, variant=i)
+                for i in range(len(cache_keys))
+            ]
+
+        return GenerationRequest(
+            mode="advanced",
+            prompt=final_prompt,
+            style_name=effective_style,
+            aspect_ratio=aspect_ratio,
+            format=format,
+            quality=quality,
+            width=adjusted_width,
+            height=adjusted_height,
+            negative_prompt=final_negative_prompt,
+            cache_keys=cache_keys,
+            scope_keys=scope_keys,
+            cache_tags=self._cache_tags(effective_style),
+            source_prompt=prompt,
+            generation_params={
+                "mode": "advanced",
+                **key_params,
+                "format": format,
+                "quality": quality,
+            },
+            timings=timings,
+            started=started,
+        )
 
 
 def get_image_generator():
@@ -0,0 +1,270 @@
+"""
+이미지 후처리 (디코딩/리사이즈/인코딩) 모듈
+
+API 응답 이미지의 디코딩, LANCZOS 리사이즈, 형식별 인코딩은 GIL을 잡는
+CPU 작업입니다. PostProcessor는 이 단계를 프로세스 풀에서 실행하여
+요청 스레드와 이벤트 루프가 CPU 작업에 묶이지 않도록 합니다.
+
+핵심 기능:
+- 이미지 바이트는 pickle 복사 대신 공유 메모리(SharedMemory)로 워커에 전달
+- 워커가 결과 파일을 직접 기록하고 크기(width, height)만 반환
+- 워커 수 0이면 호출 스레드에서 바로 처리 (기존 동작)
+- 원본이 이미 요청 형식/크기이면 디코딩/인코딩 없이 바이트를 그대로 저장
+- 디코딩/리사이즈/인코딩/쓰기 단계별 소요 시간 측정
+"""
+
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from io import BytesIO
+from multiprocessing.shared_memory import SharedMemory
+from typing import Dict, NamedTuple, Optional
+
+from PIL import Image
+
+from generators.format_handlers import save_image
+from generators.timing import stage_timer
+
+
+# 후처리 경로
+ENCODING_PASSTHROUGH = "passthrough"  # 서버 인코딩 바이트를 그대로 저장
+ENCODING_TRANSCODED = "transcoded"  # 로컬에서 디코딩/리사이즈/재인코딩
+
+
+class RenderResult(NamedTuple):
+    """후처리 결과 (워커 프로세스에서 반환되므로 pickle 가능한 타입)"""
+
+    width: int
+    height: int
+    encoding: str
+    timings: Dict[str, float]  # decode_ms, resize_ms, encode_ms, write_ms
+
+
+def detect_format(image_bytes: bytes) -> Optional[str]:
+    """
+    매직 바이트로 이미지 형식 판별
+
+    Returns:
+        "png", "jpeg", "webp" 또는 판별 불가 시 None
+    """
+    if image_bytes.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "png"
+    if image_bytes.startswith(b"\xff\xd8\xff"):
+        return "jpeg"
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "webp"
+    return None
+
+
+def encode_lossless(image_bytes: bytes) -> bytes:
+    """
+    캐시 마스터용 무손실(PNG) 바이트
+
+    원본이 이미 PNG이면 그대로 반환하고, 그 외에는 디코딩하여 PNG로 인코딩합니다.
+    """
+    if detect_format(image_bytes) == "png":
+        return image_bytes
+    with Image.open(BytesIO(image_bytes)) as image:
+        return save_image(image, format="png").getvalue()
+
+
+def write_passthrough(
+    image_bytes: bytes,
+    output_path: str,
+    format: str = "png",
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+) -> Optional[RenderResult]:
+    """
+    원본 바이트가 요청 형식이고 리사이즈가 필요 없으면 그대로 저장
+
+    크기 확인은 이미지 헤더만 읽으며 픽셀 디코딩은 하지 않습니다.
+    (decode_ms는 헤더 확인 시간, encode_ms는 0)
+
+    Returns:
+        저장한 경우 RenderResult, 로컬 변환이 필요한 경우 None
+    """
+    target = "jpeg" if format.lower() == "jpg" else format.lower()
+    if detect_format(image_bytes) != target:
+        return None
+
+    timings: Dict[str, float] = {}
+    with stage_timer(timings, "decode"):
+        with Image.open(BytesIO(image_bytes)) as image:
+            size = image.size
+    if width and height and size != (width, height):
+        return None
+
+    timings["encode_ms"] = 0.0
+    with stage_timer(timings, "write"):
+        with open(output_path, "wb") as f:
+            f.write(image_bytes)
+    return RenderResult(size[0], size[1], ENCODING_PASSTHROUGH, timings)
+
+
+def render_image(
+    image_bytes: bytes,
+    output_path: str,
+    format: str = "png",
+    quality: int = 95,
+    width: Optional[int] = None,
+    height: Optional[int] = None,
+) -> RenderResult:
+    """
+    이미지 바이트를 디코딩하고 필요 시 리사이즈하여 지정된 형식으로 저장
+
+    Args:
+        image_bytes: 원본 이미지 바이트
+        output_path: 저장 경로
+        format: 출력 형식 (png, jpeg, webp)
+        quality: 이미지 품질 1-100 (JPEG/WebP용)
+        width: 목표 너비 (height와 함께 지정 시 리사이즈)
+        height: 목표 높이
+
+    Returns:
+        저장된 이미지의 크기, 후처리 경로(항상 transcoded), 단계별 소요 시간
+    """
+    timings: Dict[str, float] = {}
+    with stage_timer(timings, "decode"):
+        image = Image.open(BytesIO(image_bytes))
+        image.load()
+
+    # 요청된 크기와 다른 경우만 리사이즈
+    if width and height and image.size != (width, height):
+        with stage_timer(timings, "resize"):
+            image = image.resize((width, height), Image.Resampling.LANCZOS)  # type: ignore[assignment]
+
+    with stage_timer(timings, "encode"):
+        encoded = save_image(image, format=format, quality=quality)
+    with stage_timer(timings, "write"):
+        with open(output_path, "wb") as f:
+            f.write(encoded.getbuffer())
+    return RenderResult(image.size[0], image.size[1], ENCODING_TRANSCODED, timings)
+
+
+def _render_shared(
+    shm_name: str,
+    size: int,
+    output_path: str,
+    format: str,
+    quality: int,
+    width: Optional[int],
+    height: Optional[int],
+) -> RenderResult:
+    """프로세스 풀 워커: 공유 메모리에서 이미지 바이트를 읽어 render_image() 수행"""
+    shm = SharedMemory(name=shm_name)
+    try:
+        image_bytes = bytes(shm.buf[:size])
+    finally:
+        shm.close()
+    return render_image(image_bytes, output_path, format, quality, width, height)
+
+
+def workers_from_env() -> int:
+    """
+    POSTPROCESS_WORKERS 환경 변수에서 워커 수 결정
+
+    "auto"는 CPU 코어 수, 0(기본값)은 프로세스 풀 비활성화
+    """
+    value = os.getenv("POSTPROCESS_WORKERS", "0").strip().lower()
+    if value == "auto":
+        return os.cpu_count() or 1
+    try:
+        return max(0, int(value))
+    except ValueError:
+        logging.warning(f"잘못된 POSTPROCESS_WORKERS 값: {value!r}, 비활성화")
+        return 0
+
+
+class PostProcessor:
+    """
+    이미지 후처리 실행기
+
+    특징:
+    - workers > 0: spawn 방식 프로세스 풀에서 처리 (첫 사용 시 생성)
+    - workers == 0: 호출 스레드에서 바로 처리
+    - 스레드 안전 (여러 요청 스레드에서 동시에 render() 호출 가능)
+    """
+
+    def __init__(self, workers: int = 0, start_method: str = "spawn"):
+        """
+        Args:
+            workers: 프로세스 풀 워커 수 (0이면 비활성화)
+            start_method: 워커 프로세스 시작 방식 (기본값: "spawn")
+        """
+        self.workers = max(0, workers)
+        self.start_method = start_method
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """프로세스 풀 사용 여부"""
+        return self.workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """프로세스 풀 지연 생성"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context(self.start_method),
+                )
+                logging.info(f"후처리 프로세스 풀 시작: workers={self.workers}")
+            return self._executor
+
+    def render(
+        self,
+        image_bytes: bytes,
+        output_path: str,
+        format: str = "png",
+        quality: int = 95,
+        width: Optional[int] = None,
+        height: Optional[int] = None,
+    ) -> RenderResult:
+        """
+        이미지 후처리 수행 (결과가 준비될 때까지 대기)
+
+        원본이 요청 형식/크기와 같으면 변환 없이 바로 저장하고,
+        그 외에는 로컬 변환(render_image())으로 대체합니다.
+        파라미터는 render_image()와 동일합니다.
+
+        Returns:
+            저장된 이미지의 크기와 후처리 경로
+        """
+        passthrough = write_passthrough(image_bytes, output_path, format, width, height)
+        if passthrough is not None:
+            return passthrough
+
+        if not self.enabled:
+            return render_image(
+                image_bytes, output_path, format, quality, width, height
+            )
+
+        size = len(image_bytes)
+        shm = SharedMemory(create=True, size=max(size, 1))
+        try:
+            shm.buf[:size] = image_bytes
+            future = self._get_executor().submit(
+                _render_shared,
+                shm.name,
+                size,
+                output_path,
+                format,
+                quality,
+                width,
+                height,
+            )
+            return future.result()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def shutdown(self) -> None:
+        """프로세스 풀 종료"""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
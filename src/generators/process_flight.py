@@ -0,0 +1,158 @@
+"""
+프로세스 간 요청 병합 모듈
+
+MCP 클라이언트(Obsidian, Cursor, Claude Desktop)마다 stdio main.py 프로세스가
+따로 실행되므로 SingleFlight(프로세스 내 병합)만으로는 같은 프롬프트를
+클라이언트 수만큼 생성합니다. ProcessSingleFlight는 공유 L2 캐시와 같은
+SQLite(WAL) 파일에 키별 임대(lease)를 기록하여, 한 프로세스만 Imagen을
+호출하고 나머지 프로세스는 임대가 해제될 때까지 기다린 뒤 공유 캐시에서
+결과를 읽게 합니다.
+
+핵심 기능:
+- BEGIN IMMEDIATE 트랜잭션으로 키별 임대 획득 (프로세스 간 직렬화)
+- 임대를 보유한 프로세스가 종료되었거나 임대 시간이 지나면 다른 프로세스가 인수
+- 해제 대기는 폴링 (간격을 점차 늘림, 동기/비동기 지원)
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from generators.blob_store import _process_alive
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flight_leases (
+    key TEXT PRIMARY KEY,
+    owner INTEGER NOT NULL,
+    token TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class ProcessSingleFlight:
+    """
+    SQLite 임대 기반 프로세스 간 single-flight
+
+    특징:
+    - try_acquire()로 임대를 얻은 프로세스만 생성하고 release()로 해제
+    - 임대를 얻지 못한 프로세스는 wait()/await_release() 후 공유 캐시를 다시 조회
+    - 스레드 안전성 (단일 연결 + Lock)
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        lease_seconds: float = 300.0,
+        poll_interval: float = 0.2,
+        max_poll_interval: float = 1.0,
+    ):
+        """
+        초기화 (파일과 테이블이 없으면 생성)
+
+        Args:
+            path: SQLite 데이터베이스 파일 경로 (공유 L2 캐시 파일)
+            lease_seconds: 임대 유효 시간(초), 생성이 이보다 오래 걸리면 다른
+                프로세스가 인수 (기본값: 300)
+            poll_interval: 해제 확인 첫 간격(초) (기본값: 0.2)
+            max_poll_interval: 해제 확인 최대 간격(초) (기본값: 1.0)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max_poll_interval
+        self._lock = threading.Lock()
+        self.waits = 0  # 다른 프로세스의 생성을 기다린 횟수
+
+        self._conn = sqlite3.connect(
+            str(self.path), check_same_thread=False, isolation_level=None, timeout=30
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """쓰기 트랜잭션 (다른 프로세스의 임대 변경과 직렬화, 예외 시 롤백)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def try_acquire(self, key: str) -> Optional[str]:
+        """
+        키의 임대 획득 시도
+
+        Args:
+            key: 병합 키
+
+        Returns:
+            임대 토큰 (release()에 전달) 또는 None (다른 보유자가 있음)
+        """
+        token = uuid.uuid4().hex
+        now = time.time()
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT owner, expires_at FROM flight_leases WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and row[1] > now and _process_alive(row[0]):
+                return None
+            conn.execute(
+                "INSERT OR REPLACE INTO flight_leases (key, owner, token, expires_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, os.getpid(), token, now + self.lease_seconds),
+            )
+        return token
+
+    def release(self, key: str, token: str) -> None:
+        """임대 해제 (다른 프로세스가 인수한 임대는 유지)"""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM flight_leases WHERE key = ? AND token = ?", (key, token)
+            )
+
+    def is_held(self, key: str) -> bool:
+        """유효한 임대가 있는지 여부 (보유 프로세스가 종료되었거나 만료되면 False)"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT owner, expires_at FROM flight_leases WHERE key = ?", (key,)
+            ).fetchone()
+        return row is not None and row[1] > time.time() and _process_alive(row[0])
+
+    def wait(self, key: str) -> None:
+        """임대가 해제될 때까지 대기 (최대 lease_seconds)"""
+        self.waits += 1
+        deadline = time.monotonic() + self.lease_seconds
+        interval = self._poll_interval
+        while self.is_held(key) and time.monotonic() < deadline:
+            time.sleep(interval)
+            interval = min(interval * 1.5, self._max_poll_interval)
+
+    async def await_release(self, key: str) -> None:
+        """wait()의 비동기 버전 (조회는 워커 스레드에서 수행)"""
+        self.waits += 1
+        deadline = time.monotonic() + self.lease_seconds
+        interval = self._poll_interval
+        while (
+            await asyncio.to_thread(self.is_held, key) and time.monotonic() < deadline
+        ):
+            await asyncio.sleep(interval)
+            interval = min(interval * 1.5, self._max_poll_interval)
+
+    def close(self) -> None:
+        """연결 종료"""
+        with self._lock:
+            self._conn.close()
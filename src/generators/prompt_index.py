@@ -0,0 +1,170 @@
+"""
+유사 프롬프트 색인 모듈
+
+정규화 후에도 표현이 조금 다른 프롬프트("a cat sitting on a sofa" /
+"a cat sitting on the red sofa")는 캐시 키가 다릅니다. PromptIndex는
+캐시된 프롬프트의 MinHash 서명을 LSH 버킷에 보관하여, 새 프롬프트와
+추정 유사도(Jaccard)가 임계값 이상인 캐시 키를 찾습니다.
+
+핵심 기능:
+- 문자 n-gram 슁글 (띄어쓰기/조사가 다른 한국어 프롬프트에도 동작)
+- MinHash 서명 (고정 시드의 선형 해시 순열)
+- 밴드 LSH로 후보 검색 후 서명 일치율로 유사도 확인
+- 범위(scope)별 분리: 프롬프트 외 생성 입력(스타일/비율/크기 등)이 같은 항목만 일치
+- 스레드 안전성 (Lock)
+"""
+
+import hashlib
+import random
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Tuple
+
+from generators.cache import canonicalize_prompt
+
+# MinHash 순열에 사용하는 메르센 소수 (2^61 - 1)
+_PRIME = (1 << 61) - 1
+
+
+def _shingles(text: str, size: int) -> Set[int]:
+    """정규화된 프롬프트의 문자 n-gram 해시 집합 (공백 제외)"""
+    compact = canonicalize_prompt(text).replace(" ", "")
+    if len(compact) <= size:
+        grams = {compact}
+    else:
+        grams = {compact[i : i + size] for i in range(len(compact) - size + 1)}
+    return {
+        int.from_bytes(
+            hashlib.blake2b(g.encode("utf-8"), digest_size=8).digest(), "big"
+        )
+        for g in grams
+    }
+
+
+class PromptIndex:
+    """
+    MinHash/LSH 기반 유사 프롬프트 색인
+
+    특징:
+    - num_perm개의 해시로 서명을 만들고 bands개의 밴드로 나누어 버킷에 저장
+    - 밴드 하나라도 일치하면 후보, 서명 일치율(추정 Jaccard)이 threshold 이상이면 일치
+    - 캐시 키당 하나의 프롬프트만 보관 (remove()로 삭제)
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.9,
+        num_perm: int = 128,
+        bands: int = 32,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        """
+        색인 초기화
+
+        Args:
+            threshold: 일치로 판단하는 최소 추정 유사도 (0-1, 기본값: 0.9)
+            num_perm: MinHash 해시 수 (기본값: 128)
+            bands: LSH 밴드 수 (num_perm의 약수, 기본값: 32)
+            shingle_size: 문자 n-gram 길이 (기본값: 3)
+            seed: 해시 순열 시드 (프로세스 간 같은 서명을 위해 고정)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self._rows = num_perm // bands
+        self._bands = bands
+        self._shingle_size = shingle_size
+        rng = random.Random(seed)
+        self._perms = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+        self._lock = threading.Lock()
+        # 캐시 키 -> (범위, 원본 프롬프트, 서명)
+        self._entries: Dict[str, Tuple[str, str, Tuple[int, ...]]] = {}
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], Set[str]] = defaultdict(
+            set
+        )
+
+    def signature(self, prompt: str) -> Tuple[int, ...]:
+        """프롬프트의 MinHash 서명"""
+        shingles = _shingles(prompt, self._shingle_size)
+        return tuple(
+            min((a * x + b) % _PRIME for x in shingles) for a, b in self._perms
+        )
+
+    def _bucket_keys(
+        self, scope: str, signature: Tuple[int, ...]
+    ) -> List[Tuple[str, int, Tuple[int, ...]]]:
+        rows = self._rows
+        return [
+            (scope, band, signature[band * rows : (band + 1) * rows])
+            for band in range(self._bands)
+        ]
+
+    def add(self, scope: str, prompt: str, key: str) -> None:
+        """
+        캐시된 프롬프트 등록 (같은 키가 있으면 교체)
+
+        Args:
+            scope: 프롬프트 외 생성 입력을 나타내는 문자열 (같은 범위끼리만 비교)
+            prompt: 캐시된 결과의 프롬프트
+            key: 캐시 키
+        """
+        signature = self.signature(prompt)
+        with self._lock:
+            self._remove_locked(key)
+            self._entries[key] = (scope, prompt, signature)
+            for bucket in self._bucket_keys(scope, signature):
+                self._buckets[bucket].add(key)
+
+    def remove(self, key: str) -> bool:
+        """캐시 키 삭제 (없으면 False)"""
+        with self._lock:
+            return self._remove_locked(key)
+
+    def _remove_locked(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        scope, _, signature = entry
+        for bucket in self._bucket_keys(scope, signature):
+            keys = self._buckets.get(bucket)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._buckets[bucket]
+        return True
+
+    def query(self, scope: str, prompt: str) -> Optional[Tuple[str, float, str]]:
+        """
+        가장 유사한 캐시된 프롬프트 검색
+
+        Args:
+            scope: 요청의 범위 문자열
+            prompt: 요청 프롬프트
+
+        Returns:
+            (캐시 키, 추정 유사도, 캐시된 프롬프트) 또는 None (임계값 미만)
+        """
+        signature = self.signature(prompt)
+        best: Optional[Tuple[str, float, str]] = None
+        with self._lock:
+            candidates: Set[str] = set()
+            for bucket in self._bucket_keys(scope, signature):
+                candidates.update(self._buckets.get(bucket, ()))
+            for key in candidates:
+                _, cached_prompt, cached_signature = self._entries[key]
+                similarity = sum(
+                    1 for a, b in zip(signature, cached_signature) if a == b
+                ) / len(signature)
+                if similarity >= self.threshold and (
+                    best is None or similarity > best[1]
+                ):
+                    best = (key, similarity, cached_prompt)
+        return best
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
@@ -0,0 +1,475 @@
+"""
+Imagen 호출 재시도 및 헤징(hedging) 모듈
+
+Imagen 응답 지연은 꼬리가 길어 대부분 수 초 안에 끝나지만 일부는
+30초 이상 멈춥니다. RetryPolicy는 일시적 오류를 지터가 섞인 지수 백오프로
+재시도하고, 선택적으로 최근 지연 시간의 p95가 지나도 응답이 없으면 같은
+요청을 한 번 더 보내 먼저 끝난 결과를 사용합니다.
+
+핵심 기능:
+- 일시적 오류(429/5xx/타임아웃) 판별 및 full jitter 지수 백오프
+- 최근 성공 지연 시간 기반 헤지 지연(분위수) 계산
+- 시도별 소요 시간 기록 (헤지 지연 튜닝용)
+- 동기(스레드)/비동기(asyncio) 호출 지원
+"""
+
+import asyncio
+import logging
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextlib import nullcontext
+from typing import (
+    Any,
+    AsyncContextManager,
+    Awaitable,
+    Callable,
+    ContextManager,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from generators.scheduler import OVERLOAD_STATUS_CODES, is_overload_error
+
+# 재시도 대상 HTTP 상태 코드와 오류 메시지
+TRANSIENT_STATUS_CODES = OVERLOAD_STATUS_CODES | {500, 502, 504}
+TRANSIENT_MARKERS = ("DEADLINE_EXCEEDED", "INTERNAL", "timed out", "Timeout")
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    재시도할 만한 일시적 오류 여부 판별
+
+    할당량 초과/과부하(429/503), 서버 오류(500/502/504), 타임아웃/연결 오류를
+    일시적 오류로 간주합니다.
+    """
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return code in TRANSIENT_STATUS_CODES
+    if is_overload_error(error):
+        return True
+    message = str(error)
+    return any(marker in message for marker in TRANSIENT_MARKERS)
+
+
+# 같은 요청을 다시 보내도 같은 결과가 나오는 오류 (안전 필터 차단, 잘못된 요청)
+DETERMINISTIC_STATUS_CODES = {400}
+DETERMINISTIC_MARKERS = ("INVALID_ARGUMENT", "SAFETY", "safety", "blocked")
+
+
+def is_deterministic_error(error: BaseException) -> bool:
+    """
+    같은 요청을 반복해도 실패할 오류 여부 판별 (실패 결과 캐싱용)
+
+    재시도 후 실패(RetryExhaustedError)는 마지막 오류로 판별하며,
+    일시적 오류와 인증/권한 오류(401/403)는 제외합니다.
+    """
+    error = getattr(error, "last_error", error)
+    if is_transient_error(error):
+        return False
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return code in DETERMINISTIC_STATUS_CODES
+    message = str(error)
+    return any(marker in message for marker in DETERMINISTIC_MARKERS)
+
+
+class _Abandoned(Exception):
+    """다른 요청이 먼저 끝나 슬롯을 얻은 뒤 호출하지 않은 헤지/주 요청"""
+
+
+class RetryExhaustedError(Exception):
+    """
+    재시도 후에도 실패한 호출
+
+    메시지는 마지막 오류와 동일하며, 시도별 기록을 attempts에 담습니다.
+    """
+
+    def __init__(self, last_error: BaseException, attempts: List[Dict[str, Any]]):
+        super().__init__(str(last_error))
+        self.last_error = last_error
+        self.attempts = attempts
+
+
+class RetryPolicy:
+    """
+    재시도/헤징 정책
+
+    특징:
+    - call(): 동기 버전 (헤지 요청은 스레드 풀에서 실행, 패자는 결과만 폐기)
+    - acall(): 비동기 버전 (패자 태스크는 취소)
+    - 반환값은 (결과, 시도별 기록)
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 2,
+        base_delay: float = 1.0,
+        max_delay: float = 20.0,
+        hedge_enabled: bool = False,
+        hedge_quantile: float = 0.95,
+        hedge_min_delay: float = 2.0,
+        hedge_min_samples: int = 20,
+        latency_window: int = 200,
+    ):
+        """
+        Args:
+            max_retries: 최초 시도 이후 최대 재시도 횟수
+            base_delay: 백오프 기본 지연(초), 재시도마다 2배
+            max_delay: 백오프 최대 지연(초)
+            hedge_enabled: 헤지 요청 사용 여부
+            hedge_quantile: 헤지 지연으로 사용할 지연 시간 분위수 (기본 p95)
+            hedge_min_delay: 헤지 지연 하한(초)
+            hedge_min_samples: 헤지를 시작하기 위한 최소 지연 시간 표본 수
+            latency_window: 분위수 계산에 사용할 최근 표본 수
+        """
+        self.max_retries = max(0, max_retries)
+        self.base_delay = max(0.0, base_delay)
+        self.max_delay = max(self.base_delay, max_delay)
+        self.hedge_enabled = hedge_enabled
+        self.hedge_quantile = min(max(hedge_quantile, 0.0), 1.0)
+        self.hedge_min_delay = max(0.0, hedge_min_delay)
+        self.hedge_min_samples = max(1, hedge_min_samples)
+        self._latencies: deque = deque(maxlen=max(1, latency_window))
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # ----- 지연 시간 통계 -----
+
+    def observe(self, seconds: float) -> None:
+        """성공한 호출의 지연 시간 기록"""
+        with self._lock:
+            self._latencies.append(seconds)
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        헤지 요청을 보낼 지연 시간(초)
+
+        Returns:
+            헤지 비활성화 또는 표본 부족 시 None
+        """
+        if not self.hedge_enabled:
+            return None
+        with self._lock:
+            if len(self._latencies) < self.hedge_min_samples:
+                return None
+            samples = sorted(self._latencies)
+        index = min(len(samples) - 1, int(len(samples) * self.hedge_quantile))
+        return max(self.hedge_min_delay, samples[index])
+
+    def backoff(self, retry: int) -> float:
+        """full jitter 지수 백오프: [0, min(max_delay, base * 2^retry)] 균등 분포"""
+        ceiling = min(self.max_delay, self.base_delay * (2**retry))
+        return random.uniform(0, ceiling)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """재시도/헤징 설정과 지연 시간 통계"""
+        with self._lock:
+            samples = sorted(self._latencies)
+
+        def percentile(q: float) -> Optional[float]:
+            if not samples:
+                return None
+            index = min(len(samples) - 1, int(len(samples) * q))
+            return round(samples[index] * 1000, 1)
+
+        delay = self.hedge_delay()
+        return {
+            "max_retries": self.max_retries,
+            "hedge_enabled": self.hedge_enabled,
+            "hedge_delay_ms": round(delay * 1000, 1) if delay is not None else None,
+            "latency_samples": len(samples),
+            "latency_p50_ms": percentile(0.5),
+            "latency_p95_ms": percentile(0.95),
+        }
+
+    # ----- 시도 기록 -----
+
+    @staticmethod
+    def _record(
+        attempts: List[Dict[str, Any]],
+        attempt: int,
+        kind: str,
+        started: float,
+        outcome: str,
+        error: Optional[BaseException] = None,
+    ) -> Dict[str, Any]:
+        entry: Dict[str, Any] = {
+            "attempt": attempt,
+            "kind": kind,
+            "ms": round((time.monotonic() - started) * 1000, 1),
+            "outcome": outcome,
+        }
+        if error is not None:
+            entry["error"] = str(error)
+        attempts.append(entry)
+        return entry
+
+    def _should_retry(
+        self, error: BaseException, attempt: int, entry: Dict[str, Any]
+    ) -> Optional[float]:
+        """재시도 여부 판단, 재시도하는 경우 백오프 지연(초) 반환"""
+        if attempt > self.max_retries or not is_transient_error(error):
+            return None
+        delay = self.backoff(attempt - 1)
+        entry["backoff_ms"] = round(delay * 1000, 1)
+        logging.warning(
+            f"Imagen 호출 일시적 오류, {delay:.2f}초 후 재시도 "
+            f"({attempt}/{self.max_retries}): {error}"
+        )
+        return delay
+
+    # ----- 동기 호출 -----
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(thread_name_prefix="imagen-hedge")
+            return self._executor
+
+    def _call_once(
+        self,
+        fn: Callable[[], Any],
+        attempt: int,
+        attempts: List[Dict[str, Any]],
+        gate: Callable[[], ContextManager[Any]],
+    ) -> Any:
+        """
+        한 번의 시도 (필요 시 헤지 요청 포함)
+
+        소요 시간과 헤지 지연은 gate(스케줄러 슬롯)를 얻은 뒤부터 측정하므로
+        대기열에서 기다린 시간 때문에 헤지 요청을 보내지 않습니다.
+        """
+        delay = self.hedge_delay()
+        if delay is None:
+            with gate():
+                started = time.monotonic()
+                try:
+                    result = fn()
+                except Exception as e:
+                    self._record(attempts, attempt, "primary", started, "error", e)
+                    raise
+            self._record(attempts, attempt, "primary", started, "success")
+            self.observe(time.monotonic() - started)
+            return result
+
+        executor = self._get_executor()
+        started_at: Dict[str, float] = {}
+        admitted = {"primary": threading.Event(), "hedge": threading.Event()}
+        settled = threading.Event()
+
+        def run(kind: str) -> Any:
+            try:
+                with gate():
+                    started_at[kind] = time.monotonic()
+                    admitted[kind].set()
+                    if settled.is_set():
+                        # 슬롯을 얻기 전에 다른 요청이 끝났으면 API를 호출하지 않음
+                        raise _Abandoned()
+                    return fn()
+            finally:
+                admitted[kind].set()
+
+        submitted = time.monotonic()
+        futures = {executor.submit(run, "primary"): "primary"}
+        # 헤지 지연은 주 요청이 슬롯을 얻은 시점부터 계산
+        admitted["primary"].wait()
+        remaining = delay - (time.monotonic() - started_at.get("primary", submitted))
+        done, _ = wait(futures, timeout=max(0.0, remaining))
+        if not done:
+            futures[executor.submit(run, "hedge")] = "hedge"
+            logging.info(f"Imagen 헤지 요청 전송 (지연 {delay:.2f}초 초과)")
+
+        pending = set(futures)
+        last_error: Optional[BaseException] = None
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    kind = futures[future]
+                    error = future.exception()
+                    started = started_at.get(kind, submitted)
+                    if error is None:
+                        self._record(attempts, attempt, kind, started, "success")
+                        self.observe(time.monotonic() - started)
+                        # 동기 호출은 중단할 수 없으므로 남은 요청의 결과는 폐기
+                        for loser in pending:
+                            loser.cancel()
+                            self._record(
+                                attempts,
+                                attempt,
+                                futures[loser],
+                                started_at.get(futures[loser], time.monotonic()),
+                                "abandoned",
+                            )
+                        return future.result()
+                    self._record(attempts, attempt, kind, started, "error", error)
+                    last_error = error
+        finally:
+            settled.set()
+        assert last_error is not None
+        raise last_error
+
+    def call(
+        self,
+        fn: Callable[[], Any],
+        gate: Optional[Callable[[], ContextManager[Any]]] = None,
+    ) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        동기 호출 (재시도 및 헤징 적용)
+
+        Args:
+            fn: API 호출 함수
+            gate: 시도마다 진입할 컨텍스트 관리자 팩토리 (예: 스케줄러 슬롯,
+                기본값: None = 바로 실행). 소요 시간은 진입 후부터 측정
+
+        Returns:
+            (fn() 결과, 시도별 기록)
+
+        Raises:
+            RetryExhaustedError: 재시도 후에도 실패한 경우 (마지막 오류 포함)
+        """
+        gate = gate or nullcontext
+        attempts: List[Dict[str, Any]] = []
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return self._call_once(fn, attempt, attempts, gate), attempts
+            except Exception as e:
+                delay = self._should_retry(e, attempt, attempts[-1])
+                if delay is None:
+                    raise RetryExhaustedError(e, attempts) from e
+                time.sleep(delay)
+
+    # ----- 비동기 호출 -----
+
+    async def _acall_once(
+        self,
+        coro_fn: Callable[[], Awaitable[Any]],
+        attempt: int,
+        attempts: List[Dict[str, Any]],
+        gate: Callable[[], AsyncContextManager[Any]],
+    ) -> Any:
+        """한 번의 시도 (필요 시 헤지 요청 포함, 패자 태스크는 취소)"""
+        delay = self.hedge_delay()
+        started: Dict[str, float] = {}
+        admitted = {"primary": asyncio.Event(), "hedge": asyncio.Event()}
+
+        async def run(kind: str) -> Any:
+            try:
+                async with gate():
+                    started[kind] = time.monotonic()
+                    admitted[kind].set()
+                    return await coro_fn()
+            finally:
+                admitted[kind].set()
+
+        submitted = time.monotonic()
+        tasks = {asyncio.ensure_future(run("primary")): "primary"}
+        try:
+            if delay is not None:
+                # 헤지 지연은 주 요청이 슬롯을 얻은 시점부터 계산
+                await admitted["primary"].wait()
+                elapsed = time.monotonic() - started.get("primary", submitted)
+                done, _ = await asyncio.wait(tasks, timeout=max(0.0, delay - elapsed))
+                if not done:
+                    tasks[asyncio.ensure_future(run("hedge"))] = "hedge"
+                    logging.info(f"Imagen 헤지 요청 전송 (지연 {delay:.2f}초 초과)")
+
+            pending = set(tasks)
+            last_error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    kind = tasks[task]
+                    error = task.exception()
+                    kind_started = started.get(kind, submitted)
+                    if error is None:
+                        self._record(attempts, attempt, kind, kind_started, "success")
+                        self.observe(time.monotonic() - kind_started)
+                        for loser in pending:
+                            loser.cancel()
+                            self._record(
+                                attempts,
+                                attempt,
+                                tasks[loser],
+                                started.get(tasks[loser], time.monotonic()),
+                                "cancelled",
+                            )
+                        return task.result()
+                    self._record(attempts, attempt, kind, kind_started, "error", error)
+                    last_error = error
+            assert last_error is not None
+            raise last_error
+        finally:
+            # 호출자가 취소된 경우에도 남은 요청 정리
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def acall(
+        self,
+        coro_fn: Callable[[], Awaitable[Any]],
+        gate: Optional[Callable[[], AsyncContextManager[Any]]] = None,
+    ) -> Tuple[Any, List[Dict[str, Any]]]:
+        """
+        비동기 호출 (재시도 및 헤징 적용)
+
+        Args:
+            coro_fn: API 호출 코루틴 함수
+            gate: 시도마다 진입할 비동기 컨텍스트 관리자 팩토리 (예: 스케줄러
+                슬롯, 기본값: None = 바로 실행). 소요 시간은 진입 후부터 측정
+
+        Returns:
+            (coro_fn() 결과, 시도별 기록)
+
+        Raises:
+            RetryExhaustedError: 재시도 후에도 실패한 경우 (마지막 오류 포함)
+        """
+        gate = gate or nullcontext
+        attempts: List[Dict[str, Any]] = []
+        attempt = 0
+        while True:
+            attempt += 1
+            try:
+                return (
+                    await self._acall_once(coro_fn, attempt, attempts, gate),
+                    attempts,
+                )
+            except Exception as e:
+                delay = self._should_retry(e, attempt, attempts[-1])
+                if delay is None:
+                    raise RetryExhaustedError(e, attempts) from e
+                await asyncio.sleep(delay)
+
+
+def retry_policy_from_env() -> RetryPolicy:
+    """
+    환경 변수 기반 재시도/헤징 정책 생성
+
+    - IMAGEN_MAX_RETRIES: 최대 재시도 횟수 (기본 2)
+    - IMAGEN_RETRY_BASE_DELAY / IMAGEN_RETRY_MAX_DELAY: 백오프 기본/최대 지연 초 (기본 1 / 20)
+    - IMAGEN_HEDGE_ENABLED: 헤지 요청 사용 (기본 false)
+    - IMAGEN_HEDGE_QUANTILE: 헤지 지연 분위수 (기본 0.95)
+    - IMAGEN_HEDGE_MIN_DELAY: 헤지 지연 하한 초 (기본 2)
+    - IMAGEN_HEDGE_MIN_SAMPLES: 헤지 시작 전 필요한 지연 시간 표본 수 (기본 20)
+    """
+    return RetryPolicy(
+        max_retries=int(os.getenv("IMAGEN_MAX_RETRIES", "2")),
+        base_delay=float(os.getenv("IMAGEN_RETRY_BASE_DELAY", "1.0")),
+        max_delay=float(os.getenv("IMAGEN_RETRY_MAX_DELAY", "20.0")),
+        hedge_enabled=os.getenv("IMAGEN_HEDGE_ENABLED", "false").lower() == "true",
+        hedge_quantile=float(os.getenv("IMAGEN_HEDGE_QUANTILE", "0.95")),
+        hedge_min_delay=float(os.getenv("IMAGEN_HEDGE_MIN_DELAY", "2.0")),
+        hedge_min_samples=int(os.getenv("IMAGEN_HEDGE_MIN_SAMPLES", "20")),
+    )
@@ -0,0 +1,380 @@
+"""
+Imagen API 호출 스케줄러 모듈
+
+Imagen 클라이언트 앞에서 호출 시점과 동시 실행 수를 조절하여
+할당량 초과(429)와 과부하(503)를 줄입니다.
+
+핵심 기능:
+- 토큰 버킷 기반 분당 요청 수 제한
+- 우선순위 대기열: 대화형 도구 호출이 배치 작업보다 먼저 실행
+- AIMD 동시 실행 제한: 429/503 시 절반으로 감소, 성공 시 점진적 증가
+- 동기(스레드)/비동기(asyncio) 호출자가 같은 대기열을 공유
+- 대기열 깊이 및 대기 시간 통계
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+# 우선순위 대기열 (값이 작을수록 먼저 실행)
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BATCH: "batch"}
+
+# 과부하로 간주하는 HTTP 상태 코드와 오류 메시지
+OVERLOAD_STATUS_CODES = {429, 503}
+OVERLOAD_MARKERS = ("429", "503", "RESOURCE_EXHAUSTED", "UNAVAILABLE")
+
+
+def is_overload_error(error: BaseException) -> bool:
+    """
+    할당량 초과/과부하 오류 여부 판별
+
+    genai APIError의 code 속성을 우선 확인하고, 없으면 메시지로 판별합니다.
+    """
+    code = getattr(error, "code", None) or getattr(error, "status_code", None)
+    if isinstance(code, int):
+        return code in OVERLOAD_STATUS_CODES
+    message = str(error)
+    return any(marker in message for marker in OVERLOAD_MARKERS)
+
+
+class TokenBucket:
+    """
+    토큰 버킷 요청 속도 제한기 (스레드 안전하지 않음, 호출자가 잠금)
+
+    rate_per_minute가 0 이하이면 제한하지 않습니다.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate_per_second = max(0.0, rate_per_minute) / 60.0
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate_per_second > 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._updated = now
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate_per_second)
+
+    def try_take(self) -> float:
+        """
+        토큰 하나 사용 시도
+
+        Returns:
+            0.0이면 사용 성공, 그 외에는 다음 토큰까지 남은 시간(초)
+        """
+        if not self.enabled:
+            return 0.0
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return 0.0
+        return (1.0 - self._tokens) / self.rate_per_second
+
+    @property
+    def tokens(self) -> float:
+        """현재 사용 가능한 토큰 수"""
+        if not self.enabled:
+            return float("inf")
+        self._refill()
+        return self._tokens
+
+
+class _Waiter:
+    """대기 중인 호출 (동기 호출자는 threading.Event, 비동기 호출자는 asyncio.Event)"""
+
+    def __init__(self, priority: int, loop: Optional[asyncio.AbstractEventLoop]):
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.loop = loop
+        self.event: Any = asyncio.Event() if loop else threading.Event()
+
+    def wake(self) -> None:
+        if not self.loop:
+            self.event.set()
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.event.set)
+        except RuntimeError:
+            # 이벤트 루프가 이미 닫힌 대기자는 무시
+            pass
+
+
+class ImagenScheduler:
+    """
+    Imagen 호출 스케줄러
+
+    특징:
+    - call(): 스레드에서 호출하는 동기 버전
+    - acall(): 이벤트 루프에서 호출하는 비동기 버전
+    - 대기열 맨 앞(가장 높은 우선순위, 먼저 도착한 순)의 호출만 시작 가능
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float = 0,
+        burst: int = 1,
+        max_concurrent: int = 8,
+        min_concurrent: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            rate_per_minute: 분당 최대 요청 수 (0이면 제한 없음)
+            burst: 토큰 버킷 최대 용량 (순간 허용 요청 수)
+            max_concurrent: AIMD 동시 실행 제한의 상한
+            min_concurrent: AIMD 동시 실행 제한의 하한
+            clock: 시간 함수 (테스트용)
+        """
+        self._lock = threading.Lock()
+        self._bucket = TokenBucket(rate_per_minute, burst, clock)
+        self.max_concurrent = max(1, max_concurrent)
+        self.min_concurrent = max(1, min(min_concurrent, self.max_concurrent))
+        self._limit = float(self.max_concurrent)
+        self._in_flight = 0
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+
+        # 통계
+        self._admitted = 0
+        self._overloads = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._admitted_by_lane: Dict[int, int] = {}
+
+    # ----- 대기열 관리 (잠금 보유 상태에서 호출) -----
+
+    def _enqueue(self, waiter: _Waiter) -> None:
+        heapq.heappush(self._queue, (waiter.priority, next(self._seq), waiter))
+
+    def _remove(self, waiter: _Waiter) -> None:
+        self._queue = [entry for entry in self._queue if entry[2] is not waiter]
+        heapq.heapify(self._queue)
+
+    def _try_admit(self, waiter: _Waiter) -> Optional[float]:
+        """
+        대기열 맨 앞이면 시작 시도
+
+        Returns:
+            0.0이면 시작 허용, 양수면 토큰 대기 시간(초), None이면 알림 대기
+        """
+        if not self._queue or self._queue[0][2] is not waiter:
+            return None
+        if self._in_flight >= int(self._limit):
+            return None
+        delay = self._bucket.try_take()
+        if delay > 0:
+            return delay
+
+        heapq.heappop(self._queue)
+        self._in_flight += 1
+        waited = time.monotonic() - waiter.enqueued_at
+        self._admitted += 1
+        self._admitted_by_lane[waiter.priority] = (
+            self._admitted_by_lane.get(waiter.priority, 0) + 1
+        )
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+        return 0.0
+
+    def _wake_head(self) -> None:
+        if self._queue:
+            self._queue[0][2].wake()
+
+    def _release(self, overloaded: bool, succeeded: bool) -> None:
+        """호출 종료 처리 및 AIMD 조정"""
+        with self._lock:
+            self._in_flight -= 1
+            if overloaded:
+                # 곱셈 감소: 과부하 신호에 즉시 절반으로
+                self._overloads += 1
+                self._limit = max(self.min_concurrent, self._limit / 2)
+            elif succeeded:
+                # 덧셈 증가: 동시 실행 제한만큼 성공하면 1 증가
+                self._limit = min(self.max_concurrent, self._limit + 1 / self._limit)
+            self._wake_head()
+
+    # ----- 슬롯 획득 -----
+
+    def _acquire(self, priority: int) -> None:
+        waiter = _Waiter(priority, None)
+        with self._lock:
+            self._enqueue(waiter)
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_admit(waiter)
+                    if delay == 0.0:
+                        self._wake_head()
+                        return
+                waiter.event.wait(delay)
+                waiter.event.clear()
+        except BaseException:
+            with self._lock:
+                self._remove(waiter)
+                self._wake_head()
+            raise
+
+    async def _aacquire(self, priority: int) -> None:
+        waiter = _Waiter(priority, asyncio.get_running_loop())
+        with self._lock:
+            self._enqueue(waiter)
+        try:
+            while True:
+                with self._lock:
+                    delay = self._try_admit(waiter)
+                    if delay == 0.0:
+                        self._wake_head()
+                        return
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                waiter.event.clear()
+        except BaseException:
+            # 취소된 대기자는 대기열에서 제거하고 다음 대기자에게 차례를 넘김
+            with self._lock:
+                self._remove(waiter)
+                self._wake_head()
+            raise
+
+    @contextmanager
+    def slot(self, priority: int = PRIORITY_INTERACTIVE) -> Iterator[None]:
+        """
+        실행 슬롯 (with 블록 진입 시 대기열에서 차례를 기다려 획득)
+
+        블록에서 발생한 과부하 오류는 AIMD 감소에 반영됩니다. 블록 진입
+        시점이 실제 호출 시작 시각이므로 호출 지연 측정은 블록 안에서 합니다.
+
+        Args:
+            priority: PRIORITY_INTERACTIVE 또는 PRIORITY_BATCH
+        """
+        self._acquire(priority)
+        try:
+            yield
+        except BaseException as e:
+            self._release(is_overload_error(e), False)
+            raise
+        self._release(False, True)
+
+    @asynccontextmanager
+    async def aslot(self, priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[None]:
+        """slot()의 비동기 버전 (async with)"""
+        await self._aacquire(priority)
+        try:
+            yield
+        except BaseException as e:
+            self._release(is_overload_error(e), False)
+            raise
+        self._release(False, True)
+
+    def call(self, fn: Callable[[], Any], priority: int = PRIORITY_INTERACTIVE) -> Any:
+        """
+        동기 호출 스케줄링
+
+        Args:
+            fn: 슬롯을 얻은 뒤 실행할 API 호출 함수
+            priority: PRIORITY_INTERACTIVE 또는 PRIORITY_BATCH
+
+        Returns:
+            fn()의 반환값 (예외는 그대로 전파)
+        """
+        with self.slot(priority):
+            return fn()
+
+    async def acall(
+        self,
+        coro_fn: Callable[[], Awaitable[Any]],
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> Any:
+        """
+        비동기 호출 스케줄링
+
+        Args:
+            coro_fn: 슬롯을 얻은 뒤 await할 API 호출 코루틴 함수
+            priority: PRIORITY_INTERACTIVE 또는 PRIORITY_BATCH
+
+        Returns:
+            coro_fn()의 결과 (예외는 그대로 전파)
+        """
+        async with self.aslot(priority):
+            return await coro_fn()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        스케줄러 통계 조회
+
+        Returns:
+            대기열 깊이(전체/우선순위별), 진행 중 호출 수, 동시 실행 제한,
+            토큰 수, 대기 시간 통계 딕셔너리
+        """
+        with self._lock:
+            depth_by_lane = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _, _ in self._queue:
+                name = PRIORITY_NAMES.get(priority, str(priority))
+                depth_by_lane[name] = depth_by_lane.get(name, 0) + 1
+
+            avg_wait = self._total_wait / self._admitted if self._admitted else 0.0
+            tokens = self._bucket.tokens
+            return {
+                "queue_depth": len(self._queue),
+                "queue_depth_by_lane": depth_by_lane,
+                "in_flight": self._in_flight,
+                "concurrency_limit": round(self._limit, 2),
+                "max_concurrent": self.max_concurrent,
+                "rate_per_minute": self._bucket.rate_per_second * 60,
+                "tokens_available": None
+                if tokens == float("inf")
+                else round(tokens, 2),
+                "admitted": self._admitted,
+                "admitted_by_lane": {
+                    PRIORITY_NAMES.get(p, str(p)): n
+                    for p, n in self._admitted_by_lane.items()
+                },
+                "overloads": self._overloads,
+                "avg_wait_ms": round(avg_wait * 1000, 2),
+                "max_wait_ms": round(self._max_wait * 1000, 2),
+            }
+
+
+def scheduler_from_env() -> ImagenScheduler:
+    """
+    환경 변수 기반 스케줄러 생성
+
+    - IMAGEN_RATE_LIMIT_RPM: 분당 최대 요청 수 (기본 0 = 제한 없음)
+    - IMAGEN_RATE_BURST: 순간 허용 요청 수 (기본 1)
+    - IMAGEN_MAX_CONCURRENT: 동시 API 호출 상한 (기본 8)
+    - IMAGEN_MIN_CONCURRENT: 과부하 시 동시 API 호출 하한 (기본 1)
+    """
+    return ImagenScheduler(
+        rate_per_minute=float(os.getenv("IMAGEN_RATE_LIMIT_RPM", "0")),
+        burst=int(os.getenv("IMAGEN_RATE_BURST", "1")),
+        max_concurrent=int(os.getenv("IMAGEN_MAX_CONCURRENT", "8")),
+        min_concurrent=int(os.getenv("IMAGEN_MIN_CONCURRENT", "1")),
+    )
@@ -0,0 +1,332 @@
+"""
+샤드 분할 이미지 캐시 모듈
+
+ImageCache는 모든 조회/저장이 하나의 RLock을 거치므로 스레드에서 실행되는
+도구 호출과 배치 생성의 캐시 HIT 조회가 그 잠금에서 직렬화됩니다.
+ShardedImageCache는 키 해시로 고른 N개의 독립된 ImageCache(샤드)에 항목을
+나누어 서로 다른 키의 조회가 같은 잠금을 기다리지 않게 합니다.
+
+핵심 기능:
+- 키 해시 기반 샤드 선택 (캐시 키는 SHA-256 16진수 문자열)
+- 샤드별 LRU/TTL/바이트 예산 (전체 예산을 샤드 수로 나눔, 근사 LRU)
+- L2 저장소는 모든 샤드가 공유 (다른 샤드의 키가 L2에서 제거되면 그 샤드에 전달)
+- 통계는 샤드 잠금을 하나씩 잡아 합산 (모든 샤드를 동시에 멈추지 않음)
+- ImageCache와 같은 인터페이스 (get/set/add/update/invalidate/invalidate_tag/
+  invalidate_prefix/resize/set_ttl/clear/keys/entries/get_stats)
+"""
+
+import logging
+import threading
+import zlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from generators.cache import ImageCache, _format_stats, _start_sweeper
+from generators.disk_cache import SqliteCacheStore
+
+logger = logging.getLogger(__name__)
+
+
+class ShardedImageCache:
+    """
+    N개의 ImageCache 샤드로 나눈 캐시
+
+    특징:
+    - 같은 키는 항상 같은 샤드 (crc32(key) % shards)
+    - 샤드마다 max_size/max_bytes를 나눈 값(올림)을 적용하므로 전체 LRU 순서는
+      근사치입니다 (샤드 안에서만 정확)
+    - 만료 정리 스레드는 캐시 전체에 하나 (샤드를 차례로 정리)
+    """
+
+    def __init__(
+        self,
+        max_size: int = 100,
+        ttl_seconds: int = 3600,
+        l2: Optional[SqliteCacheStore] = None,
+        validator: Optional[Callable[[Dict[str, Any]], bool]] = None,
+        on_remove: Optional[Callable[[str], None]] = None,
+        max_bytes: int = 0,
+        weigher: Optional[Callable[[Dict[str, Any]], int]] = None,
+        sweep_interval: float = 0,
+        shards: int = 8,
+        admission: str = "lru",
+    ):
+        """
+        캐시 초기화
+
+        Args:
+            max_size: 최대 캐시 항목 수 (샤드마다 max_size/shards, 올림)
+            ttl_seconds: 캐시 만료 시간(초)
+            l2: 모든 샤드가 공유하는 디스크 L2 저장소 (기본값: None)
+            validator: 캐시된 결과가 아직 유효한지 확인하는 함수
+            on_remove: 키가 캐시(모든 계층)에서 제거될 때 호출되는 함수
+            max_bytes: L1 항목 무게 합계 예산 (샤드마다 max_bytes/shards, 올림,
+                기본값: 0 = 제한 없음)
+            weigher: 결과의 무게(바이트)를 계산하는 함수
+            sweep_interval: 만료 항목 정리 스레드 실행 간격(초) (0 = 사용 안 함)
+            shards: 샤드 수 (기본값: 8)
+            admission: 샤드별 L1 제거 정책 ("lru" 또는 "tinylfu", 기본값: "lru")
+        """
+        self._shard_count = max(1, shards)
+        self._max_size = max_size
+        self._max_bytes = max(0, max_bytes)
+        self._ttl_seconds = ttl_seconds
+        self._l2 = l2
+        self._on_remove = on_remove
+        self._admission = admission
+        self._lock = threading.Lock()  # 정리 스레드 시작/중지 전용
+        self._sweeper: Optional[threading.Thread] = None
+        self._sweeper_stop = threading.Event()
+
+        per_shard_size = -(-max_size // self._shard_count)
+        per_shard_bytes = -(-self._max_bytes // self._shard_count)
+        self._shards: List[ImageCache] = [
+            ImageCache(
+                max_size=per_shard_size,
+                ttl_seconds=ttl_seconds,
+                l2=l2,
+                validator=validator,
+                on_remove=on_remove,
+                max_bytes=per_shard_bytes,
+                weigher=weigher,
+                owner=self._shard_for,
+                admission=admission,
+            )
+            for _ in range(self._shard_count)
+        ]
+
+        if sweep_interval > 0:
+            self.start_sweeper(sweep_interval)
+
+    def _shard_for(self, key: str) -> ImageCache:
+        """키를 담당하는 샤드"""
+        return self._shards[zlib.crc32(key.encode()) % self._shard_count]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시에서 항목 조회 (ImageCache.get()과 같음)"""
+        return self._shard_for(key).get(key)
+
+    def set(self, key: str, result: Dict[str, Any], tags: Iterable[str] = ()) -> None:
+        """캐시에 항목 저장 (ImageCache.set()과 같음)"""
+        self._shard_for(key).set(key, result, tags)
+
+    def add(
+        self,
+        key: str,
+        result: Dict[str, Any],
+        created_at: float,
+        tags: Iterable[str] = (),
+        l1: bool = True,
+    ) -> bool:
+        """없는 키만 저장 (ImageCache.add()와 같음)"""
+        return self._shard_for(key).add(key, result, created_at, tags, l1)
+
+    def update(self, key: str, result: Dict[str, Any]) -> bool:
+        """기존 항목의 결과만 교체 (ImageCache.update()와 같음)"""
+        return self._shard_for(key).update(key, result)
+
+    def expires_in(self, key: str) -> Optional[float]:
+        """L1 항목의 남은 유효 시간 (ImageCache.expires_in()과 같음)"""
+        return self._shard_for(key).expires_in(key)
+
+    def invalidate(self, key: str) -> bool:
+        """특정 키의 캐시 무효화 (ImageCache.invalidate()와 같음)"""
+        return self._shard_for(key).invalidate(key)
+
+    def invalidate_tag(self, tag: str) -> int:
+        """
+        태그가 붙은 모든 항목 무효화 (샤드별 역색인과 L2 역색인의 합집합)
+
+        Returns:
+            무효화된 항목 수
+        """
+        keys: Set[str] = set()
+        for shard in self._shards:
+            with shard._lock:
+                shard._drain_pending()
+                keys.update(shard._tag_index.get(tag, ()))
+        if self._l2 is not None:
+            keys.update(self._l2.keys_for_tag(tag))
+        return sum(1 for key in keys if self.invalidate(key))
+
+    def invalidate_prefix(self, prefix: str) -> int:
+        """키가 접두사로 시작하는 모든 항목 무효화 (ImageCache.invalidate_prefix()와 같음)"""
+        if not prefix:
+            return 0
+        keys: Set[str] = set()
+        for shard in self._shards:
+            with shard._lock:
+                shard._drain_pending()
+                keys.update(key for key in shard._cache if key.startswith(prefix))
+        if self._l2 is not None:
+            keys.update(self._l2.keys_with_prefix(prefix))
+        return sum(1 for key in keys if self.invalidate(key))
+
+    def resize(
+        self, max_size: Optional[int] = None, max_bytes: Optional[int] = None
+    ) -> int:
+        """
+        실행 중 최대 항목 수/바이트 예산 변경 (샤드마다 나눈 값, 샤드를 하나씩 처리)
+
+        Returns:
+            L1에서 제거된 항목 수
+        """
+        if max_size is not None:
+            self._max_size = max(1, max_size)
+        if max_bytes is not None:
+            self._max_bytes = max(0, max_bytes)
+        evicted = sum(
+            shard.resize(
+                max_size=None
+                if max_size is None
+                else -(-self._max_size // self._shard_count),
+                max_bytes=None
+                if max_bytes is None
+                else -(-self._max_bytes // self._shard_count),
+                include_l2=False,
+            )
+            for shard in self._shards
+        )
+        if self._l2 is not None and max_bytes is not None:
+            # 공유 L2는 전체 예산으로 한 번만 줄이고 제거된 키는 보유 샤드에 전달
+            owner = self._shards[0]
+            with owner._lock:
+                owner._sync_l2(self._l2.resize(max_bytes=self._max_bytes))
+        return evicted
+
+    def set_ttl(self, ttl_seconds: int) -> int:
+        """
+        실행 중 TTL 변경 (ImageCache.set_ttl()과 같음, 샤드를 하나씩 처리)
+
+        Returns:
+            새 TTL로 만료되어 제거된 항목 수
+        """
+        self._ttl_seconds = ttl_seconds
+        removed = sum(
+            shard.set_ttl(ttl_seconds, include_l2=False) for shard in self._shards
+        )
+        if self._l2 is not None:
+            self._l2.set_ttl(ttl_seconds)
+            removed += self.purge_expired()
+        return removed
+
+    def tag_counts(self) -> Dict[str, int]:
+        """태그별 항목 수 (ImageCache.tag_counts()와 같음)"""
+        if self._l2 is not None:
+            return self._l2.tag_counts()
+        counts: Dict[str, int] = {}
+        for shard in self._shards:
+            for tag, count in shard.tag_counts().items():
+                counts[tag] = counts.get(tag, 0) + count
+        return counts
+
+    def purge_expired(self) -> int:
+        """
+        만료된 항목을 모든 샤드와 L2에서 제거 (샤드 잠금을 하나씩 사용)
+
+        Returns:
+            제거된 항목 수
+        """
+        removed = sum(shard.purge_expired(include_l2=False) for shard in self._shards)
+        if self._l2 is not None:
+            # L1에 없는 만료 L2 항목은 공유 저장소에서 한 번만 정리
+            expired = self._l2.purge_expired()
+            for key in expired:
+                shard = self._shard_for(key)
+                shard._discard_later(key)
+                with shard._lock:
+                    shard._expired += 1
+                if self._on_remove is not None:
+                    self._on_remove(key)
+            removed += len(expired)
+        if removed:
+            logger.info(
+                f"만료 캐시 항목 정리: {removed}개 ({self._shard_count}개 샤드)"
+            )
+        return removed
+
+    def start_sweeper(self, interval: float) -> None:
+        """만료 항목 정리 스레드 시작 (이미 실행 중이면 무시)"""
+        with self._lock:
+            if self._sweeper is not None and self._sweeper.is_alive():
+                return
+            self._sweeper_stop = threading.Event()
+            self._sweeper = _start_sweeper(self, interval, self._sweeper_stop)
+
+    def stop_sweeper(self) -> None:
+        """만료 항목 정리 스레드 중지"""
+        self._sweeper_stop.set()
+        sweeper = self._sweeper
+        if sweeper is not None and sweeper is not threading.current_thread():
+            sweeper.join(timeout=5)
+        self._sweeper = None
+
+    def clear(self) -> int:
+        """
+        전체 캐시 초기화 (모든 샤드와 L2)
+
+        Returns:
+            삭제된 항목 수 (L2가 있으면 L2 기준)
+        """
+        keys = set(self.keys())
+        for shard in self._shards:
+            shard._clear_l1()
+        if self._l2 is not None:
+            self._l2.clear()
+        if self._on_remove is not None:
+            for key in keys:
+                self._on_remove(key)
+        return len(keys)
+
+    def keys(self) -> List[str]:
+        """캐시된 모든 키 (모든 샤드의 L1과 L2 합집합)"""
+        keys: List[str] = []
+        for shard in self._shards:
+            with shard._lock:
+                shard._drain_pending()
+                keys.extend(shard._cache)
+        if self._l2 is not None:
+            known = set(keys)
+            keys.extend(k for k in self._l2.keys() if k not in known)
+        return keys
+
+    def entries(
+        self,
+    ) -> Iterator[Tuple[str, Dict[str, Any], float, float, Tuple[str, ...]]]:
+        """만료되지 않은 항목 순회 (샤드 L1을 하나씩 복사한 뒤 공유 L2는 한 번만)"""
+        known: Set[str] = set()
+        for shard in self._shards:
+            for item in shard.entries(include_l2=False):
+                known.add(item[0])
+                yield item
+        if self._l2 is not None:
+            yield from (item for item in self._l2.entries() if item[0] not in known)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        캐시 통계 조회 (샤드별 카운터를 하나씩 읽어 합산)
+
+        Returns:
+            ImageCache.get_stats()와 같은 형식에 shards(샤드 수)와
+            shard_sizes(샤드별 항목 수)를 추가한 딕셔너리
+        """
+        per_shard = [shard._counters() for shard in self._shards]
+        totals = {
+            name: sum(counters[name] for counters in per_shard) for name in per_shard[0]
+        }
+        stats = _format_stats(
+            totals,
+            max_size=self._max_size,
+            max_bytes=self._max_bytes,
+            ttl_seconds=self._ttl_seconds,
+            l2=self._l2,
+            sweeper_running=self._sweeper is not None and self._sweeper.is_alive(),
+            admission=self._admission,
+        )
+        stats["shards"] = self._shard_count
+        stats["shard_sizes"] = [counters["size"] for counters in per_shard]
+        return stats
+
+    @property
+    def size(self) -> int:
+        """현재 캐시 크기 (모든 샤드의 L1 항목 수)"""
+        return sum(shard.size for shard in self._shards)
@@ -0,0 +1,136 @@
+"""
+진행 중인 요청 병합 (Single-flight) 모듈
+
+동일한 캐시 키로 동시에 들어온 요청 중 첫 번째(leader)만 실제 작업을 수행하고,
+나머지(follower)는 leader의 결과를 기다려 공유합니다.
+
+핵심 기능:
+- 동기(스레드) 경로와 비동기(asyncio) 경로가 같은 진행 중 테이블을 공유
+- concurrent.futures.Future 기반으로 스레드/이벤트 루프 간 결과 전달
+- 비동기 leader 작업은 분리된 태스크로 실행 (leader 호출자가 취소되어도
+  follower는 결과를 받음)
+- 병합된 요청 수 통계
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Set, Tuple
+
+
+class SingleFlight:
+    """
+    키 단위 진행 중 요청 병합기
+
+    특징:
+    - do(): 스레드에서 호출하는 동기 버전
+    - ado(): 이벤트 루프에서 호출하는 비동기 버전
+    - leader의 예외는 모든 follower에게 그대로 전달
+    - ado()의 leader 작업은 호출자와 분리된 태스크이므로 MCP 클라이언트
+      타임아웃 등으로 leader 호출자가 취소되어도 중단되지 않음
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._coalesced = 0
+        # 실행 중인 leader 태스크 (호출자가 취소된 뒤에도 수거되지 않도록 보관)
+        self._tasks: Set[asyncio.Future] = set()
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """진행 중인 호출에 합류하거나 새 호출의 leader가 됨"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._coalesced += 1
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            return future, True
+
+    def _finish(self, key: str, future: Future) -> None:
+        """진행 중 테이블에서 제거 (결과 설정 전에 호출)"""
+        with self._lock:
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        동기 호출 병합
+
+        Args:
+            key: 병합 키 (캐시 키)
+            fn: leader가 실행할 함수
+
+        Returns:
+            (결과, 병합 여부) - follower인 경우 병합 여부가 True
+        """
+        future, leader = self._join(key)
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future)
+            future.set_exception(e)
+            raise
+
+        self._finish(key, future)
+        future.set_result(result)
+        return result, False
+
+    async def ado(
+        self, key: str, coro_fn: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, bool]:
+        """
+        비동기 호출 병합
+
+        Args:
+            key: 병합 키 (캐시 키)
+            coro_fn: leader가 await할 코루틴 함수
+
+        Returns:
+            (결과, 병합 여부) - follower인 경우 병합 여부가 True
+        """
+        future, leader = self._join(key)
+        if not leader:
+            # follower가 취소되어도 공유 Future는 취소되지 않도록 shield
+            return await asyncio.shield(asyncio.wrap_future(future)), True
+
+        # leader 호출자가 취소되어도 작업은 계속되어 follower에게 결과 전달
+        task = asyncio.ensure_future(coro_fn())
+        self._tasks.add(task)
+        task.add_done_callback(lambda done: self._settle(key, future, done))
+        return await asyncio.shield(task), False
+
+    def _settle(self, key: str, future: Future, task: asyncio.Future) -> None:
+        """분리된 leader 태스크 완료 시 공유 Future에 결과 전달"""
+        self._tasks.discard(task)
+        self._finish(key, future)
+        if task.cancelled():
+            future.set_exception(asyncio.CancelledError())
+            return
+        error = task.exception()
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(task.result())
+
+    @property
+    def coalesced(self) -> int:
+        """병합된(follower) 요청 수"""
+        with self._lock:
+            return self._coalesced
+
+    @property
+    def in_flight(self) -> int:
+        """현재 진행 중인 leader 호출 수"""
+        with self._lock:
+            return len(self._calls)
+
+    def reset_stats(self) -> None:
+        """통계 초기화"""
+        with self._lock:
+            self._coalesced = 0
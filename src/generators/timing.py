@@ -0,0 +1,26 @@
+"""
+생성 파이프라인 단계별 소요 시간 측정 모듈
+
+각 단계의 소요 시간을 "<단계>_ms" 키로 딕셔너리에 기록합니다.
+워커 프로세스에서도 사용되므로 표준 라이브러리만 사용합니다.
+"""
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+@contextmanager
+def stage_timer(timings: Dict[str, float], stage: str) -> Iterator[None]:
+    """
+    with 블록의 소요 시간을 timings["<stage>_ms"]에 기록 (밀리초, 소수점 2자리)
+
+    Args:
+        timings: 측정 결과를 기록할 딕셔너리
+        stage: 단계 이름 (예: "api", "decode")
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[f"{stage}_ms"] = round((time.perf_counter() - started) * 1000, 2)
@@ -0,0 +1,19 @@
+"""
+Background Job Queue
+
+This module provides a disk-persisted job queue and in-process worker pool
+for long-running tool calls (fire-and-poll).
+"""
+
+from .models import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, Job
+from .job_queue import JobQueue, job_queue_from_env
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "job_queue_from_env",
+    "JOB_QUEUED",
+    "JOB_RUNNING",
+    "JOB_SUCCEEDED",
+    "JOB_FAILED",
+]
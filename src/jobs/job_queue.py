@@ -0,0 +1,316 @@
+"""
+비동기 작업 큐
+
+장시간 도구 호출(배치 이미지 생성, gen_ppt 등)을 즉시 작업 ID로 반환하고
+서버 프로세스 안의 워커가 백그라운드에서 실행합니다.
+
+핵심 기능:
+- 작업 종류별 핸들러 등록 후 submit()으로 제출
+- asyncio 워커 풀 (동시 실행 작업 수 제한)
+- 작업 목록을 JSON 파일에 저장하여 서버 재시작 후에도 대기/실행 중 작업 재개
+- 완료된 작업은 최근 max_finished개만 보관
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .models import JOB_FAILED, JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, Job
+
+logger = logging.getLogger(__name__)
+
+# 작업 핸들러: 작업 파라미터를 받아 결과(JSON 직렬화 가능)를 반환하는 코루틴 함수
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+class JobQueue:
+    """
+    디스크에 저장되는 작업 큐와 워커 풀
+
+    Attributes:
+        store_path: 작업 목록 저장 파일 경로
+        workers: 동시에 실행할 작업 수
+        max_finished: 보관할 완료 작업 수 (초과 시 오래된 작업부터 삭제)
+    """
+
+    def __init__(self, store_path: Path, workers: int = 2, max_finished: int = 200):
+        """
+        작업 큐를 초기화하고 저장된 작업을 로드합니다.
+
+        실행 중 상태로 저장된 작업은 이전 서버가 중단된 것이므로
+        대기 상태로 되돌려 다시 실행합니다.
+
+        Args:
+            store_path: 작업 목록 저장 파일 경로
+            workers: 동시에 실행할 작업 수
+            max_finished: 보관할 완료 작업 수
+        """
+        self.store_path = Path(store_path)
+        self.workers = max(1, workers)
+        self.max_finished = max(0, max_finished)
+
+        self._lock = threading.RLock()
+        self._jobs: Dict[str, Job] = {}  # 제출 순서 유지
+        self._handlers: Dict[str, JobHandler] = {}
+        self._pending: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker_tasks: List[asyncio.Task] = []
+
+        self._load()
+
+    def _load(self) -> None:
+        """작업 목록 파일을 로드합니다."""
+        if not self.store_path.exists():
+            return
+        try:
+            with open(self.store_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self._jobs = {job["id"]: Job.from_dict(job) for job in data.get("jobs", [])}
+        except (
+            OSError,
+            json.JSONDecodeError,
+            KeyError,
+            TypeError,
+            AttributeError,
+        ) as e:
+            logger.error(f"작업 목록 로드 실패: {e}")
+            self._jobs = {}
+            return
+
+        recovered = 0
+        for job in self._jobs.values():
+            if job.status == JOB_RUNNING:
+                job.status = JOB_QUEUED
+                job.started_at = None
+                recovered += 1
+        logger.info(
+            f"작업 목록 로드 완료: {len(self._jobs)}개 작업 (재개 {recovered}개)"
+        )
+
+    def _save(self) -> None:
+        """작업 목록을 임시 파일에 쓴 뒤 교체하여 저장합니다."""
+        with self._lock:
+            data = {
+                "jobs": [job.to_dict() for job in self._jobs.values()],
+                "last_updated": datetime.now().isoformat(),
+            }
+            self.store_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.store_path.with_suffix(self.store_path.suffix + ".tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.store_path)
+
+    def register_handler(self, kind: str, handler: JobHandler) -> None:
+        """
+        작업 종류별 핸들러를 등록합니다.
+
+        Args:
+            kind: 작업 종류 이름
+            handler: 작업 파라미터를 받아 결과를 반환하는 코루틴 함수
+        """
+        self._handlers[kind] = handler
+
+    async def start(self) -> None:
+        """
+        현재 이벤트 루프에서 워커를 시작합니다 (이미 시작된 경우 무시).
+
+        대기 중인 작업(재시작 전 제출된 작업 포함)을 제출 순서대로 큐에 넣습니다.
+        """
+        loop = asyncio.get_running_loop()
+        if self._loop is loop and self._worker_tasks:
+            return
+
+        self._loop = loop
+        self._pending = asyncio.Queue()
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status == JOB_QUEUED:
+                    self._pending.put_nowait(job.id)
+        self._worker_tasks = [
+            asyncio.create_task(self._worker()) for _ in range(self.workers)
+        ]
+        logger.info(
+            f"작업 워커 시작: {self.workers}개 (대기 {self._pending.qsize()}개)"
+        )
+
+    async def shutdown(self) -> None:
+        """워커를 중지합니다. 실행 중이던 작업은 다음 시작 시 재실행됩니다."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._loop = None
+
+    async def submit(self, kind: str, params: Dict[str, Any]) -> Job:
+        """
+        작업을 제출합니다.
+
+        워커가 시작되지 않았으면 현재 이벤트 루프에서 시작하고,
+        작업은 디스크에 저장된 뒤 큐에 추가됩니다.
+
+        Args:
+            kind: 등록된 작업 종류
+            params: 핸들러에 전달할 파라미터 (JSON 직렬화 가능)
+
+        Returns:
+            제출된 작업
+
+        Raises:
+            ValueError: 등록되지 않은 작업 종류
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job kind: {kind}")
+
+        await self.start()
+        assert self._pending is not None
+
+        job = Job(
+            id=f"job_{uuid.uuid4().hex[:12]}",
+            kind=kind,
+            params=params,
+            status=JOB_QUEUED,
+            created_at=datetime.now().isoformat(),
+        )
+        with self._lock:
+            self._jobs[job.id] = job
+        await asyncio.to_thread(self._save)
+
+        self._pending.put_nowait(job.id)
+        logger.info(f"작업 제출: {job.id} ({kind})")
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """
+        작업을 조회합니다.
+
+        Args:
+            job_id: 작업 ID
+
+        Returns:
+            작업 또는 None
+        """
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def queue_position(self, job_id: str) -> Optional[int]:
+        """
+        대기 중인 작업의 순번 (1부터 시작, 대기 중이 아니면 None)
+
+        Args:
+            job_id: 작업 ID
+        """
+        with self._lock:
+            queued = [job.id for job in self._jobs.values() if job.status == JOB_QUEUED]
+        return queued.index(job_id) + 1 if job_id in queued else None
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 20) -> List[Job]:
+        """
+        작업 목록을 최근 제출 순으로 조회합니다.
+
+        Args:
+            status: 상태 필터 (None이면 전체)
+            limit: 최대 개수
+
+        Returns:
+            작업 목록
+        """
+        with self._lock:
+            jobs = [
+                job
+                for job in reversed(list(self._jobs.values()))
+                if status is None or job.status == status
+            ]
+        return jobs[: max(0, limit)]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        작업 큐 통계 조회
+
+        Returns:
+            상태별 작업 수와 워커 수 딕셔너리
+        """
+        with self._lock:
+            counts = {
+                status: 0
+                for status in (JOB_QUEUED, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED)
+            }
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "workers": self.workers,
+            "running_workers": len(self._worker_tasks),
+            **counts,
+        }
+
+    async def _worker(self) -> None:
+        """큐에서 작업을 꺼내 순서대로 실행합니다."""
+        assert self._pending is not None
+        while True:
+            job_id = await self._pending.get()
+            try:
+                job = self.get(job_id)
+                if job is not None and job.status == JOB_QUEUED:
+                    await self._run(job)
+            finally:
+                self._pending.task_done()
+
+    async def _run(self, job: Job) -> None:
+        """
+        작업 하나를 실행하고 결과를 저장합니다.
+
+        핸들러 오류는 작업 실패로 기록되며 워커는 계속 실행됩니다.
+        """
+        with self._lock:
+            job.status = JOB_RUNNING
+            job.started_at = datetime.now().isoformat()
+            job.runs += 1
+        await asyncio.to_thread(self._save)
+
+        handler = self._handlers.get(job.kind)
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for job kind: {job.kind}")
+            result = await handler(job.params)
+            with self._lock:
+                job.result = result
+                job.status = JOB_SUCCEEDED
+            logger.info(f"작업 완료: {job.id}")
+        except Exception as e:
+            logger.error(f"작업 실패: {job.id} - {e}")
+            with self._lock:
+                job.error = str(e)
+                job.status = JOB_FAILED
+
+        with self._lock:
+            job.finished_at = datetime.now().isoformat()
+            self._prune_finished()
+        await asyncio.to_thread(self._save)
+
+    def _prune_finished(self) -> None:
+        """보관 개수를 초과한 오래된 완료 작업을 삭제합니다 (잠금 보유 상태)."""
+        finished = [job.id for job in self._jobs.values() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+
+def job_queue_from_env() -> JobQueue:
+    """
+    환경 변수 기반 작업 큐 생성
+
+    - JOB_STORE_PATH: 작업 목록 저장 파일 (기본 IMAGE_OUTPUT_DIR 상위 디렉토리의
+      jobs.json, 갤러리 metadata.json과 같은 위치)
+    - JOB_WORKERS: 동시에 실행할 작업 수 (기본 2)
+    - JOB_MAX_FINISHED: 보관할 완료 작업 수 (기본 200)
+    """
+    output_root = Path(os.getenv("IMAGE_OUTPUT_DIR", "output/images")).parent
+    return JobQueue(
+        store_path=Path(os.getenv("JOB_STORE_PATH", str(output_root / "jobs.json"))),
+        workers=int(os.getenv("JOB_WORKERS", "2")),
+        max_finished=int(os.getenv("JOB_MAX_FINISHED", "200")),
+    )
@@ -0,0 +1,76 @@
+"""
+작업 큐 모델
+
+Job 데이터클래스와 작업 상태 상수를 제공합니다.
+"""
+
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, Optional
+
+# 작업 상태
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+
+FINISHED_STATUSES = (JOB_SUCCEEDED, JOB_FAILED)
+
+
+@dataclass
+class Job:
+    """
+    비동기 작업 데이터 클래스
+
+    제출된 장시간 작업(배치 이미지 생성, Skywork 문서 생성 등)의
+    파라미터, 상태, 결과를 저장합니다.
+
+    Attributes:
+        id: 고유 작업 ID
+        kind: 작업 종류 (등록된 핸들러 이름)
+        params: 핸들러에 전달할 파라미터 (JSON 직렬화 가능)
+        status: 작업 상태 (queued, running, succeeded, failed)
+        created_at: 제출 일시 (ISO 8601 형식)
+        started_at: 실행 시작 일시 (없으면 None)
+        finished_at: 완료 일시 (없으면 None)
+        result: 핸들러 반환값 (성공 시)
+        error: 오류 메시지 (실패 시)
+        runs: 실행 시작 횟수 (서버 재시작으로 재실행되면 증가)
+    """
+
+    id: str
+    kind: str
+    params: Dict[str, Any]
+    status: str
+    created_at: str
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    result: Any = None
+    error: Optional[str] = None
+    runs: int = field(default=0)
+
+    @property
+    def finished(self) -> bool:
+        """성공 또는 실패로 종료되었는지 여부"""
+        return self.status in FINISHED_STATUSES
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        작업을 딕셔너리로 변환합니다.
+
+        Returns:
+            작업의 딕셔너리 표현
+        """
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Job":
+        """
+        딕셔너리에서 작업 인스턴스를 생성합니다.
+
+        Args:
+            data: 작업 딕셔너리
+
+        Returns:
+            Job 인스턴스
+        """
+        return cls(**data)
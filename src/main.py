@@ -1,10 +1,12 @@
+import asyncio
 import json
 import os
 import hashlib
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Any, AsyncIterator, Dict, List, Optional
 
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from dotenv import load_dotenv
 import logging
 import sys
@@ -20,33 +22,58 @@ logging.basicConfig(
 )
 
 try:
-    from src.generators.image_gen import get_image_generator
+    from src.generators.image_gen import MAX_VARIANTS, get_image_generator
 except ImportError:
     # If run as script from src/ dir
-    from generators.image_gen import get_image_generator  # type: ignore[no-redef]
+    from generators.image_gen import MAX_VARIANTS, get_image_generator  # type: ignore[no-redef]
 
 try:
     from src.gallery.image_gallery import ImageGallery
 except ImportError:
     from gallery.image_gallery import ImageGallery  # type: ignore[no-redef]
 
+try:
+    from src.jobs import JOB_FAILED, JOB_SUCCEEDED, job_queue_from_env
+except ImportError:
+    from jobs import JOB_FAILED, JOB_SUCCEEDED, job_queue_from_env  # type: ignore[no-redef]
+
 # Load environment variables
 load_dotenv()
 
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP) -> AsyncIterator[None]:
+    """서버 시작 시 재시작 전 대기/실행 중이던 작업을 재개하고, 종료 시 생성기 정리"""
+    await job_queue.start()
+    try:
+        yield
+    finally:
+        image_gen.close()
+
+
 # Initialize FastMCP server
-mcp = FastMCP("Smart Visual Toolkit")
+mcp = FastMCP("Smart Visual Toolkit", lifespan=_lifespan)
 
 # Initialize Generators
 image_gen = get_image_generator()
 
 # Initialize Gallery (SPEC-GALLERY-001)
-output_dir = Path("output/images")
-metadata_path = Path("output/metadata.json")
+output_dir = image_gen.output_dir
+metadata_path = output_dir.parent / "metadata.json"
 gallery = ImageGallery(
     images_dir=output_dir,
     metadata_path=metadata_path,
     enable_thumbnails=os.getenv("ENABLE_THUMBNAILS", "false").lower() == "true",
+    blob_store=image_gen.blob_store,
 )
+# 새로 생성된 이미지를 갤러리에 자동 등록
+image_gen.set_gallery(gallery)
+# 갤러리 기록으로 캐시 예열 (백그라운드 스레드, 서버 시작을 지연하지 않음)
+if os.getenv("CACHE_WARMUP", "true").lower() == "true":
+    image_gen.start_cache_warmup()
+
+# 장시간 작업 큐 (submit_* 도구로 제출, 디스크에 저장되어 재시작 후 재개)
+job_queue = job_queue_from_env()
 
 # Load styles for internal use
 STYLES_PATH = Path(__file__).parent / "resources" / "banana_styles.json"
@@ -74,22 +101,48 @@ def list_styles() -> str:
     return "\n".join(result)
 
 
+def _validate_variants(variants: int) -> Optional[str]:
+    """변형 수 검증 (오류 메시지 또는 None)"""
+    if not 1 <= variants <= MAX_VARIANTS:
+        return f"Error: variants must be between 1 and {MAX_VARIANTS}, got {variants}"
+    return None
+
+
+def _format_variants(result: Dict[str, Any]) -> List[str]:
+    """변형 이미지 경로 목록 포맷"""
+    lines = []
+    for variant in result.get("variants", []):
+        cached = " (cached)" if variant.get("cached") else ""
+        lines.append(f"- Variant {variant['variant']}{cached}: {variant['local_path']}")
+    return lines
+
+
 @mcp.tool()
-def generate_image(prompt: str, style_name: Optional[str] = None) -> str:
+async def generate_image(
+    prompt: str, style_name: Optional[str] = None, variants: int = 1
+) -> str:
     """
     Generates an image using Nano Banana Pro style patterns.
     - prompt: Visual description of the image.
     - style_name: Optional style name from list_styles().
+    - variants: Number of candidate images (1-4) generated in one API call.
     """
-    result = image_gen.generate(prompt, style_name)
+    error = _validate_variants(variants)
+    if error:
+        return error
+
+    result = await image_gen.agenerate(prompt, style_name, variants=variants)
     if result["success"]:
-        return f"Image generation request successful.\nPrompt used: {result['prompt']}\nStatus: {result['status']}\nLocal Path: {result.get('local_path')}"
+        message = f"Image generation request successful.\nPrompt used: {result['prompt']}\nStatus: {result['status']}\nLocal Path: {result.get('local_path')}"
+        if result.get("variants"):
+            message += "\nVariants:\n" + "\n".join(_format_variants(result))
+        return message
     else:
         return f"Error: {result['error']}"
 
 
 @mcp.tool()
-def generate_image_advanced(
+async def generate_image_advanced(
     prompt: str,
     style_name: Optional[str] = None,
     aspect_ratio: str = "16:9",
@@ -100,6 +153,7 @@ def generate_image_advanced(
     negative_prompt: Optional[str] = None,
     style_intensity: str = "normal",
     enhance_prompt: bool = True,
+    variants: int = 1,
 ) -> str:
     """
     Advanced image generation with fine-grained control (SPEC-IMG-004).
@@ -121,6 +175,7 @@ def generate_image_advanced(
         negative_prompt: Elements to exclude from generation (optional)
         style_intensity: Style strength - weak/normal/strong (default: "normal")
         enhance_prompt: Enable automatic style keyword addition (default: True)
+        variants: Number of candidate images 1-4 generated in one API call (default: 1)
 
     Style Intensity Guide:
     - weak: 1-2 style keywords added
@@ -144,6 +199,10 @@ def generate_image_advanced(
     if style_intensity not in valid_intensities:
         return f"Error: Invalid style_intensity '{style_intensity}'. Must be one of: {', '.join(valid_intensities)}"
 
+    error = _validate_variants(variants)
+    if error:
+        return error
+
     # 해상도 검증
     if width and height:
         from models.prompt_enhancer import validate_resolution
@@ -155,7 +214,7 @@ def generate_image_advanced(
         # 둘 중 하나만 제공된 경우
         return "Error: Both width and height must be provided together for custom resolution."
 
-    result = image_gen.generate_advanced(
+    result = await image_gen.agenerate_advanced(
         prompt=prompt,
         style_name=style_name,
         aspect_ratio=aspect_ratio,
@@ -166,6 +225,7 @@ def generate_image_advanced(
         negative_prompt=negative_prompt,
         style_intensity=style_intensity,
         enhance_prompt=enhance_prompt,
+        variants=variants,
     )
 
     if result["success"]:
@@ -189,11 +249,77 @@ def generate_image_advanced(
         response_parts.append(f"Status: {result['status']}")
         response_parts.append(f"Local Path: {result.get('local_path')}")
 
+        if result.get("variants"):
+            response_parts.append("Variants:")
+            response_parts.extend(_format_variants(result))
+
         return "\n".join(response_parts)
     else:
         return f"Error: {result['error']}"
 
 
+@mcp.tool()
+async def generate_images_batch(
+    prompts: List[Dict[str, Any]],
+    default_style: Optional[str] = None,
+    max_concurrent: Optional[int] = None,
+    ctx: Optional[Context] = None,
+) -> str:
+    """
+    Generates multiple images concurrently (SPEC-IMG-001).
+
+    Cached prompts are returned immediately; the rest run in parallel with at
+    most `max_concurrent` Imagen calls in flight. Progress is reported as each
+    item finishes, and one failed item never cancels the rest of the batch.
+
+    Args:
+        prompts: List of items like {"prompt": str, "style": str (optional),
+            "aspect_ratio": str (optional), "format": str (optional),
+            "quality": int (optional)}
+        default_style: Style for items without their own style (optional)
+        max_concurrent: Maximum number of concurrent API calls (optional, defaults
+            to and is capped at the server's BATCH_MAX_CONCURRENT)
+    """
+    if not prompts:
+        return (
+            'No prompts provided. Pass a list of {"prompt": ..., "style": ...} items.'
+        )
+
+    async def report(entry: Dict[str, Any], completed: int, total: int) -> None:
+        if ctx is None:
+            return
+        status = "ok" if entry["success"] else "failed"
+        await ctx.report_progress(
+            completed, total, message=f"#{entry['index']} {status}"
+        )
+
+    result = await image_gen.generate_batch(
+        prompts,
+        max_concurrent=max_concurrent,
+        default_style=default_style,
+        on_result=report,
+    )
+
+    if "results" not in result:
+        return f"Error: {result['error']}"
+
+    lines = [
+        f"Batch generation finished: {result['succeeded']}/{result['total']} succeeded, "
+        f"{result['failed']} failed, {result['cached']} from cache.",
+        "",
+    ]
+    for entry in result["results"]:
+        if entry["success"]:
+            cached = " (cached)" if entry.get("cached") else ""
+            lines.append(
+                f"[{entry['index']}] OK{cached} - {entry['style']}: {entry['local_path']}"
+            )
+        else:
+            lines.append(f"[{entry['index']}] FAILED - {entry['error']}")
+
+    return "\n".join(lines)
+
+
 @mcp.tool()
 def get_skywork_config(
     secret_id: Optional[str] = None, secret_key: Optional[str] = None
@@ -324,6 +450,325 @@ async def gen_ppt_fast(query: str, use_network: str = "true") -> str:
     return await _call_skywork_tool("gen_ppt_fast", query, use_network)
 
 
+# --- Background Jobs (fire-and-poll) ---
+
+SKYWORK_JOB_TOOLS = ("gen_doc", "gen_excel", "gen_ppt")
+
+
+async def _run_images_batch_job(params: Dict[str, Any]) -> str:
+    return await generate_images_batch(**params)
+
+
+def _make_skywork_job(tool_name: str):
+    async def run(params: Dict[str, Any]) -> str:
+        return await _call_skywork_tool(tool_name, **params)
+
+    return run
+
+
+job_queue.register_handler("images_batch", _run_images_batch_job)
+for _tool_name in SKYWORK_JOB_TOOLS:
+    job_queue.register_handler(_tool_name, _make_skywork_job(_tool_name))
+
+
+async def _submit_job(kind: str, params: Dict[str, Any]) -> str:
+    """작업 제출 후 작업 ID 안내 메시지 반환"""
+    job = await job_queue.submit(kind, params)
+    position = job_queue.queue_position(job.id)
+    return (
+        f"Job submitted: {job.id} ({kind})\n"
+        f"Queue position: {position}\n"
+        f'Poll with get_job_status(job_id="{job.id}") and fetch the output '
+        f'with get_job_result(job_id="{job.id}").'
+    )
+
+
+@mcp.tool()
+async def submit_images_batch(
+    prompts: List[Dict[str, Any]],
+    default_style: Optional[str] = None,
+    max_concurrent: Optional[int] = None,
+) -> str:
+    """
+    Submits a batch image generation job and returns a job id immediately.
+
+    Same arguments as generate_images_batch. Use get_job_status / get_job_result
+    to follow the job instead of holding the tool call open.
+    """
+    if not prompts:
+        return (
+            'No prompts provided. Pass a list of {"prompt": ..., "style": ...} items.'
+        )
+    return await _submit_job(
+        "images_batch",
+        {
+            "prompts": prompts,
+            "default_style": default_style,
+            "max_concurrent": max_concurrent,
+        },
+    )
+
+
+@mcp.tool()
+async def submit_gen_doc(query: str, use_network: str = "true") -> str:
+    """
+    [Skywork Proxy] Submits a Word document job and returns a job id immediately.
+    - query: Description of the document.
+    - use_network: "true" or "false" (string).
+    """
+    return await _submit_job("gen_doc", {"query": query, "use_network": use_network})
+
+
+@mcp.tool()
+async def submit_gen_excel(query: str, use_network: str = "true") -> str:
+    """
+    [Skywork Proxy] Submits an Excel spreadsheet job and returns a job id immediately.
+    - query: Description of the data/table.
+    - use_network: "true" or "false" (string).
+    """
+    return await _submit_job("gen_excel", {"query": query, "use_network": use_network})
+
+
+@mcp.tool()
+async def submit_gen_ppt(query: str, use_network: str = "true") -> str:
+    """
+    [Skywork Proxy] Submits a PowerPoint job (often 5+ minutes) and returns a job id immediately.
+    - query: Description of the slides.
+    - use_network: "true" or "false" (string).
+    """
+    return await _submit_job("gen_ppt", {"query": query, "use_network": use_network})
+
+
+@mcp.tool()
+def get_job_status(job_id: str) -> str:
+    """
+    Shows the status of a submitted job (queued, running, succeeded, failed).
+
+    Args:
+        job_id: Job id returned by a submit_* tool
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return f"Job not found: {job_id}"
+
+    lines = [
+        f"Job: {job.id}",
+        f"  Kind: {job.kind}",
+        f"  Status: {job.status}",
+        f"  Submitted: {job.created_at}",
+    ]
+    position = job_queue.queue_position(job.id)
+    if position is not None:
+        lines.append(f"  Queue position: {position}")
+    if job.started_at:
+        lines.append(f"  Started: {job.started_at}")
+    if job.finished_at:
+        lines.append(f"  Finished: {job.finished_at}")
+    if job.runs > 1:
+        lines.append(f"  Runs: {job.runs} (resumed after server restart)")
+    if job.error:
+        lines.append(f"  Error: {job.error}")
+    return "\n".join(lines)
+
+
+@mcp.tool()
+def get_job_result(job_id: str) -> str:
+    """
+    Returns the output of a finished job, or its current status if it is not done.
+
+    Args:
+        job_id: Job id returned by a submit_* tool
+    """
+    job = job_queue.get(job_id)
+    if job is None:
+        return f"Job not found: {job_id}"
+    if job.status == JOB_SUCCEEDED:
+        return str(job.result)
+    if job.status == JOB_FAILED:
+        return f"Error: Job {job.id} failed: {job.error}"
+    return f"Job {job.id} is {job.status}. Try again later."
+
+
+@mcp.tool()
+def list_jobs(status: Optional[str] = None, limit: int = 20) -> str:
+    """
+    Lists recent background jobs, newest first.
+
+    Args:
+        status: Optional filter - queued, running, succeeded, failed
+        limit: Maximum number of jobs to return (default: 20)
+    """
+    jobs = job_queue.list_jobs(status=status, limit=limit)
+    if not jobs:
+        return "No jobs found."
+
+    lines = [f"Found {len(jobs)} job(s):"]
+    for job in jobs:
+        lines.append(
+            f"- {job.id} [{job.status}] {job.kind} (submitted {job.created_at})"
+        )
+    return "\n".join(lines)
+
+
+# --- Cache Tools (SPEC-CACHE-001) ---
+
+
+def _format_cache_result(result: Dict[str, Any], summary: str) -> str:
+    """캐시 관리 결과를 도구 응답 문자열로 변환"""
+    if not result["success"]:
+        return f"✗ {result['message']}"
+    return f"✓ {summary}"
+
+
+@mcp.tool()
+def get_cache_stats() -> str:
+    """
+    [SPEC-CACHE-001] Shows image cache statistics (hit rate, size, memory, L2, tags).
+
+    Returns:
+        Cache statistics as JSON
+    """
+    stats = image_gen.get_cache_stats()
+    if not stats.get("enabled"):
+        return f"Cache disabled: {stats.get('message', '')}"
+    return "Cache statistics:\n" + json.dumps(stats, indent=2, ensure_ascii=False)
+
+
+@mcp.tool()
+def get_scheduler_stats() -> str:
+    """
+    Shows Imagen call scheduler statistics (queue depth per lane, wait times,
+    concurrency limit, retry/hedge latency quantiles).
+
+    Returns:
+        Scheduler statistics as JSON
+    """
+    stats = image_gen.get_scheduler_stats()
+    return "Scheduler statistics:\n" + json.dumps(stats, indent=2, ensure_ascii=False)
+
+
+@mcp.tool()
+async def clear_cache(confirm: bool = False) -> str:
+    """
+    [SPEC-CACHE-001] Removes every cached image result (requires confirm=True).
+
+    Args:
+        confirm: Must be True to actually clear (safety measure)
+    """
+    if not confirm:
+        return "Set confirm=True to clear the whole cache."
+    result = await asyncio.to_thread(image_gen.clear_cache)
+    return _format_cache_result(
+        result, f"Cleared {result.get('cleared_count', 0)} cache entries"
+    )
+
+
+@mcp.tool()
+async def resize_cache(
+    max_size: Optional[int] = None, max_bytes: Optional[int] = None
+) -> str:
+    """
+    [SPEC-CACHE-001] Changes the cache capacity at runtime (until restart).
+    Shrinking evicts least recently used entries in small steps.
+
+    Args:
+        max_size: New maximum number of in-memory entries (>= 1)
+        max_bytes: New budget for cached image files in bytes (0 = unlimited)
+    """
+    result = await asyncio.to_thread(image_gen.resize_cache, max_size, max_bytes)
+    return _format_cache_result(
+        result,
+        f"Cache resized: max_size={result.get('max_size')}, "
+        f"max_bytes={result.get('max_bytes')} "
+        f"({result.get('evicted_count', 0)} entries evicted)",
+    )
+
+
+@mcp.tool()
+async def set_cache_ttl(ttl_seconds: int) -> str:
+    """
+    [SPEC-CACHE-001] Changes the cache TTL at runtime (until restart).
+    Existing entries expire at their creation time plus the new TTL.
+
+    Args:
+        ttl_seconds: New time-to-live in seconds (>= 1)
+    """
+    result = await asyncio.to_thread(image_gen.set_cache_ttl, ttl_seconds)
+    return _format_cache_result(
+        result,
+        f"Cache TTL set to {ttl_seconds}s "
+        f"({result.get('expired_count', 0)} entries expired)",
+    )
+
+
+@mcp.tool()
+async def invalidate_cache(key_prefix: str) -> str:
+    """
+    [SPEC-CACHE-001] Invalidates cache entries by cache key or key prefix
+    (at least 4 hex characters, as shown in the server log).
+
+    Args:
+        key_prefix: Full 64-character cache key or a prefix of it
+    """
+    result = await asyncio.to_thread(image_gen.invalidate_cache, key_prefix)
+    return _format_cache_result(
+        result, f"Invalidated {result.get('invalidated_count', 0)} cache entries"
+    )
+
+
+@mcp.tool()
+async def invalidate_cache_tag(tag: str) -> str:
+    """
+    [SPEC-CACHE-001] Invalidates every cache entry with a tag,
+    e.g. "style:Cyberpunk" or "model:imagen-4.0-fast-generate-001".
+
+    Args:
+        tag: "<model|style>:<value>"
+    """
+    result = await asyncio.to_thread(image_gen.invalidate_cache_tag, tag)
+    return _format_cache_result(
+        result,
+        f"Invalidated {result.get('invalidated_count', 0)} cache entries "
+        f"tagged {result.get('tag')}",
+    )
+
+
+@mcp.tool()
+async def export_cache_bundle(path: str) -> str:
+    """
+    [SPEC-CACHE-001] Exports cached results and their image files into one
+    archive (e.g. a build artifact) to pre-warm other machines.
+
+    Args:
+        path: Bundle file path to write (e.g. build/image_cache.tar)
+    """
+    result = await asyncio.to_thread(image_gen.export_cache_bundle, path)
+    return _format_cache_result(
+        result,
+        f"Exported {result.get('exported', 0)} cache entries to {result.get('path')} "
+        f"({result.get('bytes', 0)} bytes, {result.get('missing', 0)} skipped)",
+    )
+
+
+@mcp.tool()
+async def import_cache_bundle(path: str) -> str:
+    """
+    [SPEC-CACHE-001] Imports a cache bundle created by export_cache_bundle.
+    Every file is checksum-verified; corrupt entries are skipped.
+
+    Args:
+        path: Bundle file path to read
+    """
+    result = await asyncio.to_thread(image_gen.import_cache_bundle, path)
+    summary = (
+        f"Imported {result.get('imported', 0)} cache entries "
+        f"({result.get('skipped', 0)} skipped, {result.get('corrupt', 0)} corrupt)"
+    )
+    if not result["success"] and "imported" in result:
+        return f"✗ {result['message']} — {summary}"
+    return _format_cache_result(result, summary)
+
+
 # --- Gallery Tools (SPEC-GALLERY-001) ---
 
 
@@ -0,0 +1,14 @@
+"""
+공통 테스트 설정
+
+ImageGenerator는 IMAGE_OUTPUT_DIR(기본 output/images)에 이미지와 내용 주소
+저장소를 만듭니다. 테스트가 개발자의 실제 저장소에 파일을 쓰거나 그 참조를
+정리하지 않도록 모든 테스트에서 임시 디렉토리를 사용합니다.
+"""
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def isolated_output_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("IMAGE_OUTPUT_DIR", str(tmp_path / "output" / "images"))
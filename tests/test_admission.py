@@ -0,0 +1,153 @@
+"""
+W-TinyLFU 입장 정책 테스트
+
+테스트 시나리오:
+- count-min sketch 빈도 추정과 감쇠
+- 일회성 키가 몰려도 자주 쓰이는 키는 유지 (LRU는 밀려남)
+- 무효화/만료/clear 후에도 정책과 캐시 항목이 일치
+- CACHE_ADMISSION 환경 변수와 조회 키 trace 기록 (close() 시 파일 닫힘)
+"""
+
+import os
+import random
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.admission import CountMinSketch  # noqa: E402
+from generators.cache import ImageCache  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.sharded_cache import ShardedImageCache  # noqa: E402
+
+
+class TestCountMinSketch:
+    """CountMinSketch 테스트"""
+
+    def test_estimate_counts(self):
+        sketch = CountMinSketch(64)
+        for _ in range(5):
+            sketch.increment("hot")
+        sketch.increment("cold")
+
+        assert sketch.estimate("hot") >= 5
+        assert sketch.estimate("cold") >= 1
+        assert sketch.estimate("hot") > sketch.estimate("never")
+
+    def test_counters_saturate_and_decay(self):
+        sketch = CountMinSketch(16)
+        for _ in range(40):
+            sketch.increment("hot")
+        assert sketch.estimate("hot") == CountMinSketch.MAX_COUNT
+
+        # 표본 수가 width * 10에 도달하면 절반으로 감쇠
+        for i in range(sketch.width * 10):
+            sketch.increment(f"noise-{i}")
+        assert sketch.estimate("hot") < CountMinSketch.MAX_COUNT
+
+
+def replay(cache: ImageCache, keys) -> None:
+    for key in keys:
+        if cache.get(key) is None:
+            cache.set(key, {"key": key})
+
+
+class TestTinyLFUCache:
+    """ImageCache(admission="tinylfu") 테스트"""
+
+    def test_burst_of_one_offs_keeps_popular_entries(self):
+        popular = [f"house-{i}" for i in range(5)]
+        warm = popular * 10
+        burst = [f"once-{i}" for i in range(200)]
+
+        lru = ImageCache(max_size=10)
+        tinylfu = ImageCache(max_size=10, admission="tinylfu")
+        for cache in (lru, tinylfu):
+            replay(cache, warm + burst)
+
+        assert all(tinylfu.get(key) is not None for key in popular)
+        assert all(lru.get(key) is None for key in popular)
+
+    def test_capacity_respected(self):
+        cache = ImageCache(max_size=20, admission="tinylfu")
+        replay(cache, [f"key-{i % 57}" for i in range(1000)])
+
+        assert cache.size == 20
+
+    def test_policy_tracks_removals(self):
+        rng = random.Random(1)
+        cache = ImageCache(max_size=8, ttl_seconds=3600, admission="tinylfu")
+        for _ in range(2000):
+            key = f"key-{rng.randrange(30)}"
+            action = rng.random()
+            if action < 0.6:
+                replay(cache, [key])
+            elif action < 0.8:
+                cache.invalidate(key)
+            elif action < 0.81:
+                cache.clear()
+            else:
+                cache.update(key, {"key": key, "updated": True})
+
+        policy = cache._policy
+        tracked = (
+            list(policy._window) + list(policy._probation) + list(policy._protected)
+        )
+        assert sorted(tracked) == sorted(cache._cache)
+        assert cache.size <= 8
+
+    def test_stats_report_policy(self):
+        assert ImageCache(admission="tinylfu").get_stats()["admission"] == "tinylfu"
+        assert ImageCache().get_stats()["admission"] == "lru"
+        sharded = ShardedImageCache(shards=2, admission="tinylfu")
+        assert sharded.get_stats()["admission"] == "tinylfu"
+
+    def test_unknown_policy_rejected(self):
+        with pytest.raises(ValueError):
+            ImageCache(admission="lfu")
+
+
+class TestImageGeneratorAdmission:
+    """CACHE_ADMISSION / CACHE_TRACE_PATH 설정 테스트"""
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "CACHE_ADMISSION": "tinylfu"})
+    def test_admission_from_env(self):
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+
+        assert generator.get_cache_stats()["admission"] == "tinylfu"
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "CACHE_ADMISSION": "bogus"})
+    def test_unknown_admission_falls_back_to_lru(self):
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+
+        assert generator.get_cache_stats()["admission"] == "lru"
+
+    def test_lookups_recorded_to_trace(self, tmp_path):
+        trace = tmp_path / "trace" / "keys.log"
+        with patch.dict(
+            os.environ, {"CACHE_ENABLED": "true", "CACHE_TRACE_PATH": str(trace)}
+        ):
+            generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+        request = generator._prepare_basic("a cat", None, "16:9", "png", 95)
+
+        generator._lookup_slot(0, request)
+        generator._lookup_slot(0, request)
+
+        assert trace.read_text().splitlines() == [request.cache_keys[0]] * 2
+
+        # 종료 시 trace 파일을 닫고 이후 조회는 기록하지 않음
+        trace_file = generator._trace_file
+        generator.close()
+        generator._lookup_slot(0, request)
+
+        assert trace_file.closed
+        assert len(trace.read_text().splitlines()) == 2
@@ -0,0 +1,251 @@
+"""
+SPEC-IMG-001: 배치 이미지 생성 테스트
+
+테스트 시나리오:
+- TC-001: 성공적인 배치 이미지 생성
+- TC-002: 부분 실패 처리
+- TC-003: 빈 입력 검증
+- TC-004: 배치 크기 초과 검증
+- TC-005: 기본 스타일 적용
+- TC-006: API 클라이언트 미초기화
+- TC-007: 고유 파일명 생성
+- TC-008: 동시 실행 제한
+- 캐시 HIT 항목 즉시 반환
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from io import BytesIO
+from PIL import Image
+import numpy as np
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import ImageGenerator  # noqa: E402
+
+
+def create_mock_png_bytes() -> bytes:
+    """유효한 PNG 이미지 바이트 생성"""
+    arr = np.zeros((64, 64, 3), dtype=np.uint8)
+    arr[:, :] = [0, 0, 255]
+    img = Image.fromarray(arr, mode="RGB")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def create_async_client(delay: float = 0.0, fail_marker: str = "[MOCK_FAIL]"):
+    """프롬프트에 fail_marker가 있으면 실패하는 비동기 클라이언트 mock"""
+    client = MagicMock()
+    state = {"in_flight": 0, "max_in_flight": 0, "prompts": []}
+    png_bytes = create_mock_png_bytes()
+
+    async def generate_images(model, prompt, config):
+        state["prompts"].append(prompt)
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(delay)
+            if fail_marker in prompt:
+                raise RuntimeError("API rate limit exceeded")
+            response = MagicMock()
+            image = MagicMock()
+            image.image.image_bytes = png_bytes
+            response.generated_images = [image]
+            return response
+        finally:
+            state["in_flight"] -= 1
+
+    client.aio.models.generate_images = generate_images
+    client.state = state
+    return client
+
+
+STYLES_DATA = {
+    "styles": [
+        {"name": "Flat Corporate", "keywords": "flat corporate"},
+        {"name": "Cyberpunk", "keywords": "neon cyberpunk"},
+        {"name": "Pixel Art", "keywords": "pixel art"},
+    ],
+    "default_style": "Flat Corporate",
+}
+
+
+def make_generator() -> ImageGenerator:
+    generator = ImageGenerator(STYLES_DATA)
+    generator.client = create_async_client()
+    return generator
+
+
+class TestGenerateBatch:
+    """ImageGenerator.generate_batch() 테스트"""
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_batch_generation_success(self):
+        """TC-001: 모든 항목 성공 시 요약과 경로 반환"""
+        generator = make_generator()
+        items = [
+            {"prompt": "A futuristic city at sunset", "style": "Cyberpunk"},
+            {"prompt": "A peaceful mountain landscape", "style": "Pixel Art"},
+            {"prompt": "Abstract data visualization"},
+        ]
+
+        result = asyncio.run(generator.generate_batch(items))
+
+        assert result["total"] == 3
+        assert result["succeeded"] == 3
+        assert result["failed"] == 0
+        assert [entry["index"] for entry in result["results"]] == [0, 1, 2]
+        for entry in result["results"]:
+            assert Path(entry["local_path"]).exists()
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_batch_partial_failure(self):
+        """TC-002: 일부 실패해도 나머지는 성공"""
+        generator = make_generator()
+        items = [
+            {"prompt": "A valid image prompt"},
+            {"prompt": "[MOCK_FAIL] Invalid", "style": "Cyberpunk"},
+            {"prompt": "Another valid prompt", "style": "Pixel Art"},
+        ]
+
+        result = asyncio.run(generator.generate_batch(items))
+
+        assert result["succeeded"] == 2
+        assert result["failed"] == 1
+        failed = result["results"][1]
+        assert failed["success"] is False
+        assert "rate limit" in failed["error"]
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_batch_empty_input(self):
+        """TC-003: 빈 입력은 안내 메시지 반환"""
+        generator = make_generator()
+
+        result = asyncio.run(generator.generate_batch([]))
+
+        assert result["success"] is False
+        assert "No prompts provided" in result["error"]
+
+    @patch.dict(
+        os.environ,
+        {
+            "CACHE_ENABLED": "false",
+            "GOOGLE_API_KEY": "test-key",
+            "BATCH_MAX_SIZE": "10",
+        },
+    )
+    def test_batch_size_limit(self):
+        """TC-004: 최대 배치 크기 초과 시 생성 시작 안 함"""
+        generator = make_generator()
+        items = [{"prompt": f"prompt {i}"} for i in range(15)]
+
+        result = asyncio.run(generator.generate_batch(items))
+
+        assert result["success"] is False
+        assert "exceeds maximum limit" in result["error"]
+        assert generator.client.state["prompts"] == []
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_default_style_application(self):
+        """TC-005: 스타일 미지정 항목에 default_style 적용"""
+        generator = make_generator()
+        items = [
+            {"prompt": "A sunset over the ocean", "style": None},
+            {"prompt": "A forest path", "style": "Pixel Art"},
+        ]
+
+        result = asyncio.run(generator.generate_batch(items, default_style="Cyberpunk"))
+
+        assert result["results"][0]["style"] == "Cyberpunk"
+        assert result["results"][1]["style"] == "Pixel Art"
+        prompts = generator.client.state["prompts"]
+        assert any("neon cyberpunk" in p and "sunset" in p for p in prompts)
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_client_not_initialized(self):
+        """TC-006: 클라이언트가 없으면 모든 항목 실패"""
+        generator = ImageGenerator(STYLES_DATA)
+        generator.client = None
+
+        result = asyncio.run(
+            generator.generate_batch([{"prompt": "a"}, {"prompt": "b"}])
+        )
+
+        assert result["failed"] == 2
+        for entry in result["results"]:
+            assert "not initialized" in entry["error"]
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_unique_filenames(self):
+        """TC-007: 같은 스타일로 동시에 생성해도 파일명은 고유"""
+        generator = make_generator()
+        items = [{"prompt": f"prompt {i}", "style": "Flat Corporate"} for i in range(3)]
+
+        result = asyncio.run(generator.generate_batch(items))
+
+        # 같은 내용의 이미지는 저장소 파일 하나를 공유하지만 생성 파일명은 고유
+        filenames = {entry["filename"] for entry in result["results"]}
+        assert len(filenames) == 3
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_concurrent_limit(self):
+        """TC-008: 동시 API 호출 수는 max_concurrent 이하"""
+        generator = ImageGenerator(STYLES_DATA)
+        generator.client = create_async_client(delay=0.02)
+        items = [{"prompt": f"prompt {i}"} for i in range(10)]
+
+        result = asyncio.run(generator.generate_batch(items, max_concurrent=3))
+
+        assert result["succeeded"] == 10
+        assert generator.client.state["max_in_flight"] == 3
+
+    @patch.dict(
+        os.environ,
+        {
+            "CACHE_ENABLED": "false",
+            "GOOGLE_API_KEY": "test-key",
+            "BATCH_MAX_CONCURRENT": "2",
+        },
+    )
+    def test_concurrent_limit_capped_by_server(self):
+        """기본값은 BATCH_MAX_CONCURRENT, 클라이언트 값은 BATCH_MAX_CONCURRENT로 제한"""
+        generator = ImageGenerator(STYLES_DATA)
+        generator.client = create_async_client(delay=0.02)
+        items = [{"prompt": f"prompt {i}"} for i in range(6)]
+
+        asyncio.run(generator.generate_batch(items))
+        assert generator.client.state["max_in_flight"] == 2
+
+        generator.client = create_async_client(delay=0.02)
+        asyncio.run(generator.generate_batch(items, max_concurrent=100))
+        assert generator.client.state["max_in_flight"] == 2
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_cache_hits_returned_first(self):
+        """캐시 HIT 항목은 API 호출 없이 먼저 완료됨"""
+        generator = ImageGenerator(STYLES_DATA)
+        generator.client = create_async_client(delay=0.05)
+        asyncio.run(generator.agenerate("cached prompt"))
+
+        order = []
+        items = [{"prompt": "new prompt"}, {"prompt": "cached prompt"}]
+        result = asyncio.run(
+            generator.generate_batch(
+                items, on_result=lambda entry, done, total: order.append(entry["index"])
+            )
+        )
+
+        assert order == [1, 0]
+        assert result["cached"] == 1
+        assert result["results"][1]["cached"] is True
+        assert len(generator.client.state["prompts"]) == 2
@@ -0,0 +1,236 @@
+"""
+내용 주소 이미지 저장소 테스트
+
+테스트 시나리오:
+- BlobStore: 같은 내용은 한 번만 저장, 마지막 참조 해제 시 파일 삭제, 재시작 후 참조 유지
+- ImageCache: validator 실패 시 MISS 처리, 제거 시 on_remove 호출
+- 갤러리 삭제가 같은 이미지를 가리키는 캐시 HIT을 깨뜨리지 않음
+- 파일이 사라진 캐시 항목은 HIT 대신 재생성
+- 여러 프로세스가 같은 저장소를 공유 (실행 중인 프로세스의 참조는 재시작 정리에서 제외)
+"""
+
+import os
+import subprocess
+import sys
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from gallery.image_gallery import ImageGallery  # noqa: E402
+from generators.blob_store import BlobStore, file_digest  # noqa: E402
+from generators.cache import ImageCache  # noqa: E402
+from generators.disk_cache import SqliteCacheStore  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+
+
+def write_file(path: Path, data: bytes) -> Path:
+    path.write_bytes(data)
+    return path
+
+
+def make_generator(tmp_path: Path) -> ImageGenerator:
+    """임시 출력 디렉토리와 고정 응답 이미지를 사용하는 ImageGenerator"""
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(buffer, "PNG")
+    response = MagicMock()
+    image = MagicMock()
+    image.image.image_bytes = buffer.getvalue()
+    response.generated_images = [image]
+
+    generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+    generator.output_dir = tmp_path / "images"
+    generator.output_dir.mkdir()
+    generator.blob_store = BlobStore(generator.output_dir / "blobs")
+    generator.client = MagicMock()
+    generator.client.models.generate_images.return_value = response
+    return generator
+
+
+class TestBlobStore:
+    """BlobStore 테스트"""
+
+    def test_identical_content_stored_once(self, tmp_path):
+        store = BlobStore(tmp_path / "blobs")
+
+        first = store.ingest(write_file(tmp_path / "a.png", b"same"))
+        second = store.ingest(write_file(tmp_path / "b.png", b"same"))
+
+        assert first == second
+        assert store.path(first).read_bytes() == b"same"
+        assert not (tmp_path / "a.png").exists()
+        assert not (tmp_path / "b.png").exists()
+        assert store.get_stats()["deduplicated"] == 1
+        assert store.get_stats()["blobs"] == 1
+
+    def test_file_deleted_after_last_release(self, tmp_path):
+        store = BlobStore(tmp_path / "blobs")
+        digest = store.ingest(write_file(tmp_path / "a.png", b"data"))
+        assert digest == file_digest(store.path(digest))
+
+        store.acquire(digest, "cache:k")
+        store.acquire(digest, "gallery:img_1")
+        assert store.refcount(digest) == 2
+
+        store.release("gallery:img_1")
+        assert store.exists(digest)
+
+        store.release("cache:k")
+        assert not store.exists(digest)
+        assert store.get_stats()["deleted"] == 1
+
+    def test_references_survive_restart(self, tmp_path):
+        root = tmp_path / "blobs"
+        store = BlobStore(root)
+        digest = store.ingest(write_file(tmp_path / "a.png", b"data"))
+        store.acquire(digest, "cache:k1")
+        store.acquire(digest, "cache:k2")
+
+        restarted = BlobStore(root)
+        assert restarted.refcount(digest) == 2
+
+        # 재시작 후 사라진 캐시 항목(k2)의 참조만 정리
+        assert restarted.retain("cache:", ["cache:k1"]) == 1
+        assert restarted.refcount(digest) == 1
+
+
+class TestSharedStore:
+    """같은 디렉토리를 쓰는 여러 프로세스 (저장소 인스턴스) 테스트"""
+
+    @staticmethod
+    def set_owner(store: BlobStore, holder: str, pid: int) -> None:
+        with store._transaction() as conn:
+            conn.execute("UPDATE holders SET owner = ? WHERE holder = ?", (pid, holder))
+
+    @staticmethod
+    def dead_pid() -> int:
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        return process.pid
+
+    def test_changes_visible_across_instances(self, tmp_path):
+        first = BlobStore(tmp_path / "blobs")
+        second = BlobStore(tmp_path / "blobs")
+        digest = first.ingest(write_file(tmp_path / "a.png", b"data"))
+
+        assert second.acquire(digest, "gallery:img_1") is True
+        first.acquire(digest, "cache:k")
+        assert second.refcount(digest) == 2
+
+        first.release("cache:k")
+        second.release("gallery:img_1")
+        assert not first.exists(digest)
+        assert first.get_stats()["blobs"] == 0
+
+    def test_reclaim_keeps_live_process_holders(self, tmp_path):
+        store = BlobStore(tmp_path / "blobs")
+        digest = store.ingest(write_file(tmp_path / "a.png", b"data"))
+        store.acquire(digest, "cache:live")
+        store.acquire(digest, "cache:dead")
+        self.set_owner(store, "cache:live", os.getppid())
+        self.set_owner(store, "cache:dead", self.dead_pid())
+
+        restarted = BlobStore(tmp_path / "blobs")
+        assert restarted.reclaim("cache:", ()) == 1
+        assert restarted.holders("cache:") == ["cache:live"]
+        assert restarted.exists(digest)
+
+
+class TestCacheHooks:
+    """ImageCache validator / on_remove 테스트"""
+
+    def test_invalid_hit_becomes_miss(self):
+        removed = []
+        cache = ImageCache(validator=lambda r: r["ok"], on_remove=removed.append)
+        cache.set("k", {"ok": False})
+
+        assert cache.get("k") is None
+        assert cache.size == 0
+        assert removed == ["k"]
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["invalidated_hits"] == 1
+
+    def test_miss_does_not_notify(self, tmp_path):
+        """캐시에 없던 키의 MISS는 제거 알림을 보내지 않음"""
+        removed = []
+        cache = ImageCache(
+            l2=SqliteCacheStore(tmp_path / "cache.sqlite3"), on_remove=removed.append
+        )
+
+        assert cache.get("never-cached") is None
+        assert cache.invalidate("never-cached") is False
+        assert removed == []
+
+    def test_eviction_and_invalidate_notify(self):
+        removed = []
+        cache = ImageCache(max_size=1, on_remove=removed.append)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+        cache.invalidate("b")
+
+        assert removed == ["a", "b"]
+
+
+class TestGeneratorStore:
+    """ImageGenerator + 갤러리 + 저장소 연동 테스트"""
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_gallery_delete_keeps_cached_image(self, tmp_path):
+        """갤러리에서 삭제해도 캐시가 참조하는 파일은 유지되어 HIT이 유효"""
+        generator = make_generator(tmp_path)
+        gallery = ImageGallery(
+            images_dir=generator.output_dir,
+            metadata_path=tmp_path / "metadata.json",
+            blob_store=generator.blob_store,
+        )
+        generator.set_gallery(gallery)
+
+        generated = generator.generate("a cat")
+        image_id = f"img_{Path(generated['filename']).stem}"
+        assert gallery.delete_image(image_id, confirm=True)["success"] is True
+
+        cached = generator.generate("a cat")
+        assert cached["cached"] is True
+        assert Path(cached["local_path"]).exists()
+        generator.client.models.generate_images.assert_called_once()
+
+        # 캐시에서도 제거되면 마지막 참조가 해제되어 파일 삭제
+        generator.clear_cache()
+        assert not Path(generated["local_path"]).exists()
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_missing_file_regenerates(self, tmp_path):
+        """파일이 사라진 캐시 항목은 HIT으로 반환하지 않고 다시 생성"""
+        generator = make_generator(tmp_path)
+        generated = generator.generate("a cat")
+        Path(generated["local_path"]).unlink()
+
+        regenerated = generator.generate("a cat")
+
+        assert not regenerated.get("cached")
+        assert Path(regenerated["local_path"]).exists()
+        assert generator.client.models.generate_images.call_count == 2
+        assert generator.get_cache_stats()["invalidated_hits"] == 1
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_identical_images_share_file(self, tmp_path):
+        generator = make_generator(tmp_path)
+
+        first = generator.generate("a cat")
+        second = generator.generate("a dog")
+
+        assert first["content_hash"] == second["content_hash"]
+        assert first["local_path"] == second["local_path"]
+        assert first["filename"] != second["filename"]
+        assert "store_ms" in first["timings"]
@@ -10,17 +10,26 @@ SPEC-CACHE-001: 캐시 모듈 단위 테스트
 - TC-006: 스레드 안전성
 - TC-007: 캐시 무효화
 - TC-008: 캐시 통계
+- TC-009: 바이트 예산 (항목 무게 기준 LRU 제거)
+- TC-010: 만료 힙 / 백그라운드 정리 (조회 없이 만료 항목 제거)
+- TC-011: 압축된 항목 표현 (복원 일치, 문자열 공유, 메모리 통계)
 """
 
 import time
 import threading
+import pytest
 import sys
 from pathlib import Path
 
 # src 디렉토리를 Python 경로에 추가
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from generators.cache import generate_cache_key, ImageCache, CacheEntry
+from generators.cache import (
+    generate_cache_key,
+    generate_cache_key_advanced,
+    ImageCache,
+    CacheEntry,
+)
 
 
 class TestGenerateCacheKey:
@@ -61,17 +70,24 @@ class TestGenerateCacheKey:
         key2 = generate_cache_key("a cat", "realistic", "1:1")
         assert key1 != key2
 
+    def test_old_positional_format_rejected(self):
+        """형식/품질을 위치 인자로 넘기던 이전 호출은 명확한 TypeError"""
+        with pytest.raises(TypeError, match="positional"):
+            generate_cache_key("a cat", "realistic", "16:9", "png")
+        with pytest.raises(TypeError, match="positional"):
+            generate_cache_key_advanced("a cat", "realistic", "16:9", "png", 95, 1024)
+
 
 class TestCacheEntry:
-    """CacheEntry 데이터클래스 테스트"""
+    """CacheEntry 테스트"""
 
     def test_not_expired(self):
         """만료되지 않은 항목"""
         entry = CacheEntry(
             key="test",
             result={"success": True},
-            created_at=time.time(),
-            expires_at=time.time() + 3600,
+            created_at=time.monotonic(),
+            expires_at=time.monotonic() + 3600,
         )
         assert entry.is_expired() is False
 
@@ -80,11 +96,47 @@ class TestCacheEntry:
         entry = CacheEntry(
             key="test",
             result={"success": True},
-            created_at=time.time() - 7200,
-            expires_at=time.time() - 3600,
+            created_at=time.monotonic() - 7200,
+            expires_at=time.monotonic() - 3600,
         )
         assert entry.is_expired() is True
 
+    def test_result_round_trip(self):
+        """TC-011: 압축 후 복원한 결과가 원본과 같음"""
+        result = {
+            "success": True,
+            "prompt": "a cat sitting on a sofa " * 4,
+            "quality": 95,
+            "width": None,
+            "ratio": 1.5,
+            "served_as": ["png:q95", "webp:q80"],
+            "renditions": {"png": {"format": "png", "local_path": "/x/a.png"}},
+            "variants": [{"index": 0}, {"index": 1}],
+            "empty": {},
+        }
+        entry = CacheEntry("k", result, time.monotonic(), time.monotonic() + 60)
+
+        assert entry.result == result
+        assert entry.result is not entry.result
+        assert not hasattr(entry, "__dict__")
+
+    def test_strings_shared(self):
+        """TC-011: 짧은 문자열은 항목 간, 반복되는 긴 문자열은 항목 안에서 공유"""
+        path = "/home/user/output/images/blobs/" + "ab" * 32 + ".png"
+        first = CacheEntry(
+            "k1",
+            {"format": "".join(["p", "ng"]), "local_path": path, "url": path[:]},
+            0.0,
+            1.0,
+        )
+        second = CacheEntry("k2", {"format": "png"}, 0.0, 1.0)
+
+        assert first._packed[1] is second._packed[1]
+        assert first._packed[2] is first._packed[3]
+        assert first._packed[0] is not second._packed[0]
+        same_schema = CacheEntry("k3", {"format": "jpeg"}, 0.0, 1.0)
+        assert same_schema._packed[0] is second._packed[0]
+
 
 class TestImageCacheBasic:
     """TC-002, TC-003: 캐시 기본 동작 테스트"""
@@ -105,8 +157,8 @@ class TestImageCacheBasic:
 
         assert cached == test_result
 
-    def test_cache_hit_returns_same_object(self):
-        """캐시 HIT 시 동일 객체 반환"""
+    def test_cache_hit_returns_independent_copies(self):
+        """캐시 HIT 시 같은 내용의 새 사본 반환 (반환값 수정이 캐시에 영향 없음)"""
         cache = ImageCache()
         test_result = {"success": True, "data": "test"}
 
@@ -114,8 +166,10 @@ class TestImageCacheBasic:
         result1 = cache.get("key1")
         result2 = cache.get("key1")
 
-        assert result1 == result2
-        assert result1 is result2  # 동일 참조
+        assert result1 == result2 == test_result
+        assert result1 is not result2
+        result1["cached"] = True
+        assert cache.get("key1") == test_result
 
 
 class TestImageCacheTTL:
@@ -146,6 +200,75 @@ class TestImageCacheTTL:
         assert cache.size == 0
 
 
+class TestImageCacheExpirySweep:
+    """TC-010: 만료 힙 / 백그라운드 정리 테스트"""
+
+    def test_purge_expired_without_get(self):
+        """조회하지 않은 만료 항목도 정리되고 on_remove 호출"""
+        removed = []
+        cache = ImageCache(ttl_seconds=1, on_remove=removed.append)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+
+        time.sleep(1.1)
+
+        assert cache.purge_expired() == 2
+        assert sorted(removed) == ["a", "b"]
+        assert cache.get_stats()["expired"] == 2
+        assert cache.get_stats()["l1"]["bytes"] == 0
+
+    def test_expired_purged_before_lru_eviction(self):
+        """만료 항목이 먼저 정리되어 살아 있는 항목이 LRU로 밀려나지 않음"""
+        cache = ImageCache(max_size=2, ttl_seconds=1)
+        cache.set("old", {"v": 0})
+        time.sleep(1.1)
+        cache._ttl_seconds = 3600
+        cache.set("live", {"v": 1})
+        cache.set("new", {"v": 2})
+
+        assert cache.get("live") is not None
+        assert cache.get("new") is not None
+        assert cache.get_stats()["expired"] == 1
+
+    def test_reset_entry_not_purged_by_stale_deadline(self):
+        """다시 저장한 항목은 이전 만료 시각으로 제거되지 않음"""
+        cache = ImageCache(ttl_seconds=1)
+        cache.set("key", {"v": 1})
+        cache._ttl_seconds = 3600
+        cache.set("key", {"v": 2})
+
+        time.sleep(1.1)
+
+        assert cache.purge_expired() == 0
+        assert cache.get("key") == {"v": 2}
+
+    def test_stats_size_excludes_expired(self):
+        """통계의 cache_size에 만료 항목이 포함되지 않음"""
+        cache = ImageCache(ttl_seconds=1)
+        cache.set("key", {"v": 1})
+
+        time.sleep(1.1)
+
+        assert cache.get_stats()["cache_size"] == 0
+
+    def test_background_sweeper(self):
+        """정리 스레드가 주기적으로 만료 항목 제거"""
+        removed = []
+        cache = ImageCache(ttl_seconds=1, on_remove=removed.append, sweep_interval=0.1)
+        try:
+            cache.set("key", {"v": 1})
+            assert cache.get_stats()["sweeper_running"] is True
+
+            deadline = time.monotonic() + 3
+            while not removed and time.monotonic() < deadline:
+                time.sleep(0.05)
+
+            assert removed == ["key"]
+        finally:
+            cache.stop_sweeper()
+        assert cache.get_stats()["sweeper_running"] is False
+
+
 class TestImageCacheLRU:
     """TC-005: LRU 정책 테스트"""
 
@@ -185,6 +308,59 @@ class TestImageCacheLRU:
         assert cache.get("key4") is not None
 
 
+class TestImageCacheByteBudget:
+    """TC-009: 바이트 예산 테스트"""
+
+    @staticmethod
+    def weigh(result):
+        return result["bytes"]
+
+    def test_evicts_lru_until_under_budget(self):
+        """무게 합계가 max_bytes 이하가 될 때까지 가장 오래된 항목부터 제거"""
+        removed = []
+        cache = ImageCache(
+            max_size=100, max_bytes=1000, weigher=self.weigh, on_remove=removed.append
+        )
+        cache.set("small1", {"bytes": 100})
+        cache.set("small2", {"bytes": 100})
+        cache.set("large", {"bytes": 700})
+        cache.get("small1")  # small1을 최근 사용으로 갱신
+
+        cache.set("medium", {"bytes": 100})  # 합계 1000: 제거 없음
+        assert removed == []
+
+        cache.set("medium2", {"bytes": 300})  # 합계 1300: small2, large 제거
+        assert removed == ["small2", "large"]
+        assert cache.get_stats()["bytes"] == 500
+        assert cache.get("small1") is not None
+
+    def test_oversized_entry_kept_alone(self):
+        cache = ImageCache(max_bytes=100, weigher=self.weigh)
+        cache.set("a", {"bytes": 50})
+        cache.set("huge", {"bytes": 500})
+
+        assert cache.get("a") is None
+        assert cache.get("huge") == {"bytes": 500}
+
+    def test_update_reweighs(self):
+        cache = ImageCache(max_bytes=1000, weigher=self.weigh)
+        cache.set("a", {"bytes": 100})
+        cache.set("b", {"bytes": 100})
+
+        cache.update("b", {"bytes": 950})
+
+        assert cache.get("a") is None
+        stats = cache.get_stats()
+        assert stats["bytes"] == 950
+        assert stats["l1"]["bytes"] == 950
+        assert stats["max_bytes"] == 1000
+
+    def test_default_weight_is_result_size(self):
+        cache = ImageCache()
+        cache.set("k", {"data": "x" * 100})
+        assert cache.get_stats()["bytes"] > 100
+
+
 class TestImageCacheThreadSafety:
     """TC-006: 스레드 안전성 테스트"""
 
@@ -338,6 +514,38 @@ class TestImageCacheStats:
         assert stats["ttl_seconds"] == 1800
 
 
+class TestImageCacheMemory:
+    """TC-011: 메모리 통계 테스트"""
+
+    def test_memory_bytes_tracks_entries(self):
+        cache = ImageCache(max_size=10)
+        assert cache.get_stats()["memory_bytes"] == 0
+
+        cache.set("k1", {"prompt": "p" * 200})
+        one = cache.get_stats()["memory_bytes"]
+        assert one > 200
+        cache.set("k2", {"prompt": "q" * 200})
+        assert cache.get_stats()["memory_bytes"] == 2 * one
+        assert cache.get_stats()["l1"]["memory_bytes"] == 2 * one
+
+        cache.update("k2", {"prompt": "q" * 400})
+        assert cache.get_stats()["memory_bytes"] == 2 * one + 200
+
+        cache.invalidate("k1")
+        cache.invalidate("k2")
+        assert cache.get_stats()["memory_bytes"] == 0
+
+    def test_memory_bytes_after_eviction_and_clear(self):
+        cache = ImageCache(max_size=2)
+        for i in range(5):
+            cache.set(f"k{i}", {"prompt": f"{i}" * 100})
+        per_entry = cache.get_stats()["memory_bytes"] // 2
+
+        assert cache.get_stats()["memory_bytes"] == 2 * per_entry
+        cache.clear()
+        assert cache.get_stats()["memory_bytes"] == 0
+
+
 class TestImageCacheEdgeCases:
     """엣지 케이스 테스트"""
 
@@ -0,0 +1,220 @@
+"""
+실행 중 캐시 관리 테스트
+
+테스트 시나리오:
+- resize(): 줄이면 LRU 항목을 단계적으로 제거 (단계 사이에 다른 스레드 조회 가능)
+- resize(): 늘리기, 바이트 예산(L2 포함), W-TinyLFU 정책
+- set_ttl(): 기존 항목도 생성 시각 + 새 TTL로 만료 (L1, L2)
+- invalidate_prefix(): 키 접두사로 무효화 (L1, L2, 샤드)
+- ImageGenerator.resize_cache()/set_cache_ttl()/invalidate_cache() 입력 검증
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators import cache as cache_module  # noqa: E402
+from generators.cache import ImageCache  # noqa: E402
+from generators.disk_cache import SqliteCacheStore  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.sharded_cache import ShardedImageCache  # noqa: E402
+
+
+class TestResize:
+    """ImageCache.resize() 테스트"""
+
+    def test_shrink_evicts_lru_in_steps(self):
+        removed = []
+        cache = ImageCache(max_size=300, on_remove=removed.append)
+        for i in range(300):
+            cache.set(f"k{i}", {"v": i})
+        cache.get("k0")  # 가장 최근 사용으로 이동
+
+        lookups = []
+
+        def concurrent_lookup(_):
+            # 단계 사이에는 잠금이 풀려 있으므로 다른 스레드의 조회가 바로 끝남
+            thread = threading.Thread(target=lambda: lookups.append(cache.get("k0")))
+            thread.start()
+            thread.join(timeout=1)
+            assert not thread.is_alive()
+
+        with patch.object(cache_module.time, "sleep", side_effect=concurrent_lookup):
+            evicted = cache.resize(max_size=10)
+
+        assert evicted == 290
+        assert len(removed) == 290
+        assert cache.get_stats()["max_size"] == 10
+        assert cache.get("k0") == {"v": 0}
+        assert cache.get("k299") == {"v": 299}
+        assert cache.get("k1") is None
+        # 290개를 64개씩 나누어 제거 (5단계)
+        assert len(lookups) == 4
+        assert all(result == {"v": 0} for result in lookups)
+
+    def test_grow_keeps_entries(self):
+        cache = ImageCache(max_size=2)
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+
+        assert cache.resize(max_size=5) == 0
+        cache.set("c", {"v": 3})
+        assert cache.size == 3
+
+    def test_byte_budget_applies_to_l2(self, tmp_path):
+        l2 = SqliteCacheStore(tmp_path / "cache.sqlite3")
+        cache = ImageCache(max_size=100, l2=l2, weigher=lambda result: 100)
+        for i in range(10):
+            cache.set(f"k{i}", {"v": i})
+            time.sleep(0.001)
+
+        cache.resize(max_bytes=300)
+
+        assert cache.get_stats()["l1"]["bytes"] <= 300
+        assert l2.total_bytes <= 300
+        assert l2.max_bytes == 300
+        assert cache.get("k9") == {"v": 9}
+        assert cache.get("k0") is None
+
+    def test_tinylfu_resize(self):
+        cache = ImageCache(max_size=200, admission="tinylfu")
+        for i in range(200):
+            cache.set(f"k{i}", {"v": i})
+
+        cache.resize(max_size=20)
+
+        assert cache.size == 20
+        for i in range(50):
+            cache.set(f"n{i}", {"v": i})
+        assert cache.size == 20
+
+    def test_sharded_resize(self):
+        cache = ShardedImageCache(max_size=80, shards=4)
+        for i in range(80):
+            cache.set(f"k{i}", {"v": i})
+
+        cache.resize(max_size=8)
+
+        assert cache.get_stats()["max_size"] == 8
+        assert all(size <= 2 for size in cache.get_stats()["shard_sizes"])
+
+
+class TestSetTtl:
+    """ImageCache.set_ttl() 테스트"""
+
+    def test_shorter_ttl_expires_old_entries(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        cache = ImageCache(ttl_seconds=3600, l2=SqliteCacheStore(path))
+        cache.add("old", {"v": 1}, time.time() - 120)
+        cache.set("new", {"v": 2})
+
+        assert cache.set_ttl(60) == 1
+
+        assert cache.get("old") is None
+        assert cache.get("new") == {"v": 2}
+        assert cache.get_stats()["ttl_seconds"] == 60
+        restarted = ImageCache(ttl_seconds=3600, l2=SqliteCacheStore(path))
+        assert restarted.get("old") is None
+        assert restarted.get("new") == {"v": 2}  # L2에서 승격
+        assert 0 < restarted.expires_in("new") <= 60
+
+    def test_longer_ttl_extends_entries(self):
+        cache = ImageCache(ttl_seconds=1)
+        cache.set("a", {"v": 1})
+
+        cache.set_ttl(3600)
+        time.sleep(1.1)
+
+        assert cache.get("a") == {"v": 1}
+        assert cache.purge_expired() == 0
+
+    def test_sharded_set_ttl(self, tmp_path):
+        cache = ShardedImageCache(
+            ttl_seconds=3600, l2=SqliteCacheStore(tmp_path / "c.sqlite3"), shards=4
+        )
+        for i in range(8):
+            cache.add(f"k{i}", {"v": i}, time.time() - 120)
+
+        assert cache.set_ttl(60) == 8
+        assert cache.get_stats()["ttl_seconds"] == 60
+        assert cache.keys() == []
+
+
+class TestInvalidatePrefix:
+    """ImageCache.invalidate_prefix() 테스트"""
+
+    def test_prefix_in_l1_and_l2(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        cache = ImageCache(l2=SqliteCacheStore(path))
+        cache.set("abcd01", {"v": 1})
+        cache.set("abcd02", {"v": 2})
+        cache.set("abce03", {"v": 3})
+        restarted = ImageCache(l2=SqliteCacheStore(path))
+
+        assert restarted.invalidate_prefix("") == 0
+        assert restarted.invalidate_prefix("abcd") == 2
+        assert restarted.keys() == ["abce03"]
+
+    def test_sharded_prefix(self):
+        cache = ShardedImageCache(shards=4)
+        for i in range(16):
+            cache.set(f"ab{i:02d}", {"v": i})
+        cache.set("ff00", {"v": 0})
+
+        assert cache.invalidate_prefix("ab") == 16
+        assert cache.keys() == ["ff00"]
+
+
+@patch.dict(
+    os.environ,
+    {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key", "CACHE_L2_PATH": ""},
+)
+class TestGeneratorAdmin:
+    """ImageGenerator 캐시 관리 메서드 테스트"""
+
+    def test_validation(self):
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+
+        assert generator.resize_cache()["success"] is False
+        assert generator.resize_cache(max_size=0)["success"] is False
+        assert generator.resize_cache(max_bytes=-1)["success"] is False
+        assert generator.set_cache_ttl(0)["success"] is False
+        assert generator.invalidate_cache("ab")["success"] is False
+        assert generator.invalidate_cache("xyz123")["success"] is False
+
+    def test_resize_ttl_and_invalidate(self):
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+        for i in range(5):
+            generator._cache.set(f"{i:x}abc{i}", {"success": True})
+
+        assert generator.resize_cache(max_size=3) == {
+            "success": True,
+            "max_size": 3,
+            "max_bytes": 0,
+            "evicted_count": 2,
+        }
+        assert generator.set_cache_ttl(120)["ttl_seconds"] == 120
+        assert generator.get_cache_stats()["ttl_seconds"] == 120
+        # 로그에 표시되는 "<키 앞부분>..." 형식도 허용
+        report = generator.invalidate_cache("4ABC4...")
+        assert report["invalidated_count"] == 1
+        assert generator.get_cache_stats()["cache_size"] == 2
+
+    def test_disabled_cache(self):
+        with patch.dict(os.environ, {"CACHE_ENABLED": "false"}):
+            generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+
+        assert generator.resize_cache(max_size=5)["success"] is False
+        assert generator.set_cache_ttl(60)["success"] is False
+        assert generator.invalidate_cache("abcd")["success"] is False
@@ -0,0 +1,312 @@
+"""
+캐시 번들 테스트
+
+테스트 시나리오:
+- 항목 순회(entries()): L1/L2 합집합, 만료 항목 제외, 통계 변화 없음
+- 번들 쓰기/읽기: 항목 뒤에 이미지 파일, 체크섬 검증, 손상 항목 건너뜀
+- 헤더가 없거나 잘린 번들은 BundleError (그 전 항목은 이미 반환)
+- 다른 장비(출력 디렉토리)로 가져오면 API 호출 없이 캐시 HIT
+- 다른 모델의 항목과 이미 캐시된 키는 건너뜀
+"""
+
+import hashlib
+import io
+import json
+import os
+import sys
+import tarfile
+import time
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.cache import ImageCache  # noqa: E402
+from generators.cache_bundle import (  # noqa: E402
+    CHECKSUM_HEADER,
+    BundleEntry,
+    BundleError,
+    BundleReader,
+    BundleWriter,
+)
+from generators.disk_cache import SqliteCacheStore  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.sharded_cache import ShardedImageCache  # noqa: E402
+
+STYLES = {
+    "styles": [{"name": "Realistic", "keywords": "photo, natural light"}],
+    "default_style": "Realistic",
+}
+
+
+def make_generator(root: Path, **env: str) -> ImageGenerator:
+    """root 아래에 출력 디렉토리와 L2 캐시를 둔 생성기 (장비 하나)"""
+    environ = {
+        "IMAGE_OUTPUT_DIR": str(root / "images"),
+        "CACHE_L2_PATH": str(root / "cache.sqlite3"),
+        "CACHE_SWEEP_INTERVAL_SECONDS": "0",
+        **env,
+    }
+    with patch.dict(os.environ, environ):
+        generator = ImageGenerator(STYLES)
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(buffer, format="PNG")
+    image = MagicMock()
+    image.image.image_bytes = buffer.getvalue()
+    response = MagicMock()
+    response.generated_images = [image]
+    generator.client = MagicMock()
+    generator.client.models.generate_images.return_value = response
+    return generator
+
+
+def write_blob(directory: Path, data: bytes) -> tuple:
+    digest = hashlib.sha256(data).hexdigest()
+    path = directory / f"{digest}.png"
+    path.write_bytes(data)
+    return digest, path
+
+
+class TestEntries:
+    """ImageCache.entries() 테스트"""
+
+    def test_union_of_l1_and_l2_without_stats(self, tmp_path):
+        l2 = SqliteCacheStore(tmp_path / "cache.sqlite3")
+        cache = ImageCache(max_size=2, l2=l2)
+        for i in range(5):
+            cache.set(f"k{i}", {"v": i}, tags=["style:a"])
+
+        entries = {key: (result, tags) for key, result, _, _, tags in cache.entries()}
+
+        assert entries == {f"k{i}": ({"v": i}, ("style:a",)) for i in range(5)}
+        stats = cache.get_stats()
+        assert stats["hits"] == 0 and stats["misses"] == 0
+
+    def test_skips_expired(self, tmp_path):
+        cache = ImageCache(ttl_seconds=1, l2=SqliteCacheStore(tmp_path / "c.sqlite3"))
+        cache.set("old", {"v": 1})
+        time.sleep(1.1)
+        cache.set("new", {"v": 2})
+
+        assert [item[0] for item in cache.entries()] == ["new"]
+
+    def test_sharded_entries(self, tmp_path):
+        cache = ShardedImageCache(
+            max_size=4, shards=4, l2=SqliteCacheStore(tmp_path / "cache.sqlite3")
+        )
+        for i in range(20):
+            cache.set(f"k{i}", {"v": i})
+
+        keys = [item[0] for item in cache.entries()]
+        assert sorted(keys) == sorted(f"k{i}" for i in range(20))
+
+    def test_add_to_l2_only(self, tmp_path):
+        cache = ImageCache(l2=SqliteCacheStore(tmp_path / "cache.sqlite3"))
+
+        assert cache.add("k", {"v": 1}, time.time(), l1=False)
+        assert cache.size == 0
+        assert cache.get("k") == {"v": 1}
+        assert cache.get_stats()["l2"]["hits"] == 1
+
+
+class TestBundleFormat:
+    """BundleWriter/BundleReader 테스트"""
+
+    def write_bundle(self, tmp_path: Path, count: int = 3) -> Path:
+        blobs = tmp_path / "src"
+        blobs.mkdir()
+        path = tmp_path / "bundle.tar"
+        with BundleWriter(path, {"model": "m"}) as writer:
+            for i in range(count):
+                digest, blob_path = write_blob(blobs, f"image-{i}".encode())
+                key = hashlib.sha256(f"key-{i}".encode()).hexdigest()
+                writer.add(
+                    BundleEntry(key, {"content_hash": digest}, 1.0, ["model:m"]),
+                    {digest: blob_path},
+                )
+        return path
+
+    def test_round_trip(self, tmp_path):
+        path = self.write_bundle(tmp_path)
+        staging = tmp_path / "staging"
+        staging.mkdir()
+        reader = BundleReader(path, staging)
+
+        items = [
+            (entry, {d: p.read_bytes() for d, p in s.items()}) for entry, s in reader
+        ]
+
+        assert reader.header["model"] == "m"
+        assert reader.entries == 3 and reader.corrupt == 0
+        for i, (entry, blobs) in enumerate(items):
+            assert entry.key == hashlib.sha256(f"key-{i}".encode()).hexdigest()
+            assert entry.tags == ["model:m"]
+            assert list(blobs.values()) == [f"image-{i}".encode()]
+        # 옮기지 않은 임시 파일은 삭제
+        assert list(staging.iterdir()) == []
+
+    def test_accept_skips_without_staging(self, tmp_path):
+        path = self.write_bundle(tmp_path)
+        reader = BundleReader(path, tmp_path, accept=lambda entry: False)
+
+        assert list(reader) == []
+        assert reader.skipped == 3
+
+    def test_corrupt_blob_skips_entry(self, tmp_path):
+        path = self.write_bundle(tmp_path)
+        data = bytearray(path.read_bytes())
+        offset = data.find(b"image-1")
+        data[offset : offset + 7] = b"IMAGE-1"
+        path.write_bytes(bytes(data))
+        reader = BundleReader(path, tmp_path)
+
+        keys = [entry.key for entry, _ in reader]
+
+        assert len(keys) == 2
+        assert reader.corrupt == 1
+
+    def test_tampered_entry_checksum(self, tmp_path):
+        path = tmp_path / "bundle.tar"
+        blobs = tmp_path / "src"
+        blobs.mkdir()
+        digest, blob_path = write_blob(blobs, b"image")
+        key = "a" * 64
+        with BundleWriter(path) as writer:
+            writer.add(BundleEntry(key, {"v": 1}, 1.0), {digest: blob_path})
+        # 체크섬은 그대로 두고 항목 내용만 같은 길이로 변경
+        data = path.read_bytes()
+        assert json.dumps({"v": 1}).encode() in data
+        path.write_bytes(data.replace(b'{"v": 1}', b'{"v": 2}'))
+        reader = BundleReader(path, tmp_path)
+
+        assert list(reader) == []
+        assert reader.corrupt == 1
+
+    def test_missing_header(self, tmp_path):
+        path = tmp_path / "other.tar"
+        with tarfile.open(path, "w") as tar:
+            info = tarfile.TarInfo("readme.txt")
+            info.size = 2
+            tar.addfile(info, io.BytesIO(b"hi"))
+
+        with pytest.raises(BundleError):
+            list(BundleReader(path, tmp_path))
+
+    def test_truncated_bundle_keeps_earlier_entries(self, tmp_path):
+        path = self.write_bundle(tmp_path)
+        data = path.read_bytes()
+        offset = data.find(b"image-2")
+        path.write_bytes(data[:offset])
+        seen = []
+
+        with pytest.raises(BundleError):
+            for entry, _ in BundleReader(path, tmp_path):
+                seen.append(entry.key)
+
+        assert len(seen) == 2
+
+    def test_gzip_bundle(self, tmp_path):
+        import gzip
+
+        path = self.write_bundle(tmp_path)
+        compressed = tmp_path / "bundle.tar.gz"
+        compressed.write_bytes(gzip.compress(path.read_bytes()))
+
+        reader = BundleReader(compressed, tmp_path)
+        assert len(list(reader)) == 3
+
+    def test_checksum_header_present(self, tmp_path):
+        path = self.write_bundle(tmp_path, count=1)
+        with tarfile.open(path) as tar:
+            assert all(CHECKSUM_HEADER in m.pax_headers for m in tar.getmembers())
+
+
+class TestGeneratorBundle:
+    """ImageGenerator.export_cache_bundle()/import_cache_bundle() 테스트"""
+
+    def test_prewarm_other_machine(self, tmp_path):
+        source = make_generator(tmp_path / "build")
+        source.generate("a cat")
+        source.generate_advanced("a dog", format="jpeg", quality=80)
+        bundle = tmp_path / "bundle.tar"
+
+        exported = source.export_cache_bundle(str(bundle))
+
+        assert exported["success"] is True
+        assert exported["exported"] == 2
+        assert exported["missing"] == 0
+        assert exported["bytes"] == bundle.stat().st_size
+
+        target = make_generator(tmp_path / "deploy")
+        imported = target.import_cache_bundle(str(bundle))
+
+        assert imported["success"] is True
+        assert imported["imported"] == 2
+        assert imported["corrupt"] == 0
+        # L2에만 저장되고 첫 HIT 때 승격
+        assert target._cache.size == 0
+        result = target.generate("a cat")
+        assert result["cached"] is True
+        assert Path(result["local_path"]).exists()
+        assert str(tmp_path / "deploy") in result["local_path"]
+        advanced = target.generate_advanced("a dog", format="jpeg", quality=80)
+        assert advanced["cached"] is True
+        target.client.models.generate_images.assert_not_called()
+        # 가져온 항목이 이미지 파일 참조를 보유
+        assert target.blob_store.holders("cache:")
+
+    def test_import_skips_existing_and_other_model(self, tmp_path):
+        source = make_generator(tmp_path / "build", IMAGEN_MODEL="imagen-a")
+        source.generate("a cat")
+        bundle = tmp_path / "bundle.tar"
+        source.export_cache_bundle(str(bundle))
+
+        other = make_generator(tmp_path / "other", IMAGEN_MODEL="imagen-b")
+        assert other.import_cache_bundle(str(bundle))["skipped"] == 1
+        # 건너뛴 항목의 이미지 파일은 기록하지 않음
+        assert other.blob_store.get_stats()["blobs"] == 0
+
+        same = make_generator(tmp_path / "same", IMAGEN_MODEL="imagen-a")
+        assert same.import_cache_bundle(str(bundle))["imported"] == 1
+        again = same.import_cache_bundle(str(bundle))
+        assert again["imported"] == 0 and again["skipped"] == 1
+
+    def test_startup_import_from_env(self, tmp_path):
+        source = make_generator(tmp_path / "build")
+        source.generate("a cat")
+        bundle = tmp_path / "bundle.tar"
+        source.export_cache_bundle(str(bundle))
+
+        target = make_generator(tmp_path / "deploy")
+        with patch.dict(os.environ, {"CACHE_BUNDLE_IMPORT": str(bundle)}):
+            thread = target.start_cache_warmup()
+        thread.join(timeout=10)
+
+        stats = target.get_cache_stats()
+        assert stats["bundle_import"]["status"] == "done"
+        assert stats["bundle_import"]["imported"] == 1
+        assert target.generate("a cat")["cached"] is True
+
+    def test_errors(self, tmp_path):
+        generator = make_generator(tmp_path / "a")
+
+        missing = generator.import_cache_bundle(str(tmp_path / "none.tar"))
+        assert missing["success"] is False
+        not_bundle = tmp_path / "not.tar"
+        not_bundle.write_bytes(b"not a tar file")
+        assert generator.import_cache_bundle(str(not_bundle))["success"] is False
+
+        with patch.dict(os.environ, {"CACHE_ENABLED": "false"}):
+            disabled = ImageGenerator(STYLES)
+        assert disabled.export_cache_bundle(str(tmp_path / "b.tar"))["success"] is False
@@ -0,0 +1,252 @@
+"""
+캐시 키 네임스페이스 및 태그 무효화 테스트
+
+테스트 시나리오:
+- 모델/스타일 정의 해시가 다르면 캐시 키가 다름 (비우면 이전 키와 같음)
+- 태그 역색인으로 태그가 붙은 항목만 무효화 (L1, L2, 샤드 캐시)
+- L2 항목 삭제 시 태그도 삭제, 결과 교체 시 태그 유지
+- IMAGEN_MODEL/스타일 정의 변경 시 이전 결과를 제공하지 않음
+- ImageGenerator.invalidate_cache_tag()
+- 예열은 다른 모델로 생성된 갤러리 기록을 건너뜀
+"""
+
+import os
+import sys
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from gallery.image_gallery import ImageGallery  # noqa: E402
+from generators.cache import (  # noqa: E402
+    ImageCache,
+    cache_tag,
+    generate_cache_key,
+    generate_cache_key_advanced,
+    style_fingerprint,
+)
+from generators.disk_cache import SqliteCacheStore  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.sharded_cache import ShardedImageCache  # noqa: E402
+
+STYLES = {
+    "styles": [
+        {"name": "Realistic", "keywords": "photo, natural light"},
+        {"name": "Cyberpunk", "keywords": "neon, rain"},
+    ],
+    "default_style": "Realistic",
+}
+
+
+def make_generator(styles=STYLES) -> ImageGenerator:
+    generator = ImageGenerator(styles)
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(buffer, format="PNG")
+    image = MagicMock()
+    image.image.image_bytes = buffer.getvalue()
+    response = MagicMock()
+    response.generated_images = [image]
+    generator.client = MagicMock()
+    generator.client.models.generate_images.return_value = response
+    return generator
+
+
+class TestNamespacedKeys:
+    """generate_cache_key*() 네임스페이스 테스트"""
+
+    def test_model_and_style_version_change_key(self):
+        base = generate_cache_key("a cat", "realistic")
+        model_a = generate_cache_key("a cat", "realistic", model="imagen-a")
+
+        assert model_a != base
+        assert model_a != generate_cache_key("a cat", "realistic", model="imagen-b")
+        assert model_a != generate_cache_key(
+            "a cat", "realistic", model="imagen-a", style_version="abc"
+        )
+        assert generate_cache_key("a cat", "realistic", model="Imagen-A") == model_a
+
+    def test_advanced_key_namespace(self):
+        base = generate_cache_key_advanced("a cat", "realistic")
+
+        assert generate_cache_key_advanced("a cat", "realistic", model="") == base
+        assert generate_cache_key_advanced("a cat", "realistic", model="m") != base
+
+    def test_style_fingerprint(self):
+        style = {"name": "Cyberpunk", "keywords": "neon"}
+
+        assert style_fingerprint(style) == style_fingerprint(dict(style))
+        assert style_fingerprint(style) != style_fingerprint(
+            {**style, "keywords": "neon, rain"}
+        )
+        assert style_fingerprint(None) == "none"
+
+    def test_cache_tag_normalized(self):
+        assert cache_tag("Style", " Cyberpunk ") == "style:cyberpunk"
+
+
+class TestImageCacheTags:
+    """ImageCache.invalidate_tag() 테스트"""
+
+    def test_invalidate_tag_memory_only(self):
+        removed = []
+        cache = ImageCache(on_remove=removed.append)
+        cache.set("a", {"v": 1}, ["style:cyberpunk", "model:m1"])
+        cache.set("b", {"v": 2}, ["style:realistic", "model:m1"])
+        cache.set("c", {"v": 3})
+
+        assert cache.tag_counts() == {
+            "style:cyberpunk": 1,
+            "style:realistic": 1,
+            "model:m1": 2,
+        }
+        assert cache.invalidate_tag("style:cyberpunk") == 1
+        assert removed == ["a"]
+        assert cache.get("b") == {"v": 2}
+        assert cache.invalidate_tag("model:m1") == 1
+        assert cache.invalidate_tag("model:m1") == 0
+        assert cache.get("c") == {"v": 3}
+        assert cache.tag_counts() == {}
+
+    def test_evicted_entry_leaves_index(self):
+        cache = ImageCache(max_size=1)
+        cache.set("a", {"v": 1}, ["style:x"])
+        cache.set("b", {"v": 2}, ["style:x"])
+
+        assert cache.tag_counts() == {"style:x": 1}
+        assert cache.invalidate_tag("style:x") == 1
+
+    def test_l2_entries_found_after_restart(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        first = ImageCache(l2=SqliteCacheStore(path))
+        first.set("a", {"v": 1}, ["model:m1"])
+        first.set("b", {"v": 2}, ["model:m2"])
+
+        restarted = ImageCache(l2=SqliteCacheStore(path))
+        assert restarted.tag_counts() == {"model:m1": 1, "model:m2": 1}
+        assert restarted.invalidate_tag("model:m1") == 1
+        assert restarted.get("a") is None
+        assert restarted.get("b") == {"v": 2}
+        # L2에서 승격된 항목도 태그 유지
+        assert restarted.invalidate_tag("model:m2") == 1
+        assert restarted.get("b") is None
+
+    def test_update_keeps_tags(self, tmp_path):
+        cache = ImageCache(l2=SqliteCacheStore(tmp_path / "cache.sqlite3"))
+        cache.set("a", {"v": 1}, ["style:x"])
+        cache.update("a", {"v": 2})
+
+        assert cache.invalidate_tag("style:x") == 1
+        assert cache.get("a") is None
+
+    def test_l2_delete_removes_tags(self, tmp_path):
+        store = SqliteCacheStore(tmp_path / "cache.sqlite3")
+        store.set("a", {"v": 1}, 0, 10**10, tags=["style:x"])
+        store.set("a", {"v": 2}, 0, 10**10)
+
+        assert store.tags("a") == ["style:x"]
+        store.delete("a")
+        assert store.keys_for_tag("style:x") == []
+        assert store.tag_counts() == {}
+
+    def test_sharded_invalidate_tag(self):
+        cache = ShardedImageCache(shards=4)
+        for i in range(12):
+            cache.set(f"k{i}", {"v": i}, [f"style:{'x' if i % 3 else 'y'}"])
+
+        assert cache.tag_counts() == {"style:x": 8, "style:y": 4}
+        assert cache.invalidate_tag("style:y") == 4
+        assert cache.size == 8
+
+
+@patch.dict(
+    os.environ,
+    {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key", "CACHE_L2_PATH": ""},
+)
+class TestGeneratorNamespaces:
+    """ImageGenerator 캐시 네임스페이스/태그 테스트"""
+
+    def test_model_change_misses(self):
+        with patch.dict(os.environ, {"IMAGEN_MODEL": "imagen-a"}):
+            generator = make_generator()
+        assert generator.model == "imagen-a"
+        generator.generate("a cat")
+        generator.model = "imagen-b"
+
+        result = generator.generate("a cat")
+
+        assert not result.get("cached")
+        assert generator.client.models.generate_images.call_count == 2
+        call = generator.client.models.generate_images.call_args
+        assert call.kwargs["model"] == "imagen-b"
+
+    def test_style_definition_change_misses(self):
+        generator = make_generator()
+        generator.generate("a cat", style_name="Cyberpunk")
+        assert generator.generate("a cat", style_name="Cyberpunk")["cached"] is True
+
+        changed = {
+            **STYLES,
+            "styles": [
+                STYLES["styles"][0],
+                {"name": "Cyberpunk", "keywords": "neon, rain, chrome"},
+            ],
+        }
+        updated = make_generator(changed)
+        updated._cache = generator._cache
+
+        assert not updated.generate("a cat", style_name="Cyberpunk").get("cached")
+        updated.client.models.generate_images.assert_called_once()
+
+    def test_invalidate_style_tag(self):
+        generator = make_generator()
+        generator.generate("a cat", style_name="Cyberpunk")
+        generator.generate_advanced("a dog", style_name="Cyberpunk")
+        generator.generate("a cat", style_name="Realistic")
+
+        stats = generator.get_cache_stats()
+        assert stats["tags"]["style:cyberpunk"] == 2
+        assert stats["tags"][f"model:{generator.model}"] == 3
+
+        report = generator.invalidate_cache_tag("style:Cyberpunk")
+
+        assert report == {
+            "success": True,
+            "tag": "style:cyberpunk",
+            "invalidated_count": 2,
+        }
+        assert not generator.generate("a cat", style_name="Cyberpunk").get("cached")
+        assert generator.generate("a cat", style_name="Realistic")["cached"] is True
+
+    def test_invalid_tag(self):
+        generator = make_generator()
+
+        assert generator.invalidate_cache_tag("cyberpunk")["success"] is False
+        assert generator.invalidate_cache_tag("color:red")["success"] is False
+
+    def test_warmup_skips_other_model_records(self, tmp_path):
+        generator = make_generator()
+        generator.set_gallery(
+            ImageGallery(
+                images_dir=generator.output_dir,
+                metadata_path=tmp_path / "metadata.json",
+                blob_store=generator.blob_store,
+            )
+        )
+        generator.generate("a cat")
+        generator.clear_cache()
+        generator.model = "imagen-other"
+
+        report = generator.warm_cache()
+
+        assert report["restored"] == 0
+        assert report["skipped"] == 1
@@ -0,0 +1,154 @@
+"""
+갤러리 기록 기반 캐시 예열 테스트
+
+테스트 시나리오:
+- 갤러리 기록의 generation_params로 캐시 키를 다시 만들어 복원 (API 호출 없이 HIT)
+- 고급 생성 기록도 같은 키로 복원
+- TTL이 지난 기록과 파일이 없는 기록은 복원하지 않음
+- 이미 캐시에 있는 키는 건너뜀
+- PNG가 아닌 기록은 같은 형식/품질 요청에만 사용
+- 백그라운드 스레드 실행과 통계 보고
+"""
+
+import os
+import sys
+from datetime import datetime, timedelta
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from gallery.image_gallery import ImageGallery  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+
+
+def make_generator(tmp_path: Path) -> ImageGenerator:
+    generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(buffer, format="PNG")
+    image = MagicMock()
+    image.image.image_bytes = buffer.getvalue()
+    response = MagicMock()
+    response.generated_images = [image]
+    generator.client = MagicMock()
+    generator.client.models.generate_images.return_value = response
+    generator.set_gallery(
+        ImageGallery(
+            images_dir=generator.output_dir,
+            metadata_path=tmp_path / "metadata.json",
+            blob_store=generator.blob_store,
+        )
+    )
+    return generator
+
+
+@patch.dict(
+    os.environ,
+    {
+        "CACHE_ENABLED": "true",
+        "GOOGLE_API_KEY": "test-key",
+        "CACHE_TTL_SECONDS": "3600",
+    },
+)
+class TestCacheWarmup:
+    """ImageGenerator.warm_cache() 테스트"""
+
+    def test_restores_basic_generation(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generated = generator.generate("a cat", aspect_ratio="1:1")
+        generator.clear_cache()
+
+        report = generator.warm_cache()
+
+        assert report["status"] == "done"
+        assert report["restored"] == 1
+        cached = generator.generate("a cat", aspect_ratio="1:1")
+        assert cached["cached"] is True
+        assert cached["content_hash"] == generated["content_hash"]
+        generator.client.models.generate_images.assert_called_once()
+
+    def test_restored_png_serves_other_formats(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate("a cat")
+        generator.clear_cache()
+        generator.warm_cache()
+
+        webp = generator.generate("a cat", format="webp", quality=80)
+
+        assert webp["cached"] is True
+        assert webp["derived"] is True
+        generator.client.models.generate_images.assert_called_once()
+
+    def test_restores_advanced_generation(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate_advanced("a cat", negative_prompt="blurry", width=16)
+        generator.clear_cache()
+
+        assert generator.warm_cache()["restored"] == 1
+        cached = generator.generate_advanced(
+            "a cat", negative_prompt="blurry", width=16
+        )
+        assert cached["cached"] is True
+        generator.client.models.generate_images.assert_called_once()
+
+    def test_expired_and_missing_records_skipped(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate("old cat")
+        missing = generator.generate("gone cat")
+        generator.clear_cache()
+        for metadata in generator.gallery.all_images():
+            if metadata.prompt.startswith("old cat"):
+                metadata.created_at = (datetime.now() - timedelta(hours=2)).isoformat()
+        Path(missing["local_path"]).unlink()
+
+        report = generator.warm_cache()
+
+        assert report["restored"] == 0
+        assert report["expired"] == 1
+        assert report["missing"] == 1
+
+    def test_existing_entries_kept(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate("a cat")
+
+        report = generator.warm_cache()
+
+        assert report["restored"] == 0
+        assert report["skipped"] == 1
+        assert generator.get_cache_stats()["cache_size"] == 1
+
+    def test_non_png_record_serves_same_format_only(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate("a cat", format="jpeg", quality=80)
+        generator.clear_cache()
+        generator.warm_cache()
+
+        same = generator.generate("a cat", format="jpeg", quality=80)
+        other = generator.generate("a cat", format="png")
+
+        assert same["cached"] is True
+        assert not other.get("cached")
+        assert generator.client.models.generate_images.call_count == 2
+
+    def test_background_thread_reports_stats(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate("a cat")
+        generator.clear_cache()
+
+        thread = generator.start_cache_warmup()
+        assert thread is not None
+        thread.join(timeout=10)
+
+        warmup = generator.get_cache_stats()["warmup"]
+        assert warmup["status"] == "done"
+        assert warmup["restored"] == 1
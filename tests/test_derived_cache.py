@@ -0,0 +1,165 @@
+"""
+파생 형식 캐시 테스트
+
+테스트 시나리오:
+- 캐시 키는 생성 입력(프롬프트/스타일/비율/크기/네거티브)만 사용
+- 다른 형식/품질 요청은 무손실 마스터에서 로컬 변환 (API 호출 없음)
+- PNG는 품질이 달라도 같은 출력본 사용
+- 변환한 출력본은 캐시 항목에 추가되어 재사용
+- 생략한 API 호출 수 통계
+"""
+
+import asyncio
+import os
+import sys
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.blob_store import BlobStore  # noqa: E402
+from generators.cache import generate_cache_key, rendition_key  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.postprocess import detect_format  # noqa: E402
+
+
+def create_image_bytes(format: str = "PNG", size: int = 32) -> bytes:
+    """지정 형식의 그라데이션 이미지 바이트 생성"""
+    arr = np.zeros((size, size, 3), dtype=np.uint8)
+    arr[:, :, 0] = np.arange(size, dtype=np.uint8)[None, :] * 4
+    buffer = BytesIO()
+    Image.fromarray(arr, mode="RGB").save(buffer, format=format)
+    return buffer.getvalue()
+
+
+def make_generator(tmp_path: Path, image_bytes: bytes) -> ImageGenerator:
+    generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+    generator.output_dir = tmp_path / "images"
+    generator.output_dir.mkdir()
+    generator.blob_store = BlobStore(generator.output_dir / "blobs")
+    response = MagicMock()
+    image = MagicMock()
+    image.image.image_bytes = image_bytes
+    response.generated_images = [image]
+    generator.client = MagicMock()
+    generator.client.models.generate_images.return_value = response
+    generator.client.aio.models.generate_images = MagicMock(
+        side_effect=lambda **kwargs: _resolved(response)
+    )
+    return generator
+
+
+async def _resolved(value):
+    return value
+
+
+class TestKeys:
+    """캐시 키 / 출력본 키 테스트"""
+
+    def test_cache_key_ignores_output_options(self):
+        assert generate_cache_key("a cat", "realistic", "16:9") == generate_cache_key(
+            "a cat", "realistic", "16:9", variant=0
+        )
+
+    def test_rendition_key(self):
+        assert rendition_key("PNG", 95) == rendition_key("png", 10) == "png"
+        assert rendition_key("jpg", 80) == rendition_key("jpeg", 80) == "jpeg:q80"
+        assert rendition_key("webp", 80) != rendition_key("webp", 90)
+
+
+@patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+class TestDerivedFormats:
+    """무손실 마스터 기반 출력본 변환 테스트"""
+
+    def test_other_format_derived_without_api_call(self, tmp_path):
+        generator = make_generator(tmp_path, create_image_bytes("PNG"))
+
+        png = generator.generate("a cat", format="png", quality=95)
+        webp = generator.generate("a cat", format="webp", quality=80)
+
+        generator.client.models.generate_images.assert_called_once()
+        assert webp["cached"] is True
+        assert webp["derived"] is True
+        assert webp["format"] == "webp"
+        assert detect_format(Path(webp["local_path"]).read_bytes()) == "webp"
+        assert webp["content_hash"] != png["content_hash"]
+        assert "renditions" not in webp
+
+        stats = generator.get_cache_stats()
+        assert stats["api_calls_saved"] == 1
+        assert stats["derived_renders"] == 1
+
+    def test_derived_rendition_reused(self, tmp_path):
+        generator = make_generator(tmp_path, create_image_bytes("PNG"))
+        generator.generate("a cat", format="png")
+
+        first = generator.generate("a cat", format="jpeg", quality=70)
+        second = generator.generate("a cat", format="jpeg", quality=70)
+
+        assert first["local_path"] == second["local_path"]
+        stats = generator.get_cache_stats()
+        assert stats["derived_renders"] == 1
+        # 이전 방식(형식/품질 포함 키)에서도 두 번째 요청은 HIT이었으므로 1회만 집계
+        assert stats["api_calls_saved"] == 1
+
+    def test_png_quality_ignored(self, tmp_path):
+        generator = make_generator(tmp_path, create_image_bytes("PNG"))
+
+        generated = generator.generate("a cat", format="png", quality=95)
+        cached = generator.generate("a cat", format="png", quality=50)
+
+        assert cached["local_path"] == generated["local_path"]
+        assert "derived" not in cached
+        assert "served_as" not in cached
+        stats = generator.get_cache_stats()
+        assert stats["derived_renders"] == 0
+        # 다른 품질의 PNG 요청은 이전 방식에서는 API 호출이었으므로 집계
+        assert stats["api_calls_saved"] == 1
+
+        generator.generate("a cat", format="png", quality=50)
+        assert generator.get_cache_stats()["api_calls_saved"] == 1
+
+    def test_master_requested_as_png(self, tmp_path):
+        """캐시 활성화 시 JPEG 요청도 무손실 PNG로 받아 마스터로 보관"""
+        generator = make_generator(tmp_path, create_image_bytes("PNG"))
+
+        with patch("generators.image_gen.types") as types_mock:
+            result = generator.generate("a cat", format="jpeg", quality=80)
+
+        config_kwargs = types_mock.GenerateImagesConfig.call_args.kwargs
+        assert config_kwargs["output_mime_type"] == "image/png"
+        assert detect_format(Path(result["local_path"]).read_bytes()) == "jpeg"
+        master = generator.blob_store.path(result["master_hash"])
+        assert detect_format(master.read_bytes()) == "png"
+
+    def test_async_derivation(self, tmp_path):
+        generator = make_generator(tmp_path, create_image_bytes("PNG"))
+
+        async def run():
+            await generator.agenerate("a cat", format="png")
+            return await generator.agenerate("a cat", format="webp", quality=60)
+
+        result = asyncio.run(run())
+
+        assert result["derived"] is True
+        generator.client.aio.models.generate_images.assert_called_once()
+
+    def test_derived_rendition_released_with_entry(self, tmp_path):
+        generator = make_generator(tmp_path, create_image_bytes("PNG"))
+        generator.generate("a cat", format="png")
+        webp = generator.generate("a cat", format="webp", quality=80)
+
+        generator.clear_cache()
+
+        assert not Path(webp["local_path"]).exists()
+        assert generator.blob_store.holders("cache:") == []
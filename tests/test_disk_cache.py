@@ -0,0 +1,249 @@
+"""
+디스크 L2 캐시 테스트
+
+테스트 시나리오:
+- SqliteCacheStore: 저장/조회, 만료, 최대 항목 수 제거, WAL 모드
+- ImageCache + L2: 재시작(새 인스턴스) 후 L2에서 L1로 승격
+- 만료 시각은 두 계층에서 동일하게 적용
+- 계층별 hit rate 통계
+- ImageGenerator: CACHE_L2_PATH 설정 시 재시작 후에도 API 호출 없이 HIT
+- 바이트 예산: 항목 무게 합계 기준 제거
+"""
+
+import os
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.blob_store import BlobStore  # noqa: E402
+from generators.cache import ImageCache  # noqa: E402
+from generators.disk_cache import SqliteCacheStore  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+
+
+class TestSqliteCacheStore:
+    """SqliteCacheStore 테스트"""
+
+    def test_set_and_get(self, tmp_path):
+        store = SqliteCacheStore(tmp_path / "cache.sqlite3")
+        now = time.time()
+
+        store.set("k", {"success": True, "local_path": "/a.png"}, now, now + 60)
+
+        result, created_at, expires_at = store.get("k")
+        assert result == {"success": True, "local_path": "/a.png"}
+        assert (created_at, expires_at) == (now, now + 60)
+        assert store.get("missing") is None
+
+    def test_wal_mode(self, tmp_path):
+        store = SqliteCacheStore(tmp_path / "cache.sqlite3")
+        (mode,) = store._conn.execute("PRAGMA journal_mode").fetchone()
+        assert mode == "wal"
+
+    def test_expired_entry_deleted(self, tmp_path):
+        store = SqliteCacheStore(tmp_path / "cache.sqlite3")
+        now = time.time()
+        store.set("old", {"v": 1}, now - 10, now - 1)
+
+        assert store.get("old") is None
+        assert store.purge_expired() == ["old"]
+        assert store.size == 0
+
+    def test_purge_expired(self, tmp_path):
+        store = SqliteCacheStore(tmp_path / "cache.sqlite3")
+        now = time.time()
+        store.set("old", {"v": 1}, now - 10, now - 1)
+        store.set("live", {"v": 2}, now, now + 60)
+
+        assert store.purge_expired() == ["old"]
+        assert store.keys() == ["live"]
+
+    def test_evicts_least_recently_accessed(self, tmp_path):
+        store = SqliteCacheStore(tmp_path / "cache.sqlite3", max_entries=2)
+        now = time.time()
+        store.set("a", {"v": "a"}, now, now + 60)
+        time.sleep(0.01)
+        store.set("b", {"v": "b"}, now, now + 60)
+        time.sleep(0.01)
+        store.get("a")  # a를 최근 접근으로 갱신
+        time.sleep(0.01)
+        store.set("c", {"v": "c"}, now, now + 60)
+
+        assert store.size == 2
+        assert store.get("b") is None
+        assert store.get("a") is not None
+
+
+class TestByteBudget:
+    """SqliteCacheStore / ImageGenerator 바이트 예산 테스트"""
+
+    def test_store_evicts_by_weight(self, tmp_path):
+        store = SqliteCacheStore(tmp_path / "cache.sqlite3", max_bytes=1000)
+        now = time.time()
+        store.set("a", {"v": "a"}, now, now + 60, weight=600)
+        time.sleep(0.01)
+
+        assert store.set("b", {"v": "b"}, now, now + 60, weight=300) == []
+        time.sleep(0.01)
+        assert store.set("c", {"v": "c"}, now, now + 60, weight=300) == ["a"]
+        assert store.total_bytes == 600
+
+    def test_generator_budget_releases_files(self, tmp_path):
+        """CACHE_MAX_BYTES를 넘으면 오래된 항목과 그 이미지 파일이 제거됨"""
+        images = []
+        for shade in (0, 255):
+            buffer = BytesIO()
+            array = np.full((32, 32, 3), shade, dtype=np.uint8)
+            array[0, :, 0] = np.arange(32, dtype=np.uint8)
+            Image.fromarray(array).save(buffer, "PNG")
+            images.append(buffer.getvalue())
+        responses = []
+        for data in images:
+            response = MagicMock()
+            image = MagicMock()
+            image.image.image_bytes = data
+            response.generated_images = [image]
+            responses.append(response)
+        # 항목 하나(마스터 + PNG 출력본, 같은 파일)만 들어가는 예산
+        budget = max(len(data) for data in images) + 1
+        env = {
+            "CACHE_ENABLED": "true",
+            "GOOGLE_API_KEY": "test-key",
+            "CACHE_MAX_BYTES": str(budget),
+            "CACHE_L2_PATH": str(tmp_path / "cache.sqlite3"),
+        }
+
+        with patch.dict(os.environ, env):
+            generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+        generator.output_dir = tmp_path / "images"
+        generator.output_dir.mkdir()
+        generator.blob_store = BlobStore(generator.output_dir / "blobs")
+        generator.client = MagicMock()
+        generator.client.models.generate_images.side_effect = responses
+
+        first = generator.generate("a cat")
+        second = generator.generate("a dog")
+
+        assert not Path(first["local_path"]).exists()
+        assert Path(second["local_path"]).exists()
+        stats = generator.get_cache_stats()
+        assert stats["bytes"] <= budget
+        assert stats["l2"]["max_bytes"] == budget
+        assert stats["l2"]["size"] == 1
+
+
+class TestTwoTierCache:
+    """ImageCache L1 + L2 테스트"""
+
+    def test_survives_restart(self, tmp_path):
+        """새 ImageCache(재시작)에서도 L2에서 조회되어 L1로 승격"""
+        path = tmp_path / "cache.sqlite3"
+        first = ImageCache(l2=SqliteCacheStore(path))
+        first.set("key", {"success": True, "prompt": "a cat"})
+
+        second = ImageCache(l2=SqliteCacheStore(path))
+        assert second.size == 0
+
+        assert second.get("key") == {"success": True, "prompt": "a cat"}
+        assert second.size == 1
+        assert second.get("key") is not None
+
+        stats = second.get_stats()
+        assert stats["hits"] == 2
+        assert stats["l1"]["hits"] == 1
+        assert stats["l2"]["hits"] == 1
+        assert stats["l2"]["hit_rate_percent"] == 100.0
+
+    def test_l1_eviction_falls_back_to_l2(self, tmp_path):
+        """L1 용량에서 밀려난 항목은 L2에서 다시 찾음"""
+        cache = ImageCache(max_size=1, l2=SqliteCacheStore(tmp_path / "c.sqlite3"))
+        cache.set("a", {"v": "a"})
+        cache.set("b", {"v": "b"})
+
+        assert cache.get("a") == {"v": "a"}
+        stats = cache.get_stats()
+        assert stats["l2"]["hits"] == 1
+        assert stats["l2"]["size"] == 2
+
+    def test_expiry_honoured_in_both_tiers(self, tmp_path):
+        """승격된 항목은 원래 만료 시각을 유지하고 만료 시 두 계층에서 삭제"""
+        path = tmp_path / "cache.sqlite3"
+        ImageCache(ttl_seconds=1, l2=SqliteCacheStore(path)).set("k", {"v": 1})
+
+        restarted = ImageCache(ttl_seconds=3600, l2=SqliteCacheStore(path))
+        assert restarted.get("k") == {"v": 1}
+        time.sleep(1.1)
+
+        assert restarted.get("k") is None
+        assert restarted.get_stats()["l2"]["size"] == 0
+
+    def test_miss_counts_per_tier(self, tmp_path):
+        cache = ImageCache(l2=SqliteCacheStore(tmp_path / "cache.sqlite3"))
+
+        assert cache.get("nothing") is None
+
+        stats = cache.get_stats()
+        assert stats["misses"] == 1
+        assert stats["l1"]["misses"] == 1
+        assert stats["l2"]["misses"] == 1
+
+    def test_invalidate_and_clear_both_tiers(self, tmp_path):
+        path = tmp_path / "cache.sqlite3"
+        cache = ImageCache(l2=SqliteCacheStore(path))
+        cache.set("a", {"v": 1})
+        cache.set("b", {"v": 2})
+
+        assert cache.invalidate("a") is True
+        assert cache.clear() == 1
+        assert ImageCache(l2=SqliteCacheStore(path)).get("b") is None
+
+    def test_without_l2(self):
+        stats = ImageCache().get_stats()
+        assert stats["l2"] == {"enabled": False}
+
+
+class TestImageGeneratorL2:
+    """ImageGenerator L2 연동 테스트"""
+
+    def test_restart_hits_disk_cache(self, tmp_path):
+        """CACHE_L2_PATH 설정 시 새 ImageGenerator도 API 호출 없이 HIT"""
+        buffer = BytesIO()
+        Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(buffer, "PNG")
+        response = MagicMock()
+        image = MagicMock()
+        image.image.image_bytes = buffer.getvalue()
+        response.generated_images = [image]
+        env = {
+            "CACHE_ENABLED": "true",
+            "GOOGLE_API_KEY": "test-key",
+            "CACHE_L2_PATH": str(tmp_path / "cache.sqlite3"),
+        }
+        styles = {"styles": [], "default_style": "realistic"}
+
+        with patch.dict(os.environ, env):
+            first = ImageGenerator(styles)
+            first.client = MagicMock()
+            first.client.models.generate_images.return_value = response
+            generated = first.generate("a cat")
+
+            second = ImageGenerator(styles)
+            second.client = MagicMock()
+            cached = second.generate("a cat")
+
+        assert cached["cached"] is True
+        assert cached["local_path"] == generated["local_path"]
+        second.client.models.generate_images.assert_not_called()
+        assert second.get_cache_stats()["l2"]["hits"] == 1
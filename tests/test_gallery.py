@@ -1018,7 +1018,9 @@ class TestMetadataConsistency:
             )
             gallery.register_image(metadata)
 
-            # 목록 조회 시 고아 메타데이터 정리
+            # 고아 메타데이터 정리 후 목록 조회 (list_images 자체는 파일을
+            # 확인하지 않음: 파일 없이 등록한 다른 목록 테스트와 같은 동작)
+            gallery.validate_metadata()
             images = gallery.list_images(
                 limit=10, offset=0, sort_by="created_at", sort_order="desc"
             )
@@ -0,0 +1,169 @@
+"""
+ImageGenerator 비동기 생성 경로 테스트
+
+테스트 시나리오:
+- agenerate()가 비동기 클라이언트(client.aio)를 사용
+- 비동기 경로의 캐시 HIT
+- agenerate_advanced() 리사이즈
+- 여러 요청의 동시 진행 (이벤트 루프 비차단)
+- API 예외 처리
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from io import BytesIO
+from PIL import Image
+import numpy as np
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import ImageGenerator  # noqa: E402
+
+
+def create_mock_png_bytes(size: int = 100) -> bytes:
+    """유효한 PNG 이미지 바이트 생성"""
+    arr = np.zeros((size, size, 3), dtype=np.uint8)
+    arr[:, :] = [255, 0, 0]
+    img = Image.fromarray(arr, mode="RGB")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def create_mock_response(size: int = 100) -> MagicMock:
+    """generated_images 하나를 가진 응답 mock"""
+    mock_response = MagicMock()
+    mock_image = MagicMock()
+    mock_image.image.image_bytes = create_mock_png_bytes(size)
+    mock_response.generated_images = [mock_image]
+    return mock_response
+
+
+def create_async_client(response: MagicMock, delay: float = 0.0) -> MagicMock:
+    """client.aio.models.generate_images를 코루틴으로 제공하는 클라이언트 mock"""
+    client = MagicMock()
+    state = {"in_flight": 0, "max_in_flight": 0, "calls": 0}
+
+    async def generate_images(**kwargs):
+        state["calls"] += 1
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(delay)
+            return response
+        finally:
+            state["in_flight"] -= 1
+
+    client.aio.models.generate_images = generate_images
+    client.state = state
+    return client
+
+
+STYLES_DATA = {
+    "styles": [{"name": "realistic", "keywords": "realistic style"}],
+    "default_style": "realistic",
+}
+
+
+class TestAsyncGenerate:
+    """agenerate() / agenerate_advanced() 테스트"""
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_agenerate_uses_async_client(self):
+        """비동기 경로는 client.aio를 사용하고 동기 API는 호출하지 않음"""
+        generator = ImageGenerator(STYLES_DATA)
+        generator.client = create_async_client(create_mock_response())
+
+        result = asyncio.run(generator.agenerate("a cat", "realistic", "16:9"))
+
+        assert result["success"] is True
+        assert Path(result["local_path"]).exists()
+        assert generator.client.state["calls"] == 1
+        generator.client.models.generate_images.assert_not_called()
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_agenerate_cache_hit(self):
+        """동일 요청은 비동기 경로에서도 캐시 HIT"""
+        generator = ImageGenerator(STYLES_DATA)
+        generator.client = create_async_client(create_mock_response())
+
+        async def run():
+            first = await generator.agenerate("a cat", "realistic", "16:9")
+            second = await generator.agenerate("a cat", "realistic", "16:9")
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first["success"] is True
+        assert second.get("cached") is True
+        assert generator.client.state["calls"] == 1
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_agenerate_advanced_resizes(self):
+        """agenerate_advanced()는 요청 해상도로 리사이즈"""
+        generator = ImageGenerator(STYLES_DATA)
+        generator.client = create_async_client(create_mock_response(512))
+
+        result = asyncio.run(
+            generator.agenerate_advanced(
+                prompt="a cat", width=256, height=256, enhance_prompt=False
+            )
+        )
+
+        assert result["success"] is True
+        assert result["width"] == 256
+        with Image.open(result["local_path"]) as img:
+            assert img.size == (256, 256)
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_concurrent_requests_overlap(self):
+        """여러 생성 요청이 이벤트 루프에서 동시에 진행됨"""
+        generator = ImageGenerator(STYLES_DATA)
+        generator.client = create_async_client(create_mock_response(), delay=0.05)
+
+        async def run():
+            return await asyncio.gather(
+                *(generator.agenerate(f"prompt {i}", "realistic") for i in range(5))
+            )
+
+        results = asyncio.run(run())
+
+        assert all(r["success"] for r in results)
+        assert generator.client.state["max_in_flight"] == 5
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_agenerate_handles_api_error(self):
+        """API 예외는 실패 결과로 변환"""
+        generator = ImageGenerator(STYLES_DATA)
+        client = MagicMock()
+
+        async def failing(**kwargs):
+            raise RuntimeError("API Error")
+
+        client.aio.models.generate_images = failing
+        generator.client = client
+
+        result = asyncio.run(generator.agenerate("a cat", "realistic"))
+
+        assert result["success"] is False
+        assert "API Error" in result["error"]
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_agenerate_without_client(self):
+        """클라이언트가 없으면 즉시 실패 결과 반환"""
+        generator = ImageGenerator(STYLES_DATA)
+        generator.client = None
+
+        result = asyncio.run(generator.agenerate("a cat"))
+
+        assert result["success"] is False
+        assert "not initialized" in result["error"]
@@ -0,0 +1,219 @@
+"""
+비동기 작업 큐 테스트
+
+테스트 시나리오:
+- 제출 즉시 작업 ID 반환, 워커가 백그라운드에서 실행하여 결과 저장
+- 핸들러 오류는 작업 실패로 기록되고 다음 작업은 계속 실행
+- 워커 수만큼만 동시 실행
+- 작업 목록 파일 저장: 재시작 후 대기/실행 중 작업 재개
+- 오래된 완료 작업 정리
+- 읽을 수 없거나 형식이 다른 작업 목록 파일은 빈 큐로 시작
+- 기본 저장 위치는 IMAGE_OUTPUT_DIR 상위 디렉토리
+"""
+
+import asyncio
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from jobs import (  # noqa: E402
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_SUCCEEDED,
+    JobQueue,
+    job_queue_from_env,
+)
+
+
+async def wait_finished(queue: JobQueue, job_id: str, timeout: float = 2.0) -> None:
+    """작업이 완료될 때까지 폴링"""
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not queue.get(job_id).finished:
+        if asyncio.get_running_loop().time() > deadline:
+            raise TimeoutError(job_id)
+        await asyncio.sleep(0.01)
+
+
+class TestJobQueue:
+    """JobQueue 테스트"""
+
+    def test_submit_returns_immediately_and_runs(self, tmp_path):
+        """제출은 핸들러 완료를 기다리지 않고, 완료 후 결과 조회 가능"""
+        queue = JobQueue(tmp_path / "jobs.json")
+
+        async def run():
+            gate = asyncio.Event()
+
+            async def handler(params):
+                await gate.wait()
+                return f"done {params['n']}"
+
+            queue.register_handler("slow", handler)
+            job = await queue.submit("slow", {"n": 1})
+            assert queue.get(job.id).status == JOB_QUEUED
+            gate.set()
+            await wait_finished(queue, job.id)
+            await queue.shutdown()
+            return job.id
+
+        job_id = asyncio.run(run())
+
+        job = queue.get(job_id)
+        assert job.status == JOB_SUCCEEDED
+        assert job.result == "done 1"
+        assert job.started_at and job.finished_at
+
+    def test_handler_error_marks_failed(self, tmp_path):
+        """핸들러 예외는 작업 실패로 기록되고 워커는 계속 실행"""
+        queue = JobQueue(tmp_path / "jobs.json", workers=1)
+
+        async def fail(params):
+            raise RuntimeError("boom")
+
+        async def ok(params):
+            return "ok"
+
+        queue.register_handler("fail", fail)
+        queue.register_handler("ok", ok)
+
+        async def run():
+            failed = await queue.submit("fail", {})
+            succeeded = await queue.submit("ok", {})
+            await wait_finished(queue, succeeded.id)
+            await queue.shutdown()
+            return failed.id, succeeded.id
+
+        failed_id, ok_id = asyncio.run(run())
+
+        assert queue.get(failed_id).status == JOB_FAILED
+        assert queue.get(failed_id).error == "boom"
+        assert queue.get(ok_id).status == JOB_SUCCEEDED
+
+    def test_unknown_kind_rejected(self, tmp_path):
+        queue = JobQueue(tmp_path / "jobs.json")
+        with pytest.raises(ValueError):
+            asyncio.run(queue.submit("missing", {}))
+
+    def test_worker_limit(self, tmp_path):
+        """워커 수보다 많은 작업은 대기"""
+        queue = JobQueue(tmp_path / "jobs.json", workers=2)
+        running = []
+        peak = []
+
+        async def handler(params):
+            running.append(1)
+            peak.append(len(running))
+            await asyncio.sleep(0.02)
+            running.pop()
+
+        queue.register_handler("work", handler)
+
+        async def run():
+            jobs = [await queue.submit("work", {}) for _ in range(5)]
+            positions = [queue.queue_position(job.id) for job in jobs[2:]]
+            assert positions == sorted(positions) and None not in positions
+            for job in jobs:
+                await wait_finished(queue, job.id)
+            await queue.shutdown()
+
+        asyncio.run(run())
+
+        assert max(peak) == 2
+        assert queue.get_stats()[JOB_SUCCEEDED] == 5
+
+
+class TestJobPersistence:
+    """작업 목록 저장 및 재개 테스트"""
+
+    def test_queued_and_running_jobs_resume_after_restart(self, tmp_path):
+        """재시작 전 대기/실행 중이던 작업은 새 큐에서 다시 실행"""
+        store = tmp_path / "jobs.json"
+        first = JobQueue(store, workers=1)
+
+        async def hang(params):
+            await asyncio.sleep(10)
+
+        first.register_handler("work", hang)
+
+        async def submit_then_crash():
+            ids = [(await first.submit("work", {"n": n})).id for n in range(2)]
+            await asyncio.sleep(0.05)  # 첫 번째 작업 실행 시작
+            await first.shutdown()
+            return ids
+
+        ids = asyncio.run(submit_then_crash())
+        saved = {
+            job["id"]: job["status"] for job in json.loads(store.read_text())["jobs"]
+        }
+        assert saved == {ids[0]: "running", ids[1]: "queued"}
+
+        second = JobQueue(store, workers=1)
+        order = []
+
+        async def record(params):
+            order.append(params["n"])
+            return params["n"]
+
+        second.register_handler("work", record)
+
+        async def resume():
+            await second.start()
+            for job_id in ids:
+                await wait_finished(second, job_id)
+            await second.shutdown()
+
+        asyncio.run(resume())
+
+        assert order == [0, 1]
+        assert second.get(ids[0]).runs == 2
+        assert second.get(ids[1]).status == JOB_SUCCEEDED
+
+    def test_prunes_oldest_finished_jobs(self, tmp_path):
+        queue = JobQueue(tmp_path / "jobs.json", workers=1, max_finished=2)
+
+        async def handler(params):
+            return params["n"]
+
+        queue.register_handler("work", handler)
+
+        async def run():
+            ids = [(await queue.submit("work", {"n": n})).id for n in range(4)]
+            await wait_finished(queue, ids[-1])
+            await queue.shutdown()
+            return ids
+
+        ids = asyncio.run(run())
+
+        assert queue.get(ids[0]) is None
+        assert [job.result for job in queue.list_jobs()] == [3, 2]
+        reloaded = JobQueue(tmp_path / "jobs.json")
+        assert len(reloaded.list_jobs()) == 2
+
+    @pytest.mark.parametrize("content", ["[1, 2]", '{"jobs": [1]}', "not json"])
+    def test_malformed_store_starts_empty(self, tmp_path, content):
+        store = tmp_path / "jobs.json"
+        store.write_text(content)
+
+        assert JobQueue(store).list_jobs() == []
+
+    def test_unreadable_store_starts_empty(self, tmp_path):
+        # 디렉토리는 열 수 없음 (OSError)
+        store = tmp_path / "jobs.json"
+        store.mkdir()
+
+        assert JobQueue(store).list_jobs() == []
+
+    def test_default_store_next_to_output_dir(self, tmp_path):
+        environ = {"IMAGE_OUTPUT_DIR": str(tmp_path / "out" / "images")}
+        with patch.dict(os.environ, environ):
+            os.environ.pop("JOB_STORE_PATH", None)
+            queue = job_queue_from_env()
+
+        assert queue.store_path == tmp_path / "out" / "jobs.json"
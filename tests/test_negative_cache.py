@@ -0,0 +1,266 @@
+"""
+실패 캐시 및 stale-while-revalidate 테스트
+
+테스트 시나리오:
+- 결정적 실패(이미지 없음, 400/안전 필터)는 짧은 TTL로 캐싱하여 API 호출 생략
+- 일시적 실패(타임아웃 등)는 캐싱하지 않음
+- 실패 캐시 TTL 만료, 비활성화, clear_cache()
+- 만료가 가까운 HIT은 캐시된 결과를 바로 반환하고 백그라운드에서 다시 생성
+- 백그라운드 갱신은 갤러리에 등록하지 않고, close()가 갱신 스레드 풀을 종료
+- 조기 갱신 확률은 남은 유효 시간과 최근 생성 소요 시간으로 결정
+"""
+
+import os
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.retry import is_deterministic_error  # noqa: E402
+
+
+class APIError(Exception):
+    """HTTP 상태 코드를 가진 API 오류"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+def make_response(images: int = 1) -> MagicMock:
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(buffer, format="PNG")
+    image = MagicMock()
+    image.image.image_bytes = buffer.getvalue()
+    response = MagicMock()
+    response.generated_images = [image] * images
+    return response
+
+
+def make_generator() -> ImageGenerator:
+    generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+    generator.client = MagicMock()
+    generator.client.models.generate_images.return_value = make_response()
+    return generator
+
+
+class TestDeterministicErrors:
+    """is_deterministic_error() 테스트"""
+
+    def test_classification(self):
+        assert is_deterministic_error(APIError(400, "INVALID_ARGUMENT"))
+        assert is_deterministic_error(Exception("Prompt blocked by SAFETY filter"))
+        assert not is_deterministic_error(APIError(429, "RESOURCE_EXHAUSTED"))
+        assert not is_deterministic_error(APIError(403, "PERMISSION_DENIED"))
+        assert not is_deterministic_error(TimeoutError("timed out"))
+
+
+@patch.dict(
+    os.environ,
+    {
+        "CACHE_ENABLED": "true",
+        "GOOGLE_API_KEY": "test-key",
+        "IMAGEN_MAX_RETRIES": "0",
+        "CACHE_NEGATIVE_TTL_SECONDS": "300",
+    },
+)
+class TestNegativeCache:
+    """실패 캐시 테스트"""
+
+    def test_no_images_cached(self):
+        generator = make_generator()
+        generator.client.models.generate_images.return_value = make_response(0)
+
+        first = generator.generate("blocked prompt")
+        second = generator.generate("blocked prompt")
+
+        generator.client.models.generate_images.assert_called_once()
+        assert first["success"] is False and first["deterministic"] is True
+        assert "cached" not in first
+        assert second["success"] is False
+        assert second["error"] == "No images returned."
+        assert second["cached"] is True
+        assert second["negative_cached"] is True
+        stats = generator.get_cache_stats()
+        assert stats["negative_hits"] == 1
+        assert stats["negative_size"] == 1
+
+    def test_invalid_argument_cached(self):
+        generator = make_generator()
+        generator.client.models.generate_images.side_effect = APIError(
+            400, "INVALID_ARGUMENT: prompt blocked"
+        )
+
+        generator.generate("blocked prompt")
+        result = generator.generate("blocked prompt")
+
+        generator.client.models.generate_images.assert_called_once()
+        assert result["negative_cached"] is True
+
+    def test_transient_failure_not_cached(self):
+        generator = make_generator()
+        generator.client.models.generate_images.side_effect = [
+            TimeoutError("timed out"),
+            make_response(),
+        ]
+
+        failed = generator.generate("a cat")
+        recovered = generator.generate("a cat")
+
+        assert failed["success"] is False
+        assert "deterministic" not in failed
+        assert recovered["success"] is True
+        assert generator.client.models.generate_images.call_count == 2
+
+    def test_other_prompts_unaffected(self):
+        generator = make_generator()
+        generator.client.models.generate_images.return_value = make_response(0)
+        generator.generate("blocked prompt")
+        generator.client.models.generate_images.return_value = make_response()
+
+        assert generator.generate("a cat")["success"] is True
+
+    @patch.dict(os.environ, {"CACHE_NEGATIVE_TTL_SECONDS": "1"})
+    def test_negative_entry_expires(self):
+        generator = make_generator()
+        generator.client.models.generate_images.return_value = make_response(0)
+        generator.generate("blocked prompt")
+
+        time.sleep(1.1)
+        generator.generate("blocked prompt")
+
+        assert generator.client.models.generate_images.call_count == 2
+
+    @patch.dict(os.environ, {"CACHE_NEGATIVE_TTL_SECONDS": "0"})
+    def test_disabled(self):
+        generator = make_generator()
+        generator.client.models.generate_images.return_value = make_response(0)
+        generator.generate("blocked prompt")
+        generator.generate("blocked prompt")
+
+        assert generator.client.models.generate_images.call_count == 2
+        assert "negative_size" not in generator.get_cache_stats()
+
+    def test_clear_cache_clears_failures(self):
+        generator = make_generator()
+        generator.client.models.generate_images.return_value = make_response(0)
+        generator.generate("blocked prompt")
+
+        generator.clear_cache()
+        generator.generate("blocked prompt")
+
+        assert generator.client.models.generate_images.call_count == 2
+
+
+@patch.dict(
+    os.environ,
+    {
+        "CACHE_ENABLED": "true",
+        "GOOGLE_API_KEY": "test-key",
+        "CACHE_STALE_WHILE_REVALIDATE": "true",
+        "CACHE_EARLY_REFRESH_BETA": "1.0",
+    },
+)
+class TestStaleWhileRevalidate:
+    """만료 전 백그라운드 갱신 테스트"""
+
+    def wait_for_refresh(self, generator: ImageGenerator) -> None:
+        generator._refresh_pool.shutdown(wait=True)
+        generator._refresh_pool = None
+
+    def test_near_expiry_hit_refreshes_in_background(self):
+        generator = make_generator()
+        generator.generate("a cat")
+        # 최근 생성 소요 시간이 TTL보다 길면 항상 조기 갱신 대상
+        generator._generation_seconds = 10**9
+
+        cached = generator.generate("a cat")
+        self.wait_for_refresh(generator)
+
+        assert cached["cached"] is True
+        assert generator.client.models.generate_images.call_count == 2
+        stats = generator.get_cache_stats()
+        assert stats["background_refreshes"] == 1
+        assert stats["refreshing"] == 0
+        # 갱신된 항목도 HIT
+        assert generator.generate("a cat")["cached"] is True
+
+    def test_refresh_does_not_register_gallery_record(self):
+        generator = make_generator()
+        generator.gallery = MagicMock()
+        generator.generate("a cat")
+        generator._generation_seconds = 10**9
+
+        generator.generate("a cat")
+        self.wait_for_refresh(generator)
+
+        assert generator.get_cache_stats()["background_refreshes"] == 1
+        # 최초 생성만 갤러리에 등록 (갱신은 캐시 항목만 교체)
+        assert generator.gallery.register_image.call_count == 1
+
+    def test_close_shuts_down_refresh_pool(self):
+        generator = make_generator()
+        generator.generate("a cat")
+        generator._generation_seconds = 10**9
+        generator.generate("a cat")
+        pool = generator._refresh_pool
+
+        generator.close()
+
+        assert generator._refresh_pool is None
+        with pytest.raises(RuntimeError):
+            pool.submit(lambda: None)
+
+    def test_fresh_entry_not_refreshed(self):
+        generator = make_generator()
+        generator.generate("a cat")
+        generator._generation_seconds = 0.001
+
+        generator.generate("a cat")
+
+        assert generator._refresh_pool is None
+        generator.client.models.generate_images.assert_called_once()
+
+    def test_refresh_probability_grows_near_expiry(self):
+        generator = make_generator()
+        generator.generate("a cat")
+        request = generator._prepare_basic("a cat", None, "16:9", "png", 95)
+        generator._generation_seconds = 10.0
+        submitted = []
+        generator._refresh_slot = lambda slot, req: submitted.append(slot)
+
+        # -ln(1 - 0.5) * 10초 ≈ 6.9초: 남은 시간이 3600초면 갱신하지 않음
+        with patch("generators.image_gen.random.random", return_value=0.5):
+            generator._maybe_refresh(0, request)
+        assert submitted == []
+
+        with patch.object(generator._cache, "expires_in", return_value=5.0):
+            with patch("generators.image_gen.random.random", return_value=0.5):
+                generator._maybe_refresh(0, request)
+        generator._refresh_pool.shutdown(wait=True)
+        assert submitted == [0]
+
+    @patch.dict(os.environ, {"CACHE_STALE_WHILE_REVALIDATE": "false"})
+    def test_disabled_by_default(self):
+        generator = make_generator()
+        generator.generate("a cat")
+        generator._generation_seconds = 10**9
+
+        generator.generate("a cat")
+
+        assert generator._refresh_pool is None
+        generator.client.models.generate_images.assert_called_once()
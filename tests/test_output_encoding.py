@@ -0,0 +1,176 @@
+"""
+출력 형식 협상 및 바이트 패스스루 테스트
+
+테스트 시나리오:
+- Imagen 지원 형식(PNG/JPEG)은 output_mime_type으로 직접 요청
+- WebP 등 미지원 형식과 SERVER_ENCODING=false는 MIME 타입 미요청
+- 요청 형식/크기 그대로 받은 바이트는 재인코딩 없이 저장 (passthrough)
+- 형식 불일치/리사이즈 필요 시 로컬 변환으로 대체 (transcoded)
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from io import BytesIO
+from PIL import Image
+import numpy as np
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.postprocess import detect_format, write_passthrough  # noqa: E402
+
+
+def create_image_bytes(format: str = "PNG", size: int = 64) -> bytes:
+    """지정 형식의 이미지 바이트 생성"""
+    arr = np.zeros((size, size, 3), dtype=np.uint8)
+    arr[:, :] = [10, 20, 30]
+    img = Image.fromarray(arr, mode="RGB")
+    buffer = BytesIO()
+    img.save(buffer, format=format)
+    return buffer.getvalue()
+
+
+def make_generator(image_bytes: bytes) -> ImageGenerator:
+    generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+    response = MagicMock()
+    image = MagicMock()
+    image.image.image_bytes = image_bytes
+    response.generated_images = [image]
+    generator.client = MagicMock()
+    generator.client.models.generate_images.return_value = response
+    return generator
+
+
+class TestDetectFormat:
+    """매직 바이트 형식 판별 테스트"""
+
+    def test_known_formats(self):
+        assert detect_format(create_image_bytes("PNG")) == "png"
+        assert detect_format(create_image_bytes("JPEG")) == "jpeg"
+        assert detect_format(create_image_bytes("WEBP")) == "webp"
+
+    def test_unknown_bytes(self):
+        assert detect_format(b"not an image") is None
+
+
+class TestWritePassthrough:
+    """write_passthrough() 테스트"""
+
+    def test_same_format_written_verbatim(self, tmp_path):
+        """요청 형식과 같으면 원본 바이트를 그대로 저장"""
+        data = create_image_bytes("JPEG")
+        output_path = tmp_path / "out.jpeg"
+
+        result = write_passthrough(data, str(output_path), "jpg")
+
+        assert result[:3] == (64, 64, "passthrough")
+        assert result.timings["encode_ms"] == 0.0
+        assert output_path.read_bytes() == data
+
+    def test_resize_needed_returns_none(self, tmp_path):
+        """요청 크기와 다르면 로컬 변환 필요"""
+        output_path = tmp_path / "out.png"
+
+        result = write_passthrough(
+            create_image_bytes("PNG"), str(output_path), "png", 32, 32
+        )
+
+        assert result is None
+        assert not output_path.exists()
+
+    def test_format_mismatch_returns_none(self, tmp_path):
+        """형식이 다르면 로컬 변환 필요"""
+        result = write_passthrough(
+            create_image_bytes("PNG"), str(tmp_path / "out.webp"), "webp"
+        )
+
+        assert result is None
+
+
+class TestOutputNegotiation:
+    """ImageGenerator 출력 형식 협상 테스트"""
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_jpeg_requested_from_server_and_passed_through(self):
+        """JPEG는 서버에 직접 요청하고 반환 바이트를 그대로 저장"""
+        data = create_image_bytes("JPEG")
+        generator = make_generator(data)
+
+        with patch("generators.image_gen.types") as types_mock:
+            result = generator.generate("a cat", format="jpeg", quality=80)
+
+        config_kwargs = types_mock.GenerateImagesConfig.call_args.kwargs
+        assert config_kwargs["output_mime_type"] == "image/jpeg"
+        assert config_kwargs["output_compression_quality"] == 80
+        assert result["encoding"] == "passthrough"
+        assert Path(result["local_path"]).read_bytes() == data
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_png_has_no_compression_quality(self):
+        """PNG는 MIME 타입만 요청 (압축 품질은 JPEG 전용)"""
+        generator = make_generator(create_image_bytes("PNG"))
+
+        with patch("generators.image_gen.types") as types_mock:
+            result = generator.generate("a cat", format="png")
+
+        config_kwargs = types_mock.GenerateImagesConfig.call_args.kwargs
+        assert config_kwargs["output_mime_type"] == "image/png"
+        assert "output_compression_quality" not in config_kwargs
+        assert result["encoding"] == "passthrough"
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_webp_transcoded_locally(self):
+        """WebP는 서버 미지원이므로 로컬 변환"""
+        generator = make_generator(create_image_bytes("PNG"))
+
+        with patch("generators.image_gen.types") as types_mock:
+            result = generator.generate("a cat", format="webp")
+
+        assert (
+            "output_mime_type" not in types_mock.GenerateImagesConfig.call_args.kwargs
+        )
+        assert result["encoding"] == "transcoded"
+        with Image.open(result["local_path"]) as img:
+            assert img.format == "WEBP"
+
+    @patch.dict(
+        os.environ,
+        {
+            "CACHE_ENABLED": "false",
+            "GOOGLE_API_KEY": "test-key",
+            "SERVER_ENCODING": "false",
+        },
+    )
+    def test_server_encoding_disabled(self):
+        """SERVER_ENCODING=false면 MIME 타입 미요청, 응답 형식이 다르면 로컬 변환"""
+        generator = make_generator(create_image_bytes("PNG"))
+
+        with patch("generators.image_gen.types") as types_mock:
+            result = generator.generate("a cat", format="jpeg")
+
+        assert (
+            "output_mime_type" not in types_mock.GenerateImagesConfig.call_args.kwargs
+        )
+        assert result["encoding"] == "transcoded"
+        with Image.open(result["local_path"]) as img:
+            assert img.format == "JPEG"
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_advanced_resize_falls_back_to_transcode(self):
+        """리사이즈가 필요한 고급 생성은 로컬 변환"""
+        generator = make_generator(create_image_bytes("PNG", size=300))
+
+        result = generator.generate_advanced(
+            "a cat", width=256, height=256, enhance_prompt=False
+        )
+
+        assert result["encoding"] == "transcoded"
+        assert (result["width"], result["height"]) == (256, 256)
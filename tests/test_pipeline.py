@@ -0,0 +1,129 @@
+"""
+생성 파이프라인 단계별 소요 시간 테스트
+
+테스트 시나리오:
+- 새로 생성한 결과에 API/디코딩/인코딩/쓰기 등 단계별 소요 시간 포함
+- 고급 생성은 프롬프트 강화와 리사이즈 단계 시간 포함
+- 캐시 HIT 결과는 키 계산/캐시 조회 시간만 포함 (캐시에는 저장하지 않음)
+- 비동기 및 변형 생성도 같은 파이프라인 사용
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from io import BytesIO
+from PIL import Image
+import numpy as np
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import PIPELINE_STAGES, ImageGenerator  # noqa: E402
+
+STYLES = {
+    "styles": [{"name": "realistic", "keywords": "photo, detailed"}],
+    "default_style": "realistic",
+}
+
+
+def create_mock_response(count: int = 1, size: int = 32) -> MagicMock:
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((size, size, 3), dtype=np.uint8)).save(buffer, "PNG")
+    response = MagicMock()
+    images = []
+    for _ in range(count):
+        image = MagicMock()
+        image.image.image_bytes = buffer.getvalue()
+        images.append(image)
+    response.generated_images = images
+    return response
+
+
+def make_generator(response: MagicMock) -> ImageGenerator:
+    generator = ImageGenerator(STYLES)
+    generator.client = MagicMock()
+    generator.client.models.generate_images.return_value = response
+
+    async def agenerate_images(**kwargs):
+        return response
+
+    generator.client.aio.models.generate_images = agenerate_images
+    return generator
+
+
+def stage_order(timings: dict) -> list:
+    stages = [key[: -len("_ms")] for key in timings if key != "total_ms"]
+    return sorted(stages, key=PIPELINE_STAGES.index)
+
+
+@patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+class TestPipelineTimings:
+    """단계별 소요 시간 테스트"""
+
+    def test_fresh_result_has_stage_timings(self):
+        """새로 생성한 결과는 모든 주요 단계 시간을 파이프라인 순서로 포함"""
+        generator = make_generator(create_mock_response())
+
+        result = generator.generate("a cat", format="webp")
+
+        timings = result["timings"]
+        for stage in ("key", "cache", "api", "decode", "encode", "write", "register"):
+            assert timings[f"{stage}_ms"] >= 0
+        assert "enhance_ms" not in timings
+        assert [k[:-3] for k in timings if k != "total_ms"] == stage_order(timings)
+        assert timings["total_ms"] >= timings["api_ms"]
+
+    def test_advanced_includes_enhance_and_resize(self):
+        """고급 생성은 프롬프트 강화와 리사이즈 시간 포함"""
+        generator = make_generator(create_mock_response(size=300))
+
+        result = generator.generate_advanced("a cat", width=256, height=256)
+
+        assert (result["width"], result["height"]) == (256, 256)
+        assert "enhance_ms" in result["timings"]
+        assert "resize_ms" in result["timings"]
+
+    def test_cache_hit_has_lookup_timings_only(self):
+        """캐시 HIT은 키 계산/캐시 조회 시간만 포함하고 timings는 캐싱하지 않음"""
+        generator = make_generator(create_mock_response())
+
+        generator.generate("a cat")
+        cached = generator.generate("a cat")
+
+        assert cached["cached"] is True
+        assert set(cached["timings"]) == {"key_ms", "cache_ms", "total_ms"}
+
+    def test_async_variants_sum_postprocess_timings(self):
+        """변형 생성은 이미지별 시간을 각 변형에, 합계를 대표 결과에 기록"""
+        generator = make_generator(create_mock_response(count=2))
+
+        result = asyncio.run(generator.agenerate("a cat", format="webp", variants=2))
+
+        assert result["variant_count"] == 2
+        per_image = [v["timings"]["encode_ms"] for v in result["variants"]]
+        assert result["timings"]["encode_ms"] == round(sum(per_image), 2)
+        assert "api_ms" in result["timings"]
+
+    def test_passthrough_skips_encode(self):
+        """요청 형식 그대로 받은 이미지는 인코딩 시간 0"""
+        generator = make_generator(create_mock_response())
+
+        result = generator.generate("a dog", format="png")
+
+        assert result["encoding"] == "passthrough"
+        assert result["timings"]["encode_ms"] == 0.0
+
+    def test_batch_entries_include_timings(self):
+        """배치 항목 결과에도 단계별 소요 시간 포함"""
+        generator = make_generator(create_mock_response())
+
+        summary = asyncio.run(generator.generate_batch([{"prompt": "a"}]))
+
+        assert "api_ms" in summary["results"][0]["timings"]
@@ -0,0 +1,179 @@
+"""
+이미지 후처리 (PostProcessor) 테스트
+
+테스트 시나리오:
+- render_image(): 디코딩/리사이즈/인코딩 후 파일 저장
+- PostProcessor 인라인 모드 (workers=0)
+- PostProcessor 프로세스 풀 모드: 공유 메모리 전달 및 정리
+- POSTPROCESS_WORKERS 환경 변수 해석
+- ImageGenerator가 후처리 단계를 사용
+"""
+
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from io import BytesIO
+from multiprocessing.shared_memory import SharedMemory
+from PIL import Image
+import numpy as np
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.postprocess import (  # noqa: E402
+    PostProcessor,
+    RenderResult,
+    render_image,
+    workers_from_env,
+)
+
+
+def create_png_bytes(size: int = 64) -> bytes:
+    """유효한 PNG 이미지 바이트 생성"""
+    arr = np.zeros((size, size, 3), dtype=np.uint8)
+    arr[:, :] = [0, 255, 0]
+    img = Image.fromarray(arr, mode="RGB")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+class TestRenderImage:
+    """render_image() 테스트"""
+
+    def test_resize_and_encode(self, tmp_path):
+        """요청 크기로 리사이즈하고 지정 형식으로 저장"""
+        output_path = tmp_path / "out.webp"
+
+        size = render_image(create_png_bytes(128), str(output_path), "webp", 80, 96, 64)
+
+        assert size[:3] == (96, 64, "transcoded")
+        assert set(size.timings) == {"decode_ms", "resize_ms", "encode_ms", "write_ms"}
+        with Image.open(output_path) as img:
+            assert img.format == "WEBP"
+            assert img.size == (96, 64)
+
+    def test_keeps_size_without_dimensions(self, tmp_path):
+        """크기를 지정하지 않으면 원본 크기 유지"""
+        output_path = tmp_path / "out.png"
+
+        size = render_image(create_png_bytes(50), str(output_path))
+
+        assert size[:2] == (50, 50)
+
+
+class TestPostProcessor:
+    """PostProcessor 테스트"""
+
+    def test_inline_mode(self, tmp_path):
+        """workers=0이면 프로세스 풀 없이 바로 처리"""
+        processor = PostProcessor(workers=0)
+        output_path = tmp_path / "inline.png"
+
+        size = processor.render(create_png_bytes(), str(output_path))
+
+        assert size[:2] == (64, 64)
+        assert output_path.exists()
+        assert processor._executor is None
+
+    def test_process_pool_mode(self, tmp_path):
+        """프로세스 풀 워커가 공유 메모리의 바이트로 처리하고 세그먼트는 정리됨"""
+        processor = PostProcessor(workers=1)
+        created = []
+        original = SharedMemory
+
+        def tracking_shared_memory(*args, **kwargs):
+            shm = original(*args, **kwargs)
+            created.append(shm.name)
+            return shm
+
+        try:
+            with patch("generators.postprocess.SharedMemory", tracking_shared_memory):
+                paths = [tmp_path / f"pool_{i}.jpeg" for i in range(2)]
+                sizes = [
+                    processor.render(
+                        create_png_bytes(80), str(path), "jpeg", 90, 40, 40
+                    )
+                    for path in paths
+                ]
+        finally:
+            processor.shutdown()
+
+        assert [size[:3] for size in sizes] == [(40, 40, "transcoded")] * 2
+        assert all(path.exists() for path in paths)
+        assert len(created) == 2
+        for name in created:
+            try:
+                original(name=name)
+            except FileNotFoundError:
+                continue
+            raise AssertionError(f"shared memory {name} was not unlinked")
+
+
+class TestWorkersFromEnv:
+    """POSTPROCESS_WORKERS 환경 변수 테스트"""
+
+    @patch.dict(os.environ, {}, clear=True)
+    def test_default_disabled(self):
+        assert workers_from_env() == 0
+
+    @patch.dict(os.environ, {"POSTPROCESS_WORKERS": "3"})
+    def test_explicit_count(self):
+        assert workers_from_env() == 3
+
+    @patch.dict(os.environ, {"POSTPROCESS_WORKERS": "auto"})
+    def test_auto_uses_cpu_count(self):
+        assert workers_from_env() == (os.cpu_count() or 1)
+
+    @patch.dict(os.environ, {"POSTPROCESS_WORKERS": "many"})
+    def test_invalid_value_disables(self):
+        assert workers_from_env() == 0
+
+
+class TestImageGeneratorPostProcessing:
+    """ImageGenerator 후처리 단계 연동 테스트"""
+
+    @patch.dict(
+        os.environ,
+        {
+            "CACHE_ENABLED": "false",
+            "GOOGLE_API_KEY": "test-key",
+            "POSTPROCESS_WORKERS": "2",
+        },
+    )
+    def test_generator_delegates_to_postprocessor(self):
+        """생성된 이미지의 디코딩/리사이즈/저장은 PostProcessor.render()로 위임"""
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+        assert generator.postprocessor.workers == 2
+
+        response = MagicMock()
+        image = MagicMock()
+        image.image.image_bytes = create_png_bytes(300)
+        response.generated_images = [image]
+        generator.client = MagicMock()
+        generator.client.models.generate_images.return_value = response
+
+        def render(image_bytes, output_path, *args):
+            Path(output_path).write_bytes(image_bytes)
+            return RenderResult(256, 256, "transcoded", {})
+
+        generator.postprocessor = MagicMock()
+        generator.postprocessor.render.side_effect = render
+
+        result = generator.generate_advanced(
+            "a cat", width=256, height=256, enhance_prompt=False
+        )
+
+        assert result["success"] is True
+        assert (result["width"], result["height"]) == (256, 256)
+        args = generator.postprocessor.render.call_args.args
+        assert args[0] == image.image.image_bytes
+        assert Path(args[1]).name == result["filename"]
+        assert args[4:] == (256, 256)
@@ -0,0 +1,158 @@
+"""
+프로세스 간 요청 병합 테스트
+
+테스트 시나리오:
+- 임대는 한 보유자만 획득하고, 해제 후 다시 획득 가능
+- 보유 프로세스가 종료되었거나 임대 시간이 지나면 다른 프로세스가 인수
+- 다른 토큰으로는 해제되지 않음
+- CACHE_SHARED로 같은 L2 파일을 쓰는 두 ImageGenerator는 Imagen을 한 번만 호출
+"""
+
+import os
+import sqlite3
+import sys
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.process_flight import ProcessSingleFlight  # noqa: E402
+
+
+def make_response() -> MagicMock:
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(buffer, format="PNG")
+    image = MagicMock()
+    image.image.image_bytes = buffer.getvalue()
+    response = MagicMock()
+    response.generated_images = [image]
+    return response
+
+
+class TestProcessSingleFlight:
+    """ProcessSingleFlight 테스트"""
+
+    def test_acquire_release(self, tmp_path):
+        first = ProcessSingleFlight(tmp_path / "cache.sqlite3")
+        second = ProcessSingleFlight(tmp_path / "cache.sqlite3")
+
+        token = first.try_acquire("key")
+        assert token is not None
+        assert second.try_acquire("key") is None
+        assert second.is_held("key")
+
+        first.release("key", token)
+        assert not second.is_held("key")
+        assert second.try_acquire("key") is not None
+
+    def test_dead_owner_taken_over(self, tmp_path):
+        flight = ProcessSingleFlight(tmp_path / "cache.sqlite3")
+        with sqlite3.connect(str(tmp_path / "cache.sqlite3")) as conn:
+            conn.execute(
+                "INSERT INTO flight_leases VALUES (?, ?, ?, ?)",
+                ("key", 2**22 + 12345, "stale", time.time() + 300),
+            )
+
+        with patch("generators.process_flight._process_alive", return_value=False):
+            assert not flight.is_held("key")
+            assert flight.try_acquire("key") is not None
+
+    def test_expired_lease_taken_over(self, tmp_path):
+        first = ProcessSingleFlight(tmp_path / "cache.sqlite3", lease_seconds=0.05)
+        second = ProcessSingleFlight(tmp_path / "cache.sqlite3")
+        assert first.try_acquire("key") is not None
+
+        time.sleep(0.1)
+
+        assert second.try_acquire("key") is not None
+
+    def test_release_with_other_token_keeps_lease(self, tmp_path):
+        flight = ProcessSingleFlight(tmp_path / "cache.sqlite3")
+        assert flight.try_acquire("key") is not None
+
+        flight.release("key", "other")
+
+        assert flight.is_held("key")
+
+    def test_wait_returns_after_release(self, tmp_path):
+        first = ProcessSingleFlight(tmp_path / "cache.sqlite3")
+        second = ProcessSingleFlight(tmp_path / "cache.sqlite3", poll_interval=0.01)
+        token = first.try_acquire("key")
+        threading.Timer(0.1, first.release, args=("key", token)).start()
+
+        start = time.monotonic()
+        second.wait("key")
+
+        assert time.monotonic() - start < 5
+        assert second.waits == 1
+        assert not second.is_held("key")
+
+
+class TestSharedGenerators:
+    """CACHE_SHARED 설정 테스트"""
+
+    def test_second_process_reuses_leader_result(self, tmp_path):
+        env = {
+            "CACHE_ENABLED": "true",
+            "CACHE_SHARED": "true",
+            "CACHE_L2_PATH": "",
+            "GOOGLE_API_KEY": "test-key",
+            "IMAGE_OUTPUT_DIR": str(tmp_path / "images"),
+        }
+        with patch.dict(os.environ, env):
+            leader = ImageGenerator({"styles": [], "default_style": "realistic"})
+            follower = ImageGenerator({"styles": [], "default_style": "realistic"})
+        follower._process_flight._poll_interval = 0.01
+
+        started = threading.Event()
+        release = threading.Event()
+        client = MagicMock()
+
+        def generate_images(**kwargs):
+            started.set()
+            assert release.wait(5)
+            return make_response()
+
+        client.models.generate_images.side_effect = generate_images
+        leader.client = client
+        follower.client = client
+
+        results = {}
+        leader_thread = threading.Thread(
+            target=lambda: results.setdefault("leader", leader.generate("a cat"))
+        )
+        leader_thread.start()
+        assert started.wait(5)
+        follower_thread = threading.Thread(
+            target=lambda: results.setdefault("follower", follower.generate("a cat"))
+        )
+        follower_thread.start()
+        time.sleep(0.2)
+        release.set()
+        leader_thread.join(5)
+        follower_thread.join(5)
+
+        assert client.models.generate_images.call_count == 1
+        assert results["leader"]["success"]
+        assert results["follower"]["success"]
+        assert results["follower"]["cached"]
+        assert Path(results["follower"]["local_path"]).exists()
+        stats = follower.get_cache_stats()
+        assert stats["cross_process_hits"] == 1
+        assert stats["shared"]["waits"] == 1
+        assert stats["shared"]["path"] == str(
+            tmp_path / "cache" / "image_cache.sqlite3"
+        )
@@ -0,0 +1,191 @@
+"""
+프롬프트 정규화 및 유사 프롬프트 색인 테스트
+
+테스트 시나리오:
+- NFKC/공백/끝 문장 부호/불용어 정규화로 표기만 다른 프롬프트는 같은 캐시 키
+- MinHash/LSH 색인: 유사 프롬프트 검색, 임계값, 범위 분리, 삭제
+- CACHE_APPROX_THRESHOLD 설정 시 근사 HIT (approximate 표시, API 호출 없음)
+"""
+
+import os
+import sys
+from io import BytesIO
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+from PIL import Image
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.blob_store import BlobStore  # noqa: E402
+from generators.cache import canonicalize_prompt, generate_cache_key  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.prompt_index import PromptIndex  # noqa: E402
+
+
+class TestCanonicalizePrompt:
+    """프롬프트 정규화 테스트"""
+
+    def test_english_variants_share_key(self):
+        keys = {
+            generate_cache_key(prompt, "realistic", "16:9")
+            for prompt in ("A cat on a sofa", "a cat on a sofa.", "a  cat on a sofa")
+        }
+        assert len(keys) == 1
+
+    def test_nfkc_and_korean_punctuation(self):
+        assert canonicalize_prompt("ＡＢＣ　고양이。") == "abc 고양이"
+        assert canonicalize_prompt("고양이 좀 그려줘!!") == "고양이 그려줘"
+        assert canonicalize_prompt("소파 위의 고양이~") == "소파 위의 고양이"
+
+    def test_stop_words_removed(self):
+        assert canonicalize_prompt("The cat on the sofa") == "cat on sofa"
+        # 불용어만 있으면 그대로 유지 (빈 키 방지)
+        assert canonicalize_prompt("A") == "a"
+
+    def test_meaningful_differences_kept(self):
+        assert generate_cache_key("a cat", "realistic") != generate_cache_key(
+            "a dog", "realistic"
+        )
+        assert generate_cache_key("a cat?", "realistic") == generate_cache_key(
+            "a cat", "realistic"
+        )
+        assert generate_cache_key("no cat", "realistic") != generate_cache_key(
+            "cat", "realistic"
+        )
+
+
+class TestPromptIndex:
+    """MinHash/LSH 색인 테스트"""
+
+    def test_similar_prompt_found(self):
+        index = PromptIndex(threshold=0.8)
+        index.add("scope", "빨간 소파 위에 앉아 있는 고양이", "key1")
+
+        match = index.query("scope", "빨간 소파위에 앉아있는 고양이가")
+
+        assert match is not None
+        key, similarity, prompt = match
+        assert key == "key1"
+        assert similarity >= 0.8
+        assert prompt == "빨간 소파 위에 앉아 있는 고양이"
+
+    def test_dissimilar_prompt_not_found(self):
+        index = PromptIndex(threshold=0.8)
+        index.add("scope", "a cat sitting on a red sofa", "key1")
+
+        assert index.query("scope", "a mountain lake at dawn") is None
+
+    def test_scope_isolated(self):
+        index = PromptIndex(threshold=0.8)
+        index.add("16:9", "a cat sitting on a red sofa", "key1")
+
+        assert index.query("1:1", "a cat sitting on a red sofa") is None
+
+    def test_remove(self):
+        index = PromptIndex(threshold=0.8)
+        index.add("scope", "a cat sitting on a red sofa", "key1")
+
+        assert index.remove("key1") is True
+        assert index.remove("key1") is False
+        assert len(index) == 0
+        assert index.query("scope", "a cat sitting on a red sofa") is None
+
+    def test_best_match_wins(self):
+        index = PromptIndex(threshold=0.5)
+        index.add("scope", "a cat sitting on a red sofa in a sunny room", "near")
+        index.add("scope", "a cat sitting on a blue chair", "far")
+
+        match = index.query("scope", "a cat sitting on a red sofa in the sunny room")
+
+        assert match is not None and match[0] == "near"
+
+
+def make_generator(tmp_path: Path) -> ImageGenerator:
+    generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+    generator.output_dir = tmp_path / "images"
+    generator.output_dir.mkdir()
+    generator.blob_store = BlobStore(generator.output_dir / "blobs")
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(buffer, format="PNG")
+    image = MagicMock()
+    image.image.image_bytes = buffer.getvalue()
+    response = MagicMock()
+    response.generated_images = [image]
+    generator.client = MagicMock()
+    generator.client.models.generate_images.return_value = response
+    return generator
+
+
+@patch.dict(
+    os.environ,
+    {
+        "CACHE_ENABLED": "true",
+        "GOOGLE_API_KEY": "test-key",
+        "CACHE_APPROX_THRESHOLD": "0.8",
+    },
+)
+class TestApproximateHit:
+    """ImageGenerator 근사 HIT 테스트"""
+
+    def test_similar_prompt_served_from_cache(self, tmp_path):
+        generator = make_generator(tmp_path)
+        first = generator.generate("빨간 소파 위에 앉아 있는 고양이")
+
+        result = generator.generate("빨간 소파위에 앉아있는 고양이가")
+
+        generator.client.models.generate_images.assert_called_once()
+        assert result["cached"] is True
+        assert result["approximate"] is True
+        assert result["similarity"] >= 0.8
+        assert result["matched_prompt"] == "빨간 소파 위에 앉아 있는 고양이"
+        assert result["local_path"] == first["local_path"]
+        stats = generator.get_cache_stats()
+        assert stats["approximate_hits"] == 1
+        assert stats["approx_index_size"] == 1
+
+    def test_exact_hit_not_flagged(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate("a cat on a sofa")
+
+        result = generator.generate("A cat on a sofa.")
+
+        generator.client.models.generate_images.assert_called_once()
+        assert result["cached"] is True
+        assert "approximate" not in result
+
+    def test_other_aspect_ratio_not_matched(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate("빨간 소파 위에 앉아 있는 고양이", aspect_ratio="16:9")
+
+        result = generator.generate(
+            "빨간 소파위에 앉아있는 고양이가", aspect_ratio="1:1"
+        )
+
+        assert generator.client.models.generate_images.call_count == 2
+        assert "approximate" not in result
+
+    def test_cleared_entries_leave_index(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate("빨간 소파 위에 앉아 있는 고양이")
+
+        generator.clear_cache()
+
+        assert generator.get_cache_stats()["approx_index_size"] == 0
+
+    @patch.dict(os.environ, {"CACHE_APPROX_THRESHOLD": "0"})
+    def test_disabled_by_default(self, tmp_path):
+        generator = make_generator(tmp_path)
+        generator.generate("빨간 소파 위에 앉아 있는 고양이")
+
+        generator.generate("빨간 소파위에 앉아있는 고양이가")
+
+        assert generator.client.models.generate_images.call_count == 2
+        assert "approx_index_size" not in generator.get_cache_stats()
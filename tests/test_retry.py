@@ -0,0 +1,344 @@
+"""
+Imagen 호출 재시도/헤징 테스트
+
+테스트 시나리오:
+- 일시적 오류 판별
+- 일시적 오류는 지터 백오프 후 재시도, 영구 오류는 즉시 실패
+- 재시도 소진 시 RetryExhaustedError에 시도별 기록 포함
+- 헤지: 표본 p95 지연 후 중복 요청, 먼저 끝난 결과 사용 및 패자 취소
+- 스케줄러 대기 시간은 헤지 지연과 시도 소요 시간에 포함하지 않음
+- ImageGenerator 결과의 시도별 기록 (캐시에는 저장하지 않음)
+"""
+
+import asyncio
+import os
+import sys
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from io import BytesIO
+from PIL import Image
+import numpy as np
+import pytest
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.retry import (  # noqa: E402
+    RetryExhaustedError,
+    RetryPolicy,
+    is_transient_error,
+)
+from generators.scheduler import ImagenScheduler  # noqa: E402
+
+
+class APIError(Exception):
+    """genai APIError처럼 code 속성을 가진 예외"""
+
+    def __init__(self, code: int):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+def create_mock_response() -> MagicMock:
+    buffer = BytesIO()
+    Image.fromarray(np.zeros((16, 16, 3), dtype=np.uint8)).save(buffer, "PNG")
+    response = MagicMock()
+    image = MagicMock()
+    image.image.image_bytes = buffer.getvalue()
+    response.generated_images = [image]
+    return response
+
+
+def make_policy(**kwargs) -> RetryPolicy:
+    kwargs.setdefault("base_delay", 0.001)
+    kwargs.setdefault("max_delay", 0.002)
+    return RetryPolicy(**kwargs)
+
+
+class TestTransientErrors:
+    """일시적 오류 판별 테스트"""
+
+    def test_transient(self):
+        assert is_transient_error(APIError(429))
+        assert is_transient_error(APIError(500))
+        assert is_transient_error(APIError(504))
+        assert is_transient_error(TimeoutError())
+        assert is_transient_error(RuntimeError("DEADLINE_EXCEEDED"))
+
+    def test_permanent(self):
+        assert not is_transient_error(APIError(400))
+        assert not is_transient_error(ValueError("invalid prompt"))
+
+
+class TestRetry:
+    """재시도 테스트"""
+
+    def test_retries_transient_then_succeeds(self):
+        """일시적 오류 후 재시도하여 성공, 시도별 기록 반환"""
+        policy = make_policy(max_retries=2)
+        outcomes = [APIError(503), APIError(429), "ok"]
+
+        def fn():
+            outcome = outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        result, attempts = policy.call(fn)
+
+        assert result == "ok"
+        assert [a["outcome"] for a in attempts] == ["error", "error", "success"]
+        assert [a["attempt"] for a in attempts] == [1, 2, 3]
+        assert all("backoff_ms" in a for a in attempts[:2])
+        assert all(a["ms"] >= 0 for a in attempts)
+
+    def test_permanent_error_not_retried(self):
+        """영구 오류는 재시도 없이 실패"""
+        policy = make_policy(max_retries=3)
+        calls = []
+
+        def fn():
+            calls.append(1)
+            raise ValueError("bad request")
+
+        with pytest.raises(RetryExhaustedError) as exc_info:
+            policy.call(fn)
+
+        assert len(calls) == 1
+        assert str(exc_info.value) == "bad request"
+        assert len(exc_info.value.attempts) == 1
+
+    def test_exhausted_after_max_retries(self):
+        """최대 재시도 후에도 실패하면 모든 시도 기록과 함께 실패"""
+        policy = make_policy(max_retries=2)
+
+        async def fn():
+            raise APIError(503)
+
+        with pytest.raises(RetryExhaustedError) as exc_info:
+            asyncio.run(policy.acall(fn))
+
+        assert len(exc_info.value.attempts) == 3
+        assert "backoff_ms" not in exc_info.value.attempts[-1]
+
+    def test_backoff_is_jittered_and_capped(self):
+        """백오프는 [0, min(max, base*2^n)] 범위"""
+        policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+        samples = [policy.backoff(5) for _ in range(200)]
+
+        assert all(0 <= s <= 4.0 for s in samples)
+        assert len(set(samples)) > 1
+
+
+class TestHedging:
+    """헤지 요청 테스트"""
+
+    def make_hedging_policy(self) -> RetryPolicy:
+        policy = make_policy(
+            hedge_enabled=True, hedge_min_delay=0.0, hedge_min_samples=5
+        )
+        for _ in range(20):
+            policy.observe(0.02)
+        return policy
+
+    def test_no_hedge_until_enough_samples(self):
+        policy = make_policy(hedge_enabled=True, hedge_min_samples=5)
+        assert policy.hedge_delay() is None
+        for _ in range(5):
+            policy.observe(0.5)
+        assert policy.hedge_delay() == pytest.approx(2.0)  # hedge_min_delay 하한
+
+    def test_hedge_delay_uses_quantile(self):
+        policy = make_policy(hedge_enabled=True, hedge_min_delay=0, hedge_min_samples=1)
+        for ms in range(1, 101):
+            policy.observe(ms / 1000)
+        assert policy.hedge_delay() == pytest.approx(0.096)
+
+    def test_async_hedge_wins_and_primary_cancelled(self):
+        """느린 primary 대신 헤지 결과를 사용하고 primary는 취소"""
+        policy = self.make_hedging_policy()
+        calls = []
+        cancelled = []
+
+        async def fn():
+            index = len(calls)
+            calls.append(index)
+            try:
+                await asyncio.sleep(1.0 if index == 0 else 0.01)
+            except asyncio.CancelledError:
+                cancelled.append(index)
+                raise
+            return f"response {index}"
+
+        start = time.monotonic()
+        result, attempts = asyncio.run(policy.acall(fn))
+
+        assert result == "response 1"
+        assert time.monotonic() - start < 0.5
+        assert cancelled == [0]
+        by_kind = {a["kind"]: a["outcome"] for a in attempts}
+        assert by_kind == {"hedge": "success", "primary": "cancelled"}
+
+    def test_async_fast_primary_skips_hedge(self):
+        """primary가 헤지 지연 전에 끝나면 헤지 요청을 보내지 않음"""
+        policy = self.make_hedging_policy()
+        calls = []
+
+        async def fn():
+            calls.append(1)
+            return "fast"
+
+        result, attempts = asyncio.run(policy.acall(fn))
+
+        assert result == "fast"
+        assert len(calls) == 1
+        assert [a["kind"] for a in attempts] == ["primary"]
+
+    def test_sync_hedge_wins(self):
+        """동기 경로도 헤지 결과를 사용하고 primary 결과는 폐기"""
+        policy = self.make_hedging_policy()
+        calls = []
+
+        def fn():
+            index = len(calls)
+            calls.append(index)
+            time.sleep(0.3 if index == 0 else 0.01)
+            return f"response {index}"
+
+        result, attempts = policy.call(fn)
+
+        assert result == "response 1"
+        by_kind = {a["kind"]: a["outcome"] for a in attempts}
+        assert by_kind == {"hedge": "success", "primary": "abandoned"}
+
+
+class TestQueuedAdmission:
+    """대기열(gate) 대기 시간은 헤지 지연과 시도 소요 시간에서 제외"""
+
+    def make_policy(self) -> RetryPolicy:
+        policy = make_policy(
+            hedge_enabled=True, hedge_min_delay=0.0, hedge_min_samples=5
+        )
+        for _ in range(20):
+            policy.observe(0.05)
+        return policy
+
+    def test_sync_queue_wait_does_not_hedge(self):
+        policy = self.make_policy()
+        calls = []
+
+        @contextmanager
+        def queued():
+            time.sleep(0.3)  # 스케줄러 대기열에서 기다리는 시간
+            yield
+
+        def fn():
+            calls.append(1)
+            time.sleep(0.01)
+            return "ok"
+
+        result, attempts = policy.call(fn, gate=queued)
+
+        assert result == "ok"
+        assert len(calls) == 1
+        assert [a["kind"] for a in attempts] == ["primary"]
+        assert attempts[0]["ms"] < 200
+
+    def test_async_queue_wait_does_not_hedge(self):
+        policy = self.make_policy()
+        calls = []
+
+        @asynccontextmanager
+        async def queued():
+            await asyncio.sleep(0.3)
+            yield
+
+        async def fn():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return "ok"
+
+        result, attempts = asyncio.run(policy.acall(fn, gate=queued))
+
+        assert result == "ok"
+        assert len(calls) == 1
+        assert attempts[0]["ms"] < 200
+        assert max(policy._latencies) < 0.2
+
+    def test_scheduler_slot_as_gate(self):
+        """속도 제한으로 대기한 호출도 API 시간만 기록"""
+        scheduler = ImagenScheduler(rate_per_minute=600, burst=1)
+        policy = make_policy()
+        gate = scheduler.slot
+
+        policy.call(lambda: "first", gate=gate)
+        start = time.monotonic()
+        _, attempts = policy.call(lambda: "second", gate=gate)
+
+        assert time.monotonic() - start >= 0.05  # 토큰 대기 (0.1초 간격)
+        assert attempts[0]["ms"] < 50
+        assert scheduler.get_stats()["in_flight"] == 0
+
+
+class TestImageGeneratorRetry:
+    """ImageGenerator 재시도 연동 테스트"""
+
+    @patch.dict(
+        os.environ,
+        {
+            "CACHE_ENABLED": "true",
+            "GOOGLE_API_KEY": "test-key",
+            "IMAGEN_RETRY_BASE_DELAY": "0.001",
+        },
+    )
+    def test_transient_error_retried_with_attempts_in_result(self):
+        """429 후 재시도 성공, 결과에 시도 기록 포함 (캐시 결과에는 제외)"""
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+        generator.client = MagicMock()
+        generator.client.models.generate_images.side_effect = [
+            APIError(429),
+            create_mock_response(),
+        ]
+
+        result = generator.generate("a cat")
+        cached = generator.generate("a cat")
+
+        assert result["success"] is True
+        assert [a["outcome"] for a in result["attempts"]] == ["error", "success"]
+        assert cached["cached"] is True
+        assert "attempts" not in cached
+        assert generator.get_scheduler_stats()["overloads"] == 1
+
+    @patch.dict(
+        os.environ,
+        {
+            "CACHE_ENABLED": "false",
+            "GOOGLE_API_KEY": "test-key",
+            "IMAGEN_MAX_RETRIES": "1",
+            "IMAGEN_RETRY_BASE_DELAY": "0.001",
+        },
+    )
+    def test_failure_reports_attempts(self):
+        """재시도 소진 시 실패 결과에 시도 기록 포함"""
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+        client = MagicMock()
+
+        async def failing(**kwargs):
+            raise APIError(503)
+
+        client.aio.models.generate_images = failing
+        generator.client = client
+
+        result = asyncio.run(generator.agenerate("a cat"))
+
+        assert result["success"] is False
+        assert result["error"] == "503 error"
+        assert len(result["attempts"]) == 2
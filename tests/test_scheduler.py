@@ -0,0 +1,296 @@
+"""
+Imagen 호출 스케줄러 테스트
+
+테스트 시나리오:
+- TokenBucket: 초기 용량, 보충, 대기 시간 계산
+- 우선순위: 대화형 호출이 먼저 대기한 배치 호출보다 먼저 실행
+- AIMD: 429/503 시 동시 실행 제한 절반, 성공 시 점진 증가
+- 속도 제한: 토큰이 없으면 보충될 때까지 대기
+- 대기열 깊이/대기 시간 통계, 취소된 대기자 정리
+- ImageGenerator 연동: 배치 항목은 배치 우선순위로 호출
+"""
+
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from io import BytesIO
+from PIL import Image
+import numpy as np
+import pytest
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.scheduler import (  # noqa: E402
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    ImagenScheduler,
+    TokenBucket,
+    is_overload_error,
+)
+
+
+class FakeClock:
+    """수동으로 진행하는 시간 함수"""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class QuotaError(Exception):
+    """genai APIError처럼 code 속성을 가진 예외"""
+
+    def __init__(self, code: int):
+        super().__init__(f"{code} error")
+        self.code = code
+
+
+def wait_until(predicate, timeout: float = 2.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate() and time.monotonic() < deadline:
+        time.sleep(0.005)
+
+
+class TestTokenBucket:
+    """TokenBucket 테스트"""
+
+    def test_burst_then_wait(self):
+        """burst만큼 즉시 사용 후 다음 토큰까지 대기 시간 반환"""
+        clock = FakeClock()
+        bucket = TokenBucket(rate_per_minute=60, burst=2, clock=clock)
+
+        assert bucket.try_take() == 0.0
+        assert bucket.try_take() == 0.0
+        assert bucket.try_take() == pytest.approx(1.0)
+
+        clock.now = 1.0
+        assert bucket.try_take() == 0.0
+
+    def test_disabled_when_rate_zero(self):
+        """rate 0이면 제한 없음"""
+        bucket = TokenBucket(rate_per_minute=0)
+        assert all(bucket.try_take() == 0.0 for _ in range(100))
+
+
+class TestOverloadDetection:
+    """과부하 오류 판별 테스트"""
+
+    def test_status_codes(self):
+        assert is_overload_error(QuotaError(429))
+        assert is_overload_error(QuotaError(503))
+        assert not is_overload_error(QuotaError(400))
+
+    def test_message_markers(self):
+        assert is_overload_error(RuntimeError("RESOURCE_EXHAUSTED: quota"))
+        assert not is_overload_error(RuntimeError("invalid prompt"))
+
+
+class TestPriority:
+    """우선순위 대기열 테스트"""
+
+    def test_interactive_runs_before_waiting_batch(self):
+        """슬롯이 비면 먼저 대기한 배치보다 대화형 호출이 먼저 실행"""
+        scheduler = ImagenScheduler(max_concurrent=1)
+        release = threading.Event()
+        order = []
+
+        def blocker():
+            release.wait(timeout=2)
+
+        def submit(name, priority):
+            scheduler.call(lambda: order.append(name), priority)
+
+        holder = threading.Thread(
+            target=lambda: scheduler.call(blocker, PRIORITY_BATCH)
+        )
+        holder.start()
+        wait_until(lambda: scheduler.get_stats()["in_flight"] == 1)
+
+        batch = threading.Thread(target=submit, args=("batch", PRIORITY_BATCH))
+        batch.start()
+        wait_until(lambda: scheduler.get_stats()["queue_depth"] == 1)
+        interactive = threading.Thread(
+            target=submit, args=("interactive", PRIORITY_INTERACTIVE)
+        )
+        interactive.start()
+        wait_until(lambda: scheduler.get_stats()["queue_depth"] == 2)
+
+        stats = scheduler.get_stats()
+        assert stats["queue_depth_by_lane"] == {"interactive": 1, "batch": 1}
+
+        release.set()
+        for t in (holder, batch, interactive):
+            t.join(timeout=2)
+
+        assert order == ["interactive", "batch"]
+        assert scheduler.get_stats()["admitted_by_lane"] == {
+            "batch": 2,
+            "interactive": 1,
+        }
+
+    def test_async_callers_respect_priority(self):
+        """비동기 호출자도 같은 우선순위 규칙을 따름"""
+        scheduler = ImagenScheduler(max_concurrent=1)
+        order = []
+
+        async def work(name):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+        async def run():
+            first = asyncio.create_task(scheduler.acall(lambda: work("first")))
+            await asyncio.sleep(0)
+            batch = asyncio.create_task(
+                scheduler.acall(lambda: work("batch"), PRIORITY_BATCH)
+            )
+            await asyncio.sleep(0)
+            interactive = asyncio.create_task(scheduler.acall(lambda: work("inter")))
+            await asyncio.gather(first, batch, interactive)
+
+        asyncio.run(run())
+
+        assert order == ["first", "inter", "batch"]
+
+
+class TestAIMD:
+    """AIMD 동시 실행 제한 테스트"""
+
+    def test_overload_halves_limit(self):
+        """429는 동시 실행 제한을 절반으로, 하한 아래로는 내려가지 않음"""
+        scheduler = ImagenScheduler(max_concurrent=8, min_concurrent=2)
+
+        def fail():
+            raise QuotaError(429)
+
+        for expected in (4, 2, 2):
+            with pytest.raises(QuotaError):
+                scheduler.call(fail)
+            assert scheduler.get_stats()["concurrency_limit"] == expected
+
+        assert scheduler.get_stats()["overloads"] == 3
+
+    def test_success_ramps_up(self):
+        """성공할 때마다 1/limit씩 증가하여 상한까지 회복"""
+        scheduler = ImagenScheduler(max_concurrent=4)
+        with pytest.raises(QuotaError):
+            scheduler.call(lambda: (_ for _ in ()).throw(QuotaError(503)))
+        assert scheduler.get_stats()["concurrency_limit"] == 2
+
+        scheduler.call(lambda: None)
+        assert scheduler.get_stats()["concurrency_limit"] == 2.5
+
+        for _ in range(10):
+            scheduler.call(lambda: None)
+        assert scheduler.get_stats()["concurrency_limit"] == 4
+
+    def test_other_errors_do_not_change_limit(self):
+        """과부하가 아닌 오류는 제한을 바꾸지 않음"""
+        scheduler = ImagenScheduler(max_concurrent=4)
+
+        with pytest.raises(ValueError):
+            scheduler.call(lambda: (_ for _ in ()).throw(ValueError("bad")))
+
+        stats = scheduler.get_stats()
+        assert stats["concurrency_limit"] == 4
+        assert stats["in_flight"] == 0
+
+
+class TestRateLimit:
+    """토큰 버킷 속도 제한 테스트"""
+
+    def test_waits_for_token(self):
+        """토큰이 없으면 보충될 때까지 대기하고 대기 시간이 통계에 기록됨"""
+        scheduler = ImagenScheduler(rate_per_minute=1200, burst=1)
+
+        start = time.monotonic()
+        for _ in range(3):
+            scheduler.call(lambda: None)
+        elapsed = time.monotonic() - start
+
+        # 초당 20개 → 두 번째, 세 번째 호출은 각각 약 50ms 대기
+        assert elapsed >= 0.08
+        stats = scheduler.get_stats()
+        assert stats["admitted"] == 3
+        assert stats["max_wait_ms"] >= 40
+
+    def test_cancelled_waiter_removed(self):
+        """취소된 비동기 대기자는 대기열에서 제거"""
+        scheduler = ImagenScheduler(rate_per_minute=1, burst=1)
+
+        async def run():
+            await scheduler.acall(lambda: asyncio.sleep(0))
+            task = asyncio.create_task(scheduler.acall(lambda: asyncio.sleep(0)))
+            await asyncio.sleep(0.01)
+            assert scheduler.get_stats()["queue_depth"] == 1
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run())
+
+        assert scheduler.get_stats()["queue_depth"] == 0
+
+
+class TestImageGeneratorScheduling:
+    """ImageGenerator 스케줄러 연동 테스트"""
+
+    @patch.dict(
+        os.environ,
+        {
+            "CACHE_ENABLED": "false",
+            "GOOGLE_API_KEY": "test-key",
+            "IMAGEN_MAX_CONCURRENT": "3",
+            "IMAGEN_RATE_LIMIT_RPM": "600",
+            "IMAGEN_RATE_BURST": "5",
+        },
+    )
+    def test_scheduler_configured_from_env(self):
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+
+        stats = generator.get_scheduler_stats()
+
+        assert stats["max_concurrent"] == 3
+        assert stats["rate_per_minute"] == 600
+        assert stats["tokens_available"] == 5
+        # get_scheduler_stats MCP 도구는 JSON으로 그대로 반환
+        assert json.loads(json.dumps(stats))["retry"] == stats["retry"]
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_batch_items_use_batch_lane(self):
+        """배치 항목은 배치 우선순위, 단일 생성은 대화형 우선순위로 호출"""
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+        buffer = BytesIO()
+        Image.fromarray(np.zeros((8, 8, 3), dtype=np.uint8)).save(buffer, "PNG")
+        response = MagicMock()
+        image = MagicMock()
+        image.image.image_bytes = buffer.getvalue()
+        response.generated_images = [image]
+
+        async def generate_images(**kwargs):
+            return response
+
+        generator.client = MagicMock()
+        generator.client.aio.models.generate_images = generate_images
+
+        async def run():
+            await generator.agenerate("single")
+            await generator.generate_batch([{"prompt": "a"}, {"prompt": "b"}])
+
+        asyncio.run(run())
+
+        lanes = generator.get_scheduler_stats()["admitted_by_lane"]
+        assert lanes == {"interactive": 1, "batch": 2}
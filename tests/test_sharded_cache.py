@@ -0,0 +1,143 @@
+"""
+샤드 분할 캐시 테스트
+
+테스트 시나리오:
+- 키는 항상 같은 샤드에 저장되고 통계는 샤드별 카운터의 합
+- 샤드별 용량 제한 (전체 용량을 샤드 수로 나눔)
+- 공유 L2에서 제거된 다른 샤드의 키는 그 샤드의 L1에서도 삭제
+- clear()는 키마다 한 번만 제거 알림
+- 여러 스레드의 동시 저장/조회
+- CACHE_SHARDS 환경 변수로 ImageGenerator가 샤드 캐시 사용
+"""
+
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.disk_cache import SqliteCacheStore  # noqa: E402
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.sharded_cache import ShardedImageCache  # noqa: E402
+
+
+class TestShardedImageCache:
+    """ShardedImageCache 테스트"""
+
+    def test_get_set_and_aggregated_stats(self):
+        cache = ShardedImageCache(shards=4)
+        for i in range(20):
+            cache.set(f"key{i}", {"v": i})
+
+        assert all(cache.get(f"key{i}") == {"v": i} for i in range(20))
+        assert cache.get("missing") is None
+
+        stats = cache.get_stats()
+        assert stats["hits"] == 20
+        assert stats["misses"] == 1
+        assert stats["cache_size"] == 20
+        assert stats["shards"] == 4
+        assert sum(stats["shard_sizes"]) == 20
+        assert cache.size == 20
+
+    def test_per_shard_capacity(self):
+        cache = ShardedImageCache(max_size=8, shards=4)
+        for i in range(100):
+            cache.set(f"key{i}", {"v": i})
+
+        stats = cache.get_stats()
+        assert all(size <= 2 for size in stats["shard_sizes"])
+        assert stats["cache_size"] <= 8
+
+    def test_l2_eviction_reaches_owning_shard(self, tmp_path):
+        removed = []
+        l2 = SqliteCacheStore(tmp_path / "cache.sqlite3", max_entries=1)
+        cache = ShardedImageCache(l2=l2, on_remove=removed.append, shards=4)
+        first, second = "a", "b"
+        # 서로 다른 샤드에 있는 두 키를 고름
+        while cache._shard_for(first) is cache._shard_for(second):
+            second += "b"
+
+        cache.set(first, {"v": 1})
+        time.sleep(0.01)
+        cache.set(second, {"v": 2})
+
+        assert removed == [first]
+        assert cache.get(first) is None
+        assert cache.get(second) == {"v": 2}
+        assert cache.size == 1
+
+    def test_clear_notifies_each_key_once(self, tmp_path):
+        removed = []
+        cache = ShardedImageCache(
+            l2=SqliteCacheStore(tmp_path / "cache.sqlite3"),
+            on_remove=removed.append,
+            shards=4,
+        )
+        for i in range(10):
+            cache.set(f"key{i}", {"v": i})
+
+        assert cache.clear() == 10
+        assert sorted(removed) == sorted(f"key{i}" for i in range(10))
+        assert cache.get_stats()["cache_size"] == 0
+
+    def test_purge_expired_across_shards(self):
+        removed = []
+        cache = ShardedImageCache(ttl_seconds=1, on_remove=removed.append, shards=4)
+        for i in range(8):
+            cache.set(f"key{i}", {"v": i})
+
+        time.sleep(1.1)
+
+        assert cache.purge_expired() == 8
+        assert len(removed) == 8
+        assert cache.get_stats()["expired"] == 8
+
+    def test_concurrent_threads(self):
+        # 모든 키가 들어가는 용량 (다른 스레드의 저장이 방금 저장한 키를 밀어내지 않도록)
+        cache = ShardedImageCache(max_size=3200, shards=8)
+        errors = []
+
+        def worker(thread_id: int) -> None:
+            try:
+                for i in range(200):
+                    key = f"t{thread_id}-{i}"
+                    cache.set(key, {"v": i})
+                    assert cache.get(key) == {"v": i}
+            except Exception as e:  # pragma: no cover - 실패 시 보고
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert cache.get_stats()["hits"] == 1600
+
+
+class TestImageGeneratorShards:
+    """CACHE_SHARDS 설정 테스트"""
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "CACHE_SHARDS": "4"})
+    def test_sharded_cache_from_env(self):
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+
+        assert isinstance(generator._cache, ShardedImageCache)
+        assert generator.get_cache_stats()["shards"] == 4
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "CACHE_SHARDS": "1"})
+    def test_single_lock_cache_by_default(self):
+        generator = ImageGenerator({"styles": [], "default_style": "realistic"})
+
+        assert not isinstance(generator._cache, ShardedImageCache)
@@ -0,0 +1,273 @@
+"""
+진행 중 요청 병합 (Single-flight) 테스트
+
+테스트 시나리오:
+- SingleFlight.do(): 스레드 간 동일 키 병합, 예외 전파
+- SingleFlight.ado(): 코루틴 간 동일 키 병합, leader 호출자 취소 시에도 follower는 결과 수신
+- ImageGenerator: 동시 동일 요청은 API를 한 번만 호출 (동기/비동기)
+- get_cache_stats()의 coalesced_hits 집계
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from io import BytesIO
+from PIL import Image
+import numpy as np
+import pytest
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.image_gen import ImageGenerator  # noqa: E402
+from generators.singleflight import SingleFlight  # noqa: E402
+
+
+def create_mock_response() -> MagicMock:
+    """generated_images 하나를 가진 응답 mock"""
+    arr = np.zeros((32, 32, 3), dtype=np.uint8)
+    img = Image.fromarray(arr, mode="RGB")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+
+    response = MagicMock()
+    image = MagicMock()
+    image.image.image_bytes = buffer.getvalue()
+    response.generated_images = [image]
+    return response
+
+
+STYLES_DATA = {
+    "styles": [{"name": "realistic", "keywords": "realistic style"}],
+    "default_style": "realistic",
+}
+
+
+class TestSingleFlight:
+    """SingleFlight 단위 테스트"""
+
+    def test_threads_share_single_call(self):
+        """동일 키로 동시에 호출한 스레드는 한 번의 실행 결과를 공유"""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def work():
+            calls.append(1)
+            release.wait(timeout=2)
+            return "value"
+
+        results = []
+
+        def worker():
+            results.append(flight.do("key", work))
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        # 모든 follower가 합류할 때까지 대기
+        deadline = time.monotonic() + 2
+        while flight.coalesced < 4 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert len(calls) == 1
+        assert sorted(r[1] for r in results) == [False, True, True, True, True]
+        assert all(r[0] == "value" for r in results)
+        assert flight.coalesced == 4
+        assert flight.in_flight == 0
+
+    def test_leader_exception_propagates(self):
+        """leader 예외는 호출자에게 전파되고 진행 중 항목은 정리됨"""
+        flight = SingleFlight()
+
+        def failing():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flight.do("key", failing)
+
+        assert flight.in_flight == 0
+        assert flight.do("key", lambda: 1) == (1, False)
+
+    def test_async_callers_share_single_call(self):
+        """동일 키로 동시에 await한 코루틴은 한 번의 실행 결과를 공유"""
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return "value"
+
+        async def run():
+            return await asyncio.gather(*(flight.ado("key", work) for _ in range(3)))
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert [r[0] for r in results] == ["value"] * 3
+        assert flight.coalesced == 2
+
+    def test_cancelled_leader_does_not_fail_followers(self):
+        """leader 호출자가 취소되어도 follower는 작업 결과를 받음"""
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "value"
+
+        async def run():
+            leader = asyncio.ensure_future(flight.ado("key", work))
+            await asyncio.sleep(0)  # leader가 먼저 진행 중 테이블에 등록
+            follower = asyncio.ensure_future(flight.ado("key", work))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(run()) == ("value", True)
+        assert len(calls) == 1
+        assert flight.in_flight == 0
+
+
+class TestImageGeneratorCoalescing:
+    """ImageGenerator 요청 병합 통합 테스트"""
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_concurrent_async_requests_call_api_once(self):
+        """동시에 들어온 동일 비동기 요청은 API를 한 번만 호출"""
+        generator = ImageGenerator(STYLES_DATA)
+        client = MagicMock()
+        calls = []
+
+        async def generate_images(**kwargs):
+            calls.append(kwargs["prompt"])
+            await asyncio.sleep(0.05)
+            return create_mock_response()
+
+        client.aio.models.generate_images = generate_images
+        generator.client = client
+
+        async def run():
+            return await asyncio.gather(
+                *(generator.agenerate("a cat", "realistic") for _ in range(4))
+            )
+
+        results = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert all(r["success"] for r in results)
+        assert sum(1 for r in results if r.get("coalesced")) == 3
+        assert len({r["local_path"] for r in results}) == 1
+
+        stats = generator.get_cache_stats()
+        assert stats["coalesced_hits"] == 3
+        assert stats["cache_size"] == 1
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_concurrent_thread_requests_call_api_once(self):
+        """동시에 들어온 동일 동기 요청(스레드)은 API를 한 번만 호출"""
+        generator = ImageGenerator(STYLES_DATA)
+        client = MagicMock()
+        release = threading.Event()
+
+        def generate_images(**kwargs):
+            release.wait(timeout=2)
+            return create_mock_response()
+
+        client.models.generate_images.side_effect = generate_images
+        generator.client = client
+
+        results = []
+        threads = [
+            threading.Thread(
+                target=lambda: results.append(
+                    generator.generate_advanced("a cat", enhance_prompt=False)
+                )
+            )
+            for _ in range(3)
+        ]
+        for t in threads:
+            t.start()
+        deadline = time.monotonic() + 2
+        while generator._singleflight.coalesced < 2 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+        for t in threads:
+            t.join()
+
+        assert client.models.generate_images.call_count == 1
+        assert all(r["success"] for r in results)
+        assert generator.get_cache_stats()["coalesced_hits"] == 2
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_different_formats_share_single_call(self):
+        """형식/품질만 다른 동시 요청도 한 번만 호출하고 마스터에서 변환"""
+        generator = ImageGenerator(STYLES_DATA)
+        client = MagicMock()
+        calls = []
+
+        async def generate_images(**kwargs):
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return create_mock_response()
+
+        client.aio.models.generate_images = generate_images
+        generator.client = client
+
+        async def run():
+            return await asyncio.gather(
+                generator.agenerate("a cat", format="png"),
+                generator.agenerate("a cat", format="webp", quality=80),
+            )
+
+        png, webp = asyncio.run(run())
+
+        assert len(calls) == 1
+        assert png["success"] and webp["success"]
+        assert {png["format"], webp["format"]} == {"png", "webp"}
+        follower = webp if webp.get("coalesced") else png
+        assert follower["coalesced"] is True
+        assert Path(follower["local_path"]).suffix == f".{follower['format']}"
+        assert png["local_path"] != webp["local_path"]
+        assert generator.get_cache_stats()["coalesced_hits"] == 1
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_coalescing_works_without_cache(self):
+        """캐시가 비활성화되어도 진행 중인 동일 요청은 병합"""
+        generator = ImageGenerator(STYLES_DATA)
+        client = MagicMock()
+        calls = []
+
+        async def generate_images(**kwargs):
+            calls.append(1)
+            await asyncio.sleep(0.02)
+            return create_mock_response()
+
+        client.aio.models.generate_images = generate_images
+        generator.client = client
+
+        async def run():
+            return await asyncio.gather(
+                generator.agenerate("a dog"), generator.agenerate("a dog")
+            )
+
+        asyncio.run(run())
+
+        assert len(calls) == 1
+        assert generator.get_cache_stats()["coalesced_hits"] == 1
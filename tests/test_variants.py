@@ -0,0 +1,210 @@
+"""
+다중 변형(variants) 이미지 생성 테스트
+
+테스트 시나리오:
+- variants=N 요청은 number_of_images=N으로 API를 한 번만 호출
+- 변형마다 별도 파일로 저장되고 개별 캐싱됨
+- 이후 더 많은 변형 요청 시 부족한 슬롯만 생성
+- 변형별 캐시 키 (variant=0은 기존 키와 동일)
+- 생성된 변형의 갤러리 등록
+"""
+
+import asyncio
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch, MagicMock
+from io import BytesIO
+from PIL import Image
+import numpy as np
+
+# src 디렉토리를 Python 경로에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+# google 모듈 mock 설정 (임포트 전에 수행)
+sys.modules["google"] = MagicMock()
+sys.modules["google.genai"] = MagicMock()
+sys.modules["google.genai.types"] = MagicMock()
+
+from generators.cache import generate_cache_key  # noqa: E402
+from generators.image_gen import ImageGenerator, MAX_VARIANTS  # noqa: E402
+
+
+def create_mock_png_bytes(shade: int) -> bytes:
+    """단색 PNG 이미지 바이트 생성"""
+    arr = np.full((48, 48, 3), shade, dtype=np.uint8)
+    img = Image.fromarray(arr, mode="RGB")
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def create_mock_response(count: int) -> MagicMock:
+    """generated_images를 count개 가진 응답 mock"""
+    response = MagicMock()
+    images = []
+    for i in range(count):
+        image = MagicMock()
+        image.image.image_bytes = create_mock_png_bytes(40 * i)
+        images.append(image)
+    response.generated_images = images
+    return response
+
+
+def create_clients() -> MagicMock:
+    """요청된 이미지 수만큼 반환하는 동기/비동기 클라이언트 mock"""
+    client = MagicMock()
+    client.requested = []
+
+    def generate_images(model, prompt, config):
+        client.requested.append(config.number_of_images)
+        return create_mock_response(config.number_of_images)
+
+    async def agenerate_images(model, prompt, config):
+        return generate_images(model, prompt, config)
+
+    client.models.generate_images.side_effect = generate_images
+    client.aio.models.generate_images = agenerate_images
+    return client
+
+
+STYLES_DATA = {
+    "styles": [{"name": "realistic", "keywords": "realistic style"}],
+    "default_style": "realistic",
+}
+
+
+def make_generator() -> ImageGenerator:
+    generator = ImageGenerator(STYLES_DATA)
+    generator.client = create_clients()
+    # config mock이 number_of_images를 그대로 노출하도록 설정
+    generator._build_config = lambda aspect_ratio, number_of_images=1, *args: MagicMock(
+        number_of_images=number_of_images
+    )
+    return generator
+
+
+class TestVariantCacheKey:
+    """변형별 캐시 키 테스트"""
+
+    def test_variant_zero_matches_legacy_key(self):
+        """variant=0 키는 기존 단일 이미지 키와 동일"""
+        assert generate_cache_key("a cat", "realistic", variant=0) == (
+            generate_cache_key("a cat", "realistic")
+        )
+
+    def test_variant_keys_are_distinct(self):
+        """변형 번호마다 다른 키 생성"""
+        keys = {generate_cache_key("a cat", "realistic", variant=i) for i in range(4)}
+        assert len(keys) == 4
+
+
+class TestVariantGeneration:
+    """ImageGenerator variants 옵션 테스트"""
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_single_round_trip(self):
+        """variants=3은 API를 한 번 호출하고 3개의 파일을 저장"""
+        generator = make_generator()
+
+        result = generator.generate("a cat", "realistic", variants=3)
+
+        assert result["success"] is True
+        assert generator.client.requested == [3]
+        assert result["variant_count"] == 3
+        paths = [variant["local_path"] for variant in result["variants"]]
+        assert len(set(paths)) == 3
+        assert all(Path(path).exists() for path in paths)
+        assert result["local_path"] == paths[0]
+        assert generator.get_cache_stats()["cache_size"] == 3
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_variant_slots_cached_individually(self):
+        """이후 요청은 캐시된 슬롯을 재사용하고 부족한 슬롯만 생성"""
+        generator = make_generator()
+        first = generator.generate("a cat", "realistic", variants=2)
+
+        single = generator.generate("a cat", "realistic")
+        more = generator.generate("a cat", "realistic", variants=4)
+
+        assert single["cached"] is True
+        assert single["local_path"] == first["variants"][0]["local_path"]
+        assert generator.client.requested == [2, 2]
+        assert more["cached_variants"] == 2
+        assert [v["variant"] for v in more["variants"]] == [0, 1, 2, 3]
+        assert more["variants"][1]["local_path"] == first["variants"][1]["local_path"]
+        assert not more["variants"][2].get("cached")
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_async_advanced_variants(self):
+        """agenerate_advanced()도 한 번의 호출로 변형을 생성하고 리사이즈"""
+        generator = make_generator()
+
+        result = asyncio.run(
+            generator.agenerate_advanced(
+                "a cat", width=256, height=256, enhance_prompt=False, variants=2
+            )
+        )
+
+        assert generator.client.requested == [2]
+        assert result["variant_count"] == 2
+        for variant in result["variants"]:
+            with Image.open(variant["local_path"]) as img:
+                assert img.size == (256, 256)
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_variants_clamped_to_maximum(self):
+        """최대 변형 수를 넘는 요청은 MAX_VARIANTS로 제한"""
+        generator = make_generator()
+
+        result = generator.generate("a cat", variants=10)
+
+        assert generator.client.requested == [MAX_VARIANTS]
+        assert result["variant_count"] == MAX_VARIANTS
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_fewer_images_returned(self):
+        """API가 요청보다 적은 이미지를 반환하면 받은 만큼만 반환"""
+        generator = make_generator()
+        generator.client.models.generate_images.side_effect = lambda **kwargs: (
+            create_mock_response(1)
+        )
+
+        result = generator.generate("a cat", variants=3)
+
+        assert result["success"] is True
+        assert result["variant_count"] == 1
+
+
+class TestVariantGalleryRegistration:
+    """생성된 변형의 갤러리 등록 테스트"""
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "true", "GOOGLE_API_KEY": "test-key"})
+    def test_each_variant_registered(self):
+        """새로 생성된 변형만 갤러리에 등록되고 캐시 HIT은 재등록하지 않음"""
+        generator = make_generator()
+        gallery = MagicMock()
+        generator.set_gallery(gallery)
+
+        generator.generate("a cat", "realistic", "1:1", variants=2)
+        generator.generate("a cat", "realistic", "1:1", variants=2)
+
+        assert gallery.register_image.call_count == 2
+        registered = [call.args[0] for call in gallery.register_image.call_args_list]
+        assert [m.generation_params["variant"] for m in registered] == [0, 1]
+        assert all(m.aspect_ratio == "1:1" for m in registered)
+        assert all(m.resolution == "48x48" for m in registered)
+        assert all(m.id == f"img_{Path(m.filename).stem}" for m in registered)
+        assert all(Path(m.filepath).stem == m.content_hash for m in registered)
+
+    @patch.dict(os.environ, {"CACHE_ENABLED": "false", "GOOGLE_API_KEY": "test-key"})
+    def test_registration_failure_does_not_fail_generation(self):
+        """갤러리 등록 실패는 생성 결과에 영향 없음"""
+        generator = make_generator()
+        gallery = MagicMock()
+        gallery.register_image.side_effect = OSError("disk full")
+        generator.set_gallery(gallery)
+
+        result = generator.generate("a cat")
+
+        assert result["success"] is True